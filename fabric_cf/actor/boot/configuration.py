@@ -514,6 +514,18 @@ class Configuration:
     def get_kafka_consumer_poll_timeout(self) -> int:
         return int(self.global_config.runtime.get(Constants.PROPERTY_CONF_KAFKA_POLL_TIMEOUT, 250))
 
+    def get_rpc_consumer_workers(self) -> int:
+        return int(self.global_config.runtime.get(Constants.PROPERTY_CONF_RPC_CONSUMER_WORKERS, 4))
+
+    def get_handler_max_workers(self) -> int:
+        return int(self.global_config.runtime.get(Constants.PROPERTY_CONF_HANDLER_MAX_WORKERS, 10))
+
+    def get_kernel_incremental_tick(self) -> bool:
+        return self.global_config.runtime.get(Constants.PROPERTY_CONF_KERNEL_INCREMENTAL_TICK, False)
+
+    def get_kernel_sweep_ticks(self) -> int:
+        return int(self.global_config.runtime.get(Constants.PROPERTY_CONF_KERNEL_SWEEP_TICKS, 60))
+
     def get_kafka_consumer_enable_auto_commit(self) -> bool:
         return self.global_config.runtime.get(Constants.PROPERTY_CONF_KAFKA_ENABLE_AUTO_COMMIT, True)
 
@@ -195,12 +195,22 @@ class ConfigurationProcessor:
             password = self.config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_PASSWORD]
             db_host = self.config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_HOST]
             db_name = self.config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_NAME]
+            reservation_summary = self.config.get_global_config().get_database().get(
+                Constants.PROPERTY_CONF_DB_RESERVATION_SUMMARY, False)
+            write_behind_window = int(self.config.get_global_config().get_database().get(
+                Constants.PROPERTY_CONF_DB_WRITE_BEHIND_WINDOW, 0))
+            occupancy_cache = self.config.get_global_config().get_database().get(
+                Constants.PROPERTY_CONF_DB_OCCUPANCY_CACHE, False)
             if isinstance(plugin, SubstrateMixin):
                 db = SubstrateActorDatabase(user=user, password=password, database=db_name, db_host=db_host,
-                                            logger=self.logger)
+                                            logger=self.logger, reservation_summary=reservation_summary,
+                                            write_behind_window=write_behind_window,
+                                            occupancy_cache=occupancy_cache)
             else:
                 db = ServerActorDatabase(user=user, password=password, database=db_name, db_host=db_host,
-                                         logger=self.logger)
+                                         logger=self.logger, reservation_summary=reservation_summary,
+                                         write_behind_window=write_behind_window,
+                                         occupancy_cache=occupancy_cache)
 
             plugin.set_database(db=db)
         return plugin
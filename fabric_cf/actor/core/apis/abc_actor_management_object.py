@@ -239,7 +239,8 @@ class ABCActorManagementObject(ABCManagementObject):
                          slice_id: ID = None, rid: ID = None, oidc_claim_sub: str = None,
                          email: str = None, rid_list: List[str] = None, type: str = None,
                          site: str = None, node_id: str = None, host: str = None, ip_subnet: str = None,
-                         full: bool = False, start: datetime = None, end: datetime = None) -> ResultReservationAvro:
+                         full: bool = None, start: datetime = None, end: datetime = None, after: ID = None,
+                         limit: int = None) -> ResultReservationAvro:
         """
         Get Reservations
         @param states states
@@ -255,9 +256,40 @@ class ABCActorManagementObject(ABCManagementObject):
         @param caller caller
         @param host host
         @param ip_subnet ip subnet
-        @param full
+        @param full include the sliver; defaults to True when querying by slice or reservation id
         @param start: start time
         @param end: end time
+        @param after: return only the reservations with id greater than this reservation id
+        @param limit: maximum number of reservations to return
+
+        @return returns list of the reservations
+        """
+
+    def get_reservation_summaries(self, *, caller: AuthToken, states: List[int] = None,
+                                  slice_id: ID = None, rid: ID = None, oidc_claim_sub: str = None, email: str = None,
+                                  rid_list: List[str] = None, type: str = None, site: str = None,
+                                  node_id: str = None, host: str = None, ip_subnet: str = None,
+                                  start: datetime = None, end: datetime = None, after: ID = None,
+                                  limit: int = None) -> ResultReservationAvro:
+        """
+        Get Reservations from their summaries without unpickling them; the returned reservations
+        carry the state, term and notices but no sliver
+        @param caller caller
+        @param states states
+        @param slice_id slice ID
+        @param rid reservation id
+        @param oidc_claim_sub: oidc claim sub
+        @param email: user email
+        @param rid_list: list of Reservation Id
+        @param type type of reservations like NodeSliver/NetworkServiceSliver
+        @param site site
+        @param node_id node id
+        @param host host
+        @param ip_subnet ip subnet
+        @param start: start time
+        @param end: end time
+        @param after: return only the reservations with id greater than this reservation id
+        @param limit: maximum number of reservations to return
 
         @return returns list of the reservations
         """
@@ -38,7 +38,7 @@ if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.abc_slice import ABCSlice
     from fabric_cf.actor.core.util.id import ID
     from fabric_cf.actor.core.plugins.handlers.configuration_mapping import ConfigurationMapping
-    from fabric_cf.actor.core.container.maintenance import Site
+    from fabric_cf.actor.core.container.maintenance import Site, MaintenanceRegistry
     from fabric_cf.actor.core.kernel.poa import Poa
 
 
@@ -147,6 +147,45 @@ class ABCDatabase(ABC):
         @throws Exception in case of error
         """
 
+    @abstractmethod
+    def flush(self, *, rid: ID = None):
+        """
+        Durability barrier for buffered reservation updates. On return the updates
+        issued before the call are persisted.
+
+        @param rid reservation id; if not specified updates for all reservations are persisted
+
+        @throws Exception in case of error
+        """
+
+    @abstractmethod
+    def stop(self):
+        """
+        Persist the buffered reservation updates and stop the background writer, if any; updates
+        issued after the call are written through
+
+        @throws Exception in case of error
+        """
+
+    @abstractmethod
+    def batch_updates(self):
+        """
+        Context manager buffering the reservation updates issued by the calling thread. The buffered
+        updates are written in a single transaction when the outermost batch completes; if the transaction
+        fails, they are written one at a time.
+
+        @return dictionary of reservation id to exception for the updates which could not be written;
+        populated when the outermost batch completes
+        """
+
+    @abstractmethod
+    def get_occupancy_cache(self):
+        """
+        Returns the in-memory mirror of the reservation occupancy used to build the broker query model
+
+        @return occupancy cache or None if not enabled or not available
+        """
+
     @abstractmethod
     def update_slice(self, *, slice_object: ABCSlice):
         """
@@ -161,15 +200,40 @@ class ABCDatabase(ABC):
     def get_reservations(self, *, slice_id: ID = None, graph_node_id: str = None, project_id: str = None,
                          email: str = None, oidc_sub: str = None, rid: ID = None, states: list[int] = None,
                          site: str = None, rsv_type: list[str] = None, start: datetime = None,
-                         end: datetime = None, ip_subnet: str = None, host: str = None) -> List[ABCReservationMixin]:
+                         end: datetime = None, ip_subnet: str = None, host: str = None, after: ID = None,
+                         limit: int = None) -> List[ABCReservationMixin]:
         """
-        Retrieves the reservations.
+        Retrieves the reservations. When after or limit is specified, the reservations are returned in the order
+        of their ids starting after the specified reservation (keyset pagination).
 
+        @param after return only the reservations with id greater than this reservation id
+        @param limit maximum number of reservations to return
         @return list of reservations
 
         @throws Exception in case of error
         """
 
+    @abstractmethod
+    def get_reservation_summaries(self, *, slice_id: ID = None, graph_node_id: str = None, project_id: str = None,
+                                  email: str = None, oidc_sub: str = None, rid: ID = None, states: list[int] = None,
+                                  category: list[int] = None, site: str = None, rsv_type: list[str] = None,
+                                  start: datetime = None, end: datetime = None, ip_subnet: str = None,
+                                  host: str = None, after: ID = None, limit: int = None,
+                                  rid_list: List[str] = None) -> List[dict]:
+        """
+        Retrieves the summaries of the reservations without unpickling the reservations
+        (see ReservationSummary for the fields included).
+
+        @param category reservation categories
+        @param after return only the reservations with id greater than this reservation id
+        @param limit maximum number of reservations to return
+        @param rid_list list of reservation ids
+
+        @return list of reservation summaries
+
+        @throws Exception in case of error
+        """
+
     @abstractmethod
     def get_components(self, *, node_id: str, states: list[int], rsv_type: list[str], component: str = None,
                        bdf: str = None, start: datetime = None, end: datetime = None,
@@ -448,6 +512,14 @@ class ABCDatabase(ABC):
         @return list of sites
         """
 
+    @abstractmethod
+    def get_maintenance_registry(self) -> MaintenanceRegistry or None:
+        """
+        Returns the in-memory registry of the maintenance state of the testbed and the sites
+
+        @return maintenance registry or None if not available
+        """
+
     def add_maintenance_properties(self, *, properties: dict):
         """
         Add maintenance properties
@@ -152,8 +152,9 @@ class ABCMgmtActor(ABCComponent):
     def get_reservations(self, *, states: List[int] = None, slice_id: ID = None,
                          rid: ID = None, oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
                          type: str = None, site: str = None, node_id: str = None,
-                         host: str = None, ip_subnet: str = None, full: bool = False,
-                         start: datetime = None, end: datetime = None) -> List[ReservationMng]:
+                         host: str = None, ip_subnet: str = None, full: bool = None,
+                         start: datetime = None, end: datetime = None, after: ID = None,
+                         limit: int = None) -> List[ReservationMng]:
         """
         Get Reservations
         @param states states
@@ -167,13 +168,43 @@ class ABCMgmtActor(ABCComponent):
         @param node_id node id
         @param ip_subnet ip subnet
         @param host host
-        @param full
+        @param full include the sliver; defaults to True when querying by slice or reservation id
         @param start: start time
         @param end: end time
+        @param after: return only the reservations with id greater than this reservation id
+        @param limit: maximum number of reservations to return
         Obtains all reservations
         @return returns list of the reservations
         """
 
+    @abstractmethod
+    def get_reservation_summaries(self, *, states: List[int] = None, slice_id: ID = None, rid: ID = None,
+                                  oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
+                                  type: str = None,
+                                  site: str = None, node_id: str = None, host: str = None, ip_subnet: str = None,
+                                  start: datetime = None, end: datetime = None, after: ID = None,
+                                  limit: int = None) -> List[ReservationMng]:
+        """
+        Get Reservations from their summaries without unpickling them; the returned reservations
+        carry the state, term and notices but no sliver
+        @param states states
+        @param slice_id slice ID
+        @param rid reservation id
+        @param oidc_claim_sub: oidc claim sub
+        @param email: user email
+        @param rid_list: list of Reservation Id
+        @param type type of reservations like NodeSliver/NetworkServiceSliver
+        @param site site
+        @param node_id node id
+        @param host host
+        @param ip_subnet ip subnet
+        @param start: start time
+        @param end: end time
+        @param after: return only the reservations with id greater than this reservation id
+        @param limit: maximum number of reservations to return
+        @return returns list of the reservations
+        """
+
     def get_components(self, *, node_id: str, rsv_type: list[str], states: list[int],
                        component: str = None, bdf: str = None, start: datetime = None,
                        end: datetime = None, excludes: List[str] = None) -> Dict[str, List[str]]:
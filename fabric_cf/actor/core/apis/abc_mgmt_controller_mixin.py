@@ -26,7 +26,8 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import TYPE_CHECKING, List
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict
 
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
 from fim.slivers.base_sliver import BaseSliver
@@ -37,6 +38,9 @@ from fabric_cf.actor.core.apis.abc_mgmt_actor import ABCMgmtActor
 if TYPE_CHECKING:
     from fabric_cf.actor.core.util.id import ID
     from fabric_mb.message_bus.messages.unit_avro import UnitAvro
+    from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+    from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
+    from fabric_mb.message_bus.messages.result_avro import ResultAvro
 
 
 class ABCMgmtControllerMixin(ABCMgmtActor, ABCMgmtClientActor):
@@ -61,6 +65,44 @@ class ABCMgmtControllerMixin(ABCMgmtActor, ABCMgmtClientActor):
         @returns true for success and false for failure
         """
 
+    @abstractmethod
+    def demand_reservations(self, *, reservations: List[ReservationMng]) -> Dict[str, ResultAvro]:
+        """
+        Update and demand a set of reservations. The actor thread is entered once for the whole set and the
+        reservation updates are persisted in a single transaction.
+        @param reservations reservations
+        @returns dictionary of reservation id to result
+        """
+
+    @abstractmethod
+    def close_reservations_by_rids(self, *, rids: List[ID]) -> Dict[str, ResultAvro]:
+        """
+        Close a set of reservations
+        @param rids reservation ids
+        @returns dictionary of reservation id to result
+        """
+
+    @abstractmethod
+    def extend_reservations(self, *, rids: List[ID], new_end_time: datetime = None,
+                            slivers: Dict[ID, BaseSliver] = None,
+                            dependencies: Dict[ID, List[ReservationPredecessorAvro]] = None) -> Dict[str, ResultAvro]:
+        """
+        Extend a set of reservations
+        @param rids reservation ids
+        @param new_end_time new end time applied to all the reservations
+        @param slivers modified slivers keyed by reservation id
+        @param dependencies redeem dependencies keyed by reservation id
+        @returns dictionary of reservation id to result
+        """
+
+    @abstractmethod
+    def modify_reservations(self, *, slivers: Dict[ID, BaseSliver]) -> Dict[str, ResultAvro]:
+        """
+        Modify a set of reservations
+        @param slivers modified slivers keyed by reservation id
+        @returns dictionary of reservation id to result
+        """
+
     @abstractmethod
     def poa(self, *, poa: PoaAvro) -> bool:
         """
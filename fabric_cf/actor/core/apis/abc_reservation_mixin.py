@@ -360,6 +360,15 @@ class ABCReservationMixin(ABCReservationResources, ABCReservationStatus):
         @throws Exception in case of error
         """
 
+    @abstractmethod
+    def is_probe_required(self) -> bool:
+        """
+        Checks if the reservation has outstanding work which must be advanced
+        by probing it on the next kernel tick.
+
+        @return true if the reservation must be probed
+        """
+
     @abstractmethod
     def reserve(self, *, policy: ABCPolicy) -> bool:
         """
@@ -91,6 +91,10 @@ class Constants:
     PROPERTY_CONF_KAFKA_BATCH_SIZE = "commit.batch.size"
     PROPERTY_CONF_KAFKA_AUTO_COMMIT_INTERVAL = "auto.commit.interval.ms"
     PROPERTY_CONF_KAFKA_ENABLE_AUTO_COMMIT = "enable.auto.commit"
+    PROPERTY_CONF_RPC_CONSUMER_WORKERS = "rpc.consumer.workers"
+    PROPERTY_CONF_HANDLER_MAX_WORKERS = "handler.max.workers"
+    PROPERTY_CONF_KERNEL_INCREMENTAL_TICK = "kernel.incremental.tick"
+    PROPERTY_CONF_KERNEL_SWEEP_TICKS = "kernel.sweep.ticks"
 
     CONFIG_SECTION_RUNTIME = "runtime"
     PROPERTY_CONF_KAFKA_SERVER = "kafka-server"
@@ -122,6 +126,8 @@ class Constants:
     CREDMGR_HOST = "credmgr-host"
     PUBLISH_INTERVAL = "publish-interval"
     REFRESH_INTERVAL = "refresh-interval"
+    QUERY_CACHE_SIZE = "query-cache-size"
+    QUERY_CACHE_GRANULARITY = "query-cache-granularity"
     DELEGATION = "delegation"
     LOCAL_BQM = "local"
 
@@ -177,6 +183,9 @@ class Constants:
 
     CONFIG_SECTION_CORE_API = "core_api"
     PROPERTY_CONF_HOST = "host"
+    PROPERTY_CONF_QUOTA_REFRESH_INTERVAL = "quota-refresh-interval"
+    PROPERTY_CONF_QUOTA_SYNC_INTERVAL = "quota-sync-interval"
+    PROPERTY_CONF_QUOTA_SYNC_RETRIES = "quota-sync-retries"
 
     CONFIG_SECTION_SMTP = "smtp"
 
@@ -185,6 +194,9 @@ class Constants:
     PROPERTY_CONF_DB_PASSWORD = "db-password"
     PROPERTY_CONF_DB_NAME = "db-name"
     PROPERTY_CONF_DB_HOST = "db-host"
+    PROPERTY_CONF_DB_RESERVATION_SUMMARY = "reservation-summary"
+    PROPERTY_CONF_DB_WRITE_BEHIND_WINDOW = "write-behind-window-ms"
+    PROPERTY_CONF_DB_OCCUPANCY_CACHE = "occupancy-cache"
 
     CONFIG_SECTION_NEO4J = "neo4j"
     CONFIG_SECTION_BQM = "bqm"
@@ -208,6 +220,10 @@ class Constants:
     INFRASTRUCTURE_PROJECT_ID = "infrastructure.project.id"
     TOTAL_SLICE_COUNT_SEED = "total_slice_count_seed"
     EXCLUDED_PROJECTS = "excluded.projects"
+    FUTURE_LEASE_WORKERS = "future.lease.workers"
+    FUTURE_LEASE_TIMEOUT_SECONDS = "future.lease.timeout.seconds"
+    SLICE_DEFER_WORKERS = "slice.defer.workers"
+    ADVANCE_SCHEDULING_WORKERS = "advance.scheduling.workers"
 
     ELASTIC_TIME = "request.elasticTime"
     ELASTIC_SIZE = "request.elasticSize"
@@ -45,6 +45,7 @@ from fabric_cf.actor.core.common.exceptions import InitializationException
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.container.container import Container
 from fabric_cf.actor.core.util.log_helper import LogHelper
+from fabric_cf.actor.security.pdp_auth import PdpAuth
 from fabric_cf.actor.security.token_validator import TokenValidator
 
 if TYPE_CHECKING:
@@ -76,6 +77,7 @@ class Globals:
         self.jwt_validator = None
         self.token_validator = None
         self.quota_mgr = None
+        self.pdp_auth = None
 
     def make_logger(self):
         """
@@ -182,7 +184,8 @@ class Globals:
         oauth_config = self.config.get_oauth_config()
         CREDMGR_CERTS = oauth_config.get(Constants.PROPERTY_CONF_O_AUTH_JWKS_URL, None)
         CREDMGR_KEY_REFRESH = oauth_config.get(Constants.PROPERTY_CONF_O_AUTH_KEY_REFRESH, None)
-        CREDMGR_TRL_REFRESH = oauth_config.get(Constants.PROPERTY_CONF_O_AUTH_TRL_REFRESH, '00:01:00')
+        # Configurations without trl-refresh keep refreshing the token revoke list with the keys
+        CREDMGR_TRL_REFRESH = oauth_config.get(Constants.PROPERTY_CONF_O_AUTH_TRL_REFRESH, CREDMGR_KEY_REFRESH)
         self.log.info(f'Initializing JWT Validator to use {CREDMGR_CERTS} endpoint, '
                       f'refreshing keys every {CREDMGR_KEY_REFRESH} HH:MM:SS refreshing '
                       f'token revoke list every {CREDMGR_TRL_REFRESH} HH:MM:SS')
@@ -190,16 +193,25 @@ class Globals:
         self.jwt_validator = JWTValidator(url=CREDMGR_CERTS,
                                           refresh_period=timedelta(hours=t.hour, minutes=t.minute, seconds=t.second))
         from urllib.parse import urlparse
-        t = datetime.strptime(CREDMGR_KEY_REFRESH, "%H:%M:%S")
+        t = datetime.strptime(CREDMGR_TRL_REFRESH, "%H:%M:%S")
         self.token_validator = TokenValidator(credmgr_host=str(urlparse(CREDMGR_CERTS).hostname),
                                               refresh_period=timedelta(hours=t.hour, minutes=t.minute, seconds=t.second),
                                               jwt_validator=self.jwt_validator)
 
+        self.pdp_auth = PdpAuth(config=self.config.get_global_config().get_pdp_config(), logger=self.log)
+
         core_api = self.config.get_core_api_config()
         if core_api.get("enable", False):
             self.quota_mgr = QuotaMgr(core_api_host=core_api.get(Constants.PROPERTY_CONF_HOST),
                                       token=core_api.get(Constants.TOKEN, ""),
-                                      logger=self.log)
+                                      logger=self.log,
+                                      refresh_interval=int(core_api.get(Constants.PROPERTY_CONF_QUOTA_REFRESH_INTERVAL,
+                                                                        QuotaMgr.DEFAULT_REFRESH_INTERVAL_SECONDS)),
+                                      sync_interval=int(core_api.get(Constants.PROPERTY_CONF_QUOTA_SYNC_INTERVAL,
+                                                                     QuotaMgr.DEFAULT_SYNC_INTERVAL_SECONDS)),
+                                      sync_retries=int(core_api.get(Constants.PROPERTY_CONF_QUOTA_SYNC_RETRIES,
+                                                                    QuotaMgr.DEFAULT_SYNC_RETRIES)))
+            self.quota_mgr.start()
 
     def load_config(self):
         """
@@ -222,6 +234,9 @@ class Globals:
     def get_quota_mgr(self) -> QuotaMgr:
         return self.quota_mgr
 
+    def get_pdp_auth(self) -> PdpAuth:
+        return self.pdp_auth
+
     def get_container(self) -> ABCActorContainer:
         """
         Get the container
@@ -318,6 +333,19 @@ class Globals:
         if self.get_config():
             return self.get_config().get_kafka_consumer_commit_batch_size()
 
+    def get_rpc_consumer_workers(self):
+        if self.get_config():
+            return self.get_config().get_rpc_consumer_workers()
+
+    def get_kernel_incremental_tick(self):
+        if self.get_config():
+            return self.get_config().get_kernel_incremental_tick()
+        return False
+
+    def get_kernel_sweep_ticks(self):
+        if self.get_config():
+            return self.get_config().get_kernel_sweep_ticks()
+
     def get_kafka_consumer_auto_commit_interval(self):
         if self.get_config():
             return self.get_config().get_kafka_consumer_auto_commit_interval()
@@ -484,6 +512,8 @@ class Globals:
             self.started = False
             self.stop_timer_thread()
             self.get_container().shutdown()
+            if self.quota_mgr is not None:
+                self.quota_mgr.stop()
         except Exception as e:
             self.log.error("Error while shutting down: {}".format(e))
         finally:
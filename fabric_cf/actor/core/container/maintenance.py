@@ -23,8 +23,9 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Tuple, Union, Callable, Set
 
 from fim.slivers.maintenance_mode import MaintenanceInfo, MaintenanceState
 
@@ -101,6 +102,137 @@ class Site:
         self.maintenance_info = maint_info
 
 
+class MaintenanceRegistry:
+    """
+    In-memory registry of the maintenance state of the Testbed and the Sites.
+
+    The registry is loaded once from the database and is then kept up to date by the database as sites are
+    added, updated or removed via the management API, so that lookups do not query the database and unpickle
+    the Site. The projects and users allowed to provision during maintenance are kept as sets per site.
+
+    Every change bumps the version; invalidate() marks the registry stale so that it is reloaded on the next
+    lookup. Callers must treat the returned Site objects as read only.
+    """
+    def __init__(self, *, loader: Callable[[], List[Site]], logger=None):
+        """
+        @param loader callable returning all the sites from the database; raises an exception on failure
+        @param logger logger
+        """
+        self.loader = loader
+        self.logger = logger
+        self.lock = threading.Lock()
+        # Site name => (Site, allowed projects, allowed users)
+        self.entries = {}
+        self.version = 0
+        self.ready = False
+
+    @staticmethod
+    def get_allow_list(*, value) -> Set[str]:
+        """
+        Convert the comma separated list of projects/users saved in the Site properties to a set
+        @param value comma separated string or list
+        @return set of projects/users
+        """
+        if value is None:
+            return set()
+        if isinstance(value, str):
+            value = value.split(",")
+        return {v.strip() for v in value if v is not None and len(v.strip()) > 0}
+
+    @staticmethod
+    def __make_entry(*, site: Site) -> tuple:
+        properties = site.get_properties() if site.get_properties() is not None else {}
+        return (site, frozenset(MaintenanceRegistry.get_allow_list(value=properties.get(Constants.PROJECT_ID))),
+                frozenset(MaintenanceRegistry.get_allow_list(value=properties.get(Constants.USERS))))
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    def get_version(self) -> int:
+        """
+        Return the version of the registry; incremented every time the maintenance state changes
+        """
+        return self.version
+
+    def load(self) -> bool:
+        """
+        Load the registry from the database if it is not loaded
+        @return True if the registry is loaded; False otherwise
+        """
+        if self.ready:
+            return True
+        with self.lock:
+            if self.ready:
+                return True
+            try:
+                entries = {}
+                for s in self.loader():
+                    entries[s.get_name()] = self.__make_entry(site=s)
+                self.entries = entries
+                self.version += 1
+                self.ready = True
+                if self.logger is not None:
+                    self.logger.debug(f"Maintenance registry loaded with {len(entries)} sites, "
+                                      f"version: {self.version}")
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.error(f"Failed to load maintenance registry: {e}")
+        return self.ready
+
+    def invalidate(self):
+        """
+        Mark the registry stale; it is reloaded from the database on the next lookup
+        """
+        with self.lock:
+            self.ready = False
+            self.entries = {}
+            self.version += 1
+
+    def site_updated(self, *, site: Site):
+        """
+        Invoked when a site is added or updated in the database
+        @param site site
+        """
+        with self.lock:
+            if self.ready:
+                entries = self.entries.copy()
+                entries[site.get_name()] = self.__make_entry(site=site)
+                self.entries = entries
+            self.version += 1
+
+    def site_removed(self, *, site_name: str):
+        """
+        Invoked when a site is removed from the database
+        @param site_name site name
+        """
+        with self.lock:
+            if self.ready:
+                entries = self.entries.copy()
+                entries.pop(site_name, None)
+                self.entries = entries
+            self.version += 1
+
+    def get_site(self, *, site_name: str) -> Site or None:
+        entry = self.entries.get(site_name)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def is_allowed(self, *, site_name: str, project: str, email: str) -> bool:
+        """
+        Determine if the project or user is allowed to provision on a site in maintenance
+        @param site_name site name
+        @param project project
+        @param email user's email
+        @return True if allowed; False otherwise
+        """
+        entry = self.entries.get(site_name)
+        if entry is None:
+            return False
+        site, projects, users = entry
+        return (project is not None and project in projects) or (email is not None and email in users)
+
+
 class Maintenance:
     @staticmethod
     def update_maintenance_mode(*, database: ABCDatabase, properties: Dict[str, str], sites: List[Site] = None):
@@ -148,9 +280,43 @@ class Maintenance:
             else:
                 database.add_site(site=s)
 
+    @staticmethod
+    def get_site(*, database: ABCDatabase, site_name: str) -> Site or None:
+        """
+        Get the maintenance state of a site from the maintenance registry; the database is used only
+        when the registry is not available
+        @param database database
+        @param site_name site name
+        @return Site
+        """
+        registry = database.get_maintenance_registry()
+        if registry is not None:
+            return registry.get_site(site_name=site_name)
+        return database.get_site(site_name=site_name)
+
+    @staticmethod
+    def is_allowed(*, database: ABCDatabase, site: Site, project: str, email: str) -> bool:
+        """
+        Determine if the project or user is in the list of projects/users allowed to provision
+        on a site in maintenance
+        @param database database
+        @param site site
+        @param project project
+        @param email user's email
+        @return True if allowed; False otherwise
+        """
+        registry = database.get_maintenance_registry()
+        if registry is not None:
+            return registry.is_allowed(site_name=site.get_name(), project=project, email=email)
+
+        properties = site.get_properties() if site.get_properties() is not None else {}
+        projects = MaintenanceRegistry.get_allow_list(value=properties.get(Constants.PROJECT_ID))
+        users = MaintenanceRegistry.get_allow_list(value=properties.get(Constants.USERS))
+        return (project is not None and project in projects) or (email is not None and email in users)
+
     @staticmethod
     def is_testbed_in_maintenance(*, database: ABCDatabase) -> Tuple[bool, Dict[str, str] or None]:
-        test_bed = database.get_site(site_name=Constants.ALL)
+        test_bed = Maintenance.get_site(database=database, site_name=Constants.ALL)
         if test_bed is not None:
             return test_bed.is_in_maintenance(), test_bed.get_properties()
 
@@ -158,7 +324,7 @@ class Maintenance:
 
     @staticmethod
     def is_site_in_maintenance(*, database: ABCDatabase, site_name: str) -> Tuple[bool, Site or None]:
-        site = database.get_site(site_name=site_name)
+        site = Maintenance.get_site(database=database, site_name=site_name)
         if site is None:
             return False, None
 
@@ -183,13 +349,7 @@ class Maintenance:
         if not status and site is None:
             return True, None
 
-        projects = site.get_properties().get(Constants.PROJECT_ID)
-        users = site.get_properties().get(Constants.USERS)
-
-        if project is not None and projects is not None and project in projects:
-            return True, None
-
-        if email is not None and users is not None and email in users:
+        if Maintenance.is_allowed(database=database, site=site, project=project, email=email):
             return True, None
 
         if status:
@@ -212,18 +372,9 @@ class Maintenance:
         @return True if allowed; False otherwise
         """
 
-        status, properties = Maintenance.is_testbed_in_maintenance(database=database)
+        status, test_bed = Maintenance.is_site_in_maintenance(database=database, site_name=Constants.ALL)
 
         if not status:
             return True
 
-        users = properties.get(Constants.USERS)
-        projects = properties.get(Constants.PROJECT_ID)
-
-        if project is not None and projects is not None and project in projects:
-            return True
-
-        if users is not None and email is not None and email in users:
-            return True
-
-        return False
+        return Maintenance.is_allowed(database=database, site=test_bed, project=project, email=email)
@@ -23,16 +23,20 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import functools
 import logging
 import traceback
 from typing import List
 
 import threading
 
+from confluent_kafka.avro import SerializerError
+from confluent_kafka.cimpl import TopicPartition
 from fabric_mb.message_bus.consumer import AvroConsumerApi
 from fabric_mb.message_bus.messages.abc_message_avro import AbcMessageAvro
 
 from fabric_cf.actor.core.common.exceptions import KafkaServiceException
+from fabric_cf.actor.core.container.offset_tracker import OffsetTracker
 
 
 class MessageService(AvroConsumerApi):
@@ -51,6 +55,9 @@ class MessageService(AvroConsumerApi):
         self.consumer_thread = consumer_thread
         self.thread_lock = threading.Lock()
         self.thread = None
+        self.offset_tracker = OffsetTracker()
+        # Acknowledgement callback for the message currently being handed off
+        self.current_ack = None
 
     def start(self):
         try:
@@ -84,9 +91,86 @@ class MessageService(AvroConsumerApi):
                 self.thread_lock.release()
 
     def handle_message(self, message: AbcMessageAvro):
+        ack = self.current_ack
+        self.current_ack = None
         try:
-            self.consumer_thread.enqueue(message)
+            self.consumer_thread.enqueue(message, ack=ack)
         except Exception as e:
             self.logger.error(traceback.format_exc())
             self.logger.error(e)
             self.logger.error("Discarding the incoming message {}".format(message))
+            if ack is not None:
+                ack()
+
+    def __commit(self, *, batch_size: int, asynchronous: bool = True):
+        """
+        Commit the offsets of the messages acknowledged by the consumer workers
+        """
+        if self.enable_auto_commit:
+            return
+        offsets = self.offset_tracker.committable(batch_size=batch_size)
+        if len(offsets):
+            self.consumer.commit(offsets=[TopicPartition(topic=topic, partition=partition, offset=offset)
+                                          for topic, partition, offset in offsets], asynchronous=asynchronous)
+
+    def consume(self):
+        """
+        Consume records unless shutdown triggered. Messages are handed off to the consumer thread and
+        offsets are only committed once the worker processing a message has acknowledged it.
+        """
+        self.consumer.subscribe(self.topics)
+
+        while self.running:
+            try:
+                msg = self.consumer.poll(timeout=self.poll_timeout)
+
+                # There were no messages on the queue, commit anything acknowledged and continue polling
+                if msg is None:
+                    self.__commit(batch_size=1)
+                    continue
+
+                if msg.error():
+                    self.logger.error(f"KAFKA: Consumer error: {msg.error()}")
+                    continue
+
+                topic = msg.topic()
+                partition = msg.partition()
+                current_offset = msg.offset()
+                self.offset_tracker.track(topic=topic, partition=partition, offset=current_offset)
+                ack = functools.partial(self.offset_tracker.ack, topic=topic, partition=partition,
+                                        offset=current_offset)
+                self.logger.info(f"Partition {partition}: Current Offset={current_offset}, "
+                                  f"Current Message: {msg.value().get('name')}")
+                self.current_ack = ack
+                try:
+                    self.process_message(topic, msg.key(), msg.value())
+                finally:
+                    # Message was not handed off to the consumer thread
+                    if self.current_ack is not None:
+                        self.current_ack = None
+                        ack()
+
+                self.__commit(batch_size=self.batch_size)
+
+            except SerializerError as e:
+                # Report malformed record, discard results, continue polling
+                self.logger.error(f"KAFKA: Message deserialization failed {e}")
+                self.logger.error(traceback.format_exc())
+                continue
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                self.logger.error(f"KAFKA: consumer error: {e}")
+                self.logger.error(traceback.format_exc())
+
+        self.logger.info("KAFKA: Shutting down consumer..")
+        # Commit all the messages processed if any pending
+        try:
+            self.__commit(batch_size=1, asynchronous=False)
+        except Exception as e:
+            self.logger.error(f"KAFKA: commit failure: {e}")
+        pending = self.offset_tracker.pending()
+        if len(pending):
+            self.logger.info(f"KAFKA: Messages not acknowledged and to be redelivered: {pending}")
+        self.consumer.close()
+        self.logger.info("KAFKA: Consumer Shutting down complete..")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import heapq
+import threading
+from typing import Dict, List, Tuple
+
+
+class OffsetTracker:
+    """
+    Tracks the Kafka offsets handed off for processing and determines the offsets which are safe to commit.
+
+    Messages may be acknowledged out of order by different workers; the offset committed for a partition
+    never moves past the oldest message which has not been acknowledged yet.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (topic, partition) -> heap of the offsets in flight
+        self.in_flight = {}
+        # (topic, partition) -> offsets acknowledged but still in the heap
+        self.acked = {}
+        # (topic, partition) -> next offset to be consumed
+        self.next_offset = {}
+        # (topic, partition) -> last committed offset
+        self.committed = {}
+        self.ack_count = 0
+
+    def track(self, *, topic: str, partition: int, offset: int):
+        """
+        Record a message handed off for processing
+        @param topic topic
+        @param partition partition
+        @param offset offset of the message
+        """
+        key = (topic, partition)
+        with self.lock:
+            heapq.heappush(self.in_flight.setdefault(key, []), offset)
+            self.acked.setdefault(key, set())
+            self.next_offset[key] = max(self.next_offset.get(key, 0), offset + 1)
+
+    def ack(self, *, topic: str, partition: int, offset: int):
+        """
+        Record a message as processed
+        @param topic topic
+        @param partition partition
+        @param offset offset of the message
+        """
+        key = (topic, partition)
+        with self.lock:
+            acked = self.acked.get(key)
+            if acked is None:
+                return
+            acked.add(offset)
+            heap = self.in_flight[key]
+            while heap and heap[0] in acked:
+                acked.discard(heapq.heappop(heap))
+            self.ack_count += 1
+
+    def committable(self, *, batch_size: int = 1) -> List[Tuple[str, int, int]]:
+        """
+        Return the offsets to commit, if at least batch_size messages have been acknowledged since the last commit
+        @param batch_size minimum number of acknowledged messages
+        @return list of (topic, partition, offset) tuples, offset being the next offset to consume
+        """
+        result = []
+        with self.lock:
+            if self.ack_count == 0 or self.ack_count < batch_size:
+                return result
+            self.ack_count = 0
+            for key, heap in self.in_flight.items():
+                offset = heap[0] if heap else self.next_offset[key]
+                if self.committed.get(key) != offset:
+                    self.committed[key] = offset
+                    result.append((key[0], key[1], offset))
+        return result
+
+    def pending(self) -> Dict[Tuple[str, int], int]:
+        """
+        Return the number of messages in flight per partition
+        """
+        with self.lock:
+            return {key: len(heap) for key, heap in self.in_flight.items() if len(heap)}
@@ -25,16 +25,18 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable
 import logging
 import queue
 import threading
 import time
 import traceback
+import zlib
 
 
 from fabric_mb.message_bus.messages.abc_message_avro import AbcMessageAvro
-from fabric_cf.actor.core.util.iterable_queue import IterableQueue
+
+from fabric_cf.actor.core.util.metrics import RPC_MESSAGE_SECONDS
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.proxies.kafka.services.actor_service import ActorService
@@ -68,11 +70,20 @@ class RPCConsumer:
                            AbcMessageAvro.get_sites_request]
 
     def __init__(self, *, kafka_service: ActorService, kafka_mgmt_service: KafkaActorService,
-                 logger: logging.Logger = None):
-        self.message_queue = queue.Queue()
+                 logger: logging.Logger = None, workers: int = 1):
+        """
+        Messages are dispatched to one of the worker threads based on the entity they refer to; messages for the
+        same reservation/delegation/slice/actor are always processed in order by the same worker while messages for
+        unrelated entities are processed in parallel.
+        @param kafka_service service processing inter actor messages
+        @param kafka_mgmt_service service processing management messages
+        @param logger logger
+        @param workers number of worker threads
+        """
+        self.workers = max(int(workers or 1), 1)
+        self.queues = [queue.Queue() for _ in range(self.workers)]
         self.thread_lock = threading.Lock()
-        self.condition = threading.Condition()
-        self.thread = None
+        self.threads = []
         self.shutdown = False
         self.name = self.__class__.__name__
         if logger is None:
@@ -84,18 +95,18 @@ class RPCConsumer:
 
     def __getstate__(self):
         state = self.__dict__.copy()
-        del state['message_queue']
+        del state['queues']
         del state['thread_lock']
-        del state['condition']
-        del state['thread']
+        del state['threads']
         del state['shutdown']
         del state['logger']
+        return state
 
     def __setstate__(self, state):
-        self.message_queue = queue.Queue()
+        self.__dict__.update(state)
+        self.queues = [queue.Queue() for _ in range(self.workers)]
         self.thread_lock = threading.Lock()
-        self.condition = threading.Condition()
-        self.thread = None
+        self.threads = []
         self.shutdown = False
         self.logger = None
 
@@ -105,12 +116,16 @@ class RPCConsumer:
     def start(self):
         try:
             self.thread_lock.acquire()
-            if self.thread is not None:
+            if len(self.threads):
                 raise RPCConsumerException(f"{self.name} has already been started")
 
-            self.thread = threading.Thread(target=self.__run, name=self.name, daemon=True)
-            self.thread.start()
-            self.logger.debug(f"{self.name} has been started")
+            self.shutdown = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self.__run, args=(self.queues[i],), name=f"{self.name}-{i}",
+                                          daemon=True)
+                thread.start()
+                self.threads.append(thread)
+            self.logger.debug(f"{self.name} has been started with {self.workers} workers")
         finally:
             self.thread_lock.release()
 
@@ -118,67 +133,111 @@ class RPCConsumer:
         self.shutdown = True
         try:
             self.thread_lock.acquire()
-            temp = self.thread
-            self.thread = None
-            if temp is not None:
-                self.logger.warning(f"It seems that the f{self.name} thread is running. Interrupting it")
+            temp = self.threads
+            self.threads = []
+            for q in self.queues:
+                q.put_nowait(None)
+            for thread in temp:
                 try:
-                    temp.join()
+                    thread.join()
                 except Exception as e:
-                    self.logger.error(f"Could not join {self.name} thread {e}")
-                finally:
-                    self.thread_lock.release()
+                    self.logger.error(f"Could not join {thread.name} thread {e}")
         finally:
-            if self.thread_lock is not None and self.thread_lock.locked():
-                self.thread_lock.release()
+            self.thread_lock.release()
 
-    def enqueue(self, incoming):
+    @staticmethod
+    def get_key(*, message: AbcMessageAvro) -> str:
+        """
+        Return the key identifying the entity a message refers to: the reservation or delegation if known, else
+        the slice, else the actor for management messages. Messages not referring to any entity are keyed by
+        their message id.
+
+        The reservation id is used even when the slice is known, since some messages (e.g. FailedRpc) carry
+        only the reservation id; all the messages for a reservation are then processed by the same worker.
+        @param message message
+        @return key
+        """
+        for attr in ['reservation', 'delegation', 'reservation_obj']:
+            obj = getattr(message, attr, None)
+            if obj is None:
+                continue
+            obj_id = getattr(obj, 'delegation_id' if attr == 'delegation' else 'reservation_id', None)
+            if obj_id is not None:
+                return str(obj_id)
+
+        for attr in ['reservation_id', 'delegation_id']:
+            value = getattr(message, attr, None)
+            if value is not None:
+                return str(value)
+
+        for attr in ['reservation', 'delegation']:
+            obj = getattr(message, attr, None)
+            if obj is not None and obj.slice is not None and obj.slice.guid is not None:
+                return obj.slice.guid
+
+        slice_obj = getattr(message, 'slice_obj', None)
+        if slice_obj is not None and slice_obj.guid is not None:
+            return slice_obj.guid
+
+        for attr in ['slice_id', 'guid']:
+            value = getattr(message, attr, None)
+            if value is not None:
+                return str(value)
+
+        return str(message.get_message_id())
+
+    def get_worker(self, *, message: AbcMessageAvro) -> int:
+        """
+        Return the index of the worker responsible for a message
+        @param message message
+        @return worker index
+        """
+        if self.workers == 1:
+            return 0
+        key = self.get_key(message=message)
+        return zlib.crc32(key.encode()) % self.workers
+
+    def enqueue(self, incoming, ack: Callable = None):
+        """
+        Queue a message for processing
+        @param incoming message
+        @param ack callback invoked once the message has been processed
+        """
         try:
-            self.message_queue.put_nowait(incoming)
-            with self.condition:
-                self.condition.notify_all()
-            self.logger.debug("Added message to queue {}".format(incoming.__class__.__name__))
+            worker = self.get_worker(message=incoming)
+            self.queues[worker].put_nowait((incoming, ack, time.perf_counter()))
+            self.logger.debug(f"Added message to queue {incoming.__class__.__name__} worker: {worker}")
         except Exception as e:
             self.logger.error(f"Failed to queue message: {incoming.__class__.__name__} e: {e}")
+            raise e
 
-    def __dequeue(self, queue_obj: queue.Queue):
-        events = []
-        if not queue_obj.empty():
-            try:
-                for event in IterableQueue(source_queue=queue_obj):
-                    events.append(event)
-            except Exception as e:
-                self.logger.error(f"Error while adding message to queue! e: {e}")
-                self.logger.error(traceback.format_exc())
-        return events
-
-    def __process_messages(self, *, messages: list):
-        for message in messages:
-            try:
-                begin = time.time()
-                if message.get_message_name() in self.MANAGEMENT_MESSAGES:
-                    self.kafka_mgmt_service.process(message=message)
-                else:
-                    self.kafka_service.process(message=message)
-                diff = int(time.time() - begin)
-                if diff > 0:
-                    self.logger.info(f"Event {message.__class__.__name__} TIME: {diff}")
-            except Exception as e:
-                self.logger.error(f"Error while processing message {type(message)}, {e}")
-                self.logger.error(traceback.format_exc())
-
-    def __run(self):
-        while True:
-            with self.condition:
-                while not self.shutdown and self.message_queue.empty():
-                    self.condition.wait()
+    def __process_message(self, *, message: AbcMessageAvro, queued_at: float):
+        try:
+            begin = time.perf_counter()
+            if message.get_message_name() in self.MANAGEMENT_MESSAGES:
+                self.kafka_mgmt_service.process(message=message)
+            else:
+                self.kafka_service.process(message=message)
+            end = time.perf_counter()
+            RPC_MESSAGE_SECONDS.labels(message=message.get_message_name()).observe(end - queued_at)
+            diff = end - begin
+            if diff >= 1:
+                self.logger.info(f"Event {message.__class__.__name__} TIME: {diff:.3f}")
+        except Exception as e:
+            self.logger.error(f"Error while processing message {type(message)}, {e}")
+            self.logger.error(traceback.format_exc())
 
-            if self.shutdown:
-                break
+    def __run(self, message_queue: queue.Queue):
+        while True:
+            entry = message_queue.get()
 
-            if self.shutdown:
-                self.logger.info(f"{self.name} exiting")
+            if entry is None or self.shutdown:
+                self.logger.info(f"{threading.current_thread().name} exiting")
                 return
 
-            messages = self.__dequeue(self.message_queue)
-            self.__process_messages(messages=messages)
+            message, ack, queued_at = entry
+            try:
+                self.__process_message(message=message, queued_at=queued_at)
+            finally:
+                if ack is not None:
+                    ack()
@@ -326,7 +326,9 @@ class ActorMixin(ABCActorMixin):
             self.policy.initialize(config=config)
             self.policy.set_logger(logger=self.logger)
 
-            self.wrapper = KernelWrapper(actor=self, plugin=self.plugin, policy=self.policy)
+            self.wrapper = KernelWrapper(actor=self, plugin=self.plugin, policy=self.policy,
+                                         incremental_tick=GlobalsSingleton.get().get_kernel_incremental_tick(),
+                                         sweep_ticks=GlobalsSingleton.get().get_kernel_sweep_ticks())
 
             self.current_cycle = -1
 
@@ -802,6 +804,9 @@ class ActorMixin(ABCActorMixin):
         if self.plugin.get_handler_processor() is not None:
             self.plugin.get_handler_processor().shutdown()
 
+        if self.plugin.get_database() is not None:
+            self.plugin.get_database().stop()
+
     def tick_handler(self):
         """
         Tick handler
@@ -900,12 +905,13 @@ class ActorMixin(ABCActorMixin):
                                                                              class_name=class_name)()
             kafka_mgmt_service.set_logger(logger=self.logger)
 
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
             self.rpc_consumer = RPCConsumer(kafka_service=kafka_service,
                                             kafka_mgmt_service=kafka_mgmt_service,
-                                            logger=self.logger)
+                                            logger=self.logger,
+                                            workers=GlobalsSingleton.get().get_rpc_consumer_workers())
 
             # Incoming Message Service
-            from fabric_cf.actor.core.container.globals import GlobalsSingleton
             config = GlobalsSingleton.get().get_config()
             topic = config.get_actor_config().get_kafka_topic()
             if "," in topic:
@@ -50,6 +50,7 @@ from fabric_cf.actor.core.delegation.delegation_factory import DelegationFactory
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.util.client import Client
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.metrics import timed, POLICY_SECONDS
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.security.auth_token import AuthToken
 
@@ -240,7 +241,8 @@ class Authority(ActorMixin, ABCAuthority):
         # close expired reservations
         self.close_expiring(cycle=self.current_cycle)
         # process all requests for the current cycle
-        self.policy.assign(cycle=self.current_cycle)
+        with timed(POLICY_SECONDS, operation="assign"):
+            self.policy.assign(cycle=self.current_cycle)
 
     def register_client(self, *, client: Client):
         db = self.plugin.get_database()
@@ -43,6 +43,7 @@ from fabric_cf.actor.core.manage.kafka.services.kafka_broker_service import Kafk
 from fabric_cf.actor.core.proxies.kafka.services.broker_service import BrokerService
 from fabric_cf.actor.core.registry.actor_registry import ActorRegistrySingleton
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.metrics import timed, POLICY_SECONDS
 from fabric_cf.actor.core.apis.abc_broker_reservation import ABCBrokerReservation
 from fabric_cf.actor.core.apis.abc_broker_mixin import ABCBrokerMixin
 from fabric_cf.actor.core.common.constants import Constants
@@ -357,7 +358,8 @@ class Broker(ActorMixin, ABCBrokerMixin):
         self.wrapper.relinquish_request(reservation=reservation, caller=caller)
 
     def tick_handler(self):
-        self.policy.allocate(cycle=self.current_cycle)
+        with timed(POLICY_SECONDS, operation="allocate"):
+            self.policy.allocate(cycle=self.current_cycle)
         self.bid(cycle=self.current_cycle)
         self.close_expiring(cycle=self.current_cycle)
 
@@ -34,6 +34,7 @@ from fabric_cf.actor.core.apis.abc_actor_event import ABCActorEvent
 from fabric_cf.actor.core.apis.abc_actor_runnable import ABCActorRunnable
 from fabric_cf.actor.core.apis.abc_timer_task import ABCTimerTask
 from fabric_cf.actor.core.util.iterable_queue import IterableQueue
+from fabric_cf.actor.core.util.metrics import EVENT_QUEUE_WAIT_SECONDS, EVENT_RUN_SECONDS
 
 
 class EventType(enum.Enum):
@@ -166,7 +167,8 @@ class EventProcessor:
 
     def enqueue(self, incoming):
         try:
-            self.event_queue.put_nowait(incoming)
+            # Queued with the time it was queued at to measure the time spent waiting
+            self.event_queue.put_nowait((incoming, time.perf_counter()))
             with self.condition:
                 self.condition.notify_all()
             self.logger.debug("Added event to event queue {}".format(incoming.__class__.__name__))
@@ -220,16 +222,19 @@ class EventProcessor:
         return events
 
     def __process_events(self, *, events: list):
-        for event in events:
+        for event, queued_at in events:
             try:
-                begin = time.time()
+                event_name = event.__class__.__name__
+                begin = time.perf_counter()
+                EVENT_QUEUE_WAIT_SECONDS.labels(processor=self.name, event=event_name).observe(begin - queued_at)
                 if isinstance(event, ABCTimerTask):
                     event.execute()
                 else:
                     event.process()
-                diff = int(time.time() - begin)
-                if diff > 0:
-                    self.logger.info(f"Event {event.__class__.__name__} TIME: {diff}")
+                diff = time.perf_counter() - begin
+                EVENT_RUN_SECONDS.labels(processor=self.name, event=event_name).observe(diff)
+                if diff >= 1:
+                    self.logger.info(f"Event {event_name} TIME: {diff:.3f}")
             except Exception as e:
                 self.logger.error(f"Error while processing event {type(event)}, {e}")
                 self.logger.error(traceback.format_exc())
@@ -38,6 +38,7 @@ from fabric_cf.actor.core.kernel.request_types import RequestTypes
 from fabric_cf.actor.core.kernel.reservation_server import ReservationServer
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
 from fabric_cf.actor.core.util.rpc_exception import RPCError
+from fabric_cf.actor.core.util.metrics import timed, POLICY_SECONDS
 from fabric_cf.actor.core.util.utils import sliver_to_str
 
 if TYPE_CHECKING:
@@ -261,7 +262,8 @@ class AuthorityReservation(ReservationServer, ABCAuthorityReservation):
                 # case of a deferred request, we will eventually come back to
                 # this method after the policy has done its job.
                 if self.is_bid_pending():
-                    granted = self.policy.bind(reservation=self)
+                    with timed(POLICY_SECONDS, operation="redeem"):
+                        granted = self.policy.bind(reservation=self)
                 else:
                     granted = True
             except Exception as e:
@@ -595,6 +597,9 @@ class AuthorityReservation(ReservationServer, ABCAuthorityReservation):
                 return cs.get_units()
         return 0
 
+    def is_probe_required(self) -> bool:
+        return super().is_probe_required() or (self.is_failed() and not self.notified_about_failure)
+
     def get_notices(self) -> str:
         s = super().get_notices()
         if self.resources is not None and self.resources.get_resources() is not None:
@@ -33,6 +33,7 @@ from typing import TYPE_CHECKING
 
 from fabric_cf.actor.core.common.exceptions import BrokerException, ExceptionErrorCode
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.metrics import timed, POLICY_SECONDS
 from fabric_cf.actor.core.apis.abc_authority_policy import ABCAuthorityPolicy
 from fabric_cf.actor.core.apis.abc_broker_policy_mixin import ABCBrokerPolicyMixin
 from fabric_cf.actor.core.apis.abc_reservation_mixin import ReservationCategory, ABCReservationMixin
@@ -436,7 +437,8 @@ class BrokerReservation(ReservationServer, ABCBrokerReservation):
                     # come back to this method after the policy has done its job.
                     if self.is_bid_pending():
                         if not self.is_exporting():
-                            granted = self.policy.bind(reservation=self)
+                            with timed(POLICY_SECONDS, operation="ticket"):
+                                granted = self.policy.bind(reservation=self)
                         else:
                             self.internal_error(err="Exporting reservations not implemented")
                     else:
@@ -521,6 +523,11 @@ class BrokerReservation(ReservationServer, ABCBrokerReservation):
 
         return hold
 
+    def is_probe_required(self) -> bool:
+        if super().is_probe_required():
+            return True
+        return (self.is_failed() and not self.notified_failed) or bool(self.must_send_update)
+
     def is_closed_in_priming(self) -> bool:
         return self.closed_in_priming
 
@@ -23,6 +23,8 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import heapq
+import itertools
 import threading
 import time
 import traceback
@@ -56,6 +58,7 @@ from fabric_cf.actor.core.container.maintenance import Site, Maintenance
 from fabric_cf.actor.core.proxies.kafka.translate import Translate
 from fabric_cf.actor.core.time.term import Term
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.metrics import KERNEL_TICK_PHASE_SECONDS
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.core.util.update_data import UpdateData
 from fabric_cf.actor.security.auth_token import AuthToken
@@ -63,7 +66,10 @@ from fabric_cf.actor.security.pdp_auth import ActionId
 
 
 class Kernel:
-    def __init__(self, *, plugin: ABCBasePlugin, policy: ABCPolicy, logger):
+    DEFAULT_SWEEP_TICKS = 60
+
+    def __init__(self, *, plugin: ABCBasePlugin, policy: ABCPolicy, logger, incremental_tick: bool = False,
+                 sweep_ticks: int = DEFAULT_SWEEP_TICKS):
         # The plugin.
         self.plugin = plugin
         # Policy
@@ -77,6 +83,20 @@ class Kernel:
         self.delegations = {}
         self.lock = threading.Lock()
         self.nothing_pending = threading.Condition()
+        # Incremental tick: only the reservations which need work are probed on every tick i.e.
+        # reservations touched by a kernel operation, with an operation in progress or whose term
+        # boundary has been crossed. All the reservations are probed once every sweep_ticks ticks.
+        self.incremental_tick = incremental_tick
+        self.sweep_ticks = max(int(sweep_ticks), 1) if sweep_ticks else self.DEFAULT_SWEEP_TICKS
+        self.ticks = 0
+        # Reservations and client slices to be probed on the next tick
+        self.dirty_reservations = {}
+        self.dirty_slices = {}
+        # Heap of (boundary, sequence, rid) for term start and end times not yet reached
+        self.term_boundaries = []
+        self.scheduled_terms = {}
+        self.boundary_sequence = itertools.count()
+        self.dirty_lock = threading.Lock()
 
     def amend_reserve(self, *, reservation: ABCReservationMixin):
         """
@@ -86,6 +106,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             ignore = reservation.reserve(policy=self.policy)
             self.plugin.get_database().update_reservation(reservation=reservation)
@@ -160,6 +181,7 @@ class Kernel:
         @param message message
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             if not reservation.is_failed() and not reservation.is_closed():
                 reservation.fail(message=message, exception=None)
@@ -215,6 +237,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             if not reservation.is_closed() and not reservation.is_closing():
                 self.policy.close(reservation=reservation)
@@ -307,6 +330,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             reservation.extend_lease()
             self.plugin.get_database().update_reservation(reservation=reservation)
@@ -329,6 +353,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             reservation.modify_lease()
             self.plugin.get_database().update_reservation(reservation=reservation)
@@ -360,6 +385,7 @@ class Kernel:
         if real is None:
             raise KernelException(f"Unknown reservation rid: {rid}")
         try:
+            self.mark_dirty(reservation=real)
             real.lock()
             # check for a pending operation: we cannot service the extend if there is another operation in progress.
             if real.get_pending_state() != ReservationPendingStates.None_:
@@ -407,6 +433,7 @@ class Kernel:
         """
         try:
             self.logger.debug(f"Processing extend ticket for reservation={type(reservation)}")
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             if reservation.can_renew():
                 reservation.extend_ticket(actor=self.plugin.get_actor())
@@ -657,12 +684,13 @@ class Kernel:
         finally:
             delegation.unlock()
 
-    def __purge(self):
+    def __purge(self, *, reservations: List[ABCReservationMixin]):
         """
         Purges all closed reservations.
+        @param reservations reservations to check
         @throws Exception
         """
-        for reservation in self.reservations.values():
+        for reservation in reservations:
             if reservation.is_closed():
                 try:
                     reservation.lock()
@@ -675,6 +703,7 @@ class Kernel:
                     reservation.get_kernel_slice().unlock_slice()
                     reservation.unlock()
                     self.reservations.remove(reservation=reservation)
+                    self.__forget(rid=reservation.get_reservation_id())
 
         try:
             self.lock.acquire()
@@ -711,6 +740,7 @@ class Kernel:
         @param reservation reservation
         """
         try:
+            self.mark_dirty(reservation=reservation)
             begin = time.time()
             reservation.lock()
             diff = int(time.time() - begin)
@@ -778,6 +808,7 @@ class Kernel:
                 reservation.set_actor(actor=self.plugin.get_actor())
                 # attach the local slice object
                 reservation.set_slice(slice_object=slice_object)
+                self.mark_dirty(reservation=reservation)
                 add = True
             else:
                 self.logger.warning(f"Attempting to register a closed reservation #{reservation.get_reservation_id()}")
@@ -891,6 +922,7 @@ class Kernel:
         if real is None:
             self.logger.debug("Slice object not found in local data structure")
         else:
+            self.mark_slice_dirty(slice_object=real)
             try:
                 real.lock_slice()
                 if not real.is_dead_or_closing():
@@ -921,6 +953,7 @@ class Kernel:
         if real is None:
             self.logger.debug("Slice object not found in local data structure")
         else:
+            self.mark_slice_dirty(slice_object=real)
             try:
                 real.lock_slice()
                 if not real.is_dead_or_closing():
@@ -941,6 +974,7 @@ class Kernel:
             slice_object.lock_slice()
             slice_object.prepare()
             self.slices.add(slice_object=slice_object)
+            self.mark_slice_dirty(slice_object=slice_object)
 
             try:
                 # Only add slice if it doesn't exist
@@ -1132,6 +1166,7 @@ class Kernel:
             slice_object.unlock_slice()
 
         self.slices.add(slice_object=slice_object)
+        self.mark_slice_dirty(slice_object=slice_object)
 
         try:
             slices = self.plugin.get_database().get_slices(slice_id=slice_object.get_slice_id())
@@ -1153,6 +1188,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             reservation.reserve(policy=self.policy)
             self.plugin.get_database().update_reservation(reservation=reservation)
@@ -1257,14 +1293,140 @@ class Kernel:
         if rid is not None:
             result = self.reservations.get(rid=rid)
 
+        if result is not None:
+            self.mark_dirty(reservation=result)
+
+        return result
+
+    def mark_dirty(self, *, reservation: ABCReservationMixin):
+        """
+        Schedules the reservation to be probed on the next tick when the incremental tick is enabled
+        @param reservation reservation
+        """
+        if not self.incremental_tick or reservation is None:
+            return
+        with self.dirty_lock:
+            self.dirty_reservations[reservation.get_reservation_id()] = reservation
+            self.__schedule_term_boundaries(reservation=reservation)
+
+    def mark_slice_dirty(self, *, slice_object: ABCSlice):
+        """
+        Schedules the slice to be probed on the next tick when the incremental tick is enabled
+        @param slice_object slice
+        """
+        if not self.incremental_tick or slice_object is None:
+            return
+        with self.dirty_lock:
+            self.dirty_slices[slice_object.get_slice_id()] = slice_object
+
+    def __schedule_term_boundaries(self, *, reservation: ABCReservationMixin):
+        """
+        Tracks the start and end time of the reservation term so that the reservation is probed once
+        they are reached. Must be called with the dirty lock on.
+        @param reservation reservation
+        """
+        term = reservation.get_term()
+        if term is None:
+            term = reservation.get_requested_term()
+        if term is None:
+            return
+        rid = reservation.get_reservation_id()
+        boundaries = (term.get_start_time(), term.get_end_time())
+        if self.scheduled_terms.get(rid) == boundaries:
+            return
+        self.scheduled_terms[rid] = boundaries
+        now = datetime.now(timezone.utc)
+        for boundary in boundaries:
+            if boundary is not None and boundary.tzinfo is None:
+                boundary = boundary.replace(tzinfo=timezone.utc)
+            if boundary is not None and boundary > now:
+                heapq.heappush(self.term_boundaries, (boundary, next(self.boundary_sequence), rid))
+
+    def __forget(self, *, rid: ID):
+        """
+        Drops the incremental tick state for a reservation no longer managed by the kernel
+        @param rid reservation id
+        """
+        if not self.incremental_tick:
+            return
+        with self.dirty_lock:
+            self.dirty_reservations.pop(rid, None)
+            self.scheduled_terms.pop(rid, None)
+
+    def __get_dirty_reservations(self) -> List[ABCReservationMixin]:
+        """
+        Returns the reservations to be probed on this tick: reservations marked dirty since the last
+        tick and reservations whose term start or end time has been reached
+        @return list of reservations
+        """
+        now = datetime.now(timezone.utc)
+        with self.dirty_lock:
+            while len(self.term_boundaries) > 0 and self.term_boundaries[0][0] <= now:
+                boundary, sequence, rid = heapq.heappop(self.term_boundaries)
+                reservation = self.reservations.get(rid=rid)
+                if reservation is not None:
+                    self.dirty_reservations[rid] = reservation
+            dirty = self.dirty_reservations
+            self.dirty_reservations = {}
+
+        result = []
+        for rid, reservation in dirty.items():
+            if self.reservations.get(rid=rid) is not None:
+                result.append(reservation)
+        return result
+
+    def __get_dirty_slices(self, *, reservations: List[ABCReservationMixin]) -> List[ABCSlice]:
+        """
+        Returns the client slices to be probed on this tick: slices marked dirty since the last tick
+        and slices of the reservations probed on this tick
+        @param reservations reservations probed on this tick
+        @return list of slices
+        """
+        with self.dirty_lock:
+            dirty = self.dirty_slices
+            self.dirty_slices = {}
+
+        for reservation in reservations:
+            slice_obj = reservation.get_slice()
+            if slice_obj is not None:
+                dirty[slice_obj.get_slice_id()] = slice_obj
+
+        result = []
+        for slice_id in dirty.keys():
+            slice_obj = self.slices.get(slice_id=slice_id)
+            if slice_obj is not None and slice_obj.is_client():
+                result.append(slice_obj)
         return result
 
+    def __retain_dirty(self, *, reservations: List[ABCReservationMixin], sweep: bool):
+        """
+        Keeps the probed reservations which still have work outstanding scheduled for the next tick
+        @param reservations reservations probed on this tick
+        @param sweep true if all the reservations were probed on this tick
+        """
+        if not self.incremental_tick:
+            return
+        with self.dirty_lock:
+            for reservation in reservations:
+                if not self.reservations.contains(reservation=reservation):
+                    continue
+                self.__schedule_term_boundaries(reservation=reservation)
+                if reservation.is_probe_required():
+                    self.dirty_reservations[reservation.get_reservation_id()] = reservation
+            if sweep:
+                for rid in list(self.scheduled_terms.keys()):
+                    if self.reservations.get(rid=rid) is None:
+                        self.scheduled_terms.pop(rid)
+
     def tick(self):
         """
-        Timer interrupt.
+        Timer interrupt. With the incremental tick only the reservations and slices which need work
+        are probed, except on every sweep_ticks tick when all of them are probed.
         @throws Exception
         """
         try:
+            self.ticks += 1
+            sweep = not self.incremental_tick or self.ticks % self.sweep_ticks == 0
             begin = time.time()
             try:
                 self.lock.acquire()
@@ -1272,25 +1434,43 @@ class Kernel:
                     self.__probe_pending_delegation(delegation=delegation)
             finally:
                 self.lock.release()
-            self.logger.info(f"KERNEL DEL TICK TIME: {time.time() - begin:.0f}")
+            elapsed = time.time() - begin
+            KERNEL_TICK_PHASE_SECONDS.labels(phase="delegations").observe(elapsed)
+            self.logger.info(f"KERNEL DEL TICK TIME: {elapsed:.3f}")
 
             begin = time.time()
-            for reservation in self.reservations.values():
+            if sweep:
+                reservations = self.reservations.values()
+            else:
+                reservations = self.__get_dirty_reservations()
+            for reservation in reservations:
                 self.__probe_pending(reservation=reservation)
-            self.logger.info(f"KERNEL RES TICK TIME: {time.time() - begin:.0f} {self.reservations.size()}")
+            elapsed = time.time() - begin
+            KERNEL_TICK_PHASE_SECONDS.labels(phase="reservations").observe(elapsed)
+            self.logger.info(f"KERNEL RES TICK TIME: {elapsed:.3f} "
+                             f"{len(reservations)}/{self.reservations.size()}")
 
             begin = time.time()
             try:
                 self.lock.acquire()
-                for slice_obj in self.slices.get_client_slices():
+                if sweep:
+                    slices = self.slices.get_client_slices()
+                else:
+                    slices = self.__get_dirty_slices(reservations=reservations)
+                for slice_obj in slices:
                     self.__probe_pending_slices(slice_obj=slice_obj)
             finally:
                 self.lock.release()
-            self.logger.info(f"KERNEL SLC TICK TIME: {time.time() - begin:.0f}")
+            elapsed = time.time() - begin
+            KERNEL_TICK_PHASE_SECONDS.labels(phase="slices").observe(elapsed)
+            self.logger.info(f"KERNEL SLC TICK TIME: {elapsed:.3f}")
 
             begin = time.time()
-            self.__purge()
-            self.logger.info(f"KERNEL PURGE TICK TIME: {time.time() - begin:.0f}")
+            self.__purge(reservations=reservations)
+            self.__retain_dirty(reservations=reservations, sweep=sweep)
+            elapsed = time.time() - begin
+            KERNEL_TICK_PHASE_SECONDS.labels(phase="purge").observe(elapsed)
+            self.logger.info(f"KERNEL PURGE TICK TIME: {elapsed:.3f}")
             self.check_nothing_pending()
         except Exception as e:
             self.logger.error(traceback.format_exc())
@@ -1301,7 +1481,13 @@ class Kernel:
         Check is kernel has any pending reservations
         @return true if no terminal/nascent/pending reservations exist; false otherwise
         """
-        for reservation in self.reservations.values():
+        if self.incremental_tick:
+            # Nascent and pending reservations always remain scheduled for the next tick
+            with self.dirty_lock:
+                reservations = list(self.dirty_reservations.values())
+        else:
+            reservations = self.reservations.values()
+        for reservation in reservations:
             if not reservation.is_terminal() and (reservation.is_nascent() or not reservation.is_no_pending()):
                 return True
 
@@ -1338,6 +1524,7 @@ class Kernel:
             finally:
                 slice_object.unlock_slice()
             self.reservations.remove(reservation=reservation)
+            self.__forget(rid=reservation.get_reservation_id())
         else:
             raise KernelException("Only reservations in failed, closed, or closewait state can be unregistered.")
 
@@ -1355,6 +1542,7 @@ class Kernel:
         finally:
             slice_object.unlock_slice()
         self.reservations.remove(reservation=reservation)
+        self.__forget(rid=reservation.get_reservation_id())
 
     def unregister_no_check_d(self, *, delegation: ABCDelegation, slice_object: ABCSlice):
         """
@@ -1422,6 +1610,7 @@ class Kernel:
         """
         try:
             self.logger.debug(f"update_lease: Incoming term {update.get_term()}")
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             reservation.update_lease(incoming=update, update_data=update_data)
 
@@ -1452,6 +1641,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
             reservation.update_ticket(incoming=update, update_data=update_data)
             self.plugin.get_database().update_reservation(reservation=reservation)
@@ -1570,6 +1760,7 @@ class Kernel:
         try:
             # Add POA to the database
             self.plugin.get_database().add_poa(poa=poa)
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
 
             # Process POA
@@ -1598,6 +1789,7 @@ class Kernel:
         @throws Exception
         """
         try:
+            self.mark_dirty(reservation=reservation)
             reservation.lock()
 
             # Process POA Info from Authority
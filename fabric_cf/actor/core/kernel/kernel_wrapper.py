@@ -70,11 +70,13 @@ class KernelWrapper:
     invoking these calls. The internal kernel methods can only be invoked through
     an instance of the kernel wrapper.
     """
-    def __init__(self, *, actor: ABCActorMixin, plugin: ABCBasePlugin, policy: ABCPolicy):
+    def __init__(self, *, actor: ABCActorMixin, plugin: ABCBasePlugin, policy: ABCPolicy,
+                 incremental_tick: bool = False, sweep_ticks: int = Kernel.DEFAULT_SWEEP_TICKS):
         # The actor linked by the wrapper to the kernel.
         self.actor = actor
         # The kernel instance.
-        self.kernel = Kernel(plugin=plugin, policy=policy, logger=actor.get_logger())
+        self.kernel = Kernel(plugin=plugin, policy=policy, logger=actor.get_logger(),
+                             incremental_tick=incremental_tick, sweep_ticks=sweep_ticks)
         # Logger.
         self.logger = actor.get_logger()
 
@@ -1146,6 +1148,8 @@ class KernelWrapper:
 
     def __authorize_request(self, *, reservation: ABCReservationMixin, action_id: ActionId, sliver: BaseSliver,
                             lease_end_time: datetime = None):
+        # Reservations are received one per message, so each is authorized on its own (one PDP decision per
+        # reservation); the shared PDP client reuses its pooled connections and cached decisions
         slice_object = reservation.get_slice()
         config_props = slice_object.get_config_properties()
         project = config_props.get(Constants.PROJECT_ID, None)
@@ -36,6 +36,7 @@ from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin,
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.event_logger import EventLogger, EventLoggerSingleton
 from fabric_cf.actor.core.common.exceptions import ReservationException
+from fabric_cf.actor.core.kernel.reservation_event_bus import ReservationEventBusSingleton
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates, JoinState
 from fabric_cf.actor.core.proxies.kafka.translate import Translate
 from fabric_cf.actor.core.util.reservation_state import ReservationState
@@ -448,6 +449,16 @@ class Reservation(ABCReservationMixin):
     def is_no_pending(self) -> bool:
         return self.pending_state == ReservationPendingStates.None_
 
+    def is_probe_required(self) -> bool:
+        if self.dirty or self.state_transition:
+            return True
+        if self.pending_state != ReservationPendingStates.None_:
+            return True
+        if self.service_pending not in [ReservationPendingStates.None_, JoinState.None_]:
+            return True
+        return self.state in [ReservationStates.Nascent, ReservationStates.CloseWait, ReservationStates.Closed,
+                              ReservationStates.CloseFail]
+
     def is_pending_recover(self):
         return self.pending_recover
 
@@ -639,6 +650,7 @@ class Reservation(ABCReservationMixin):
                 sliver.reservation_info.reservation_state = str(self.state)
                 EventLoggerSingleton.get().log_sliver_event(
                     slice_object=Translate.translate_slice_to_avro(slice_obj=self.slice), sliver=sliver)
+            ReservationEventBusSingleton.get().publish(reservation=self)
 
     def update_lease(self, *, incoming: ABCReservationMixin, update_data):
         self.internal_error(err="abstract update_lease trap")
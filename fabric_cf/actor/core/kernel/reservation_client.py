@@ -982,6 +982,9 @@ class ReservationClient(Reservation, ABCControllerReservation):
     def is_exported(self) -> bool:
         return self.exported
 
+    def is_probe_required(self) -> bool:
+        return super().is_probe_required() or self.joinstate != JoinState.NoJoin
+
     @staticmethod
     def is_controller(*, actor: ABCActorMixin):
         """
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import queue
+import threading
+import traceback
+from typing import TYPE_CHECKING, Callable, Iterable, List, Dict
+
+from fabric_cf.actor.core.common.exceptions import InitializationException
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+
+if TYPE_CHECKING:
+    from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+    from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+    from fabric_cf.actor.core.util.id import ID
+
+
+class ReservationSubscription:
+    """
+    Interest in the transition of a reservation into any of the target states
+    """
+    def __init__(self, *, rid: ID, states: Iterable[ReservationStates], callback: Callable[[ReservationMng], None]):
+        self.rid = str(rid)
+        self.states = frozenset(states)
+        self.callback = callback
+
+    def __str__(self):
+        return f"rid: {self.rid} states: {[s.name for s in self.states]} callback: {self.callback}"
+
+
+class ReservationEventBus:
+    """
+    In-process bus publishing reservation state transitions to the subscribers interested in them.
+
+    A subscription is removed on the first transition of the reservation into one of its target states; its
+    callback is invoked on the bus dispatcher thread with a snapshot of the reservation taken at the time of
+    the transition. The dispatcher thread is started with the first subscription.
+    A transition of a reservation without subscribers costs a dictionary lookup.
+    """
+    def __init__(self, *, logger=None):
+        self.logger = logger
+        self.lock = threading.Lock()
+        # rid -> subscriptions
+        self.subscriptions: Dict[str, List[ReservationSubscription]] = {}
+        self.events = queue.Queue()
+        self.thread_lock = threading.Lock()
+        self.thread = None
+
+    def get_logger(self):
+        if self.logger is None:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            self.logger = GlobalsSingleton.get().get_logger()
+        return self.logger
+
+    def start(self):
+        """
+        Start the dispatcher thread if not running
+        """
+        with self.thread_lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self.run, name=self.__class__.__name__, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Stop the dispatcher thread; the pending subscriptions are retained
+        """
+        with self.thread_lock:
+            temp = self.thread
+            self.thread = None
+            if temp is not None:
+                self.events.put_nowait(None)
+                try:
+                    temp.join()
+                except Exception as e:
+                    self.get_logger().error(f"Could not join {self.__class__.__name__} thread {e}")
+
+    def subscribe(self, *, rid: ID, states: Iterable[ReservationStates],
+                  callback: Callable[[ReservationMng], None]) -> ReservationSubscription:
+        """
+        Subscribe to the transition of a reservation into any of the target states. Subscribe before
+        triggering the transition, a reservation already in a target state is not reported.
+        @param rid reservation id
+        @param states target states
+        @param callback callback invoked with the reservation snapshot
+        @return subscription
+        """
+        subscription = ReservationSubscription(rid=rid, states=states, callback=callback)
+        with self.lock:
+            self.subscriptions.setdefault(subscription.rid, []).append(subscription)
+        self.start()
+        return subscription
+
+    def unsubscribe(self, *, subscription: ReservationSubscription):
+        """
+        Remove a subscription
+        @param subscription subscription
+        """
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.rid)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.remove(subscription)
+            if len(subscriptions) == 0:
+                self.subscriptions.pop(subscription.rid)
+
+    def has_subscriptions(self, *, rid: ID) -> bool:
+        return str(rid) in self.subscriptions
+
+    def publish(self, *, reservation: ABCReservationMixin):
+        """
+        Publish the current state of a reservation; invoked by the kernel on every state transition
+        @param reservation reservation
+        """
+        rid = str(reservation.get_reservation_id())
+        if rid not in self.subscriptions:
+            return
+
+        try:
+            state = reservation.get_state()
+            with self.lock:
+                subscriptions = self.subscriptions.get(rid)
+                if subscriptions is None:
+                    return
+                matched = [s for s in subscriptions if state in s.states]
+                if len(matched) == 0:
+                    return
+                remaining = [s for s in subscriptions if state not in s.states]
+                if len(remaining):
+                    self.subscriptions[rid] = remaining
+                else:
+                    self.subscriptions.pop(rid)
+
+            snapshot = self.snapshot(reservation=reservation)
+            for subscription in matched:
+                self.events.put_nowait((subscription, snapshot))
+        except Exception as e:
+            self.get_logger().error(f"Failed to publish transition of reservation# {rid}: {e}")
+            self.get_logger().error(traceback.format_exc())
+
+    @staticmethod
+    def snapshot(*, reservation: ABCReservationMixin) -> ReservationMng:
+        from fabric_cf.actor.core.manage.converter import Converter
+        return Converter.fill_reservation(reservation=reservation, full=True)
+
+    def run(self):
+        while True:
+            entry = self.events.get()
+            if entry is None:
+                return
+
+            subscription, snapshot = entry
+            try:
+                subscription.callback(snapshot)
+            except Exception as e:
+                self.get_logger().error(f"Callback failed for subscription {subscription}: {e}")
+                self.get_logger().error(traceback.format_exc())
+
+
+class ReservationEventBusSingleton:
+    """
+    ReservationEventBus Singleton class
+    """
+    __instance = None
+
+    def __init__(self):
+        if self.__instance is not None:
+            raise InitializationException("Singleton can't be created twice !")
+
+    def get(self):
+        """
+        Actually create an instance
+        """
+        if self.__instance is None:
+            self.__instance = ReservationEventBus()
+        return self.__instance
+
+    get = classmethod(get)
@@ -568,6 +568,10 @@ class RPCManager:
         if not self.started:
             logger.warning("Ignoring RPC request: container is shutting down")
             return
+        if rpc.reservation is not None and rpc.actor is not None:
+            # Buffered reservation updates must be persisted before the request leaves the actor
+            rpc.actor.get_plugin().get_database().flush(rid=rpc.reservation.get_reservation_id())
+
         if rpc.handler is not None:
             self.add_pending_request(guid=rpc.request.get_message_id(), request=rpc)
 
@@ -116,16 +116,18 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
         password = config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_PASSWORD]
         db_host = config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_HOST]
         db_name = config.get_global_config().get_database()[Constants.PROPERTY_CONF_DB_NAME]
+        reservation_summary = config.get_global_config().get_database().get(
+            Constants.PROPERTY_CONF_DB_RESERVATION_SUMMARY, False)
 
         from fabric_cf.actor.core.apis.abc_actor_mixin import ActorType
         if actor.get_type() in [ActorType.Orchestrator, ActorType.Authority]:
             from fabric_cf.actor.core.plugins.substrate.db.substrate_actor_database import SubstrateActorDatabase
             self.db = SubstrateActorDatabase(user=user, password=password, database=db_name, db_host=db_host,
-                                             logger=self.logger)
+                                             logger=self.logger, reservation_summary=reservation_summary)
         else:
             from fabric_cf.actor.core.plugins.db.server_actor_database import ServerActorDatabase
             self.db = ServerActorDatabase(user=user, password=password, database=db_name, db_host=db_host,
-                                          logger=self.logger)
+                                          logger=self.logger, reservation_summary=reservation_summary)
         self.db.set_actor_name(name=self.actor.get_name())
         self.db.initialize()
         self.db.actor_added(actor=actor)
@@ -453,7 +455,8 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
                          slice_id: ID = None, rid: ID = None, oidc_claim_sub: str = None,
                          email: str = None, rid_list: List[str] = None, type: str = None,
                          site: str = None, node_id: str = None, host: str = None, ip_subnet: str = None,
-                         full: bool = False, start: datetime = None, end: datetime = None) -> ResultReservationAvro:
+                         full: bool = None, start: datetime = None, end: datetime = None, after: ID = None,
+                         limit: int = None) -> ResultReservationAvro:
         result = ResultReservationAvro()
         result.status = ResultAvro()
 
@@ -471,10 +474,10 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
                 if rid_list is not None:
                     res_list = self.db.get_reservations_by_rids(rid=rid_list)
                 else:
-                    res_list = self.db.get_reservations(slice_id=slice_id, rid=rid, email=email,
-                                                        states=states, rsv_type=rsv_type, site=site,
+                    res_list = self.db.get_reservations(slice_id=slice_id, rid=rid, oidc_sub=oidc_claim_sub,
+                                                        email=email, states=states, rsv_type=rsv_type, site=site,
                                                         graph_node_id=node_id, host=host, ip_subnet=ip_subnet,
-                                                        start=start, end=end)
+                                                        start=start, end=end, after=after, limit=limit)
             except Exception as e:
                 self.logger.error("getReservations:db access {}".format(e))
                 result.status.set_code(ErrorCodes.ErrorDatabaseError.value)
@@ -483,12 +486,12 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
 
             if res_list is not None:
                 result.reservations = []
+                if full is None:
+                    full = True if slice_id or rid else False
                 for r in res_list:
                     r_slice_id = r.get_slice_id()
                     slice_obj = self.get_slice_by_guid(guid=r_slice_id)
                     r.restore(actor=self.actor, slice_obj=slice_obj)
-                    if not full:
-                        full = True if slice_id or rid else False
                     rr = Converter.fill_reservation(reservation=r, full=full)
                     result.reservations.append(rr)
         except ReservationNotFoundException as e:
@@ -503,6 +506,49 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
 
         return result
 
+    def get_reservation_summaries(self, *, caller: AuthToken, states: List[int] = None,
+                                  slice_id: ID = None, rid: ID = None, oidc_claim_sub: str = None, email: str = None,
+                                  rid_list: List[str] = None, type: str = None, site: str = None,
+                                  node_id: str = None, host: str = None, ip_subnet: str = None,
+                                  start: datetime = None, end: datetime = None, after: ID = None,
+                                  limit: int = None) -> ResultReservationAvro:
+        result = ResultReservationAvro()
+        result.status = ResultAvro()
+
+        if caller is None:
+            result.status.set_code(ErrorCodes.ErrorInvalidArguments.value)
+            result.status.set_message(ErrorCodes.ErrorInvalidArguments.interpret())
+            return result
+
+        try:
+            rsv_type = None
+            if type is not None:
+                rsv_type = type.split(",")
+            summaries = None
+            try:
+                summaries = self.db.get_reservation_summaries(slice_id=slice_id, rid=rid, oidc_sub=oidc_claim_sub,
+                                                              email=email, states=states,
+                                                              rsv_type=rsv_type, site=site, graph_node_id=node_id,
+                                                              host=host, ip_subnet=ip_subnet, start=start, end=end,
+                                                              after=after, limit=limit, rid_list=rid_list)
+            except Exception as e:
+                self.logger.error("get_reservation_summaries:db access {}".format(e))
+                result.status.set_code(ErrorCodes.ErrorDatabaseError.value)
+                result.status.set_message(ErrorCodes.ErrorDatabaseError.interpret(exception=e))
+                result.status = ManagementObject.set_exception_details(result=result.status, e=e)
+
+            if summaries is not None:
+                result.reservations = []
+                for summary in summaries:
+                    result.reservations.append(Converter.fill_reservation_from_summary(summary=summary))
+        except Exception as e:
+            self.logger.error("get_reservation_summaries: {}".format(e))
+            result.status.set_code(ErrorCodes.ErrorInternalError.value)
+            result.status.set_message(ErrorCodes.ErrorInternalError.interpret(exception=e))
+            result.status = ManagementObject.set_exception_details(result=result.status, e=e)
+
+        return result
+
     def remove_reservation(self, *, caller: AuthToken, rid: ID) -> ResultAvro:
         result = ResultAvro()
 
@@ -665,9 +711,9 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
 
         try:
 
-            res_list = None
+            summaries = None
             try:
-                res_list = self.db.get_reservations_by_rids(rid=rids)
+                summaries = self.db.get_reservation_summaries(rid_list=rids)
             except Exception as e:
                 self.logger.error("get_reservation_state_for_reservations db access {}".format(e))
                 result.status.set_code(ErrorCodes.ErrorDatabaseError.value)
@@ -676,8 +722,8 @@ class ActorManagementObject(ManagementObject, ABCActorManagementObject):
                 return result
 
             result.reservation_states = []
-            for r in res_list:
-                result.reservation_states.append(Converter.fill_reservation_state(res=r))
+            for summary in summaries:
+                result.reservation_states.append(Converter.fill_reservation_state_from_summary(summary=summary))
 
         except ReservationNotFoundException as e:
             self.logger.error("get_reservation_state_for_reservations: {}".format(e))
@@ -27,7 +27,7 @@ from __future__ import annotations
 
 import traceback
 from datetime import datetime
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Dict, Callable
 
 from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
@@ -339,6 +339,163 @@ class ClientActorManagementObjectHelper(ABCClientActorManagementObject):
 
         return result
 
+    @staticmethod
+    def add_redeem_predecessors(*, actor: ABCClientActor, res: ABCControllerReservation,
+                                predecessors: List[ReservationPredecessorAvro], logger):
+        """
+        Set the redeem predecessors of a reservation
+        @param actor actor
+        @param res reservation
+        @param predecessors predecessors
+        @param logger logger
+        """
+        for pred in predecessors:
+            if pred.get_reservation_id() is None:
+                logger.warning(f"Predecessor specified for rid={res.get_reservation_id()} "
+                               "but missing reservation id of predecessor")
+                continue
+
+            predid = ID(uid=pred.get_reservation_id())
+            pr = actor.get_reservation(rid=predid)
+
+            if pr is None:
+                logger.warning(f"Predecessor for rid={res.get_reservation_id()} with rid={predid} "
+                               f"does not exist. Ignoring it!")
+                continue
+
+            if not isinstance(pr, ABCControllerReservation):
+                logger.warning(f"Predecessor for rid={res.get_reservation_id()} is not an "
+                               f"IControllerReservation: class={type(pr)}")
+                continue
+
+            logger.debug(f"Setting redeem predecessor on reservation # {res.get_reservation_id()} "
+                         f"pred={pr.get_reservation_id()}")
+            res.add_redeem_predecessor(reservation=pr)
+
+    @staticmethod
+    def extend_on_actor(*, actor: ABCClientActor, res: ABCControllerReservation, new_end_time: datetime,
+                        sliver: BaseSliver, dependencies: List[ReservationPredecessorAvro] = None) -> ResultAvro:
+        """
+        Extend a reservation; must be invoked on the actor thread
+        @param actor actor
+        @param res reservation
+        @param new_end_time new end time; term is not changed if not specified
+        @param sliver modified sliver; if specified
+        @param dependencies redeem dependencies
+        @return result
+        """
+        result = ResultAvro()
+        redeem_dep_res_list = []
+        if dependencies is not None:
+            for d in dependencies:
+                dep_res = actor.get_reservation(rid=ID(uid=d.get_reservation_id()))
+                if dep_res is None:
+                    result.set_code(ErrorCodes.ErrorNoSuchReservation.value)
+                    result.set_message(ErrorCodes.ErrorNoSuchReservation.interpret())
+                    return result
+                redeem_dep_res_list.append(dep_res)
+
+        rset = ResourceSet()
+        units = res.get_resources().get_units()
+        rset.set_units(units=units)
+        rset.set_type(rtype=res.get_resources().get_type())
+
+        new_term = res.get_term()
+        if new_end_time is not None:
+            tmp_start_time = res.get_term().get_start_time()
+            new_term = res.get_term().extend()
+
+            new_term.set_end_time(date=new_end_time)
+            new_term.set_new_start_time(date=tmp_start_time)
+            new_term.set_start_time(date=tmp_start_time)
+        if sliver is not None:
+            rset.set_sliver(sliver=sliver)
+
+        actor.extend(rid=res.get_reservation_id(), resources=rset, term=new_term, dependencies=redeem_dep_res_list)
+
+        return result
+
+    @staticmethod
+    def get_batch_error(*, rids: List[str], code: ErrorCodes, e: Exception = None) -> Dict[str, ResultAvro]:
+        """
+        Build the per reservation results for a batch which failed as a whole
+        @param rids reservation ids
+        @param code error code
+        @param e exception
+        @return dictionary of reservation id to result
+        """
+        results = {}
+        for rid in rids:
+            result = ResultAvro()
+            result.set_code(code.value)
+            result.set_message(code.interpret(exception=e))
+            if e is not None:
+                result = ManagementObject.set_exception_details(result=result, e=e)
+            results[rid] = result
+        return results
+
+    def run_batch(self, *, rids: List[str], caller: AuthToken, action: Callable, name: str) -> Dict[str, ResultAvro]:
+        """
+        Apply an action to a set of reservations on the actor thread. The actor thread is entered once for the
+        whole batch and the reservation updates resulting from the batch are written in a single transaction;
+        if the transaction fails, the updates are written one at a time and only the reservations whose update
+        could not be written are reported with ErrorDatabaseError.
+        @param rids reservation ids
+        @param caller caller
+        @param action callable invoked with the reservation id and the reservation object for each reservation;
+        it returns a ResultAvro or None on success
+        @param name name of the operation used for logging
+        @return dictionary of reservation id to result
+        """
+        if rids is None or len(rids) == 0:
+            return {}
+
+        if caller is None:
+            return self.get_batch_error(rids=rids, code=ErrorCodes.ErrorInvalidArguments)
+
+        try:
+            class Runner(ABCActorRunnable):
+                def __init__(self, *, actor: ABCClientActor, logger):
+                    self.actor = actor
+                    self.logger = logger
+
+                def run(self):
+                    results = {}
+                    try:
+                        with self.actor.get_plugin().get_database().batch_updates() as failed:
+                            for rid in rids:
+                                result = ResultAvro()
+                                r = self.actor.get_reservation(rid=ID(uid=rid))
+                                if r is None:
+                                    result.set_code(ErrorCodes.ErrorNoSuchReservation.value)
+                                    result.set_message(ErrorCodes.ErrorNoSuchReservation.interpret())
+                                else:
+                                    try:
+                                        result = action(rid, r) or result
+                                    except Exception as e:
+                                        self.logger.error(f"{name} rid: {rid} {e}")
+                                        result.set_code(ErrorCodes.ErrorInternalError.value)
+                                        result.set_message(ErrorCodes.ErrorInternalError.interpret(exception=e))
+                                        result = ManagementObject.set_exception_details(result=result, e=e)
+                                results[rid] = result
+                        # Only the reservations whose updates could not be written are reported as failed
+                        for rid, e in failed.items():
+                            self.logger.error(f"Could not commit {name} update for rid: {rid} {e}")
+                            results.update(ClientActorManagementObjectHelper.get_batch_error(
+                                rids=[rid], code=ErrorCodes.ErrorDatabaseError, e=e))
+                    except Exception as e:
+                        self.logger.error(f"{name} {e}")
+                        remaining = [rid for rid in rids if rid not in results]
+                        results.update(ClientActorManagementObjectHelper.get_batch_error(
+                            rids=remaining, code=ErrorCodes.ErrorInternalError, e=e))
+                    return results
+
+            return self.client.execute_on_actor_thread_and_wait(runnable=Runner(actor=self.client,
+                                                                                logger=self.logger))
+        except Exception as e:
+            self.logger.error(f"{name} {e}")
+            return self.get_batch_error(rids=rids, code=ErrorCodes.ErrorInternalError, e=e)
+
     def demand_reservation_rid(self, *, rid: ID, caller: AuthToken) -> ResultAvro:
         result = ResultAvro()
 
@@ -379,31 +536,6 @@ class ClientActorManagementObjectHelper(ABCClientActorManagementObject):
                     self.actor = actor
                     self.logger = logger
 
-                def __add_predecessors(self, predecessors: List[ReservationPredecessorAvro],
-                                       res: ABCControllerReservation):
-                    for pred in predecessors:
-                        if pred.get_reservation_id() is None:
-                            self.logger.warning(f"Predecessor specified for rid={res.get_reservation_id()} "
-                                                "but missing reservation id of predecessor")
-                            continue
-
-                        predid = ID(uid=pred.get_reservation_id())
-                        pr = self.actor.get_reservation(rid=predid)
-
-                        if pr is None:
-                            self.logger.warning(f"Predecessor for rid={res.get_reservation_id()} with rid={predid} "
-                                                f"does not exist. Ignoring it!")
-                            continue
-
-                        if not isinstance(pr, ABCControllerReservation):
-                            self.logger.warning(f"Predecessor for rid={res.get_reservation_id()} is not an "
-                                                f"IControllerReservation: class={type(pr)}")
-                            continue
-
-                        self.logger.debug(f"Setting redeem predecessor on reservation # {res.get_reservation_id()} "
-                                          f"pred={pr.get_reservation_id()}")
-                        res.add_redeem_predecessor(reservation=pr)
-
                 def run(self):
                     result = ResultAvro()
                     rid = ID(uid=reservation.get_reservation_id())
@@ -418,7 +550,8 @@ class ClientActorManagementObjectHelper(ABCClientActorManagementObject):
                         predecessors = reservation.get_redeem_predecessors()
                         if predecessors is not None:
                             self.logger.debug("Processing Redeem predecessors")
-                            self.__add_predecessors(res=r, predecessors=predecessors)
+                            ClientActorManagementObjectHelper.add_redeem_predecessors(
+                                actor=self.actor, res=r, predecessors=predecessors, logger=self.logger)
 
                     try:
                         self.actor.get_plugin().get_database().update_reservation(reservation=r)
@@ -462,36 +595,10 @@ class ClientActorManagementObjectHelper(ABCClientActorManagementObject):
                         result.set_message(ErrorCodes.ErrorNoSuchReservation.interpret())
                         return result
 
-                    redeem_dep_res_list = []
-                    if dependencies is not None:
-                        for d in dependencies:
-                            dep_res = self.actor.get_reservation(rid=ID(uid=d.get_reservation_id()))
-                            if dep_res is None:
-                                result.set_code(ErrorCodes.ErrorNoSuchReservation.value)
-                                result.set_message(ErrorCodes.ErrorNoSuchReservation.interpret())
-                                return result
-                            redeem_dep_res_list.append(dep_res)
-
-                    rset = ResourceSet()
-                    units = r.get_resources().get_units()
-                    rset.set_units(units=units)
-                    rset.set_type(rtype=r.get_resources().get_type())
-
-                    new_term = r.get_term()
-                    if new_end_time is not None:
-                        tmp_start_time = r.get_term().get_start_time()
-                        new_term = r.get_term().extend()
-
-                        new_term.set_end_time(date=new_end_time)
-                        new_term.set_new_start_time(date=tmp_start_time)
-                        new_term.set_start_time(date=tmp_start_time)
-                    if sliver is not None:
-                        rset.set_sliver(sliver=sliver)
-
-                    self.actor.extend(rid=r.get_reservation_id(), resources=rset, term=new_term,
-                                      dependencies=redeem_dep_res_list)
-
-                    return result
+                    return ClientActorManagementObjectHelper.extend_on_actor(actor=self.actor, res=r,
+                                                                             new_end_time=new_end_time,
+                                                                             sliver=sliver,
+                                                                             dependencies=dependencies)
             '''
             # Process Extend for Renew synchronously
             if new_end_time is not None:
@@ -546,6 +653,67 @@ class ClientActorManagementObjectHelper(ABCClientActorManagementObject):
 
         return result
 
+    def demand_reservations(self, *, reservations: List[ReservationMng],
+                            caller: AuthToken) -> Dict[str, ResultAvro]:
+        reservation_map = {}
+        if reservations is not None:
+            reservation_map = {r.get_reservation_id(): r for r in reservations}
+
+        def demand(rid: str, r: ABCControllerReservation):
+            reservation = reservation_map.get(rid)
+            ManagementUtils.update_reservation(res_obj=r, rsv_mng=reservation)
+            if isinstance(reservation, LeaseReservationAvro):
+                predecessors = reservation.get_redeem_predecessors()
+                if predecessors is not None:
+                    self.add_redeem_predecessors(actor=self.client, res=r, predecessors=predecessors,
+                                                 logger=self.logger)
+
+            self.client.get_plugin().get_database().update_reservation(reservation=r)
+            self.client.demand(rid=r.get_reservation_id())
+
+        return self.run_batch(rids=list(reservation_map.keys()), caller=caller, action=demand,
+                              name="demand_reservations")
+
+    def close_reservations_by_rids(self, *, rids: List[ID], caller: AuthToken) -> Dict[str, ResultAvro]:
+        def close(rid: str, r: ABCControllerReservation):
+            self.client.close_by_rid(rid=r.get_reservation_id(), force=True)
+
+        return self.run_batch(rids=[str(rid) for rid in rids] if rids is not None else None, caller=caller,
+                              action=close, name="close_reservations_by_rids")
+
+    def extend_reservations(self, *, rids: List[ID], caller: AuthToken, new_end_time: datetime = None,
+                            slivers: Dict[ID, BaseSliver] = None,
+                            dependencies: Dict[ID, List[ReservationPredecessorAvro]] = None) -> Dict[str, ResultAvro]:
+        slivers = {str(k): v for k, v in slivers.items()} if slivers is not None else {}
+        dependencies = {str(k): v for k, v in dependencies.items()} if dependencies is not None else {}
+
+        def extend(rid: str, r: ABCControllerReservation):
+            sliver = slivers.get(rid)
+            if new_end_time is None and sliver is None:
+                result = ResultAvro()
+                result.set_code(ErrorCodes.ErrorInvalidArguments.value)
+                result.set_message(ErrorCodes.ErrorInvalidArguments.interpret())
+                return result
+
+            return self.extend_on_actor(actor=self.client, res=r, new_end_time=new_end_time, sliver=sliver,
+                                        dependencies=dependencies.get(rid))
+
+        return self.run_batch(rids=[str(rid) for rid in rids] if rids is not None else None, caller=caller,
+                              action=extend, name="extend_reservations")
+
+    def modify_reservations(self, *, slivers: Dict[ID, BaseSliver], caller: AuthToken) -> Dict[str, ResultAvro]:
+        slivers = {str(k): v for k, v in slivers.items()} if slivers is not None else {}
+
+        def modify(rid: str, r: ABCControllerReservation):
+            result = ResultAvro()
+            if slivers.get(rid) is None:
+                result.set_code(ErrorCodes.ErrorInvalidArguments.value)
+                result.set_message(ErrorCodes.ErrorInvalidArguments.interpret())
+                return result
+            self.client.modify(reservation_id=r.get_reservation_id(), modified_sliver=slivers.get(rid))
+
+        return self.run_batch(rids=list(slivers.keys()), caller=caller, action=modify, name="modify_reservations")
+
     def claim_delegations(self, *, broker: ID, did: str, caller: AuthToken) -> ResultDelegationAvro:
         result = ResultDelegationAvro()
         result.status = ResultAvro()
@@ -26,7 +26,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Dict
 
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
 from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
@@ -138,6 +138,22 @@ class ControllerManagementObject(ActorManagementObject, ABCClientActorManagement
     def modify_reservation(self, *, rid: ID, modified_sliver: BaseSliver, caller: AuthToken) -> ResultAvro:
         return self.client_helper.modify_reservation(rid=rid, modified_sliver=modified_sliver, caller=caller)
 
+    def demand_reservations(self, *, reservations: List[ReservationMng],
+                            caller: AuthToken) -> Dict[str, ResultAvro]:
+        return self.client_helper.demand_reservations(reservations=reservations, caller=caller)
+
+    def close_reservations_by_rids(self, *, rids: List[ID], caller: AuthToken) -> Dict[str, ResultAvro]:
+        return self.client_helper.close_reservations_by_rids(rids=rids, caller=caller)
+
+    def extend_reservations(self, *, rids: List[ID], caller: AuthToken, new_end_time: datetime = None,
+                            slivers: Dict[ID, BaseSliver] = None,
+                            dependencies: Dict[ID, List[ReservationPredecessorAvro]] = None) -> Dict[str, ResultAvro]:
+        return self.client_helper.extend_reservations(rids=rids, caller=caller, new_end_time=new_end_time,
+                                                      slivers=slivers, dependencies=dependencies)
+
+    def modify_reservations(self, *, slivers: Dict[ID, BaseSliver], caller: AuthToken) -> Dict[str, ResultAvro]:
+        return self.client_helper.modify_reservations(slivers=slivers, caller=caller)
+
     def poa(self, *, poa: PoaAvro, caller: AuthToken) -> ResultAvro:
         return self.client_helper.poa(poa=poa, caller=caller)
 
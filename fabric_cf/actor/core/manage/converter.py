@@ -42,12 +42,14 @@ from fabric_cf.actor.core.apis.abc_authority_proxy import ABCAuthorityProxy
 from fabric_cf.actor.core.apis.abc_broker_proxy import ABCBrokerProxy
 from fabric_cf.actor.core.apis.abc_client_reservation import ABCClientReservation
 from fabric_cf.actor.core.apis.abc_controller_reservation import ABCControllerReservation
+from fabric_cf.actor.core.apis.abc_reservation_mixin import ReservationCategory
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.core.actor_identity import ActorIdentity
 from fabric_cf.actor.core.core.ticket import Ticket
 from fabric_cf.actor.core.core.unit import Unit
 from fabric_cf.actor.core.kernel.predecessor_state import PredecessorState
 from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.plugins.db.reservation_summary import ReservationSummary
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.proxies.actor_location import ActorLocation
 from fabric_cf.actor.core.proxies.kafka.kafka_proxy import KafkaProxy
@@ -184,6 +186,52 @@ class Converter:
 
         return result
 
+    @staticmethod
+    def fill_reservation_from_summary(*, summary: dict) -> ReservationMng:
+        """
+        Fill the reservation from its summary; the sliver and the properties derived from the
+        pickled reservation (units, authority, broker etc.) are not included
+        @param summary reservation summary
+        @return reservation
+        """
+        if summary.get(ReservationSummary.CATEGORY) == ReservationCategory.Client.value:
+            rsv_mng = LeaseReservationAvro()
+            rsv_mng.set_join_state(summary.get(ReservationSummary.JOIN_STATE))
+        else:
+            rsv_mng = ReservationMng()
+
+        rsv_mng.set_reservation_id(summary.get(ReservationSummary.RESERVATION_ID))
+        rsv_mng.set_slice_id(summary.get(ReservationSummary.SLICE_ID))
+        rsv_mng.set_state(summary.get(ReservationSummary.STATE))
+        rsv_mng.set_pending_state(summary.get(ReservationSummary.PENDING_STATE))
+
+        start = ReservationSummary.str_to_time(summary.get(ReservationSummary.LEASE_START))
+        if start is not None:
+            rsv_mng.set_start(ActorClock.to_milliseconds(when=start))
+        end = ReservationSummary.str_to_time(summary.get(ReservationSummary.LEASE_END))
+        if end is not None:
+            rsv_mng.set_end(ActorClock.to_milliseconds(when=end))
+
+        rsv_mng.set_notices(summary.get(ReservationSummary.NOTICES))
+
+        closed_at = ReservationSummary.str_to_time(summary.get(ReservationSummary.CLOSED_AT))
+        if closed_at is not None:
+            rsv_mng.set_closed_at(ActorClock.to_milliseconds(when=closed_at))
+
+        return rsv_mng
+
+    @staticmethod
+    def fill_reservation_state_from_summary(*, summary: dict) -> ReservationStateAvro:
+        if summary.get(ReservationSummary.CATEGORY) == ReservationCategory.Client.value:
+            result = LeaseReservationStateAvro()
+            result.set_joining(summary.get(ReservationSummary.JOIN_STATE))
+        else:
+            result = ReservationStateAvro()
+        result.set_reservation_id(rid=summary.get(ReservationSummary.RESERVATION_ID))
+        result.set_state(summary.get(ReservationSummary.STATE))
+        result.set_pending_state(summary.get(ReservationSummary.PENDING_STATE))
+        return result
+
     @staticmethod
     def fill_reservation_states(*, res_list: list) -> List[ReservationStateAvro]:
         result = []
@@ -133,8 +133,9 @@ class KafkaActor(KafkaProxy, ABCMgmtActor):
     def get_reservations(self, *, states: List[int] = None, slice_id: ID = None,
                          rid: ID = None, oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
                          type: str = None, site: str = None, node_id: str = None,
-                         host: str = None, ip_subnet: str = None, full: bool = False,
-                         start: datetime = None, end: datetime = None) -> List[ReservationMng]:
+                         host: str = None, ip_subnet: str = None, full: bool = None,
+                         start: datetime = None, end: datetime = None, after: ID = None,
+                         limit: int = None) -> List[ReservationMng]:
         request = GetReservationsRequestAvro()
         request = self.fill_request_by_id_message(request=request, slice_id=slice_id,
                                                   states=states, email=email, rid=rid,
@@ -142,7 +143,26 @@ class KafkaActor(KafkaProxy, ABCMgmtActor):
         status, response = self.send_request(request)
 
         if status.code == 0:
-            return response.reservations
+            reservations = response.reservations
+            # The request message does not carry the cursor; apply it to the returned reservations
+            if reservations is not None and (after is not None or limit is not None):
+                reservations = sorted(reservations, key=lambda r: r.get_reservation_id())
+                if after is not None:
+                    reservations = [r for r in reservations if r.get_reservation_id() > str(after)]
+                if limit is not None:
+                    reservations = reservations[:limit]
+            return reservations
+
+    def get_reservation_summaries(self, *, states: List[int] = None, slice_id: ID = None, rid: ID = None,
+                                  oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
+                                  type: str = None, site: str = None, node_id: str = None, host: str = None,
+                                  ip_subnet: str = None, start: datetime = None, end: datetime = None,
+                                  after: ID = None, limit: int = None) -> List[ReservationMng]:
+        # The message bus has no summary request; fall back to loading the reservations
+        return self.get_reservations(states=states, slice_id=slice_id, rid=rid, oidc_claim_sub=oidc_claim_sub,
+                                     email=email, rid_list=rid_list, type=type, site=site, node_id=node_id,
+                                     host=host, ip_subnet=ip_subnet, full=False, start=start, end=end,
+                                     after=after, limit=limit)
 
     def get_sites(self, *, site: str) -> List[SiteAvro] or None:
         request = GetSitesRequestAvro()
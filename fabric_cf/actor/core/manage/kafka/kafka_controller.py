@@ -26,11 +26,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import List, Dict, Callable
 
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
 from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
 from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
 from fabric_mb.message_bus.messages.ticket_reservation_avro import TicketReservationAvro
 from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
 from fabric_mb.message_bus.messages.broker_query_model_avro import BrokerQueryModelAvro
@@ -46,7 +47,7 @@ from fabric_mb.message_bus.messages.extend_reservation_avro import ExtendReserva
 from fabric_cf.actor.core.apis.abc_actor_mixin import ActorType
 from fabric_cf.actor.core.common.exceptions import ManageException
 from fabric_cf.actor.core.apis.abc_mgmt_controller_mixin import ABCMgmtControllerMixin
-from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.common.constants import Constants, ErrorCodes
 from fabric_cf.actor.core.manage.kafka.kafka_actor import KafkaActor
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.util.id import ID
@@ -101,5 +102,55 @@ class KafkaController(KafkaActor, ABCMgmtControllerMixin):
     def modify_reservation(self, *, rid: ID, modify_properties: dict) -> bool:
         raise ManageException(Constants.NOT_IMPLEMENTED)
 
+    def demand_reservations(self, *, reservations: List[ReservationMng]) -> Dict[str, ResultAvro]:
+        raise ManageException(Constants.NOT_IMPLEMENTED)
+
+    def run_batch(self, *, rids: List[ID], action: Callable[[ID], ResultAvro]) -> Dict[str, ResultAvro]:
+        """
+        Apply an action to a set of reservations one request at a time; the message bus has no batch requests.
+        The last status is set to the first failure.
+        @param rids reservation ids
+        @param action callable invoked with the reservation id; returns the result for the reservation
+        @return dictionary of reservation id to result
+        """
+        results = {}
+        failure = None
+        for rid in rids or []:
+            result = action(rid)
+            results[str(rid)] = result
+            if failure is None and result.get_code() != 0:
+                failure = result
+        self.last_status = failure if failure is not None else ResultAvro()
+        return results
+
+    def close_reservations_by_rids(self, *, rids: List[ID]) -> Dict[str, ResultAvro]:
+        def close(rid: ID) -> ResultAvro:
+            self.close_reservation(rid=rid)
+            return self.last_status
+
+        return self.run_batch(rids=rids, action=close)
+
+    def extend_reservations(self, *, rids: List[ID], new_end_time: datetime = None,
+                            slivers: Dict[ID, BaseSliver] = None,
+                            dependencies: Dict[ID, List[ReservationPredecessorAvro]] = None) -> Dict[str, ResultAvro]:
+        slivers = {str(k): v for k, v in slivers.items()} if slivers is not None else {}
+        dependencies = {str(k): v for k, v in dependencies.items()} if dependencies is not None else {}
+
+        def extend(rid: ID) -> ResultAvro:
+            sliver = slivers.get(str(rid))
+            if new_end_time is None and sliver is None:
+                result = ResultAvro()
+                result.set_code(ErrorCodes.ErrorInvalidArguments.value)
+                result.set_message(ErrorCodes.ErrorInvalidArguments.interpret())
+                return result
+            self.extend_reservation(reservation=rid, new_end_time=new_end_time, sliver=sliver,
+                                    dependencies=dependencies.get(str(rid)))
+            return self.last_status
+
+        return self.run_batch(rids=rids, action=extend)
+
+    def modify_reservations(self, *, slivers: Dict[ID, BaseSliver]) -> Dict[str, ResultAvro]:
+        raise ManageException(Constants.NOT_IMPLEMENTED)
+
     def poa(self, *, poa: PoaAvro) -> bool:
         raise ManageException(Constants.NOT_IMPLEMENTED)
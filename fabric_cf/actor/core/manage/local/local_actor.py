@@ -111,14 +111,38 @@ class LocalActor(LocalProxy, ABCMgmtActor):
     def get_reservations(self, *, states: List[int] = None, slice_id: ID = None,
                          rid: ID = None, oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
                          type: str = None, site: str = None, node_id: str = None,
-                         host: str = None, ip_subnet: str = None, full: bool = False,
-                         start: datetime = None, end: datetime = None) -> List[ReservationMng]:
+                         host: str = None, ip_subnet: str = None, full: bool = None,
+                         start: datetime = None, end: datetime = None, after: ID = None,
+                         limit: int = None) -> List[ReservationMng]:
         self.clear_last()
         try:
             result = self.manager.get_reservations(caller=self.auth, states=states, slice_id=slice_id, rid=rid,
                                                    oidc_claim_sub=oidc_claim_sub, email=email, rid_list=rid_list,
                                                    type=type, site=site, node_id=node_id, host=host,
-                                                   ip_subnet=ip_subnet, full=full, start=start, end=end)
+                                                   ip_subnet=ip_subnet, full=full, start=start, end=end,
+                                                   after=after, limit=limit)
+            self.last_status = result.status
+
+            if result.status.get_code() == 0:
+                return result.reservations
+
+        except Exception as e:
+            self.on_exception(e=e, traceback_str=traceback.format_exc())
+
+    def get_reservation_summaries(self, *, states: List[int] = None, slice_id: ID = None, rid: ID = None,
+                                  oidc_claim_sub: str = None, email: str = None, rid_list: List[str] = None,
+                                  type: str = None,
+                                  site: str = None, node_id: str = None, host: str = None, ip_subnet: str = None,
+                                  start: datetime = None, end: datetime = None, after: ID = None,
+                                  limit: int = None) -> List[ReservationMng]:
+        self.clear_last()
+        try:
+            result = self.manager.get_reservation_summaries(caller=self.auth, states=states, slice_id=slice_id,
+                                                            rid=rid, oidc_claim_sub=oidc_claim_sub, email=email,
+                                                            rid_list=rid_list, type=type,
+                                                            site=site, node_id=node_id, host=host,
+                                                            ip_subnet=ip_subnet, start=start, end=end,
+                                                            after=after, limit=limit)
             self.last_status = result.status
 
             if result.status.get_code() == 0:
@@ -27,12 +27,13 @@ from __future__ import annotations
 
 import traceback
 from datetime import datetime
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Dict
 
 from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
 from fabric_mb.message_bus.messages.broker_query_model_avro import BrokerQueryModelAvro
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
 from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
 from fabric_mb.message_bus.messages.ticket_reservation_avro import TicketReservationAvro
 from fabric_mb.message_bus.messages.unit_avro import UnitAvro
 from fim.slivers.base_sliver import BaseSliver
@@ -245,6 +246,56 @@ class LocalController(LocalActor, ABCMgmtControllerMixin):
 
         return False
 
+    def set_batch_status(self, *, results: Dict[str, ResultAvro]):
+        """
+        Set the last status to the first failure in a batch result
+        @param results dictionary of reservation id to result
+        """
+        self.last_status = ResultAvro()
+        for result in results.values():
+            if result.get_code() != 0:
+                self.last_status = result
+                break
+
+    def demand_reservations(self, *, reservations: List[ReservationMng]) -> Dict[str, ResultAvro]:
+        self.clear_last()
+        try:
+            results = self.manager.demand_reservations(reservations=reservations, caller=self.auth)
+            self.set_batch_status(results=results)
+            return results
+        except Exception as e:
+            self.on_exception(e=e, traceback_str=traceback.format_exc())
+
+    def close_reservations_by_rids(self, *, rids: List[ID]) -> Dict[str, ResultAvro]:
+        self.clear_last()
+        try:
+            results = self.manager.close_reservations_by_rids(rids=rids, caller=self.auth)
+            self.set_batch_status(results=results)
+            return results
+        except Exception as e:
+            self.on_exception(e=e, traceback_str=traceback.format_exc())
+
+    def extend_reservations(self, *, rids: List[ID], new_end_time: datetime = None,
+                            slivers: Dict[ID, BaseSliver] = None,
+                            dependencies: Dict[ID, List[ReservationPredecessorAvro]] = None) -> Dict[str, ResultAvro]:
+        self.clear_last()
+        try:
+            results = self.manager.extend_reservations(rids=rids, caller=self.auth, new_end_time=new_end_time,
+                                                       slivers=slivers, dependencies=dependencies)
+            self.set_batch_status(results=results)
+            return results
+        except Exception as e:
+            self.on_exception(e=e, traceback_str=traceback.format_exc())
+
+    def modify_reservations(self, *, slivers: Dict[ID, BaseSliver]) -> Dict[str, ResultAvro]:
+        self.clear_last()
+        try:
+            results = self.manager.modify_reservations(slivers=slivers, caller=self.auth)
+            self.set_batch_status(results=results)
+            return results
+        except Exception as e:
+            self.on_exception(e=e, traceback_str=traceback.format_exc())
+
     def clone(self):
         return LocalController(manager=self.manager, auth=self.auth)
 
@@ -27,8 +27,9 @@ import pickle
 import threading
 import time
 import traceback
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Union, Dict
+from typing import List, Union, Dict, Set
 
 from fim.slivers.network_link import NetworkLinkSliver
 
@@ -43,8 +44,11 @@ from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import DatabaseException
 from fabric_cf.actor.core.kernel.poa import Poa, PoaStates
 from fabric_cf.actor.core.kernel.slice import SliceTypes
+from fabric_cf.actor.core.plugins.db.occupancy_cache import OccupancyCache
+from fabric_cf.actor.core.plugins.db.reservation_summary import ReservationSummary
+from fabric_cf.actor.core.plugins.db.reservation_write_behind import ReservationWriteBehind
 from fabric_cf.actor.core.plugins.handlers.configuration_mapping import ConfigurationMapping
-from fabric_cf.actor.core.container.maintenance import Site
+from fabric_cf.actor.core.container.maintenance import Site, MaintenanceRegistry
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.db.psql_database import PsqlDatabase
 
@@ -52,7 +56,8 @@ from fabric_cf.actor.db.psql_database import PsqlDatabase
 class ActorDatabase(ABCDatabase):
     MAINTENANCE = 'maintenance'
 
-    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger):
+    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger,
+                 reservation_summary: bool = False, write_behind_window: int = 0, occupancy_cache: bool = False):
         self.user = user
         self.password = password
         self.database = database
@@ -67,6 +72,19 @@ class ActorDatabase(ABCDatabase):
         self.reset_state = False
         self.actor = None
         self.lock = threading.Lock()
+        # When enabled, a compact summary of the hot reservation fields is saved with every reservation write
+        self.reservation_summary = reservation_summary
+        # When set, reservation updates are buffered for write_behind_window milliseconds and written in batches
+        self.write_behind_window = write_behind_window
+        self.write_behind = None
+        # When enabled, the occupancy of the reservations is mirrored in memory for building the broker query model
+        self.occupancy_cache_enabled = occupancy_cache
+        self.occupancy_cache = None
+        self.occupancy_load_lock = threading.Lock()
+        # Maintenance state of the testbed and sites mirrored in memory; kept up to date by the site updates
+        self.maintenance_registry = MaintenanceRegistry(loader=self._load_sites, logger=logger)
+        # Reservation updates buffered by batch_updates; per thread so that only the batching thread is affected
+        self.batch_state = threading.local()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -79,6 +97,11 @@ class ActorDatabase(ABCDatabase):
         del state['reset_state']
         del state['actor']
         del state['lock']
+        del state['write_behind']
+        del state['occupancy_cache']
+        del state['occupancy_load_lock']
+        del state['maintenance_registry']
+        del state['batch_state']
         return state
 
     def __setstate__(self, state):
@@ -92,9 +115,15 @@ class ActorDatabase(ABCDatabase):
         self.logger = None
         self.reset_state = False
         self.lock = threading.Lock()
+        self.write_behind = None
+        self.occupancy_cache = None
+        self.occupancy_load_lock = threading.Lock()
+        self.maintenance_registry = MaintenanceRegistry(loader=self._load_sites)
+        self.batch_state = threading.local()
 
     def set_logger(self, *, logger):
         self.logger = logger
+        self.maintenance_registry.logger = logger
         if self.db is not None:
             self.db.set_logger(logger=logger)
 
@@ -105,6 +134,12 @@ class ActorDatabase(ABCDatabase):
         if not self.initialized:
             if self.actor_name is None:
                 raise DatabaseException(Constants.NOT_SPECIFIED_PREFIX.format("actor name"))
+            if self.write_behind_window and self.write_behind_window > 0:
+                self.write_behind = ReservationWriteBehind(db=self.db, logger=self.logger,
+                                                           window_ms=self.write_behind_window)
+                self.write_behind.start()
+            if self.occupancy_cache_enabled:
+                self.occupancy_cache = OccupancyCache(logger=self.logger)
             self.initialized = True
 
     def actor_added(self, *, actor):
@@ -275,6 +310,83 @@ class ActorDatabase(ABCDatabase):
                 self.lock.release()
         return -1
 
+    @staticmethod
+    def _get_reservation_fields(*, reservation: ABCReservationMixin) -> dict:
+        """
+        Derive the searchable fields saved with a reservation from its sliver
+        @param reservation reservation
+        @return dictionary with sliver, site, rsv_type, components, host, ip_subnet and links
+        """
+        site = None
+        rsv_type = None
+        components = None
+        host = None
+        ip_subnet = None
+        sliver = None
+        links = []
+        from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
+        if isinstance(reservation, ReservationClient) and reservation.get_leased_resources() and \
+                reservation.get_leased_resources().get_sliver():
+            sliver = reservation.get_leased_resources().get_sliver()
+        if not sliver and reservation.get_resources() and reservation.get_resources().get_sliver():
+            sliver = reservation.get_resources().get_sliver()
+
+        if sliver:
+            rsv_type = sliver.get_type().name
+            from fim.slivers.network_service import NetworkServiceSliver
+            from fim.slivers.network_node import NodeSliver
+
+            if isinstance(sliver, NetworkServiceSliver) and sliver.interface_info:
+                site = sliver.get_site()
+                if sliver.get_gateway():
+                    ip_subnet = sliver.get_gateway().subnet
+
+                components = []
+                for interface in sliver.interface_info.interfaces.values():
+                    graph_id_node_id_component_id, bqm_if_name = interface.get_node_map()
+                    if ":" in graph_id_node_id_component_id or "#" in graph_id_node_id_component_id:
+                        if "#" in graph_id_node_id_component_id:
+                            split_string = graph_id_node_id_component_id.split("#")
+                        else:
+                            split_string = graph_id_node_id_component_id.split(":")
+                        node_id = split_string[1] if len(split_string) > 1 else None
+                        comp_id = split_string[2] if len(split_string) > 2 else None
+                        bdf = ":".join(split_string[3:]) if len(split_string) > 3 else None
+                        if node_id and comp_id and bdf:
+                            components.append((node_id, comp_id, bdf))
+                if sliver.ero and sliver.capacities:
+                    type, path = sliver.ero.get()
+                    if path and len(path.get()):
+                        for hop in path.get()[0]:
+                            if hop.startswith('link:'):
+                                links.append({"node_id": hop,
+                                              "bw": sliver.capacities.bw})
+
+            elif isinstance(sliver, NodeSliver):
+                site = sliver.get_site()
+                if sliver.get_labels() and sliver.get_labels().instance_parent:
+                    host = sliver.get_labels().instance_parent
+                if sliver.get_label_allocations() and sliver.get_label_allocations().instance_parent:
+                    host = sliver.get_label_allocations().instance_parent
+                if sliver.get_management_ip():
+                    ip_subnet = str(sliver.get_management_ip())
+
+                node_id = reservation.get_graph_node_id()
+                if node_id and sliver.attached_components_info:
+                    components = []
+                    for c in sliver.attached_components_info.devices.values():
+                        if c.get_node_map():
+                            bqm_id, comp_id = c.get_node_map()
+                            if c.labels and c.labels.bdf:
+                                bdf = c.labels.bdf
+                                if isinstance(c.labels.bdf, str):
+                                    bdf = [c.labels.bdf]
+                                for x in bdf:
+                                    components.append((node_id, comp_id, x))
+
+        return dict(sliver=sliver, site=site, rsv_type=rsv_type, components=components, host=host,
+                    ip_subnet=ip_subnet, links=links)
+
     def add_reservation(self, *, reservation: ABCReservationMixin):
         try:
             #self.lock.acquire()
@@ -287,74 +399,19 @@ class ActorDatabase(ABCDatabase):
                 oidc_claim_sub = reservation.get_slice().get_owner().get_oidc_sub_claim()
                 email = reservation.get_slice().get_owner().get_email()
 
-            site = None
-            rsv_type = None
-            components = None
-            host = None
-            ip_subnet = None
-            sliver = None
-            links = []
-            from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
-            if isinstance(reservation, ReservationClient) and reservation.get_leased_resources() and \
-                    reservation.get_leased_resources().get_sliver():
-                sliver = reservation.get_leased_resources().get_sliver()
-            if not sliver and reservation.get_resources() and reservation.get_resources().get_sliver():
-                sliver = reservation.get_resources().get_sliver()
-
-            if sliver:
-                rsv_type = sliver.get_type().name
-                from fim.slivers.network_service import NetworkServiceSliver
-                from fim.slivers.network_node import NodeSliver
-
-                if isinstance(sliver, NetworkServiceSliver) and sliver.interface_info:
-                    site = sliver.get_site()
-                    if sliver.get_gateway():
-                        ip_subnet = sliver.get_gateway().subnet
-
-                    components = []
-                    for interface in sliver.interface_info.interfaces.values():
-                        graph_id_node_id_component_id, bqm_if_name = interface.get_node_map()
-                        if ":" in graph_id_node_id_component_id or "#" in graph_id_node_id_component_id:
-                            if "#" in graph_id_node_id_component_id:
-                                split_string = graph_id_node_id_component_id.split("#")
-                            else:
-                                split_string = graph_id_node_id_component_id.split(":")
-                            node_id = split_string[1] if len(split_string) > 1 else None
-                            comp_id = split_string[2] if len(split_string) > 2 else None
-                            bdf = ":".join(split_string[3:]) if len(split_string) > 3 else None
-                            if node_id and comp_id and bdf:
-                                components.append((node_id, comp_id, bdf))
-                    if sliver.ero and sliver.capacities:
-                        type, path = sliver.ero.get()
-                        if path and len(path.get()):
-                            for hop in path.get()[0]:
-                                if hop.startswith('link:'):
-                                    links.append({"node_id": hop,
-                                                  "bw": sliver.capacities.bw})
-
-                elif isinstance(sliver, NodeSliver):
-                    site = sliver.get_site()
-                    if sliver.get_labels() and sliver.get_labels().instance_parent:
-                        host = sliver.get_labels().instance_parent
-                    if sliver.get_label_allocations() and sliver.get_label_allocations().instance_parent:
-                        host = sliver.get_label_allocations().instance_parent
-                    if sliver.get_management_ip():
-                        ip_subnet = str(sliver.get_management_ip())
-
-                    node_id = reservation.get_graph_node_id()
-                    if node_id and sliver.attached_components_info:
-                        components = []
-                        for c in sliver.attached_components_info.devices.values():
-                            if c.get_node_map():
-                                bqm_id, comp_id = c.get_node_map()
-                                if c.labels and c.labels.bdf:
-                                    bdf = c.labels.bdf
-                                    if isinstance(c.labels.bdf, str):
-                                        bdf = [c.labels.bdf]
-                                    for x in bdf:
-                                        components.append((node_id, comp_id, x))
+            fields = self._get_reservation_fields(reservation=reservation)
+            sliver = fields.get('sliver')
+            site = fields.get('site')
+            rsv_type = fields.get('rsv_type')
+            components = fields.get('components')
+            host = fields.get('host')
+            ip_subnet = fields.get('ip_subnet')
+            links = fields.get('links')
 
             term = reservation.get_term()
+            summary = None
+            if self.reservation_summary:
+                summary = ReservationSummary.build(reservation=reservation, sliver=sliver, site=site, host=host)
 
             self.db.add_reservation(slc_guid=str(reservation.get_slice_id()),
                                     rsv_resid=str(reservation.get_reservation_id()),
@@ -369,7 +426,9 @@ class ActorDatabase(ABCDatabase):
                                     lease_start=term.get_start_time() if term else None,
                                     lease_end=term.get_end_time() if term else None,
                                     host=host, ip_subnet=ip_subnet, links=links,
-                                    closed_at=getattr(reservation, 'closed_at', None))
+                                    closed_at=getattr(reservation, 'closed_at', None), summary=summary)
+            self._update_occupancy_cache(reservation=reservation, rsv_type=rsv_type, components=components,
+                                         links=links)
             self.logger.debug(
                 "Reservation {} added to slice {}".format(reservation.get_reservation_id(), reservation.get_slice()))
         finally:
@@ -386,93 +445,47 @@ class ActorDatabase(ABCDatabase):
             self.logger.debug("Updating reservation {} in slice {}".format(reservation.get_reservation_id(),
                                                                            reservation.get_slice()))
 
-            site = None
-            rsv_type = None
-            components = None
-            ip_subnet = None
-            host = None
-            sliver = None
-            links = []
-            from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
-            if isinstance(reservation, ReservationClient) and reservation.get_leased_resources() and \
-                    reservation.get_leased_resources().get_sliver():
-                sliver = reservation.get_leased_resources().get_sliver()
-            if not sliver and reservation.get_resources() and reservation.get_resources().get_sliver():
-                sliver = reservation.get_resources().get_sliver()
-
-            if sliver:
-                rsv_type = sliver.get_type().name
-                from fim.slivers.network_service import NetworkServiceSliver
-                from fim.slivers.network_node import NodeSliver
-                if isinstance(sliver, NetworkServiceSliver) and sliver.interface_info:
-                    site = sliver.get_site()
-
-                    if sliver.get_gateway():
-                        ip_subnet = sliver.get_gateway().subnet
-
-                    components = []
-                    for interface in sliver.interface_info.interfaces.values():
-                        graph_id_node_id_component_id, bqm_if_name = interface.get_node_map()
-                        if ":" in graph_id_node_id_component_id or "#" in graph_id_node_id_component_id:
-                            if "#" in graph_id_node_id_component_id:
-                                split_string = graph_id_node_id_component_id.split("#")
-                            else:
-                                split_string = graph_id_node_id_component_id.split(":")
-                            node_id = split_string[1] if len(split_string) > 1 else None
-                            comp_id = split_string[2] if len(split_string) > 2 else None
-                            bdf = ":".join(split_string[3:]) if len(split_string) > 3 else None
-                            if node_id and comp_id and bdf:
-                                components.append((node_id, comp_id, bdf))
-
-                    if sliver.ero and sliver.capacities:
-                        type, path = sliver.ero.get()
-                        if path and len(path.get()):
-                            for hop in path.get()[0]:
-                                if hop.startswith('link:'):
-                                    links.append({"node_id": hop,
-                                                  "bw": sliver.capacities.bw})
-                elif isinstance(sliver, NodeSliver):
-                    site = sliver.get_site()
-
-                    if sliver.get_labels() and sliver.get_labels().instance_parent:
-                        host = sliver.get_labels().instance_parent
-                    if sliver.get_label_allocations() and sliver.get_label_allocations().instance_parent:
-                        host = sliver.get_label_allocations().instance_parent
-                    if sliver.get_management_ip():
-                        ip_subnet = str(sliver.get_management_ip())
-                    node_id = reservation.get_graph_node_id()
-                    if node_id and sliver.attached_components_info:
-                        components = []
-                        for c in sliver.attached_components_info.devices.values():
-                            if c.get_node_map():
-                                bqm_id, comp_id = c.get_node_map()
-                                if c.labels and c.labels.bdf:
-                                    bdf = c.labels.bdf
-                                    if isinstance(c.labels.bdf, str):
-                                        bdf = [c.labels.bdf]
-                                    for x in bdf:
-                                        components.append((node_id, comp_id, x))
+            fields = self._get_reservation_fields(reservation=reservation)
+            sliver = fields.get('sliver')
+            site = fields.get('site')
+            rsv_type = fields.get('rsv_type')
+            components = fields.get('components')
+            host = fields.get('host')
+            ip_subnet = fields.get('ip_subnet')
+            links = fields.get('links')
 
             term = reservation.get_term()
+            summary = None
+            if self.reservation_summary:
+                summary = ReservationSummary.build(reservation=reservation, sliver=sliver, site=site, host=host)
             begin = time.time()
             properties = pickle.dumps(reservation)
             diff = int(time.time() - begin)
             if diff > 0:
                 self.logger.info(f"PICKLE TIME: {diff}")
             begin = time.time()
-            self.db.update_reservation(slc_guid=str(reservation.get_slice_id()),
-                                       rsv_resid=str(reservation.get_reservation_id()),
-                                       rsv_category=reservation.get_category().value,
-                                       rsv_state=reservation.get_state().value,
-                                       rsv_pending=reservation.get_pending_state().value,
-                                       rsv_joining=reservation.get_join_state().value,
-                                       properties=properties,
-                                       rsv_graph_node_id=reservation.get_graph_node_id(),
-                                       site=site, rsv_type=rsv_type, components=components,
-                                       lease_start=term.get_start_time() if term else None,
-                                       lease_end=term.get_end_time() if term else None,
-                                       ip_subnet=ip_subnet, host=host, links=links,
-                                       closed_at=getattr(reservation, 'closed_at', None))
+            record = dict(slc_guid=str(reservation.get_slice_id()),
+                          rsv_resid=str(reservation.get_reservation_id()),
+                          rsv_category=reservation.get_category().value,
+                          rsv_state=reservation.get_state().value,
+                          rsv_pending=reservation.get_pending_state().value,
+                          rsv_joining=reservation.get_join_state().value,
+                          properties=properties,
+                          rsv_graph_node_id=reservation.get_graph_node_id(),
+                          site=site, rsv_type=rsv_type, components=components,
+                          lease_start=term.get_start_time() if term else None,
+                          lease_end=term.get_end_time() if term else None,
+                          ip_subnet=ip_subnet, host=host, links=links,
+                          closed_at=getattr(reservation, 'closed_at', None), summary=summary)
+            batch = getattr(self.batch_state, 'records', None)
+            if batch is not None:
+                batch[record.get('rsv_resid')] = record
+            elif self.write_behind is not None:
+                self.write_behind.submit(rid=record.get('rsv_resid'), record=record)
+            else:
+                self.db.update_reservation(**record)
+            self._update_occupancy_cache(reservation=reservation, rsv_type=rsv_type, components=components,
+                                         links=links)
             diff = int(time.time() - begin)
             if diff > 0:
                 self.logger.info(f"DB TIME: {diff}")
@@ -484,68 +497,251 @@ class ActorDatabase(ABCDatabase):
         try:
             #self.lock.acquire()
             self.logger.debug("Removing reservation {}".format(rid))
+            batch = getattr(self.batch_state, 'records', None)
+            if batch is not None:
+                batch.pop(str(rid), None)
+            if self.write_behind is not None:
+                self.write_behind.discard(rid=str(rid))
             try:
                 self.db.remove_unit(unt_uid=str(rid))
             except Exception as e:
                 self.logger.debug("No associated Unit associated with the reservation")
             self.db.remove_reservation(rsv_resid=str(rid))
+            if self.occupancy_cache is not None:
+                self.occupancy_cache.remove(rid=rid)
         finally:
             if self.lock.locked():
                 self.lock.release()
 
-    def _load_reservation_from_pickled_object(self, pickled_res: bytes, slc_id: int) -> ABCReservationMixin or None:
+    def flush(self, *, rid: ID = None):
+        batch = getattr(self.batch_state, 'records', None)
+        if batch:
+            self.batch_state.failed.update(self._write_records(records=list(batch.values())))
+            batch.clear()
+        if self.write_behind is not None:
+            self.write_behind.flush(rid=str(rid) if rid is not None else None)
+
+    def stop(self):
         try:
-            slice_obj = self.get_slice_by_id(slc_id=slc_id)
-            result = pickle.loads(pickled_res)
-            result.restore(actor=self.actor, slice_obj=slice_obj)
-
-            if isinstance(result, ABCControllerReservation):
-                if result.get_redeem_predecessors() is not None:
-                    for p in result.get_redeem_predecessors():
-                        if p.reservation_id is not None:
-                            parent = self.get_reservations(rid=p.reservation_id)
-                            if parent is not None and len(parent) > 0:
-                                p.set_reservation(reservation=parent[0])
-
-                    for p in result.get_join_predecessors():
-                        if p.reservation_id is not None:
-                            parent = self.get_reservations(rid=p.reservation_id)
-                            if parent is not None and len(parent) > 0:
-                                p.set_reservation(reservation=parent[0])
-
-            # Load in progress POAs
-            poa_list = self.get_poas(sliver_id=result.get_reservation_id(), include_res_info=False,
-                                     states=[PoaStates.Nascent.value, PoaStates.Performing.value,
-                                             PoaStates.AwaitingCompletion.value, PoaStates.SentToAuthority.value])
-
-            from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
-            from fabric_cf.actor.core.kernel.authority_reservation import AuthorityReservation
-            if isinstance(result, ReservationClient) or isinstance(result, AuthorityReservation):
-                for poa in poa_list:
-                    poa.restore(actor=self.actor, reservation=result)
-                    result.poas[poa.get_poa_id()] = poa
+            self.flush()
+        finally:
+            write_behind = self.write_behind
+            if write_behind is not None:
+                write_behind.stop()
+                self.write_behind = None
+                # Write the updates submitted while the writer was stopping
+                write_behind.flush()
+
+    @contextmanager
+    def batch_updates(self):
+        records = getattr(self.batch_state, 'records', None)
+        if records is not None:
+            # Nested batch; the updates are written when the outermost batch completes
+            yield self.batch_state.failed
+            return
 
-            return result
+        failed = {}
+        self.batch_state.records = {}
+        self.batch_state.failed = failed
+        try:
+            yield failed
+        finally:
+            records = self.batch_state.records
+            self.batch_state.records = None
+            self.batch_state.failed = None
+            if len(records):
+                self.logger.debug(f"Writing {len(records)} batched reservation updates")
+                failed.update(self._write_records(records=list(records.values())))
+
+    def _write_records(self, *, records: List[dict]) -> Dict[str, Exception]:
+        """
+        Write the reservation records in a single transaction; if the transaction fails, the records are
+        written one at a time so that only the failing records are lost
+        @param records records
+        @return dictionary of reservation id to exception for the records which could not be written
+        """
+        failed = {}
+        if self.write_behind is not None:
+            for record in records:
+                self.write_behind.submit(rid=record.get('rsv_resid'), record=record)
+            return failed
+
+        try:
+            self.db.update_reservations(records=records)
         except Exception as e:
-            self.logger.error(e)
+            self.logger.error(f"Failed to write {len(records)} reservation updates in a single transaction, "
+                              f"writing them one at a time: {e}")
+            for record in records:
+                try:
+                    self.db.update_reservation(**record)
+                except Exception as e:
+                    self.logger.error(f"Failed to update reservation {record.get('rsv_resid')}: {e}")
+                    failed[record.get('rsv_resid')] = e
+        return failed
+
+    def _update_occupancy_cache(self, *, reservation: ABCReservationMixin, rsv_type: str, components: list,
+                                links: list):
+        if self.occupancy_cache is None:
+            return
+        try:
+            self.occupancy_cache.update(reservation=reservation, rsv_type=rsv_type, components=components,
+                                        links=links)
+        except Exception as e:
+            self.logger.error(f"Failed to update occupancy cache for {reservation.get_reservation_id()}, "
+                              f"invalidating it: {e}")
+            self.occupancy_cache.invalidate()
+
+    def get_occupancy_cache(self) -> OccupancyCache or None:
+        if self.occupancy_cache is None:
+            return None
+        if not self.occupancy_cache.is_ready():
+            with self.occupancy_load_lock:
+                if not self.occupancy_cache.is_ready():
+                    self._load_occupancy_cache()
+        return self.occupancy_cache if self.occupancy_cache.is_ready() else None
+
+    def _load_occupancy_cache(self):
+        try:
+            self.occupancy_cache.begin_load()
+            self.flush()
+            res_dict_list = self.db.get_reservations(states=OccupancyCache.STATES)
+            reservations = self._load_reservations_from_db(res_dict_list=res_dict_list)
+            for r in reservations:
+                fields = self._get_reservation_fields(reservation=r)
+                self.occupancy_cache.load(reservation=r, rsv_type=fields.get('rsv_type'),
+                                          components=fields.get('components'), links=fields.get('links'))
+            self.occupancy_cache.end_load()
+            self.logger.info(f"Occupancy cache loaded with {len(reservations)} reservations")
+        except Exception as e:
+            self.logger.error(f"Failed to load occupancy cache, falling back to database: {e}")
             self.logger.error(traceback.format_exc())
-        return None
+            self.occupancy_cache.invalidate()
 
-    def _load_reservations_from_db(self, *, res_dict_list: List[dict]) -> List[ABCReservationMixin]:
+    def _get_slices_by_ids(self, *, slc_ids: Set[int]) -> Dict[int, ABCSlice]:
+        """
+        Load and unpickle the slices with the given ids in a single query
+        @param slc_ids set of slice ids
+        @return dictionary of slice id to slice object
+        """
+        result = {}
+        if len(slc_ids) == 0:
+            return result
+        for s in self.db.get_slices_by_ids(slc_ids=list(slc_ids)):
+            pickled_slice = s.get(Constants.PROPERTY_PICKLE_PROPERTIES)
+            result[s.get('slc_id')] = pickle.loads(pickled_slice)
+        return result
+
+    def _load_reservations_from_db(self, *, res_dict_list: List[dict], slice_cache: Dict[int, ABCSlice] = None,
+                                   reservation_cache: Dict[str, ABCReservationMixin] = None) \
+            -> List[ABCReservationMixin]:
+        """
+        Hydrate reservations from the database rows. Slices, redeem/join predecessors and in progress POAs for all
+        the rows are loaded with a constant number of queries, and reservations belonging to the same slice share
+        the slice object.
+        @param res_dict_list reservation rows
+        @param slice_cache slices already loaded, keyed by slice id
+        @param reservation_cache reservations already loaded, keyed by reservation id
+        @return list of reservations
+        """
         result = []
         if res_dict_list is None:
             return result
 
+        if slice_cache is None:
+            slice_cache = {}
+        if reservation_cache is None:
+            reservation_cache = {}
+
+        try:
+            slc_ids = {r.get(Constants.RSV_SLC_ID) for r in res_dict_list} - set(slice_cache.keys())
+            slice_cache.update(self._get_slices_by_ids(slc_ids=slc_ids))
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+
         for r in res_dict_list:
-            pickled_res = r.get(Constants.PROPERTY_PICKLE_PROPERTIES)
-            slc_id = r.get(Constants.RSV_SLC_ID)
-            res_obj = self._load_reservation_from_pickled_object(pickled_res=pickled_res, slc_id=slc_id)
-            result.append(res_obj)
+            try:
+                pickled_res = r.get(Constants.PROPERTY_PICKLE_PROPERTIES)
+                res_obj = pickle.loads(pickled_res)
+                res_obj.restore(actor=self.actor, slice_obj=slice_cache.get(r.get(Constants.RSV_SLC_ID)))
+                reservation_cache[str(res_obj.get_reservation_id())] = res_obj
+                result.append(res_obj)
+            except Exception as e:
+                self.logger.error(e)
+                self.logger.error(traceback.format_exc())
+                result.append(None)
+
+        loaded = [x for x in result if x is not None]
+        try:
+            self._load_predecessors(reservations=loaded, slice_cache=slice_cache,
+                                    reservation_cache=reservation_cache)
+            self._load_in_progress_poas(reservations=loaded)
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
         return result
 
+    def _load_predecessors(self, *, reservations: List[ABCReservationMixin], slice_cache: Dict[int, ABCSlice],
+                           reservation_cache: Dict[str, ABCReservationMixin]):
+        """
+        Link redeem/join predecessors for controller reservations; predecessors not already loaded are
+        fetched together in one query
+        @param reservations reservations
+        @param slice_cache slices already loaded, keyed by slice id
+        @param reservation_cache reservations already loaded, keyed by reservation id
+        """
+        predecessors = []
+        for r in reservations:
+            if isinstance(r, ABCControllerReservation):
+                if r.get_redeem_predecessors() is not None:
+                    predecessors.extend(r.get_redeem_predecessors())
+                if r.get_join_predecessors() is not None:
+                    predecessors.extend(r.get_join_predecessors())
+
+        predecessors = [p for p in predecessors if p.reservation_id is not None]
+        if len(predecessors) == 0:
+            return
+
+        missing = {str(p.reservation_id) for p in predecessors} - set(reservation_cache.keys())
+        if len(missing) > 0:
+            res_dict_list = self.db.get_reservations_by_rids(rsv_resid_list=list(missing))
+            self._load_reservations_from_db(res_dict_list=res_dict_list, slice_cache=slice_cache,
+                                            reservation_cache=reservation_cache)
+
+        for p in predecessors:
+            parent = reservation_cache.get(str(p.reservation_id))
+            if parent is not None:
+                p.set_reservation(reservation=parent)
+
+    def _load_in_progress_poas(self, *, reservations: List[ABCReservationMixin]):
+        """
+        Load in progress POAs for all the reservations in one query
+        @param reservations reservations
+        """
+        from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
+        from fabric_cf.actor.core.kernel.authority_reservation import AuthorityReservation
+        res_map = {}
+        for r in reservations:
+            if isinstance(r, ReservationClient) or isinstance(r, AuthorityReservation):
+                res_map[str(r.get_reservation_id())] = r
+
+        if len(res_map) == 0:
+            return
+
+        poa_dict_list = self.db.get_poas(sliver_ids=list(res_map.keys()),
+                                         states=[PoaStates.Nascent.value, PoaStates.Performing.value,
+                                                 PoaStates.AwaitingCompletion.value,
+                                                 PoaStates.SentToAuthority.value])
+        for poa in self._load_poa_from_db(poa_dict_list=poa_dict_list, include_res_info=False):
+            reservation = res_map.get(str(poa.get_sliver_id()))
+            if reservation is not None:
+                poa.restore(actor=self.actor, reservation=reservation)
+                reservation.poas[poa.get_poa_id()] = poa
+
     def get_client_reservations(self, *, slice_id: ID = None) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             sid = str(slice_id) if slice_id is not None else None
             res_dict_list = self.db.get_reservations(slice_id=sid,
@@ -564,6 +760,7 @@ class ActorDatabase(ABCDatabase):
     def get_holdings(self, *, slice_id: ID = None) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             sid = str(slice_id) if slice_id is not None else None
             res_dict_list = self.db.get_reservations(slice_id=sid, category=[ReservationCategory.Client.value])
@@ -580,6 +777,7 @@ class ActorDatabase(ABCDatabase):
     def get_broker_reservations(self) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             res_dict_list = self.db.get_reservations(category=[ReservationCategory.Broker.value])
             if self.lock.locked():
@@ -595,6 +793,7 @@ class ActorDatabase(ABCDatabase):
     def get_authority_reservations(self) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             result = []
             res_dict_list = self.db.get_reservations(category=[ReservationCategory.Authority.value])
@@ -612,6 +811,7 @@ class ActorDatabase(ABCDatabase):
                        bdf: str = None, start: datetime = None, end: datetime = None,
                        excludes: List[str] = None) -> Dict[str, List[str]]:
         try:
+            self.flush()
             return self.db.get_components(node_id=node_id, states=states, component=component, bdf=bdf,
                                           rsv_type=rsv_type, start=start, end=end, excludes=excludes)
         except Exception as e:
@@ -623,6 +823,7 @@ class ActorDatabase(ABCDatabase):
     def get_links(self, *, node_id: str, states: list[int], rsv_type: list[str], start: datetime = None,
                   end: datetime = None, excludes: List[str] = None) -> Dict[str, int]:
         try:
+            self.flush()
             return self.db.get_links(node_id=node_id, states=states, rsv_type=rsv_type, start=start,
                                      end=end, excludes=excludes)
         except Exception as e:
@@ -634,6 +835,7 @@ class ActorDatabase(ABCDatabase):
     def get_link_allocations(self, *, states: list[int], rsv_type: list[str],
                              start: datetime = None, end: datetime = None) -> list[dict]:
         try:
+            self.flush()
             return self.db.get_link_allocations(states=states, rsv_type=rsv_type, start=start, end=end)
         except Exception as e:
             self.logger.error(e)
@@ -645,6 +847,7 @@ class ActorDatabase(ABCDatabase):
     def get_component_allocations(self, *, states: list[int],
                                   start: datetime = None, end: datetime = None) -> list[dict]:
         try:
+            self.flush()
             return self.db.get_component_allocations(states=states, start=start, end=end)
         except Exception as e:
             self.logger.error(e)
@@ -656,15 +859,19 @@ class ActorDatabase(ABCDatabase):
     def get_reservations(self, *, slice_id: ID = None, graph_node_id: str = None, project_id: str = None,
                          email: str = None, oidc_sub: str = None, rid: ID = None, states: list[int] = None,
                          site: str = None, rsv_type: list[str] = None, start: datetime = None,
-                         end: datetime = None, ip_subnet: str = None, host: str = None) -> List[ABCReservationMixin]:
+                         end: datetime = None, ip_subnet: str = None, host: str = None, after: ID = None,
+                         limit: int = None) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             sid = str(slice_id) if slice_id is not None else None
             res_id = str(rid) if rid is not None else None
+            after_id = str(after) if after is not None else None
             res_dict_list = self.db.get_reservations(slice_id=sid, graph_node_id=graph_node_id, host=host, ip_subnet=ip_subnet,
                                                      project_id=project_id, email=email, oidc_sub=oidc_sub, rid=res_id,
-                                                     states=states, site=site, rsv_type=rsv_type, start=start, end=end)
+                                                     states=states, site=site, rsv_type=rsv_type, start=start, end=end,
+                                                     after=after_id, limit=limit)
             if self.lock.locked():
                self.lock.release()
             result = self._load_reservations_from_db(res_dict_list=res_dict_list)
@@ -675,9 +882,74 @@ class ActorDatabase(ABCDatabase):
                 self.lock.release()
         return result
 
+    def get_reservation_summaries(self, *, slice_id: ID = None, graph_node_id: str = None, project_id: str = None,
+                                  email: str = None, oidc_sub: str = None, rid: ID = None, states: list[int] = None,
+                                  category: list[int] = None, site: str = None, rsv_type: list[str] = None,
+                                  start: datetime = None, end: datetime = None, ip_subnet: str = None,
+                                  host: str = None, after: ID = None, limit: int = None,
+                                  rid_list: List[str] = None) -> List[dict]:
+        result = []
+        try:
+            self.flush()
+            sid = str(slice_id) if slice_id is not None else None
+            res_id = str(rid) if rid is not None else None
+            after_id = str(after) if after is not None else None
+            res_dict_list = self.db.get_reservation_summaries(slice_id=sid, graph_node_id=graph_node_id, host=host,
+                                                              ip_subnet=ip_subnet, project_id=project_id, email=email,
+                                                              oidc_sub=oidc_sub, rid=res_id, states=states,
+                                                              category=category, site=site, rsv_type=rsv_type,
+                                                              start=start, end=end, after=after_id, limit=limit,
+                                                              rid_list=rid_list)
+            # Rows written without a summary (or with an older summary version) are
+            # summarized from the pickled reservation
+            stale = [r.get('rsv_resid') for r in res_dict_list
+                     if not ReservationSummary.is_current(summary=r.get('summary'))]
+            rebuilt = {}
+            if len(stale) > 0:
+                for reservation in self.get_reservations_by_rids(rid=stale):
+                    if reservation is not None:
+                        rebuilt[str(reservation.get_reservation_id())] = \
+                            self._build_reservation_summary(reservation=reservation)
+
+            # Preserve the order of the rows; keyset pagination relies on it
+            for r in res_dict_list:
+                summary = r.get('summary')
+                if not ReservationSummary.is_current(summary=summary):
+                    summary = rebuilt.get(r.get('rsv_resid'))
+                if summary is not None:
+                    result.append(summary)
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        finally:
+            if self.lock.locked():
+                self.lock.release()
+        return result
+
+    @staticmethod
+    def _build_reservation_summary(*, reservation: ABCReservationMixin) -> dict:
+        from fabric_cf.actor.core.kernel.reservation_client import ReservationClient
+        sliver = None
+        if isinstance(reservation, ReservationClient) and reservation.get_leased_resources() and \
+                reservation.get_leased_resources().get_sliver():
+            sliver = reservation.get_leased_resources().get_sliver()
+        if not sliver and reservation.get_resources() and reservation.get_resources().get_sliver():
+            sliver = reservation.get_resources().get_sliver()
+
+        site = None
+        host = None
+        if sliver is not None:
+            site = sliver.get_site()
+            if sliver.get_labels() and sliver.get_labels().instance_parent:
+                host = sliver.get_labels().instance_parent
+            if sliver.get_label_allocations() and sliver.get_label_allocations().instance_parent:
+                host = sliver.get_label_allocations().instance_parent
+        return ReservationSummary.build(reservation=reservation, sliver=sliver, site=site, host=host)
+
     def get_reservations_by_rids(self, *, rid: List[str]) -> List[ABCReservationMixin]:
         result = []
         try:
+            self.flush()
             #self.lock.acquire()
             res_dict_list = self.db.get_reservations_by_rids(rsv_resid_list=rid)
             if self.lock.locked():
@@ -786,21 +1058,16 @@ class ActorDatabase(ABCDatabase):
             if self.lock.locked():
                 self.lock.release()
 
-    def _load_delegation_from_pickled_instance(self, pickled_del: bytes, slc_id: int) -> ABCDelegation:
-        slice_obj = self.get_slice_by_id(slc_id=slc_id)
-        delegation = pickle.loads(pickled_del)
-        delegation.restore(actor=self.actor, slice_obj=slice_obj)
-        return delegation
-
     def _load_delegation_from_db(self, dlg_dict_list: List[dict]) -> List[ABCDelegation]:
         result = []
         if dlg_dict_list is None:
             return result
 
+        slice_cache = self._get_slices_by_ids(slc_ids={d.get(Constants.DLG_SLC_ID) for d in dlg_dict_list})
         for d in dlg_dict_list:
             pickled_del = d.get(Constants.PROPERTY_PICKLE_PROPERTIES)
-            slc_id = d.get(Constants.DLG_SLC_ID)
-            dlg_obj = self._load_delegation_from_pickled_instance(pickled_del=pickled_del, slc_id=slc_id)
+            dlg_obj = pickle.loads(pickled_del)
+            dlg_obj.restore(actor=self.actor, slice_obj=slice_cache.get(d.get(Constants.DLG_SLC_ID)))
             result.append(dlg_obj)
 
         return result
@@ -873,6 +1140,7 @@ class ActorDatabase(ABCDatabase):
             #self.lock.acquire()
             properties = pickle.dumps(site)
             self.db.add_site(site_name=site.get_name(), state=site.get_state().value, properties=properties)
+            self.maintenance_registry.site_updated(site=pickle.loads(properties))
             self.logger.debug(f"Site {site.get_name()} added")
         finally:
             if self.lock.locked():
@@ -884,6 +1152,7 @@ class ActorDatabase(ABCDatabase):
             self.logger.debug(f"Updating site {site.get_name()}")
             properties = pickle.dumps(site)
             self.db.update_site(site_name=site.get_name(), state=site.get_state().value, properties=properties)
+            self.maintenance_registry.site_updated(site=pickle.loads(properties))
         finally:
             if self.lock.locked():
                 self.lock.release()
@@ -893,6 +1162,7 @@ class ActorDatabase(ABCDatabase):
             #self.lock.acquire()
             self.logger.debug(f"Removing site {site_name}")
             self.db.remove_site(site_name=site_name)
+            self.maintenance_registry.site_removed(site_name=site_name)
         finally:
             if self.lock.locked():
                 self.lock.release()
@@ -925,6 +1195,17 @@ class ActorDatabase(ABCDatabase):
                 self.lock.release()
         return None
 
+    def _load_sites(self) -> List[Site]:
+        """
+        Load all the sites for the maintenance registry; unlike get_sites, failures are raised
+        """
+        return self._load_site_from_db(site_list=self.db.get_sites())
+
+    def get_maintenance_registry(self) -> MaintenanceRegistry or None:
+        if self.maintenance_registry.load():
+            return self.maintenance_registry
+        return None
+
     def get_sites(self) -> List[Site]:
         result = []
         try:
@@ -980,12 +1261,17 @@ class ActorDatabase(ABCDatabase):
         for p in poa_dict_list:
             pickled_poa = p.get(Constants.PROPERTY_PICKLE_PROPERTIES)
             poa_obj = pickle.loads(pickled_poa)
-            sliver_id = poa_obj.get_sliver_id()
-            if include_res_info:
-                reservations = self.get_reservations(rid=sliver_id)
-                if reservations is not None:
-                    poa_obj.restore(actor=self.actor, reservation=reservations[0])
             result.append(poa_obj)
+
+        if include_res_info and len(result) > 0:
+            # Load the reservations for all POAs in one go
+            sliver_ids = list({str(poa_obj.get_sliver_id()) for poa_obj in result})
+            reservations = self.get_reservations_by_rids(rid=sliver_ids)
+            res_map = {str(r.get_reservation_id()): r for r in reservations if r is not None}
+            for poa_obj in result:
+                reservation = res_map.get(str(poa_obj.get_sliver_id()))
+                if reservation is not None:
+                    poa_obj.restore(actor=self.actor, reservation=reservation)
         return result
 
     def get_poas(self, *, poa_id: str = None, email: str = None, sliver_id: ID = None, slice_id: ID = None,
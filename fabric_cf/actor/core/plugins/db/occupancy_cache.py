@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import copy
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from fim.slivers.capacities_labels import Capacities
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+
+if TYPE_CHECKING:
+    from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+
+
+class OccupancyEntry:
+    """
+    Occupancy contributed by a single reservation, captured when the reservation is written to the database
+    """
+    def __init__(self, *, rid: str, graph_node_id: Optional[str], rsv_type: Optional[str],
+                 lease_start: Optional[datetime], lease_end: Optional[datetime],
+                 capacities: Optional[Capacities], component_capacities: List[Tuple[str, str, Capacities]],
+                 components: List[Tuple[str, str, str]], links: List[Tuple[str, int]]):
+        self.rid = rid
+        self.graph_node_id = graph_node_id
+        self.rsv_type = rsv_type
+        self.lease_start = lease_start
+        self.lease_end = lease_end
+        self.capacities = capacities
+        self.component_capacities = component_capacities
+        self.components = components
+        self.links = links
+        self.sequence = 0
+
+    def get_node_ids(self) -> set:
+        result = set()
+        if self.graph_node_id is not None:
+            result.add(self.graph_node_id)
+        for node_id, comp_id, bdf in self.components:
+            result.add(node_id)
+        for node_id, bw in self.links:
+            result.add(node_id)
+        return result
+
+    def get_buckets(self) -> Tuple[int, int] or None:
+        """
+        Return the range [first, last] of time buckets overlapped by the lease, or None if the lease is not known
+        """
+        if self.lease_start is None or self.lease_end is None:
+            return None
+        first = OccupancyCache.bucket(when=min(self.lease_start, self.lease_end))
+        last = OccupancyCache.bucket(when=max(self.lease_start, self.lease_end))
+        return first, last
+
+    def matches(self, *, start: datetime = None, end: datetime = None) -> bool:
+        """
+        Apply the lease filter used by the database queries; reservations without lease times never
+        match a time filter
+        """
+        if start is None and end is None:
+            return True
+        if start is not None and end is not None:
+            if self.lease_start is None or self.lease_end is None:
+                return False
+            return (start <= self.lease_end <= end) or (start <= self.lease_start <= end) or \
+                (self.lease_start <= start and self.lease_end >= end)
+        if self.lease_end is None:
+            return False
+        if start is not None:
+            return start <= self.lease_end
+        return self.lease_end <= end
+
+
+class OccupancyCache:
+    """
+    In-memory mirror of the occupancy of the Active/Ticketed/Nascent reservations persisted in the database.
+
+    Entries are maintained from the same reservation writes (allocations, updates and releases) that update
+    the database, so for the same state the queries return the same results as the database queries used to
+    build the Broker Query Model, without a query and unpickling per graph node. Entries are indexed by graph
+    node and by BUCKET_SECONDS wide time buckets, so that windowed queries only visit the reservations
+    whose lease overlaps the window.
+
+    The cache is consulted only once it is marked ready i.e. after it has been loaded from the database; any
+    failure to apply an update invalidates it and callers fall back to the database until it is reloaded.
+    """
+    BUCKET_SECONDS = 86400
+
+    STATES = [ReservationStates.Active.value,
+              ReservationStates.ActiveTicketed.value,
+              ReservationStates.Ticketed.value,
+              ReservationStates.Nascent.value]
+
+    def __init__(self, *, logger=None):
+        self.logger = logger
+        # reservation id => entry
+        self.entries = {}
+        # graph node id => ordered set of reservation ids
+        self.by_node = {}
+        # (graph node id, bucket) => set of reservation ids
+        self.buckets = {}
+        self.sequence = 0
+        self.ready = False
+        self.loading = False
+        # reservation ids updated while loading; these must not be overwritten by the load
+        self.touched = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def to_utc(*, when: Optional[datetime]) -> Optional[datetime]:
+        if when is None:
+            return None
+        if isinstance(when, str):
+            when = datetime.fromisoformat(when)
+        if when.tzinfo is None:
+            return when.replace(tzinfo=timezone.utc)
+        return when
+
+    @staticmethod
+    def bucket(*, when: datetime) -> int:
+        return math.floor(when.timestamp() / OccupancyCache.BUCKET_SECONDS)
+
+    @staticmethod
+    def get_allocated_capacities(*, reservation: ABCReservationMixin) -> \
+            Tuple[Optional[Capacities], List[Tuple[str, str, Capacities]]]:
+        """
+        Return the capacities and the component capacities allocated to a reservation
+        @param reservation reservation
+        @return tuple of capacities and a list of (resource type, resource model, capacities) for the components;
+                capacities is None if the reservation has no allocated sliver
+        """
+        allocated_sliver = None
+        if reservation.is_ticketing() and reservation.get_approved_resources() is not None:
+            allocated_sliver = reservation.get_approved_resources().get_sliver()
+
+        if (reservation.is_active() or reservation.is_ticketed()) and reservation.get_resources() is not None:
+            allocated_sliver = reservation.get_resources().get_sliver()
+
+        if allocated_sliver is None:
+            return None, []
+
+        component_capacities = []
+        if allocated_sliver.attached_components_info is not None:
+            for allocated_component in allocated_sliver.attached_components_info.devices.values():
+                # Ignore components without any allocations
+                if not allocated_component.capacity_allocations:
+                    continue
+                component_capacities.append((allocated_component.resource_type,
+                                             allocated_component.resource_model,
+                                             allocated_component.capacity_allocations))
+        return allocated_sliver.get_capacity_allocations(), component_capacities
+
+    @staticmethod
+    def build_entry(*, reservation: ABCReservationMixin, rsv_type: Optional[str],
+                    components: Optional[List[tuple]], links: List[dict]) -> OccupancyEntry:
+        """
+        Build the entry for a reservation from the fields written to the database
+        @param reservation reservation
+        @param rsv_type reservation type saved in the database
+        @param components list of (node id, component id, bdf) saved in the database
+        @param links list of links (node id and bandwidth) saved in the database
+        @return entry
+        """
+        capacities = None
+        component_capacities = []
+        if reservation.get_graph_node_id() is not None:
+            capacities, component_capacities = OccupancyCache.get_allocated_capacities(reservation=reservation)
+            # Decouple from the reservation so later in-memory changes only show up once written
+            capacities = copy.deepcopy(capacities)
+            component_capacities = copy.deepcopy(component_capacities)
+
+        term = reservation.get_term()
+        return OccupancyEntry(rid=str(reservation.get_reservation_id()),
+                              graph_node_id=reservation.get_graph_node_id(),
+                              rsv_type=rsv_type,
+                              lease_start=OccupancyCache.to_utc(when=term.get_start_time() if term else None),
+                              lease_end=OccupancyCache.to_utc(when=term.get_end_time() if term else None),
+                              capacities=capacities,
+                              component_capacities=component_capacities,
+                              components=list(components) if components else [],
+                              links=[(link.get("node_id"), link.get("bw")) for link in links] if links else [])
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    def begin_load(self):
+        """
+        Start loading the cache from the database; updates received while loading take precedence
+        """
+        with self.lock:
+            self.__clear()
+            self.loading = True
+
+    def end_load(self):
+        with self.lock:
+            self.loading = False
+            self.touched.clear()
+            self.ready = True
+
+    def invalidate(self):
+        """
+        Drop all the entries; the cache is not consulted until it is loaded again
+        """
+        with self.lock:
+            self.__clear()
+
+    def __clear(self):
+        self.entries.clear()
+        self.by_node.clear()
+        self.buckets.clear()
+        self.touched.clear()
+        self.loading = False
+        self.ready = False
+
+    def __remove(self, *, rid: str):
+        entry = self.entries.pop(rid, None)
+        if entry is None:
+            return
+        buckets = entry.get_buckets()
+        for node_id in entry.get_node_ids():
+            node_entries = self.by_node.get(node_id)
+            if node_entries is not None:
+                node_entries.pop(rid, None)
+                if len(node_entries) == 0:
+                    self.by_node.pop(node_id)
+            if buckets is None:
+                continue
+            for b in range(buckets[0], buckets[1] + 1):
+                bucket_entries = self.buckets.get((node_id, b))
+                if bucket_entries is not None:
+                    bucket_entries.discard(rid)
+                    if len(bucket_entries) == 0:
+                        self.buckets.pop((node_id, b))
+
+    def __add(self, *, entry: OccupancyEntry):
+        # An updated entry moves to the end, keeping the sequence consistent with the insertion order per node
+        self.__remove(rid=entry.rid)
+        self.sequence += 1
+        entry.sequence = self.sequence
+        self.entries[entry.rid] = entry
+        buckets = entry.get_buckets()
+        for node_id in entry.get_node_ids():
+            if node_id not in self.by_node:
+                self.by_node[node_id] = OrderedDict()
+            self.by_node[node_id][entry.rid] = None
+            if buckets is None:
+                continue
+            for b in range(buckets[0], buckets[1] + 1):
+                if (node_id, b) not in self.buckets:
+                    self.buckets[(node_id, b)] = set()
+                self.buckets[(node_id, b)].add(entry.rid)
+
+    def update(self, *, reservation: ABCReservationMixin, rsv_type: Optional[str],
+               components: Optional[List[tuple]], links: List[dict]):
+        """
+        Apply a reservation write; reservations no longer in one of the tracked states are dropped
+        @param reservation reservation
+        @param rsv_type reservation type saved in the database
+        @param components list of (node id, component id, bdf) saved in the database
+        @param links list of links (node id and bandwidth) saved in the database
+        """
+        rid = str(reservation.get_reservation_id())
+        entry = None
+        if reservation.get_state().value in self.STATES:
+            entry = self.build_entry(reservation=reservation, rsv_type=rsv_type, components=components, links=links)
+        with self.lock:
+            if self.loading:
+                self.touched.add(rid)
+            if entry is None:
+                self.__remove(rid=rid)
+            else:
+                self.__add(entry=entry)
+
+    def load(self, *, reservation: ABCReservationMixin, rsv_type: Optional[str],
+             components: Optional[List[tuple]], links: List[dict]):
+        """
+        Add a reservation read from the database while loading, unless it has been updated since the load started
+        """
+        entry = self.build_entry(reservation=reservation, rsv_type=rsv_type, components=components, links=links)
+        with self.lock:
+            if entry.rid in self.touched:
+                return
+            self.__add(entry=entry)
+
+    def remove(self, *, rid):
+        """
+        Remove a reservation deleted from the database
+        @param rid reservation id
+        """
+        with self.lock:
+            if self.loading:
+                self.touched.add(str(rid))
+            self.__remove(rid=str(rid))
+
+    def __find(self, *, node_id: str, start: datetime = None, end: datetime = None) -> List[OccupancyEntry]:
+        """
+        Return the entries referencing a graph node which match the time filter, ordered by insertion
+        """
+        start = self.to_utc(when=start)
+        end = self.to_utc(when=end)
+        with self.lock:
+            node_entries = self.by_node.get(node_id)
+            if node_entries is None:
+                return []
+            candidates = None
+            if start is not None and end is not None and start <= end:
+                first = self.bucket(when=start)
+                last = self.bucket(when=end)
+                # Visit the buckets only if cheaper than scanning all the entries on the node
+                if last - first + 1 < len(node_entries):
+                    candidates = set()
+                    for b in range(first, last + 1):
+                        candidates.update(self.buckets.get((node_id, b), ()))
+            if candidates is None:
+                entries = [self.entries[rid] for rid in node_entries]
+            else:
+                entries = sorted((self.entries[rid] for rid in candidates), key=lambda x: x.sequence)
+        return [e for e in entries if e.matches(start=start, end=end)]
+
+    def get_node_capacities(self, *, node_id: str, start: datetime = None,
+                            end: datetime = None) -> Tuple[Capacities, Dict[str, Dict[str, Capacities]]]:
+        """
+        Return the capacities and the component capacities (organized by type and model) occupied on a graph node
+        @param node_id graph node id
+        @param start start time
+        @param end end time
+        @return tuple of occupied capacities and component capacities
+        """
+        occupied_capacities = Capacities()
+        occupied_component_capacities = defaultdict(dict)
+        for entry in self.__find(node_id=node_id, start=start, end=end):
+            if entry.graph_node_id != node_id or entry.capacities is None:
+                continue
+            occupied_capacities = occupied_capacities + entry.capacities
+            for rt, rm, capacities in entry.component_capacities:
+                if occupied_component_capacities[rt].get(rm) is None:
+                    occupied_component_capacities[rt][rm] = Capacities()
+                occupied_component_capacities[rt][rm] = occupied_component_capacities[rt][rm] + capacities
+        return occupied_capacities, occupied_component_capacities
+
+    def get_components(self, *, node_id: str, rsv_type: List[str], component: str = None, start: datetime = None,
+                       end: datetime = None) -> Dict[str, List[str]]:
+        """
+        Return the components on a graph node in use by reservations of the given types
+        @param node_id graph node id
+        @param rsv_type reservation types
+        @param component component name
+        @param start start time
+        @param end end time
+        @return Dictionary with component name as the key and value as list of associated PCI addresses in use.
+        """
+        result = {}
+        for entry in self.__find(node_id=node_id, start=start, end=end):
+            if entry.rsv_type not in rsv_type:
+                continue
+            for comp_node_id, comp_id, bdf in entry.components:
+                if comp_node_id != node_id or (component is not None and comp_id != component):
+                    continue
+                if comp_id not in result:
+                    result[comp_id] = []
+                if bdf not in result[comp_id]:
+                    result[comp_id].append(bdf)
+        return result
+
+    def get_links(self, *, node_id: str, rsv_type: List[str], start: datetime = None,
+                  end: datetime = None) -> Dict[str, int]:
+        """
+        Return the bandwidth in use on a link by reservations of the given types
+        @param node_id link node id
+        @param rsv_type reservation types
+        @param start start time
+        @param end end time
+        @return Dictionary with link node id as the key and the bandwidth in use as the value
+        """
+        result = {}
+        for entry in self.__find(node_id=node_id, start=start, end=end):
+            if entry.rsv_type not in rsv_type:
+                continue
+            for link_node_id, bw in entry.links:
+                if link_node_id != node_id:
+                    continue
+                if link_node_id not in result:
+                    result[link_node_id] = 0
+                result[link_node_id] += bw
+        return result
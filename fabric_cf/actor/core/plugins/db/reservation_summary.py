@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fim.slivers.base_sliver import BaseSliver
+    from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+
+
+class ReservationSummary:
+    """
+    Versioned compact serialization of the hot fields of a reservation. The summary is saved alongside the
+    pickled reservation so that readers which only need state, term, placement or capacity information
+    do not have to unpickle the whole reservation.
+    """
+    VERSION = 2
+
+    VERSION_KEY = "version"
+    RESERVATION_ID = "reservation_id"
+    SLICE_ID = "slice_id"
+    CATEGORY = "category"
+    STATE = "state"
+    PENDING_STATE = "pending_state"
+    JOIN_STATE = "join_state"
+    LEASE_START = "lease_start"
+    LEASE_END = "lease_end"
+    NEW_START = "new_start"
+    GRAPH_NODE_ID = "graph_node_id"
+    SLIVER_TYPE = "sliver_type"
+    SLIVER_NAME = "sliver_name"
+    SITE = "site"
+    HOST = "host"
+    MANAGEMENT_IP = "management_ip"
+    CAPACITIES = "capacities"
+    CAPACITY_ALLOCATIONS = "capacity_allocations"
+    LABELS = "labels"
+    LABEL_ALLOCATIONS = "label_allocations"
+    NOTICES = "notices"
+    CLOSED_AT = "closed_at"
+
+    @staticmethod
+    def _time_to_str(value: datetime) -> str or None:
+        return value.isoformat() if value is not None else None
+
+    @staticmethod
+    def str_to_time(value: str) -> datetime or None:
+        """
+        Convert a time string stored in the summary back to datetime
+        @param value time string
+        @return datetime or None
+        """
+        return datetime.fromisoformat(value) if value is not None else None
+
+    @staticmethod
+    def _to_dict(obj) -> dict or None:
+        return obj.to_dict() if obj is not None else None
+
+    @staticmethod
+    def build(*, reservation: ABCReservationMixin, sliver: BaseSliver = None, site: str = None,
+              host: str = None) -> dict:
+        """
+        Build the summary for a reservation
+        @param reservation reservation
+        @param sliver sliver associated with the reservation (leased sliver if available, else requested sliver)
+        @param site site
+        @param host host
+        @return summary dictionary
+        """
+        term = reservation.get_term()
+        result = {
+            ReservationSummary.VERSION_KEY: ReservationSummary.VERSION,
+            ReservationSummary.RESERVATION_ID: str(reservation.get_reservation_id()),
+            ReservationSummary.SLICE_ID: str(reservation.get_slice_id()),
+            ReservationSummary.CATEGORY: reservation.get_category().value,
+            ReservationSummary.STATE: reservation.get_state().value,
+            ReservationSummary.PENDING_STATE: reservation.get_pending_state().value,
+            ReservationSummary.JOIN_STATE: reservation.get_join_state().value,
+            ReservationSummary.LEASE_START: ReservationSummary._time_to_str(term.get_start_time()) if term else None,
+            ReservationSummary.LEASE_END: ReservationSummary._time_to_str(term.get_end_time()) if term else None,
+            ReservationSummary.NEW_START: ReservationSummary._time_to_str(term.get_new_start_time()) if term else None,
+            ReservationSummary.GRAPH_NODE_ID: reservation.get_graph_node_id(),
+            ReservationSummary.SITE: site,
+            ReservationSummary.HOST: host,
+            ReservationSummary.NOTICES: reservation.get_notices(),
+            ReservationSummary.CLOSED_AT: ReservationSummary._time_to_str(getattr(reservation, 'closed_at', None))
+        }
+
+        if sliver is not None:
+            result[ReservationSummary.SLIVER_TYPE] = sliver.get_type().name if sliver.get_type() else None
+            result[ReservationSummary.SLIVER_NAME] = sliver.get_name()
+            result[ReservationSummary.CAPACITIES] = ReservationSummary._to_dict(sliver.get_capacities())
+            result[ReservationSummary.CAPACITY_ALLOCATIONS] = \
+                ReservationSummary._to_dict(sliver.get_capacity_allocations())
+            result[ReservationSummary.LABELS] = ReservationSummary._to_dict(sliver.get_labels())
+            result[ReservationSummary.LABEL_ALLOCATIONS] = ReservationSummary._to_dict(sliver.get_label_allocations())
+            management_ip = getattr(sliver, 'management_ip', None)
+            result[ReservationSummary.MANAGEMENT_IP] = str(management_ip) if management_ip is not None else None
+
+        return result
+
+    @staticmethod
+    def is_current(*, summary: dict) -> bool:
+        """
+        Check if summary can be used as is or must be rebuilt from the pickled reservation
+        @param summary summary
+        @return True if summary exists and matches the current version
+        """
+        return summary is not None and summary.get(ReservationSummary.VERSION_KEY) == ReservationSummary.VERSION
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import traceback
+from collections import OrderedDict
+from typing import List, Dict
+
+from fabric_cf.actor.db.psql_database import PsqlDatabase
+
+
+class ReservationWriteBehind:
+    """
+    Write-behind buffer for reservation updates.
+
+    An update submitted for a reservation replaces any update for the same reservation which has not
+    been written yet. A background thread writes the pending updates, once they have been buffered for
+    the configured window, as a single multi-row transaction.
+
+    flush is the durability barrier: when it returns, every update submitted before the call has been
+    persisted. Writes are serialized so that updates to a reservation are always applied in order.
+
+    An update which cannot be written is queued again, unless a newer update for the reservation has been
+    submitted meanwhile, and is dropped only after MAX_ATTEMPTS failed writes.
+    """
+    DEFAULT_MAX_BATCH = 500
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, *, db: PsqlDatabase, logger, window_ms: int, max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        @param db database
+        @param logger logger
+        @param window_ms time in milliseconds for which updates are buffered before they are written
+        @param max_batch number of buffered reservations which triggers a write before the window elapses
+        """
+        self.db = db
+        self.logger = logger
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        # rsv_resid -> keyword arguments for PsqlDatabase.update_reservation
+        self.pending = OrderedDict()
+        # rsv_resid -> number of failed writes of the pending update
+        self.attempts = {}
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        """
+        Start the background writer
+        """
+        with self.condition:
+            if self.thread is not None:
+                return
+            self.stopped = False
+            self.thread = threading.Thread(target=self.run, name="ReservationWriteBehind", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the background writer and write the pending updates
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def submit(self, *, rid: str, record: dict):
+        """
+        Buffer an update for a reservation
+        @param rid reservation id
+        @param record keyword arguments for PsqlDatabase.update_reservation
+        """
+        with self.condition:
+            self.pending[rid] = record
+            if len(self.pending) == 1 or len(self.pending) >= self.max_batch:
+                self.condition.notify_all()
+
+    def discard(self, *, rid: str):
+        """
+        Drop a buffered update for a reservation e.g. when the reservation is removed
+        @param rid reservation id
+        """
+        with self.condition:
+            self.pending.pop(rid, None)
+            self.attempts.pop(rid, None)
+
+    def has_pending(self) -> bool:
+        with self.condition:
+            return len(self.pending) > 0
+
+    def flush(self, *, rid: str = None):
+        """
+        Durability barrier; write the buffered updates and return once they are persisted
+        @param rid reservation id; if specified only the update for this reservation is written
+        @raises Exception if an update could not be written
+        """
+        with self.write_lock:
+            with self.condition:
+                if rid is not None:
+                    record = self.pending.pop(rid, None)
+                    records = [record] if record is not None else []
+                else:
+                    records = list(self.pending.values())
+                    self.pending.clear()
+            if len(records) == 0:
+                return
+            failed = self.__write(records=records)
+            self.__requeue(records=records, failed=failed)
+            if len(failed) > 0:
+                raise list(failed.values())[-1]
+
+    def __write(self, *, records: List[dict]) -> Dict[str, Exception]:
+        """
+        Write the records in a single transaction; if the transaction fails, write each record on
+        its own so that one bad record does not drop the rest of the batch
+        @param records records
+        @return dictionary of reservation id to the error for the records which could not be written
+        """
+        try:
+            self.db.update_reservations(records=records)
+            return {}
+        except Exception as e:
+            if len(records) == 1:
+                return {records[0].get('rsv_resid'): e}
+            self.logger.warning(f"Batched update of {len(records)} reservations failed: {e}, "
+                                f"writing them individually")
+
+        failed = {}
+        for record in records:
+            try:
+                self.db.update_reservation(**record)
+            except Exception as e:
+                self.logger.error(f"Failed to update reservation {record.get('rsv_resid')}: {e}")
+                failed[record.get('rsv_resid')] = e
+        return failed
+
+    def __requeue(self, *, records: List[dict], failed: Dict[str, Exception]):
+        """
+        Queue the records which could not be written again so that they are retried with the next write
+        @param records records written
+        @param failed dictionary of reservation id to the error for the records which could not be written
+        """
+        with self.condition:
+            for record in records:
+                rid = record.get('rsv_resid')
+                if rid not in failed or rid in self.pending:
+                    # Written, or superseded by a newer update
+                    self.attempts.pop(rid, None)
+                    continue
+                attempts = self.attempts.get(rid, 0) + 1
+                if attempts >= self.MAX_ATTEMPTS:
+                    self.logger.error(f"Dropping update for reservation {rid} after {attempts} failed attempts")
+                    self.attempts.pop(rid, None)
+                    continue
+                self.attempts[rid] = attempts
+                self.pending[rid] = record
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped and len(self.pending) == 0:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                # Let updates accumulate for the window unless the batch is already full
+                if len(self.pending) < self.max_batch:
+                    self.condition.wait(timeout=self.window)
+                if self.stopped:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Error occurred while writing reservation updates: {e}")
+                self.logger.error(traceback.format_exc())
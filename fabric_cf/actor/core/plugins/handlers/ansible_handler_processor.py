@@ -27,6 +27,7 @@ import concurrent.futures
 import logging
 import multiprocessing
 import os
+import queue
 import threading
 import time
 import traceback
@@ -36,9 +37,12 @@ from fabric_cf.actor.core.common.exceptions import AuthorityException
 from fabric_cf.actor.core.plugins.handlers.config_token import ConfigToken
 from fabric_cf.actor.core.plugins.handlers.handler_processor import HandlerProcessor
 from fabric_cf.actor.core.util.log_helper import LogHelper
+from fabric_cf.actor.core.util.metrics import HANDLER_SECONDS
 from fabric_cf.actor.core.util.reflection_utils import ReflectionUtils
 
 process_pool_logger = None
+# Handler instances cached per worker process
+process_pool_handlers = {}
 
 
 class AnsibleHandlerProcessor(HandlerProcessor):
@@ -51,11 +55,16 @@ class AnsibleHandlerProcessor(HandlerProcessor):
         super().__init__()
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.log_config = GlobalsSingleton.get().get_log_config()
+        self.max_workers = self.MAX_WORKERS
+        if GlobalsSingleton.get().get_config() is not None:
+            self.max_workers = GlobalsSingleton.get().get_config().get_handler_max_workers()
         self.executor = None
         self.process_pool_manager = None
         self.process_pool_lock = None
         self.__setup_process_pool()
-        self.futures = []
+        # Outstanding futures; completed futures are pushed to the completion queue by the done callback
+        self.futures = {}
+        self.completed = queue.Queue()
         self.thread = None
         self.future_lock = threading.Condition()
         self.stopped = False
@@ -70,6 +79,7 @@ class AnsibleHandlerProcessor(HandlerProcessor):
         del state['process_pool_manager']
         del state['process_pool_lock']
         del state['futures']
+        del state['completed']
         del state['thread']
         del state['future_lock']
         del state['stopped']
@@ -83,7 +93,8 @@ class AnsibleHandlerProcessor(HandlerProcessor):
         self.initialized = False
         self.lock = threading.Lock()
         self.__setup_process_pool()
-        self.futures = []
+        self.futures = {}
+        self.completed = queue.Queue()
         self.thread = None
         self.future_lock = threading.Condition()
         self.stopped = False
@@ -96,7 +107,9 @@ class AnsibleHandlerProcessor(HandlerProcessor):
         log_size = int(self.log_config.get(Constants.PROPERTY_CONF_LOG_SIZE, 5000000))
         logger = self.log_config.get(Constants.PROPERTY_CONF_LOGGER, "handler")
         logger = f"{logger}-handler"
-        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.MAX_WORKERS,
+        # The pool has a fixed size of handler.max.workers; with the fork start method all the worker processes
+        # are spawned on the first submission. Handlers submitted beyond that are queued by the executor
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers,
                                                                initializer=AnsibleHandlerProcessor.process_pool_initializer,
                                                                initargs=(log_dir, log_file, log_level, log_retain,
                                                                          log_size, logger))
@@ -120,16 +133,16 @@ class AnsibleHandlerProcessor(HandlerProcessor):
             self.lock.acquire()
             self.executor.shutdown(wait=True)
             self.stopped = True
-            for f, u in self.futures:
-                f.cancel()
+            with self.future_lock:
+                for f in self.futures:
+                    f.cancel()
 
             temp = self.thread
             self.thread = None
             if temp is not None:
                 self.logger.warning("It seems that the future thread is running. Interrupting it")
                 try:
-                    with self.future_lock:
-                        self.future_lock.notify_all()
+                    self.completed.put_nowait(None)
                     temp.join()
                 except Exception as e:
                     self.logger.error("Could not join future thread {}".format(e))
@@ -148,14 +161,27 @@ class AnsibleHandlerProcessor(HandlerProcessor):
 
     def queue_future(self, future: concurrent.futures.Future, unit: ConfigToken):
         """
-        Queue an future on Future Processor timer queue
+        Track a future; it is handed to the Future Processor as soon as it completes
         @param future
         @param unit Unit being processed; This is needed
         """
         with self.future_lock:
-            self.futures.append((future, unit))
-            self.logger.debug("Added future to Future queue")
-            self.future_lock.notify_all()
+            self.futures[future] = unit
+            backlog = len(self.futures)
+        self.logger.debug(f"Added future to Future queue, outstanding: {backlog}")
+        if backlog > self.max_workers:
+            self.logger.info(f"Handler backlog {backlog} exceeds the number of workers {self.max_workers}")
+        future.add_done_callback(self.future_done)
+
+    def future_done(self, future: concurrent.futures.Future):
+        """
+        Done callback for the futures; runs on the thread completing the future, so only hands it off
+        to the Future Processor
+        @param future
+        """
+        with self.future_lock:
+            unit = self.futures.pop(future, None)
+        self.completed.put_nowait((future, unit))
 
     def invoke_handler(self, unit: ConfigToken, operation: str, data: dict = None):
         try:
@@ -169,9 +195,12 @@ class AnsibleHandlerProcessor(HandlerProcessor):
             if handler is None:
                 raise AuthorityException(f"No handler found for resource type {unit.get_resource_type()}")
 
+            submitted_at = time.perf_counter()
             future = self.executor.submit(self.process_pool_main, operation, handler.get_class_name(),
                                           handler.get_module_name(), handler.get_properties(), unit, data,
                                           self.process_pool_lock)
+            future.add_done_callback(
+                lambda f: HANDLER_SECONDS.labels(operation=operation).observe(time.perf_counter() - submitted_at))
 
             self.queue_future(future=future, unit=unit)
             if unit:
@@ -234,55 +263,31 @@ class AnsibleHandlerProcessor(HandlerProcessor):
 
     def process_futures(self):
         while True:
-            done = []
-
-            with self.future_lock:
-
-                while len(self.futures) == 0 and not self.stopped:
-                    try:
-                        self.future_lock.wait()
-                    except InterruptedError as e:
-                        self.logger.info("Future Processor thread interrupted. Exiting")
-                        return
-
-                if self.stopped:
-                    self.logger.info("Future Processor exiting")
-                    return
-
-                if len(self.futures) > 0:
-                    try:
-                        for f, u in self.futures:
-                            if f.done():
-                                done.append((f, u))
-
-                        for x in done:
-                            self.futures.remove(x)
-                    except Exception as e:
-                        self.logger.error(f"Error while adding future to future queue! e: {e}")
-                        self.logger.error(traceback.format_exc())
-
-                self.future_lock.notify_all()
-
-            if len(done) > 0:
-                self.logger.debug(f"Processing {len(done)} futures")
-                for f, u in done:
-                    try:
-                        self.process(future=f, old_unit=u)
-                    except Exception as e:
-                        self.logger.error(f"Error while processing event {type(f)}, {e}")
-                        self.logger.error(traceback.format_exc())
+            entry = self.completed.get()
 
-                done.clear()
+            if entry is None or self.stopped:
+                self.logger.info("Future Processor exiting")
+                return
 
-            time.sleep(5)
+            f, u = entry
+            try:
+                self.process(future=f, old_unit=u)
+            except Exception as e:
+                self.logger.error(f"Error while processing event {type(f)}, {e}")
+                self.logger.error(traceback.format_exc())
 
     @staticmethod
     def process_pool_main(operation: str, handler_class: str, handler_module: str, properties: dict,
                           unit: ConfigToken, data: dict, process_lock: multiprocessing.Lock):
         global process_pool_logger
-        handler_class = ReflectionUtils.create_instance_with_params(module_name=handler_module,
-                                                                    class_name=handler_class)
-        handler_obj = handler_class(process_pool_logger, properties, process_lock)
+        global process_pool_handlers
+        key = (handler_module, handler_class, repr(sorted(properties.items())) if properties else None)
+        handler_obj = process_pool_handlers.get(key)
+        if handler_obj is None:
+            handler_class = ReflectionUtils.create_instance_with_params(module_name=handler_module,
+                                                                        class_name=handler_class)
+            handler_obj = handler_class(process_pool_logger, properties, process_lock)
+            process_pool_handlers[key] = handler_obj
 
         if operation == Constants.TARGET_CREATE:
             return handler_obj.create(unit)
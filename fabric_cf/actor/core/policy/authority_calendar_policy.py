@@ -43,6 +43,7 @@ from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, Re
 from fabric_cf.actor.core.kernel.resource_set import ResourceSet
 from fabric_cf.actor.core.plugins.handlers.config_token import ConfigToken
 from fabric_cf.actor.core.apis.abc_resource_control import ABCResourceControl
+from fabric_cf.actor.core.policy.node_allocation_index import NodeAllocationIndex
 from fabric_cf.actor.core.time.term import Term
 from fabric_cf.actor.core.time.calendar.authority_calendar import AuthorityCalendar
 from fabric_cf.actor.core.util.id import ID
@@ -77,9 +78,12 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
         self.aggregate_resource_model_graph_id = None
 
         self.lock = threading.Lock()
+        # Reservations allocated on each ARM node and deep slivers built from the ARM
+        self.allocation_index = NodeAllocationIndex()
 
     def load_aggregate_resource_model(self):
         if self.aggregate_resource_model_graph_id is not None:
+            self.allocation_index.clear_graph_nodes()
             self.logger.debug(f"Loading an existing Aggregate ResourceModel Graph:"
                               f" {self.aggregate_resource_model_graph_id}")
 
@@ -98,6 +102,7 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
         del state['aggregate_resource_model']
         del state['lock']
         del state['delegations']
+        del state['allocation_index']
 
         return state
 
@@ -111,6 +116,7 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
         self.aggregate_resource_model = None
 
         self.lock = threading.Lock()
+        self.allocation_index = NodeAllocationIndex()
         self.restore()
 
     def restore(self):
@@ -125,6 +131,7 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
 
     def set_aggregate_resource_model(self, aggregate_resource_model: Neo4jARMGraph):
         self.aggregate_resource_model = aggregate_resource_model
+        self.allocation_index.clear_graph_nodes()
         if aggregate_resource_model is not None:
             self.set_aggregate_resource_model_graph_id(graph_id=aggregate_resource_model.graph_id)
 
@@ -234,11 +241,33 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
             if control is None:
                 raise AuthorityException("Missing resource control")
             control.revisit(reservation=reservation)
+            if not reservation.is_terminal():
+                self.allocation_index.add(reservation=reservation)
 
     def recovery_ended(self):
         super().recovery_ended()
         for c in self.controls_by_guid.values():
             c.recovery_ended()
+        self.rebuild_allocation_index()
+
+    def rebuild_allocation_index(self):
+        """
+        Complete the node allocation index once recovery has finished. Reservations which were not revisited but
+        still hold resources are loaded from the database. The index is consulted for assignment only after this point.
+        """
+        try:
+            states = [s.value for s in NodeAllocationIndex.RESERVATION_STATES]
+            reservations = self.actor.get_plugin().get_database().get_reservations(states=states)
+            for r in reservations:
+                if r is None or self.allocation_index.contains(rid=r.get_reservation_id()):
+                    continue
+                live = self.actor.get_reservation(rid=r.get_reservation_id())
+                self.allocation_index.add(reservation=live if live is not None else r)
+            self.allocation_index.set_ready(value=True)
+            self.logger.info(f"Node allocation index rebuilt with {len(reservations)} reservations")
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild node allocation index, falling back to database: {e}")
+            self.logger.error(traceback.format_exc())
 
     def bind(self, *, reservation: ABCAuthorityReservation) -> bool:
         # Simple for now: make sure that this is a valid term and do not modify
@@ -305,6 +334,7 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
     def closed(self, *, reservation: ABCReservationMixin):
         if isinstance(reservation, ABCAuthorityReservation):
             self.calendar.remove_outlay(reservation=reservation)
+            self.allocation_index.remove(rid=reservation.get_reservation_id())
 
     def remove(self, *, reservation: ABCReservationMixin):
         raise AuthorityException(Constants.NOT_IMPLEMENTED)
@@ -409,6 +439,7 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
                 reservation.set_approved(term=approved, approved_resources=assigned)
                 reservation.set_bid_pending(value=False)
                 node_id = assigned.get_sliver().get_node_map()[1]
+                self.allocation_index.add(reservation=reservation, node_id=node_id)
 
                 if node_id_to_reservations.get(node_id, None) is None:
                     node_id_to_reservations[node_id] = ReservationSet()
@@ -587,20 +618,30 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
             raise e
 
     def get_network_node_from_graph(self, *, node_id: str) -> NodeSliver or None:
+        graph_node = self.allocation_index.get_graph_node(node_id=node_id)
+        if graph_node is not None:
+            return graph_node
         try:
             self.lock.acquire()
             if self.aggregate_resource_model is None:
                 return None
-            return self.aggregate_resource_model.build_deep_node_sliver(node_id=node_id)
+            graph_node = self.aggregate_resource_model.build_deep_node_sliver(node_id=node_id)
+            self.allocation_index.add_graph_node(node_id=node_id, graph_node=graph_node)
+            return graph_node
         finally:
             self.lock.release()
 
     def get_network_service_from_graph(self, *, node_id: str) -> NetworkServiceSliver or None:
+        graph_node = self.allocation_index.get_graph_node(node_id=node_id)
+        if graph_node is not None:
+            return graph_node
         try:
             self.lock.acquire()
             if self.aggregate_resource_model is None:
                 return None
-            return self.aggregate_resource_model.build_deep_ns_sliver(node_id=node_id)
+            graph_node = self.aggregate_resource_model.build_deep_ns_sliver(node_id=node_id)
+            self.allocation_index.add_graph_node(node_id=node_id, graph_node=graph_node)
+            return graph_node
         except Exception as e:
             self.logger.error(f"Unable to get network service: {e}")
             self.logger.error(traceback.format_exc())
@@ -613,8 +654,11 @@ class AuthorityCalendarPolicy(AuthorityPolicy):
                   ReservationStates.Ticketed.value,
                   ReservationStates.Nascent.value]
 
-        existing_reservations = self.actor.get_plugin().get_database().get_reservations(graph_node_id=node_id,
-                                                                                        states=states)
+        if self.allocation_index.is_ready():
+            existing_reservations = self.allocation_index.get_reservations(node_id=node_id)
+        else:
+            existing_reservations = self.actor.get_plugin().get_database().get_reservations(graph_node_id=node_id,
+                                                                                            states=states)
         if existing_reservations:
             closing_reservations = []
             for r in existing_reservations:
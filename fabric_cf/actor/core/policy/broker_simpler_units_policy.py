@@ -57,6 +57,7 @@ from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, Re
 from fabric_cf.actor.core.policy.broker_calendar_policy import BrokerCalendarPolicy
 from fabric_cf.actor.core.policy.fifo_queue import FIFOQueue
 from fabric_cf.actor.core.policy.network_node_inventory import NetworkNodeInventory
+from fabric_cf.actor.core.policy.node_allocation_index import NodeAllocationIndex
 from fabric_cf.actor.core.policy.network_service_inventory import NetworkServiceInventory
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.time.term import Term
@@ -118,6 +119,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
 
         self.queue = FIFOQueue()
         self.inventory = Inventory()
+        self.allocation_index = NodeAllocationIndex()
 
         self.pluggable_registry = PluggableRegistry()
         self.abqm_lock = threading.Lock()
@@ -153,6 +155,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         del state['ready']
         del state['queue']
         del state['pluggable_registry']
+        del state['allocation_index']
 
         return state
 
@@ -188,6 +191,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
 
         self.queue = FIFOQueue()
         self.pluggable_registry = PluggableRegistry()
+        self.allocation_index = NodeAllocationIndex()
 
     def load_combined_broker_model(self):
         """
@@ -783,13 +787,18 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         :return: Pruned list of node IDs excluding those under maintenance
         :rtype: List[str]
         """
+        database = self.actor.get_plugin().get_database()
+        # Nothing to prune when the site has no maintenance state
+        if Maintenance.get_site(database=database, site_name=site) is None:
+            return node_id_list
+
         project_id = reservation.get_slice().get_project_id()
         email = reservation.get_slice().get_owner().get_email()
 
         nodes_to_remove = []
         for node_id in node_id_list:
             graph_node = self.get_network_node_from_graph(node_id=node_id)
-            status, error_message = Maintenance.is_sliver_provisioning_allowed(database=self.actor.get_plugin().get_database(),
+            status, error_message = Maintenance.is_sliver_provisioning_allowed(database=database,
                                                                                project=project_id, site=site,
                                                                                worker=graph_node.get_name(),
                                                                                email=email)
@@ -1819,6 +1828,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
                 if node_id_to_reservations.get(node_id, None) is None:
                     node_id_to_reservations[node_id] = ReservationSet()
                 node_id_to_reservations[node_id].add(reservation=reservation)
+                self.allocation_index.add(reservation=reservation, node_id=node_id)
 
                 if isinstance(sliver, NetworkServiceSliver) and sliver.ero:
                     sliver_type, path = sliver.ero.get()
@@ -1908,6 +1918,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
             if self.__is_modify_on_openstack_vnic(sliver=sliver):
                 self.issue_ticket(reservation=reservation, units=needed, rtype=requested_resources.get_type(),
                                   term=term, source=reservation.get_source(), sliver=sliver)
+                self.allocation_index.add(reservation=reservation)
             else:
                 status, node_id_to_reservations, error_msg = self.ticket_inventory(reservation=reservation,
                                                                                    inv=inv, term=term,
@@ -1995,6 +2006,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         if isinstance(reservation, ABCBrokerReservation):
             self.logger.debug("Broker reservation")
             super().release(reservation=reservation)
+            self.allocation_index.remove(rid=reservation.get_reservation_id())
         elif isinstance(reservation, ABCClientReservation):
             self.logger.debug("Client reservation")
             super().release(reservation=reservation)
@@ -2002,6 +2014,40 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
             self.logger.debug(f"Removing reservation: {reservation.get_reservation_id()} "
                               f"from inventory status: {status}")
 
+    def revisit(self, *, reservation: ABCReservationMixin):
+        """
+        Recover a reservation and register it with the node allocation index.
+
+        :param reservation: Reservation being recovered
+        :type reservation: ABCReservationMixin
+        """
+        super().revisit(reservation=reservation)
+        if isinstance(reservation, ABCBrokerReservation) and not reservation.is_terminal():
+            self.allocation_index.add(reservation=reservation)
+
+    def recovery_ended(self):
+        """
+        Complete the node allocation index once recovery has finished.
+
+        Reservations which were not revisited (e.g. belonging to slices not recovered) but still hold
+        resources are loaded from the database so that the index reflects all the allocations. The index
+        is consulted for ticketing only after this point.
+        """
+        super().recovery_ended()
+        try:
+            states = [s.value for s in NodeAllocationIndex.COMPONENT_STATES]
+            reservations = self.actor.get_plugin().get_database().get_reservations(states=states)
+            for r in reservations:
+                if r is None or self.allocation_index.contains(rid=r.get_reservation_id()):
+                    continue
+                live = self.actor.get_reservation(rid=r.get_reservation_id())
+                self.allocation_index.add(reservation=live if live is not None else r)
+            self.allocation_index.set_ready(value=True)
+            self.logger.info(f"Node allocation index rebuilt with {len(reservations)} reservations")
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild node allocation index, falling back to database: {e}")
+            self.logger.error(traceback.format_exc())
+
     def align_end(self, *, when: datetime) -> datetime:
         """
         Align a timestamp to the end of the nearest allocation cycle.
@@ -2126,6 +2172,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         try:
             if self.combined_broker_model.graph_exists():
                 snapshot_graph_id = self.combined_broker_model.snapshot()
+            self.allocation_index.clear_graph_nodes()
             self.combined_broker_model.merge_adm(adm=adm_graph)
             self.combined_broker_model.validate_graph()
             # delete the snapshot
@@ -2161,6 +2208,7 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         try:
             if self.combined_broker_model.graph_exists():
                 snapshot_graph_id = self.combined_broker_model.snapshot()
+            self.allocation_index.clear_graph_nodes()
             self.combined_broker_model.unmerge_adm(graph_id=graph_id)
             if self.combined_broker_model.graph_exists():
                 self.combined_broker_model.validate_graph()
@@ -2343,11 +2391,16 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         :return: Node sliver or None if not found
         :rtype: NodeSliver or None
         """
+        graph_node = self.allocation_index.get_graph_node(node_id=node_id)
+        if graph_node is not None:
+            return graph_node
         try:
             self.lock.acquire()
             if self.combined_broker_model is None:
                 return None
-            return self.combined_broker_model.build_deep_node_sliver(node_id=node_id)
+            graph_node = self.combined_broker_model.build_deep_node_sliver(node_id=node_id)
+            self.allocation_index.add_graph_node(node_id=node_id, graph_node=graph_node)
+            return graph_node
         finally:
             self.lock.release()
 
@@ -2580,7 +2633,8 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
         Retrieve a list of existing reservations for the specified node ID within an optional time window.
 
         This method searches the `node_id_to_reservations` map for reservations associated with the given node,
-        and filters them based on optional start and end time constraints.
+        and filters them based on optional start and end time constraints. Existing reservations are looked up
+        in the in-memory node allocation index once it has been rebuilt after recovery, else in the database.
 
         Commonly used to:
           - Check for overlapping allocations during ticket or lease requests
@@ -2603,10 +2657,13 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
                   ReservationStates.Nascent.value]
 
         # Only get Active or Ticketing reservations
-        existing_reservations = self.actor.get_plugin().get_database().get_reservations(graph_node_id=node_id,
-                                                                                        states=states,
-                                                                                        start=start,
-                                                                                        end=end)
+        if self.allocation_index.is_ready():
+            existing_reservations = self.allocation_index.get_reservations(node_id=node_id, start=start, end=end)
+        else:
+            existing_reservations = self.actor.get_plugin().get_database().get_reservations(graph_node_id=node_id,
+                                                                                            states=states,
+                                                                                            start=start,
+                                                                                            end=end)
 
         reservations_allocated_in_cycle = node_id_to_reservations.get(node_id, None)
 
@@ -2733,6 +2790,10 @@ class BrokerSimplerUnitsPolicy(BrokerCalendarPolicy):
             for x in NodeType:
                 res_type.append(str(x))
 
+        if self.allocation_index.is_ready():
+            return self.allocation_index.get_components(node_id=node_id, start=start, end=end, excludes=excludes,
+                                                        include_ns=include_ns, include_node=include_node)
+
         # Only get Active or Ticketing reservations
         return self.actor.get_plugin().get_database().get_components(node_id=node_id, rsv_type=res_type, states=states,
                                                                      start=start, end=end, excludes=excludes)
@@ -24,7 +24,6 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import ipaddress
-import random
 import traceback
 from ipaddress import IPv6Network, IPv4Network
 from typing import List, Tuple, Union
@@ -42,31 +41,17 @@ from fabric_cf.actor.core.common.exceptions import BrokerException, ExceptionErr
 from fabric_cf.actor.core.kernel.reservation_states import ReservationOperation
 from fabric_cf.actor.core.policy.inventory_for_type import InventoryForType
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.subnet_pool import SubnetPool
+from fabric_cf.actor.core.util.vlan_pool import VlanPool
 
 
 class NetworkServiceInventory(InventoryForType):
     @staticmethod
-    def __extract_vlan_range(*, labels: Labels) -> List[int] or None:
-        vlan_range = None
-        if labels is None:
-            return vlan_range
-        if labels.vlan_range is not None:
-            if isinstance(labels.vlan_range, list):
-                vlan_range = []
-                for v_r in labels.vlan_range:
-                    vlans = v_r.split("-")
-                    for x in list(range(int(vlans[0]), int(vlans[1]) + 1)):
-                        if x not in vlan_range:
-                            vlan_range.append(x)
-            else:
-                vlans = labels.vlan_range.split("-")
-                vlan_range = list(range(int(vlans[0]), int(vlans[1]) + 1))
-        elif labels.vlan is not None:
-            vlan_range = [int(labels.vlan)]
-        return vlan_range
-
-    def __exclude_allocated_vlans(self, *, rid: ID, available_vlan_range: List[int], bqm_ifs: InterfaceSliver,
-                                  existing_reservations: List[ABCReservationMixin]) -> List[int]:
+    def __extract_vlan_range(*, labels: Labels) -> VlanPool or None:
+        return VlanPool.from_labels(labels=labels)
+
+    def __exclude_allocated_vlans(self, *, rid: ID, available_vlan_range: VlanPool, bqm_ifs: InterfaceSliver,
+                                  existing_reservations: List[ABCReservationMixin]) -> VlanPool:
         # Exclude the already allocated VLANs and subnets
         if existing_reservations is None:
             return available_vlan_range
@@ -99,10 +84,7 @@ class NetworkServiceInventory(InventoryForType):
 
                 # Exclude VLANs on the allocated on the same port
                 if allocated_ifs.label_allocations.vlan is not None:
-                    allocated_vlan = int(allocated_ifs.label_allocations.vlan)
-
-                    if allocated_vlan in available_vlan_range:
-                        available_vlan_range.remove(allocated_vlan)
+                    available_vlan_range.reserve(vlan=int(allocated_ifs.label_allocations.vlan))
 
         if available_vlan_range is None or len(available_vlan_range) == 0:
             raise BrokerException(error_code=ExceptionErrorCode.INSUFFICIENT_RESOURCES,
@@ -173,7 +155,7 @@ class NetworkServiceInventory(InventoryForType):
                     return requested_ifs
 
                 if requested_vlan is None:
-                    requested_ifs.labels.vlan = str(random.choice(vlan_range))
+                    requested_ifs.labels.vlan = str(vlan_range.random_free())
                     return requested_ifs
 
                 if requested_vlan not in vlan_range:
@@ -203,14 +185,14 @@ class NetworkServiceInventory(InventoryForType):
                     return requested_ifs
 
                 if bqm_ifs.get_type() != InterfaceType.FacilityPort:
-                    requested_ifs.labels.vlan = str(random.choice(vlan_range))
+                    requested_ifs.labels.vlan = str(vlan_range.random_free())
                     requested_ifs.label_allocations = Labels(vlan=requested_ifs.labels.vlan)
                 else:
                     if not requested_ifs.labels:
                         return requested_ifs
 
                     if requested_ifs.labels.vlan is None:
-                        requested_ifs.labels.vlan = str(random.choice(vlan_range))
+                        requested_ifs.labels.vlan = str(vlan_range.random_free())
 
                     if int(requested_ifs.labels.vlan) not in vlan_range:
                         raise BrokerException(
@@ -290,12 +272,17 @@ class NetworkServiceInventory(InventoryForType):
                     continue
 
                 if allocated_sliver.label_allocations is not None and allocated_sliver.label_allocations.vlan is not None:
-                    vlans_range.remove(int(allocated_sliver.label_allocations.vlan))
+                    vlans_range.reserve(vlan=int(allocated_sliver.label_allocations.vlan))
+
+            vlan = vlans_range.first_free()
+            if vlan is None:
+                raise BrokerException(error_code=ExceptionErrorCode.INSUFFICIENT_RESOURCES,
+                                      msg=f"No VLANs available!")
 
             if requested_ns.label_allocations is None:
                 requested_ns.label_allocations = Labels()
-            #requested_ns.label_allocations.vlan = str(random.choice(vlans_range))
-            requested_ns.label_allocations.vlan = str(vlans_range[0])
+            #requested_ns.label_allocations.vlan = str(vlans_range.random_free())
+            requested_ns.label_allocations.vlan = str(vlan)
         except Exception as e:
             self.logger.error(f"Error in allocate_vNIC: {e}")
             self.logger.error(traceback.format_exc())
@@ -367,47 +354,44 @@ class NetworkServiceInventory(InventoryForType):
         return requested_ns
 
     def _generate_subnet_list(self, *, owner_ns: NetworkServiceSliver,
-                              delegated_label: Labels) -> Tuple[Union[IPv4Network, IPv6Network], List]:
+                              delegated_label: Labels) -> Tuple[Union[IPv4Network, IPv6Network], SubnetPool]:
         """
-        Generate the list of subnets based on the owner network service type.
+        Generate the pool of subnets based on the owner network service type.
 
         :param owner_ns: The NetworkServiceSliver representing the owner network service.
         :param delegated_label: The Labels object containing the delegated subnet information.
-        :return: A tuple containing the IP network and the list of generated subnets.
+        :return: A tuple containing the IP network and the pool of available subnets.
         """
         subnet_list = None
         ip_network = None
         if owner_ns.get_type() in Constants.L3_FABNETv6_SERVICES:
             ip_network = IPv6Network(delegated_label.ipv6_subnet)
-            subnet_list = list(ip_network.subnets(new_prefix=64))
             # Exclude the 1st subnet as it is reserved for control plane
-            subnet_list.pop(0)
             # Exclude the last subnet for FABRIC STAR Bastion Host Allocation
-            subnet_list.pop(-1)
+            subnet_list = SubnetPool(network=ip_network, new_prefix=64, exclude_first=1, exclude_last=1)
 
         elif owner_ns.get_type() in [ServiceType.FABNetv4, ServiceType.FABNetv4Ext]:
             ip_network = IPv4Network(delegated_label.ipv4_subnet)
             if owner_ns.get_type() == ServiceType.FABNetv4:
-                subnet_list = list(ip_network.subnets(new_prefix=24))
-                subnet_list.pop(0)
+                subnet_list = SubnetPool(network=ip_network, new_prefix=24, exclude_first=1)
 
             elif owner_ns.get_type() == ServiceType.FABNetv4Ext:
-                subnet_list = list(ip_network.hosts())
+                subnet_list = SubnetPool.hosts(network=ip_network)
 
         self.logger.debug(f"Available Subnets: {subnet_list}")
 
         return ip_network, subnet_list
 
-    def _exclude_allocated_subnets(self, *, subnet_list: List, requested_ns_type: str, rid: ID,
-                                   existing_reservations: List[ABCReservationMixin]) -> List:
+    def _exclude_allocated_subnets(self, *, subnet_list: SubnetPool, requested_ns_type: str, rid: ID,
+                                   existing_reservations: List[ABCReservationMixin]) -> SubnetPool:
         """
         Exclude the subnets that are already allocated.
 
-        :param subnet_list: A list of available subnets to be allocated.
+        :param subnet_list: A pool of available subnets to be allocated.
         :param requested_ns_type: The type of the requested network service.
         :param rid: The reservation ID of the current request.
         :param existing_reservations: A list of existing reservations that may contain allocated subnets.
-        :return: A list of subnets excluding those that have already been allocated.
+        :return: The pool of subnets excluding those that have already been allocated.
         """
         for reservation in existing_reservations:
             if rid == reservation.get_reservation_id():
@@ -433,8 +417,7 @@ class NetworkServiceInventory(InventoryForType):
                     f"Excluding already allocated IP4Subnet: "
                     f"{allocated_sliver.get_gateway().subnet}"
                     f" to res# {reservation.get_reservation_id()}")
-                if subnet_to_remove in subnet_list:
-                    subnet_list.remove(subnet_to_remove)
+                subnet_list.reserve(value=subnet_to_remove)
 
             elif allocated_sliver.get_type() == ServiceType.FABNetv4Ext:
                 if allocated_sliver.labels is not None and allocated_sliver.labels.ipv4 is not None:
@@ -444,8 +427,7 @@ class NetworkServiceInventory(InventoryForType):
                             f"Excluding already allocated IP4: "
                             f"{x}"
                             f" to res# {reservation.get_reservation_id()}")
-                        if subnet_to_remove in subnet_list:
-                            subnet_list.remove(subnet_to_remove)
+                        subnet_list.reserve(value=subnet_to_remove)
 
             elif allocated_sliver.get_type() in Constants.L3_FABNETv6_SERVICES:
                 subnet_to_remove = IPv6Network(allocated_sliver.get_gateway().subnet)
@@ -454,20 +436,19 @@ class NetworkServiceInventory(InventoryForType):
                     f"{allocated_sliver.get_gateway().subnet}"
                     f" to res# {reservation.get_reservation_id()}")
 
-                if subnet_to_remove in subnet_list:
-                    subnet_list.remove(subnet_to_remove)
+                subnet_list.reserve(value=subnet_to_remove)
 
             self.logger.debug(f"Excluding already allocated subnet for reservation {reservation.get_reservation_id()}")
 
         return subnet_list
 
-    def _assign_gateway_labels(self, *, ip_network: Union[IPv4Network, IPv6Network], subnet_list: List,
+    def _assign_gateway_labels(self, *, ip_network: Union[IPv4Network, IPv6Network], subnet_list: SubnetPool,
                                requested_ns: NetworkServiceSliver) -> Labels:
         """
         Assign gateway labels based on the requested network service type.
 
         :param ip_network: The IP network from which subnets are derived, either IPv4Network or IPv6Network.
-        :param subnet_list: A list of subnets derived from the ip_network.
+        :param subnet_list: A pool of available subnets derived from the ip_network.
         :param requested_ns: Network Service sliver.
         :return: Gateway labels populated with the appropriate subnet and IP address.
         """
@@ -484,12 +465,13 @@ class NetworkServiceInventory(InventoryForType):
                     gateway_labels.ipv4 = str(next(requested_subnet.hosts()))
                     return gateway_labels
 
-            gateway_labels.ipv4_subnet = subnet_list[0].with_prefixlen
-            gateway_labels.ipv4 = str(list(subnet_list[0].hosts())[0])
+            subnet = subnet_list.first()
+            gateway_labels.ipv4_subnet = subnet.with_prefixlen
+            gateway_labels.ipv4 = str(next(subnet.hosts()))
 
         elif requested_ns.get_type() == ServiceType.FABNetv4Ext:
             gateway_labels.ipv4_subnet = ip_network.with_prefixlen
-            gateway_labels.ipv4 = str(subnet_list[0])
+            gateway_labels.ipv4 = str(subnet_list.first())
 
         elif requested_ns.get_type() in Constants.L3_FABNETv6_SERVICES:
             # Allocate the requested network if available else allocate new network
@@ -500,14 +482,15 @@ class NetworkServiceInventory(InventoryForType):
                     gateway_labels.ipv6 = str(next(requested_subnet.hosts()))
                     return gateway_labels
 
-            gateway_labels.ipv6_subnet = subnet_list[0].with_prefixlen
-            gateway_labels.ipv6 = str(next(subnet_list[0].hosts()))
+            subnet = subnet_list.first()
+            gateway_labels.ipv6_subnet = subnet.with_prefixlen
+            gateway_labels.ipv6 = str(next(subnet.hosts()))
 
         self.logger.debug(f"Allocated Gateway Labels for Network Service: {gateway_labels}")
 
         return gateway_labels
 
-    def _can_extend(self, *, subnet_list: List, requested_ns: NetworkServiceSliver):
+    def _can_extend(self, *, subnet_list: SubnetPool, requested_ns: NetworkServiceSliver):
         if requested_ns.get_type() == ServiceType.FABNetv4:
             allocated_subnet = ipaddress.IPv4Network(requested_ns.gateway.subnet)
             if allocated_subnet not in subnet_list:
@@ -563,8 +546,8 @@ class NetworkServiceInventory(InventoryForType):
                                           msg=f"Renew failed: VLAN {requested_ifs.labels.vlan} for Interface : "
                                               f"{requested_ifs.get_name()} already in use by another reservation")
 
-            vlan = str(random.choice(available_vlans))
-            #vlan = str(available_vlans[0])
+            vlan = str(available_vlans.random_free())
+            #vlan = str(available_vlans.first_free())
             ifs_labels = Labels.update(ifs_labels, vlan=vlan)
 
         requested_ifs.labels = ifs_labels
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import copy
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from fim.slivers.network_node import NodeSliver
+from fim.slivers.network_service import NetworkServiceSliver
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.policy.inventory_for_type import InventoryForType
+
+if TYPE_CHECKING:
+    from fim.slivers.base_sliver import BaseSliver
+    from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+
+
+class NodeAllocationIndex:
+    """
+    In-memory index of the reservations and components allocated on each graph node of the CBM.
+
+    The index references the live reservation objects held by the actor, so capacity allocations
+    are always read from the current state of a reservation. State and term filters are applied at
+    lookup time to match the semantics of the corresponding database queries.
+
+    The index is only consulted once it is marked ready i.e. after recovery has repopulated it; until
+    then callers are expected to fall back to the database.
+    """
+    RESERVATION_STATES = [ReservationStates.Active,
+                          ReservationStates.ActiveTicketed,
+                          ReservationStates.Ticketed,
+                          ReservationStates.Nascent]
+
+    COMPONENT_STATES = RESERVATION_STATES + [ReservationStates.CloseFail]
+
+    def __init__(self):
+        # graph node id => {reservation id => reservation}
+        self.reservations = {}
+        # graph node id => {reservation id => [(component id, bdf)]}
+        self.components = {}
+        # reservation id => graph node ids referenced by the reservation
+        self.nodes_by_rid = {}
+        # graph node id => NodeSliver built from the CBM
+        self.graph_nodes = {}
+        self.ready = False
+        self.lock = threading.Lock()
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    def set_ready(self, *, value: bool):
+        self.ready = value
+
+    def clear(self):
+        """
+        Drop all the indexed allocations and cached graph nodes
+        """
+        with self.lock:
+            self.reservations.clear()
+            self.components.clear()
+            self.nodes_by_rid.clear()
+            self.graph_nodes.clear()
+            self.ready = False
+
+    def contains(self, *, rid) -> bool:
+        with self.lock:
+            return str(rid) in self.nodes_by_rid
+
+    @staticmethod
+    def get_components_from_sliver(*, node_id: str, sliver: BaseSliver) -> List[Tuple[str, str, str]]:
+        """
+        Extract the components (and their PCI addresses) referenced by a sliver
+        :param node_id: graph node id on which the reservation has been allocated
+        :param sliver: allocated sliver
+        :return: list of tuples (graph node id, component id, bdf)
+        """
+        result = []
+        if isinstance(sliver, NetworkServiceSliver) and sliver.interface_info:
+            for interface in sliver.interface_info.interfaces.values():
+                if interface.get_node_map() is None:
+                    continue
+                graph_id_node_id_component_id, bqm_if_name = interface.get_node_map()
+                if ":" in graph_id_node_id_component_id or "#" in graph_id_node_id_component_id:
+                    if "#" in graph_id_node_id_component_id:
+                        split_string = graph_id_node_id_component_id.split("#")
+                    else:
+                        split_string = graph_id_node_id_component_id.split(":")
+                    if_node_id = split_string[1] if len(split_string) > 1 else None
+                    comp_id = split_string[2] if len(split_string) > 2 else None
+                    bdf = ":".join(split_string[3:]) if len(split_string) > 3 else None
+                    if if_node_id and comp_id and bdf:
+                        result.append((if_node_id, comp_id, bdf))
+
+        elif isinstance(sliver, NodeSliver) and node_id and sliver.attached_components_info:
+            for c in sliver.attached_components_info.devices.values():
+                if c.get_node_map() and c.labels and c.labels.bdf:
+                    bqm_id, comp_id = c.get_node_map()
+                    bdf = c.labels.bdf
+                    if isinstance(c.labels.bdf, str):
+                        bdf = [c.labels.bdf]
+                    for x in bdf:
+                        result.append((node_id, comp_id, x))
+        return result
+
+    def __remove(self, *, rid: str):
+        for node_id in self.nodes_by_rid.pop(rid, set()):
+            node_reservations = self.reservations.get(node_id)
+            if node_reservations is not None:
+                node_reservations.pop(rid, None)
+                if len(node_reservations) == 0:
+                    self.reservations.pop(node_id)
+            node_components = self.components.get(node_id)
+            if node_components is not None:
+                node_components.pop(rid, None)
+                if len(node_components) == 0:
+                    self.components.pop(node_id)
+
+    def add(self, *, reservation: ABCReservationMixin, node_id: str = None):
+        """
+        Add or refresh a reservation in the index. Any previous entries for the reservation are replaced.
+        :param reservation: reservation
+        :param node_id: graph node id on which the reservation is allocated; defaults to the reservation's graph node
+        """
+        if node_id is None:
+            node_id = reservation.get_graph_node_id()
+        if node_id is None:
+            return
+
+        rid = str(reservation.get_reservation_id())
+        sliver = InventoryForType.get_allocated_sliver(reservation=reservation)
+        if reservation.is_extending_ticket() and reservation.get_requested_resources() is not None and \
+                reservation.get_requested_resources().get_sliver() is not None:
+            sliver = reservation.get_requested_resources().get_sliver()
+
+        components = self.get_components_from_sliver(node_id=node_id, sliver=sliver) if sliver else []
+
+        with self.lock:
+            self.__remove(rid=rid)
+            nodes = {node_id}
+            if node_id not in self.reservations:
+                self.reservations[node_id] = {}
+            self.reservations[node_id][rid] = reservation
+
+            for comp_node_id, comp_id, bdf in components:
+                nodes.add(comp_node_id)
+                if comp_node_id not in self.components:
+                    self.components[comp_node_id] = {}
+                if rid not in self.components[comp_node_id]:
+                    self.components[comp_node_id][rid] = []
+                self.components[comp_node_id][rid].append((comp_id, bdf))
+            self.nodes_by_rid[rid] = nodes
+
+    def remove(self, *, rid):
+        """
+        Remove a reservation from the index
+        :param rid: reservation id
+        """
+        with self.lock:
+            self.__remove(rid=str(rid))
+
+    @staticmethod
+    def __overlaps(*, reservation: ABCReservationMixin, start: datetime = None, end: datetime = None) -> bool:
+        if start is None and end is None:
+            return True
+        term = reservation.get_term()
+        if term is None:
+            # Reservations yet to be ticketed have no term; the database keeps NULL lease times for them
+            return False
+        lease_start = term.get_start_time()
+        lease_end = term.get_end_time()
+        if start is not None and end is not None:
+            return lease_start <= end and start <= lease_end
+        if start is not None:
+            return start <= lease_end
+        return lease_end <= end
+
+    def __prune(self, *, node_id: str, states: List[ReservationStates]) -> List[ABCReservationMixin]:
+        """
+        Return the reservations on the node in one of the states; terminal reservations are dropped from the index
+        """
+        result = []
+        terminal = []
+        for rid, reservation in self.reservations.get(node_id, {}).items():
+            if reservation.is_closed() or reservation.is_failed():
+                terminal.append(rid)
+                continue
+            if reservation.get_state() in states:
+                result.append(reservation)
+        for rid in terminal:
+            self.__remove(rid=rid)
+        return result
+
+    def get_reservations(self, *, node_id: str, start: datetime = None,
+                         end: datetime = None) -> List[ABCReservationMixin]:
+        """
+        Return the Active/Ticketed/Nascent reservations allocated on a graph node overlapping the time window
+        :param node_id: graph node id
+        :param start: start time
+        :param end: end time
+        :return: list of reservations
+        """
+        with self.lock:
+            reservations = self.__prune(node_id=node_id, states=self.RESERVATION_STATES)
+        return [r for r in reservations if self.__overlaps(reservation=r, start=start, end=end)]
+
+    def get_components(self, *, node_id: str, start: datetime = None, end: datetime = None,
+                       excludes: List[str] = None, include_ns: bool = True,
+                       include_node: bool = True) -> Dict[str, List[str]]:
+        """
+        Return the components on a graph node in use by reservations overlapping the time window
+        :param node_id: graph node id
+        :param start: start time
+        :param end: end time
+        :param excludes: reservation ids to ignore
+        :param include_ns: include components used by network service reservations
+        :param include_node: include components used by node reservations
+        :return: Dictionary with component name as the key and value as list of associated PCI addresses in use.
+        """
+        result = {}
+        with self.lock:
+            entries = list(self.components.get(node_id, {}).items())
+            reservations = {}
+            for rid, comps in entries:
+                for nid in self.nodes_by_rid.get(rid, set()):
+                    r = self.reservations.get(nid, {}).get(rid)
+                    if r is not None:
+                        reservations[rid] = r
+                        break
+
+        for rid, comps in entries:
+            if excludes and rid in excludes:
+                continue
+            reservation = reservations.get(rid)
+            if reservation is None or reservation.get_state() not in self.COMPONENT_STATES:
+                continue
+            if not self.__overlaps(reservation=reservation, start=start, end=end):
+                continue
+            sliver = InventoryForType.get_allocated_sliver(reservation=reservation)
+            if sliver is None and reservation.get_requested_resources() is not None:
+                sliver = reservation.get_requested_resources().get_sliver()
+            if isinstance(sliver, NetworkServiceSliver) and not include_ns:
+                continue
+            if isinstance(sliver, NodeSliver) and not include_node:
+                continue
+            for comp_id, bdf in comps:
+                if comp_id not in result:
+                    result[comp_id] = []
+                if bdf not in result[comp_id]:
+                    result[comp_id].append(bdf)
+        return result
+
+    def get_graph_node(self, *, node_id: str) -> NodeSliver or None:
+        """
+        Return a copy of the cached graph node; callers are free to modify the returned sliver
+        :param node_id: graph node id
+        :return: NodeSliver or None if not cached
+        """
+        with self.lock:
+            graph_node = self.graph_nodes.get(node_id)
+        if graph_node is None:
+            return None
+        return copy.deepcopy(graph_node)
+
+    def add_graph_node(self, *, node_id: str, graph_node: NodeSliver):
+        """
+        Cache a graph node built from the CBM
+        :param node_id: graph node id
+        :param graph_node: graph node
+        """
+        if graph_node is None:
+            return
+        with self.lock:
+            self.graph_nodes[node_id] = copy.deepcopy(graph_node)
+
+    def clear_graph_nodes(self):
+        """
+        Invalidate the cached graph nodes; must be invoked whenever the CBM is updated
+        """
+        with self.lock:
+            self.graph_nodes.clear()
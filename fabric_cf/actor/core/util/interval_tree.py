@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import random
+from typing import Any, Iterator, List, Tuple
+
+
+class IntervalTreeNode:
+    """
+    Node of the interval tree; a closed interval [start, end] identified by key
+    """
+    __slots__ = ['start', 'end', 'key', 'value', 'priority', 'left', 'right', 'max_end', 'min_end']
+
+    def __init__(self, *, start: int, end: int, key: Any, value: Any):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        # Largest and smallest end of the intervals in the subtree rooted at this node
+        self.max_end = end
+        self.min_end = end
+
+    def order(self) -> Tuple[int, Any]:
+        return self.start, self.key
+
+    def update(self):
+        self.max_end = self.end
+        self.min_end = self.end
+        for child in (self.left, self.right):
+            if child is not None:
+                if child.max_end > self.max_end:
+                    self.max_end = child.max_end
+                if child.min_end < self.min_end:
+                    self.min_end = child.min_end
+
+
+class IntervalTree:
+    """
+    Augmented interval tree holding closed intervals [start, end], each identified by a unique key.
+
+    The tree is a treap ordered by (start, key); every node tracks the largest and smallest end of the
+    intervals in its subtree. Inserts and removals take O(log(n)) expected time; stabbing, overlap and
+    expiry queries take O(log(n) + k) expected time, where k is the number of intervals returned.
+    """
+    def __init__(self):
+        self.root = None
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Iterate over (start, end, value) in increasing order of start
+        """
+        stack = []
+        node = self.root
+        while len(stack) > 0 or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end, node.value
+            node = node.right
+
+    def clear(self):
+        self.root = None
+        self.count = 0
+
+    @staticmethod
+    def __split(node: IntervalTreeNode, order: Tuple[int, Any], inclusive: bool) -> Tuple[IntervalTreeNode,
+                                                                                           IntervalTreeNode]:
+        """
+        Split the subtree into the nodes ordered before order (also equal to it if inclusive) and the rest
+        """
+        if node is None:
+            return None, None
+        node_order = node.order()
+        if node_order < order or (inclusive and node_order == order):
+            left, right = IntervalTree.__split(node.right, order, inclusive)
+            node.right = left
+            node.update()
+            return node, right
+        left, right = IntervalTree.__split(node.left, order, inclusive)
+        node.left = right
+        node.update()
+        return left, node
+
+    @staticmethod
+    def __merge(left: IntervalTreeNode, right: IntervalTreeNode) -> IntervalTreeNode:
+        """
+        Merge two subtrees where every node of left is ordered before every node of right
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = IntervalTree.__merge(left.right, right)
+            left.update()
+            return left
+        right.left = IntervalTree.__merge(left, right.left)
+        right.update()
+        return right
+
+    def insert(self, *, start: int, end: int, key: Any, value: Any):
+        """
+        Insert an interval; the caller must ensure no interval with the same start and key is present
+        @param start start of the interval
+        @param end end of the interval
+        @param key key identifying the interval
+        @param value value associated with the interval
+        """
+        node = IntervalTreeNode(start=start, end=end, key=key, value=value)
+        left, right = self.__split(self.root, node.order(), False)
+        self.root = self.__merge(self.__merge(left, node), right)
+        self.count += 1
+
+    def remove(self, *, start: int, key: Any) -> bool:
+        """
+        Remove an interval
+        @param start start of the interval
+        @param key key identifying the interval
+        @return True if the interval was removed; False if not found
+        """
+        left, right = self.__split(self.root, (start, key), False)
+        found, right = self.__split(right, (start, key), True)
+        self.root = self.__merge(left, right)
+        if found is not None:
+            self.count -= 1
+            return True
+        return False
+
+    def overlap(self, *, start: int, end: int) -> List[Any]:
+        """
+        Return the values of the intervals intersecting [start, end]
+        @param start start of the range
+        @param end end of the range
+        @return values
+        """
+        result = []
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node is None or node.max_end < start:
+                continue
+            stack.append(node.left)
+            # Nodes on the right start after this node
+            if node.start <= end:
+                if node.end >= start:
+                    result.append(node.value)
+                stack.append(node.right)
+        return result
+
+    def stab(self, *, point: int) -> List[Any]:
+        """
+        Return the values of the intervals containing point
+        @param point point
+        @return values
+        """
+        return self.overlap(start=point, end=point)
+
+    def ending_by(self, *, time: int) -> List[Tuple[int, Any, Any]]:
+        """
+        Return (start, key, value) of the intervals whose end is not after time
+        @param time time
+        @return list of (start, key, value)
+        """
+        result = []
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node is None or node.min_end > time:
+                continue
+            if node.end <= time:
+                result.append((node.start, node.key, node.value))
+            stack.append(node.left)
+            stack.append(node.right)
+        return result
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Prometheus instrumentation of the hot paths of the actors. The metrics are registered with the default
+registry and are served by the prometheus HTTP server each actor starts on the configured prometheus.port.
+"""
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from prometheus_client import Counter, Histogram
+
+# Latency buckets in seconds; fine grained below a second so that sub-second regressions are visible
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0, 120.0, 300.0)
+
+KERNEL_TICK_PHASE_SECONDS = Histogram("cf_kernel_tick_phase_seconds", "Duration of the kernel tick phases",
+                                      ["phase"], buckets=LATENCY_BUCKETS)
+
+EVENT_QUEUE_WAIT_SECONDS = Histogram("cf_event_queue_wait_seconds",
+                                     "Time spent by events in the event processor queue",
+                                     ["processor", "event"], buckets=LATENCY_BUCKETS)
+
+EVENT_RUN_SECONDS = Histogram("cf_event_run_seconds", "Time spent processing events in the event processor",
+                              ["processor", "event"], buckets=LATENCY_BUCKETS)
+
+RPC_MESSAGE_SECONDS = Histogram("cf_rpc_message_seconds",
+                                "Time from queuing an incoming RPC message to completing its processing",
+                                ["message"], buckets=LATENCY_BUCKETS)
+
+DB_QUERY_SECONDS = Histogram("cf_db_query_seconds", "Duration of the database operations",
+                             ["method"], buckets=LATENCY_BUCKETS)
+
+DB_QUERY_ERRORS = Counter("cf_db_query_errors", "Number of failed database operations", ["method"])
+
+POLICY_SECONDS = Histogram("cf_policy_seconds", "Duration of the policy operations",
+                           ["operation"], buckets=LATENCY_BUCKETS)
+
+HANDLER_SECONDS = Histogram("cf_handler_seconds", "Time from submitting a handler operation to its completion",
+                            ["operation"], buckets=LATENCY_BUCKETS)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels):
+    """
+    Observe the duration of the enclosed block in the histogram; the duration is observed even if the block raises
+    @param histogram histogram
+    @param labels label values
+    """
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - begin)
+
+
+def instrument_methods(*, histogram: Histogram, errors: Counter = None, excludes: tuple = ()):
+    """
+    Class decorator observing the duration of every public method in the histogram labelled by method name
+    and counting the methods raising an exception
+    @param histogram histogram with a single method label
+    @param errors counter with a single method label
+    @param excludes names of the methods not to instrument
+    """
+    def decorate(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or name in excludes or not callable(member) or \
+                    isinstance(member, (staticmethod, classmethod)):
+                continue
+            setattr(cls, name, _instrument(func=member, histogram=histogram, errors=errors))
+        return cls
+    return decorate
+
+
+def _instrument(*, func, histogram: Histogram, errors: Counter = None):
+    observed = histogram.labels(method=func.__name__)
+    failed = errors.labels(method=func.__name__) if errors is not None else None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        begin = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            if failed is not None:
+                failed.inc()
+            raise
+        finally:
+            observed.observe(time.perf_counter() - begin)
+    return wrapper
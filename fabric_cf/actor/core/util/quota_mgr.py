@@ -26,6 +26,9 @@
 import logging
 import re
 import threading
+import time
+import traceback
+from collections import defaultdict
 from typing import Any
 
 from fabrictestbed.external_api.core_api import CoreApi
@@ -37,21 +40,112 @@ from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
 from fabric_cf.actor.core.policy.inventory_for_type import InventoryForType
 
 
+class ProjectQuotaLedger:
+    """
+    Local accounting of the quota usage of a project.
+
+    quotas holds the snapshot of the quotas fetched from Core API, with quota_used including the deltas
+    which have been synced since; pending holds the usage deltas which have not been synced yet and
+    in_flight the deltas being pushed to Core API.
+    """
+    def __init__(self, *, project_id: str):
+        self.project_id = project_id
+        self.quotas = {}
+        self.pending = defaultdict(float)
+        self.in_flight = defaultdict(float)
+        self.refreshed_at = None
+        # Serializes the refresh of the snapshot and the sync of the deltas of the project
+        self.sync_lock = threading.Lock()
+
+    def get_used(self, *, quota_key: tuple[str, str]) -> float:
+        """
+        Return the usage of a quota including the deltas not yet synced
+        """
+        return self.quotas[quota_key]["quota_used"] + self.pending.get(quota_key, 0) + \
+            self.in_flight.get(quota_key, 0)
+
+    def complete(self, *, quota_key: tuple[str, str], usage: float, applied: bool):
+        """
+        Complete the push of an in-flight usage delta; a delta which was not applied is pending again
+        """
+        self.in_flight[quota_key] -= usage
+        if abs(self.in_flight[quota_key]) < 1e-9:
+            self.in_flight.pop(quota_key)
+        if applied:
+            existing = self.quotas.get(quota_key)
+            if existing is not None:
+                existing["quota_used"] = existing.get("quota_used", 0) + usage
+        else:
+            self.pending[quota_key] += usage
+
+
 class QuotaMgr:
     """
     Manages resource quotas for projects, including listing, updating, and enforcing limits.
+
+    Quota usage is accounted in a local per-project ledger. Limits are enforced against the ledger and
+    the usage deltas are synced to Core API in batches by a background worker, so allocations and
+    closes never wait on Core API. The snapshot of the quotas of a project is fetched when the project
+    is first seen and refreshed every refresh_interval seconds.
     """
-    def __init__(self, *, core_api_host: str, token: str, logger: logging.Logger):
+    DEFAULT_REFRESH_INTERVAL_SECONDS = 300
+    DEFAULT_SYNC_INTERVAL_SECONDS = 5
+    DEFAULT_SYNC_RETRIES = 3
+    DEFAULT_RETRY_DELAY_SECONDS = 1
+
+    __catalog = None
+
+    def __init__(self, *, core_api_host: str, token: str, logger: logging.Logger, core_api: CoreApi = None,
+                 refresh_interval: int = DEFAULT_REFRESH_INTERVAL_SECONDS,
+                 sync_interval: int = DEFAULT_SYNC_INTERVAL_SECONDS, sync_retries: int = DEFAULT_SYNC_RETRIES,
+                 retry_delay: float = DEFAULT_RETRY_DELAY_SECONDS):
         """
         Initialize the Quota Manager.
 
         @param core_api_host: The API host for core services.
         @param token: Authentication token for API access.
         @param logger: Logger instance for logging messages.
+        @param core_api: Core API client to use instead of the one created for core_api_host.
+        @param refresh_interval: Interval in seconds after which the quota snapshot of a project is refreshed.
+        @param sync_interval: Interval in seconds at which the usage deltas are synced to Core API.
+        @param sync_retries: Number of attempts to sync a usage delta in each sync cycle.
+        @param retry_delay: Delay in seconds before retrying a failed sync; doubled on every attempt.
         """
-        self.core_api = CoreApi(core_api_host=core_api_host, token=token)
+        self.core_api = core_api if core_api is not None else CoreApi(core_api_host=core_api_host, token=token)
         self.logger = logger
+        self.refresh_interval = refresh_interval
+        self.sync_interval = sync_interval
+        self.sync_retries = max(1, sync_retries)
+        self.retry_delay = retry_delay
+        # Protects the ledgers
         self.lock = threading.Lock()
+        self.ledgers = {}
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        """
+        Start the background worker syncing the usage to Core API
+        """
+        with self.condition:
+            if self.thread is not None:
+                return
+            self.stopped = False
+            self.thread = threading.Thread(target=self.run, name="QuotaMgr", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the background worker and sync the pending usage
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sync()
 
     def list_quotas(self, project_uuid: str, offset: int = 0, limit: int = 200) -> dict[tuple[str, str], dict]:
         """
@@ -68,55 +162,172 @@ class QuotaMgr:
             quotas[(q.get("resource_type").get("name").lower(), q.get("resource_unit").lower())] = q
         return quotas
 
+    def __get_ledger(self, *, project_id: str) -> ProjectQuotaLedger:
+        with self.lock:
+            ledger = self.ledgers.get(project_id)
+            if ledger is None:
+                ledger = ProjectQuotaLedger(project_id=project_id)
+                self.ledgers[project_id] = ledger
+            return ledger
+
+    def __is_stale(self, *, ledger: ProjectQuotaLedger) -> bool:
+        return ledger.refreshed_at is None or time.monotonic() - ledger.refreshed_at >= self.refresh_interval
+
+    def __refresh(self, *, ledger: ProjectQuotaLedger, force: bool = False):
+        """
+        Fetch the quota snapshot of a project from Core API
+        @param ledger ledger of the project
+        @param force refresh even if the snapshot is not stale
+        """
+        with ledger.sync_lock:
+            if not force and not self.__is_stale(ledger=ledger):
+                return
+            quotas = self.list_quotas(project_uuid=ledger.project_id)
+            with self.lock:
+                ledger.quotas = quotas
+                ledger.refreshed_at = time.monotonic()
+            self.logger.debug(f"Refreshed quotas for project {ledger.project_id}: {quotas}")
+
+    def get_ledger(self, *, project_id: str) -> ProjectQuotaLedger:
+        """
+        Get the ledger of a project; the quota snapshot is fetched when the project is seen the first time
+        @param project_id project id
+        @return ledger
+        """
+        ledger = self.__get_ledger(project_id=project_id)
+        if ledger.refreshed_at is None:
+            self.__refresh(ledger=ledger)
+        return ledger
+
     def update_quota(self, reservation: ABCReservationMixin, duration: float):
         """
-        Update the quota usage for a given reservation.
+        Update the quota usage for a given reservation. The usage is accounted in the local ledger and
+        synced to Core API by the background worker.
 
         @param reservation: Reservation object containing resource usage details.
         @param duration: Duration in milliseconds for which the reservation was held.
         """
         try:
-            with self.lock:  # Locking critical section
-                self.logger.debug("Acquired lock for quota update.")
-
-                slice_object = reservation.get_slice()
-                if not slice_object:
-                    return
-                project_id = slice_object.get_project_id()
-                if not project_id:
-                    return
+            slice_object = reservation.get_slice()
+            if not slice_object:
+                return
+            project_id = slice_object.get_project_id()
+            if not project_id:
+                return
 
-                sliver = InventoryForType.get_allocated_sliver(reservation=reservation)
-                if not sliver:
-                    return
+            sliver = InventoryForType.get_allocated_sliver(reservation=reservation)
+            if not sliver:
+                return
 
-                if duration < 60:
-                    return
+            if duration < 60:
+                return
 
-                existing_quotas = self.list_quotas(project_uuid=project_id)
+            sliver_quota_usage = self.extract_quota_usage(sliver=sliver, duration=duration)
+            if not sliver_quota_usage:
+                return
 
-                sliver_quota_usage = self.extract_quota_usage(sliver=sliver, duration=duration)
+            self.logger.debug(f"Updated by: {sliver_quota_usage}")
 
-                self.logger.debug(f"Existing: {existing_quotas}")
-                self.logger.debug(f"Updated by: {sliver_quota_usage}")
+            # Return resource hours for a sliver deleted before expiry
+            sign = -1 if reservation.is_closing() or reservation.is_closed() else 1
 
-                # Check each accumulated resource usage against its quota
+            ledger = self.__get_ledger(project_id=project_id)
+            with self.lock:
                 for quota_key, total_duration in sliver_quota_usage.items():
-                    existing = existing_quotas.get(quota_key)
-                    if not existing:
-                        self.logger.debug("Existing not found, skipping!")
-                        continue
-
-                    # Return resource hours for a sliver deleted before expiry
-                    usage = -total_duration if reservation.is_closing() or reservation.is_closed() else total_duration
-
-                    self.core_api.update_quota_usage(uuid=existing.get("uuid"), project_uuid=project_id,
-                                                     quota_used=usage)
-
+                    ledger.pending[quota_key] += sign * total_duration
         except Exception as e:
             self.logger.error(f"Failed to update Quota: {e}")
-        finally:
-            self.logger.debug("Released lock for quota update.")
+
+    def __update_quota_usage(self, *, uuid: str, project_id: str, usage: float):
+        """
+        Sync a usage delta to Core API, retrying on failure
+        @raises Exception if the usage could not be synced after all the attempts
+        """
+        delay = self.retry_delay
+        for attempt in range(1, self.sync_retries + 1):
+            try:
+                self.core_api.update_quota_usage(uuid=uuid, project_uuid=project_id, quota_used=usage)
+                return
+            except Exception as e:
+                if attempt == self.sync_retries:
+                    raise e
+                self.logger.warning(f"Failed to update quota {uuid} of project {project_id} "
+                                    f"(attempt {attempt}/{self.sync_retries}): {e}")
+                time.sleep(delay)
+                delay *= 2
+
+    def __sync_ledger(self, *, ledger: ProjectQuotaLedger):
+        """
+        Sync the pending usage deltas of a project to Core API and refresh the snapshot if stale;
+        deltas which fail to sync stay pending for the next cycle
+        """
+        with ledger.sync_lock:
+            # The deltas stay accounted as in flight until the push is applied
+            with self.lock:
+                pending = dict(ledger.pending)
+                ledger.pending.clear()
+                for quota_key, usage in pending.items():
+                    ledger.in_flight[quota_key] += usage
+
+            if len(pending) > 0 and ledger.refreshed_at is None:
+                try:
+                    quotas = self.list_quotas(project_uuid=ledger.project_id)
+                    with self.lock:
+                        ledger.quotas = quotas
+                        ledger.refreshed_at = time.monotonic()
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch quotas for project {ledger.project_id}: {e}")
+                    with self.lock:
+                        for quota_key, usage in pending.items():
+                            ledger.complete(quota_key=quota_key, usage=usage, applied=False)
+                    return
+
+            for quota_key, usage in pending.items():
+                existing = ledger.quotas.get(quota_key)
+                if not existing or usage == 0:
+                    if not existing:
+                        self.logger.debug(f"Quota {quota_key} not found for project {ledger.project_id}, skipping!")
+                    with self.lock:
+                        ledger.in_flight.pop(quota_key, None)
+                    continue
+                try:
+                    self.__update_quota_usage(uuid=existing.get("uuid"), project_id=ledger.project_id,
+                                              usage=usage)
+                    with self.lock:
+                        ledger.complete(quota_key=quota_key, usage=usage, applied=True)
+                except Exception as e:
+                    self.logger.error(f"Failed to update quota {quota_key} of project {ledger.project_id}: {e}")
+                    with self.lock:
+                        ledger.complete(quota_key=quota_key, usage=usage, applied=False)
+
+        if self.__is_stale(ledger=ledger):
+            try:
+                self.__refresh(ledger=ledger)
+            except Exception as e:
+                self.logger.error(f"Failed to refresh quotas for project {ledger.project_id}: {e}")
+
+    def sync(self):
+        """
+        Sync the pending usage of all the projects to Core API and refresh the stale quota snapshots
+        """
+        with self.lock:
+            ledgers = list(self.ledgers.values())
+        for ledger in ledgers:
+            try:
+                self.__sync_ledger(ledger=ledger)
+            except Exception as e:
+                self.logger.error(f"Failed to sync quotas for project {ledger.project_id}: {e}")
+                self.logger.error(traceback.format_exc())
+
+    def run(self):
+        while True:
+            with self.condition:
+                if self.stopped:
+                    return
+                self.condition.wait(timeout=self.sync_interval)
+                if self.stopped:
+                    return
+            self.sync()
 
     @staticmethod
     def __massage_name(name: str) -> str:
@@ -127,6 +338,15 @@ class QuotaMgr:
         """
         return re.sub(r'[ -]', '_', name)
 
+    @staticmethod
+    def get_instance_catalog() -> InstanceCatalog:
+        """
+        Return the instance catalog; loaded once and shared
+        """
+        if QuotaMgr.__catalog is None:
+            QuotaMgr.__catalog = InstanceCatalog()
+        return QuotaMgr.__catalog
+
     @staticmethod
     def extract_quota_usage(sliver: NodeSliver, duration: float) -> dict[tuple[str, str], float]:
         """
@@ -147,7 +367,7 @@ class QuotaMgr:
 
         allocations = sliver.get_capacity_allocations()
         if not allocations and sliver.get_capacity_hints():
-            catalog = InstanceCatalog()
+            catalog = QuotaMgr.get_instance_catalog()
             allocations = catalog.get_instance_capacities(instance_type=
                                                           sliver.get_capacity_hints().instance_type)
         else:
@@ -180,6 +400,7 @@ class QuotaMgr:
     def enforce_quota_limits(self, reservation: ABCReservationMixin, duration: float) -> tuple[bool, Any]:
         """
         Verify whether a reservation's requested resources fit within the project's quota limits.
+        The usage is taken from the local ledger, including the usage not yet synced to Core API.
 
         @param reservation: The reservation to check against available quotas.
         @param duration: Duration in milliseconds for the reservation request.
@@ -204,15 +425,15 @@ class QuotaMgr:
                 return False, None
 
             sliver_resources = self.extract_quota_usage(sliver, duration)
-            quotas = self.list_quotas(project_uuid=project_uuid)
+            ledger = self.get_ledger(project_id=project_uuid)
 
             # Check each accumulated resource usage against its quota
             for quota_key, total_requested_duration in sliver_resources.items():
-                if quota_key not in quotas:
-                    return False, f"Quota not defined for resource: {quota_key[0]} ({quota_key[1]})."
-
-                quota_info = quotas[quota_key]
-                available_quota = quota_info["quota_limit"] - quota_info["quota_used"]
+                with self.lock:
+                    quota_info = ledger.quotas.get(quota_key)
+                    if quota_info is None:
+                        return False, f"Quota not defined for resource: {quota_key[0]} ({quota_key[1]})."
+                    available_quota = quota_info["quota_limit"] - ledger.get_used(quota_key=quota_key)
 
                 if total_requested_duration > available_quota:
                     return False, (
@@ -23,12 +23,12 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import bisect
+from typing import List
 
 from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+from fabric_cf.actor.core.util.interval_tree import IntervalTree
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.core.util.resource_type import ResourceType
-from fabric_cf.actor.core.util.utils import binary_search
 
 
 class ReservationWrapper:
@@ -76,17 +76,24 @@ class ReservationHoldings:
     As time goes by, the class can be purged from irrelevant reservation records
     by invoking tick(). Purging is strongly recommended as it reduces the cost of intersection queries.
 
-    An attempt has been made to optimize the cost of using this data structure.
-    Inserts are O(log(n)). Queries, however, may take between O(log(n)) and O(n).
+    Reservations are kept in an interval tree. Inserts and removals are O(log(n)); intersection
+    queries and tick are O(log(n) + k), where k is the number of reservations returned or purged.
     """
     def __init__(self):
-        # List of reservation wrappers sorted by increasing end time.
-        self.list = []
+        # Interval tree of reservation wrappers keyed by reservation id
+        self.tree = IntervalTree()
         # All reservations stored in this collection.
         self.reservation_set = ReservationSet()
         # Map of reservations to ReservationWrappers. Needed when removing a reservation.
         self.map = {}
 
+    @property
+    def list(self) -> List[ReservationWrapper]:
+        """
+        Reservation wrappers sorted by increasing end time; O(n log(n)), meant for debugging
+        """
+        return sorted(value for start, end, value in self.tree)
+
     def add_reservation(self, *, reservation: ABCReservationMixin, start: int, end: int):
         """
         Adds a reservation to the collection for the specified period of time.
@@ -114,20 +121,25 @@ class ReservationHoldings:
 
     def add_to_list(self, *, entry: ReservationWrapper):
         """
-        Adds the entry to the linked list. Maintains the list in sorted order.
+        Adds the entry to the interval tree.
         Cost: O(log(n)).
         @params entry : entry to add
         """
-        bisect.insort_left(self.list, entry)
+        self.tree.insert(start=entry.start, end=entry.end, key=str(entry.reservation.get_reservation_id()),
+                         value=entry)
 
     def clear(self):
         """
         Clears the collection.
         """
         self.map.clear()
-        self.list.clear()
+        self.tree.clear()
         self.reservation_set.clear()
 
+    @staticmethod
+    def __matches(*, entry: ReservationWrapper, rtype: ResourceType = None) -> bool:
+        return rtype is None or rtype == entry.reservation.get_type()
+
     def get_reservations(self, *, time: int = None, rtype: ResourceType = None) -> ReservationSet:
         """
         Performs an intersection query: returns all reservations from the
@@ -141,46 +153,39 @@ class ReservationHoldings:
             return self.reservation_set
 
         result = ReservationSet()
-        key = ReservationWrapper(reservation=None, start=time, end=time)
-
-        # Find the location of key in the list.
-        index = binary_search(a=self.list, x=key)
-        if index < 0:
-            index = -index - 1
-
-        # Scan the upper part of the list. We need to scan the whole list.
-        i = index
-        count = self.size()
-        while i < count:
-            entry = self.list[i]
-
-            if rtype is None or rtype == entry.reservation.getType():
-                if entry.start <= time <= entry.end:
-                    result.add(reservation=entry.reservation)
-            i += 1
-
-        # Scan the lower part of the list until no further intersections are possible
-        i = index - 1
-        while i >= 0:
-            entry = self.list[i]
-            if entry.end < time:
-                break
-
-            if entry.start <= time and rtype is None or entry.reservation.getType() == rtype:
+        if time is None:
+            entries = self.map.values()
+        else:
+            entries = self.tree.stab(point=time)
+
+        for entry in entries:
+            if self.__matches(entry=entry, rtype=rtype):
                 result.add(reservation=entry.reservation)
-            i -= 1
 
         return result
 
-    def remove_from_list(self, *, entry: ReservationWrapper):
+    def get_reservations_in_range(self, *, start: int, end: int, rtype: ResourceType = None) -> ReservationSet:
         """
-        Removes a reservation from the collection.
-        @params reservation : reservation to remove
+        Performs a range query: returns all reservations from the specified resource
+        type present in the collection that are active at any time in [start, end].
+        @params start : start time
+        @params end : end time
+        @params rtype : resource type
+        @returns reservations set containing active reservations
         """
-        index = binary_search(a=self.list, x=entry)
+        result = ReservationSet()
+        for entry in self.tree.overlap(start=start, end=end):
+            if self.__matches(entry=entry, rtype=rtype):
+                result.add(reservation=entry.reservation)
+        return result
 
-        if index >= 0:
-            self.list.pop(index)
+    def remove_from_list(self, *, entry: ReservationWrapper):
+        """
+        Removes the entry from the interval tree.
+        Cost: O(log(n)).
+        @params entry : entry to remove
+        """
+        self.tree.remove(start=entry.start, key=str(entry.reservation.get_reservation_id()))
 
     def remove_reservation(self, *, reservation: ABCReservationMixin):
         """
@@ -205,14 +210,7 @@ class ReservationHoldings:
         Removes all reservations that have end time not after the given cycle.
         @params time : time
         """
-        while True:
-            if len(self.list) > 0:
-                entry = self.list[0]
-                if entry.end <= time:
-                    self.list.remove(entry)
-                    self.reservation_set.remove(reservation=entry.reservation)
-                    self.map.pop(entry.reservation.get_reservation_id())
-                else:
-                    break
-            else:
-                break
+        for start, key, entry in self.tree.ending_by(time=time):
+            self.tree.remove(start=start, key=key)
+            self.reservation_set.remove(reservation=entry.reservation)
+            self.map.pop(entry.reservation.get_reservation_id())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import bisect
+import ipaddress
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+from typing import Union
+
+IPNetwork = Union[IPv4Network, IPv6Network]
+IPAddress = Union[IPv4Address, IPv6Address]
+
+
+class SubnetPool:
+    """
+    Pool of free, equally sized blocks carved out of an IP network.
+
+    Free space is kept as a sorted list of disjoint, inclusive intervals of block indices, so the pool
+    never enumerates the blocks of the network. With new_prefix equal to the maximum prefix length
+    (32 for IPv4) the blocks are individual host addresses.
+
+    Allocating the next free block is O(1); reserving or releasing a specific block is O(log(n)) in
+    the number of free intervals, plus the cost of splitting or merging an interval.
+    """
+    def __init__(self, *, network: IPNetwork, new_prefix: int, exclude_first: int = 0, exclude_last: int = 0):
+        """
+        Create a pool with all the blocks of the network free
+        @param network network to carve the blocks from
+        @param new_prefix prefix length of each block
+        @param exclude_first number of blocks at the start of the network which are never allocated
+        @param exclude_last number of blocks at the end of the network which are never allocated
+        """
+        if new_prefix < network.prefixlen or new_prefix > network.max_prefixlen:
+            raise ValueError(f"Invalid prefix {new_prefix} for {network}")
+        self.network = network
+        self.new_prefix = new_prefix
+        self.block_size = 1 << (network.max_prefixlen - new_prefix)
+        self.base = int(network.network_address)
+        total = 1 << (new_prefix - network.prefixlen)
+
+        # Sorted, disjoint inclusive intervals of free block indices
+        self.starts = []
+        self.ends = []
+        self.count = 0
+        start = exclude_first
+        end = total - 1 - exclude_last
+        if start <= end:
+            self.starts.append(start)
+            self.ends.append(end)
+            self.count = end - start + 1
+
+    @staticmethod
+    def hosts(*, network: IPNetwork) -> SubnetPool:
+        """
+        Create a pool of the usable host addresses of a network i.e. the addresses returned by network.hosts()
+        @param network network
+        @return pool
+        """
+        exclude = 1 if network.max_prefixlen - network.prefixlen >= 2 else 0
+        exclude_last = exclude if isinstance(network, IPv4Network) else 0
+        return SubnetPool(network=network, new_prefix=network.max_prefixlen, exclude_first=exclude,
+                          exclude_last=exclude_last)
+
+    def __index(self, value: Union[IPNetwork, IPAddress]) -> int or None:
+        """
+        Return the block index for a network or address, or None if it is not a block of this pool
+        """
+        if isinstance(value, (IPv4Address, IPv6Address)):
+            if self.block_size != 1 or value.version != self.network.version:
+                return None
+            offset = int(value) - self.base
+        elif isinstance(value, (IPv4Network, IPv6Network)):
+            if value.version != self.network.version or value.prefixlen != self.new_prefix:
+                return None
+            offset = int(value.network_address) - self.base
+        else:
+            return None
+        if offset < 0 or offset % self.block_size != 0:
+            return None
+        index = offset // self.block_size
+        if index >= (1 << (self.new_prefix - self.network.prefixlen)):
+            return None
+        return index
+
+    def __block(self, index: int) -> Union[IPNetwork, IPAddress]:
+        address = ipaddress.ip_address(self.base + index * self.block_size)
+        if self.block_size == 1:
+            return address
+        return ipaddress.ip_network(f"{address}/{self.new_prefix}")
+
+    def __find(self, index: int) -> int:
+        """
+        Return the position of the free interval containing index, or -1
+        """
+        pos = bisect.bisect_right(self.starts, index) - 1
+        if pos >= 0 and self.ends[pos] >= index:
+            return pos
+        return -1
+
+    def __contains__(self, value) -> bool:
+        index = self.__index(value)
+        return index is not None and self.__find(index) >= 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def first(self) -> Union[IPNetwork, IPAddress, None]:
+        """
+        Return the lowest free block without reserving it
+        @return block or None if pool is exhausted
+        """
+        if self.count == 0:
+            return None
+        return self.__block(self.starts[0])
+
+    def reserve(self, *, value: Union[IPNetwork, IPAddress]) -> bool:
+        """
+        Mark a block as in use
+        @param value subnet or address
+        @return True if the block was free and is now reserved, False otherwise
+        """
+        index = self.__index(value)
+        if index is None:
+            return False
+        pos = self.__find(index)
+        if pos < 0:
+            return False
+        start, end = self.starts[pos], self.ends[pos]
+        if start == end:
+            del self.starts[pos]
+            del self.ends[pos]
+        elif index == start:
+            self.starts[pos] = index + 1
+        elif index == end:
+            self.ends[pos] = index - 1
+        else:
+            self.ends[pos] = index - 1
+            self.starts.insert(pos + 1, index + 1)
+            self.ends.insert(pos + 1, end)
+        self.count -= 1
+        return True
+
+    def allocate(self) -> Union[IPNetwork, IPAddress, None]:
+        """
+        Reserve and return the lowest free block
+        @return block or None if pool is exhausted
+        """
+        block = self.first()
+        if block is not None:
+            self.reserve(value=block)
+        return block
+
+    def release(self, *, value: Union[IPNetwork, IPAddress]):
+        """
+        Return a block to the pool
+        @param value subnet or address
+        """
+        index = self.__index(value)
+        if index is None or self.__find(index) >= 0:
+            return
+        pos = bisect.bisect_right(self.starts, index)
+        merge_prev = pos > 0 and self.ends[pos - 1] == index - 1
+        merge_next = pos < len(self.starts) and self.starts[pos] == index + 1
+        if merge_prev and merge_next:
+            self.ends[pos - 1] = self.ends[pos]
+            del self.starts[pos]
+            del self.ends[pos]
+        elif merge_prev:
+            self.ends[pos - 1] = index
+        elif merge_next:
+            self.starts[pos] = index
+        else:
+            self.starts.insert(pos, index)
+            self.ends.insert(pos, index)
+        self.count += 1
+
+    def __str__(self):
+        intervals = []
+        for start, end in zip(self.starts[:5], self.ends[:5]):
+            if start == end:
+                intervals.append(f"{self.__block(start)}")
+            else:
+                intervals.append(f"{self.__block(start)}-{self.__block(end)}")
+        if len(self.starts) > 5:
+            intervals.append("...")
+        return f"{self.network}/{self.new_prefix}: {self.count} free [{', '.join(intervals)}]"
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import random
+from typing import List
+
+from fim.slivers.capacities_labels import Labels
+
+
+class VlanPool:
+    """
+    Pool of free VLAN tags backed by a 4096 bit bitmap; a set bit represents a free tag.
+
+    Reserve, release and membership checks are O(1); selecting the first free tag is a single
+    bit operation and selecting a random free tag scans at most 64 machine words.
+    """
+    MAX_VLAN = 4095
+    WORD_SIZE = 64
+    WORD_MASK = (1 << WORD_SIZE) - 1
+
+    def __init__(self, *, bits: int = 0):
+        self.bits = bits
+
+    @staticmethod
+    def __bit(vlan: int) -> int:
+        vlan = int(vlan)
+        if vlan < 0 or vlan > VlanPool.MAX_VLAN:
+            raise ValueError(f"Invalid VLAN tag: {vlan}")
+        return 1 << vlan
+
+    @staticmethod
+    def from_range(*, start: int, end: int) -> VlanPool:
+        """
+        Create a pool with all the tags in the range [start, end] free
+        @param start first tag
+        @param end last tag
+        @return pool
+        """
+        start = int(start)
+        end = int(end)
+        if start > end:
+            return VlanPool()
+        # Validate the bounds
+        VlanPool.__bit(start)
+        VlanPool.__bit(end)
+        return VlanPool(bits=((1 << (end - start + 1)) - 1) << start)
+
+    @staticmethod
+    def from_labels(*, labels: Labels) -> VlanPool or None:
+        """
+        Create a pool from the vlan_range (or vlan) on the labels
+        @param labels labels
+        @return pool or None if labels do not carry any VLAN information
+        """
+        if labels is None:
+            return None
+        if labels.vlan_range is not None:
+            vlan_ranges = labels.vlan_range if isinstance(labels.vlan_range, list) else [labels.vlan_range]
+            pool = VlanPool()
+            for v_r in vlan_ranges:
+                vlans = str(v_r).split("-")
+                pool.bits |= VlanPool.from_range(start=vlans[0], end=vlans[-1]).bits
+            return pool
+        if labels.vlan is not None:
+            return VlanPool(bits=VlanPool.__bit(labels.vlan))
+        return None
+
+    def reserve(self, *, vlan: int) -> bool:
+        """
+        Mark a tag as in use
+        @param vlan tag
+        @return True if the tag was free, False otherwise
+        """
+        bit = self.__bit(vlan)
+        was_free = (self.bits & bit) != 0
+        self.bits &= ~bit
+        return was_free
+
+    def release(self, *, vlan: int):
+        """
+        Return a tag to the pool
+        @param vlan tag
+        """
+        self.bits |= self.__bit(vlan)
+
+    def is_free(self, *, vlan: int) -> bool:
+        try:
+            return (self.bits & self.__bit(vlan)) != 0
+        except ValueError:
+            return False
+
+    def first_free(self) -> int or None:
+        """
+        Return the lowest free tag
+        @return tag or None if the pool is exhausted
+        """
+        if self.bits == 0:
+            return None
+        return (self.bits & -self.bits).bit_length() - 1
+
+    def random_free(self) -> int or None:
+        """
+        Return a free tag chosen uniformly at random
+        @return tag or None if the pool is exhausted
+        """
+        count = len(self)
+        if count == 0:
+            return None
+        n = random.randrange(count)
+        offset = 0
+        bits = self.bits
+        while bits:
+            word = bits & self.WORD_MASK
+            word_count = word.bit_count()
+            if n < word_count:
+                # Clear the lowest set bits until the n-th one is the lowest
+                for _ in range(n):
+                    word &= word - 1
+                return offset + (word & -word).bit_length() - 1
+            n -= word_count
+            bits >>= self.WORD_SIZE
+            offset += self.WORD_SIZE
+        return None
+
+    def intersect(self, *, other: VlanPool) -> VlanPool:
+        """
+        Return a new pool with the tags free in both the pools
+        @param other other pool
+        @return pool
+        """
+        return VlanPool(bits=self.bits & other.bits)
+
+    def copy(self) -> VlanPool:
+        return VlanPool(bits=self.bits)
+
+    def to_list(self) -> List[int]:
+        result = []
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            result.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return result
+
+    def __contains__(self, vlan) -> bool:
+        return self.is_free(vlan=vlan)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __eq__(self, other):
+        if not isinstance(other, VlanPool):
+            # don't attempt to compare against unrelated types
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __str__(self):
+        ranges = []
+        start = prev = None
+        for vlan in self.to_list():
+            if start is None:
+                start = prev = vlan
+            elif vlan == prev + 1:
+                prev = vlan
+            else:
+                ranges.append(f"{start}-{prev}" if start != prev else f"{start}")
+                start = prev = vlan
+        if start is not None:
+            ranges.append(f"{start}-{prev}" if start != prev else f"{start}")
+        return f"[{', '.join(ranges)}]"
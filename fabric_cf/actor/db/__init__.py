@@ -138,6 +138,8 @@ class Reservations(Base):
     lease_start = Column(TIMESTAMP(timezone=True), nullable=True)
     lease_end = Column(TIMESTAMP(timezone=True), nullable=True)
     closed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    # Versioned compact summary of the hot reservation fields; lets readers skip unpickling properties
+    summary = Column(JSON, nullable=True)
     properties = Column(LargeBinary)
     components = relationship('Components', back_populates='reservation')
     links = relationship('Links', back_populates='reservation')
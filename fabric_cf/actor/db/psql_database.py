@@ -30,11 +30,13 @@ from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import List, Tuple, Dict, Optional
 
-from sqlalchemy import create_engine, desc, func, and_, or_
-from sqlalchemy.orm import scoped_session, sessionmaker, joinedload
+from sqlalchemy import create_engine, desc, func, and_, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import scoped_session, sessionmaker, joinedload, defer
 
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import DatabaseException
+from fabric_cf.actor.core.util.metrics import instrument_methods, DB_QUERY_SECONDS, DB_QUERY_ERRORS
 from fabric_cf.actor.db import Base, Clients, ConfigMappings, Proxies, Units, Reservations, Slices, ManagerObjects, \
     Miscellaneous, Actors, Delegations, Sites, Poas, Components, Metrics, Links
 
@@ -53,6 +55,7 @@ def session_scope(psql_db_engine):
         session.close()
 
 
+@instrument_methods(histogram=DB_QUERY_SECONDS, errors=DB_QUERY_ERRORS, excludes=("get_session", "set_logger"))
 class PsqlDatabase:
     """
     Implements interface to Postgres database
@@ -670,12 +673,29 @@ class PsqlDatabase:
             raise e
         return result
 
+    def get_slices_by_ids(self, *, slc_ids: List[int]) -> List[dict]:
+        """
+        Get slices by ids
+        @param slc_ids list of slice ids
+        @return list of slice dictionaries
+        """
+        result = []
+        session = self.get_session()
+        try:
+            for row in session.query(Slices).filter(Slices.slc_id.in_(slc_ids)).all():
+                result.append(self.generate_dict_from_row(row=row))
+        except Exception as e:
+            session.rollback()
+            self.logger.error(Constants.EXCEPTION_OCCURRED.format(e))
+            raise e
+        return result
+
     def add_reservation(self, *, slc_guid: str, rsv_resid: str, rsv_category: int, rsv_state: int,
                         rsv_pending: int, rsv_joining: int, properties, lease_start: datetime = None,
                         lease_end: datetime = None, rsv_graph_node_id: str = None, oidc_claim_sub: str = None,
                         email: str = None, project_id: str = None, site: str = None, rsv_type: str = None,
                         components: List[Tuple[str, str, str]] = None, host: str = None, ip_subnet: str = None,
-                        links: list[dict] = None, closed_at: datetime = None):
+                        links: list[dict] = None, closed_at: datetime = None, summary: dict = None):
         """
         Add a reservation
         @param slc_guid slice guid
@@ -698,6 +718,7 @@ class PsqlDatabase:
         @param ip_subnet ip_subnet
         @param links: list of dictionary objects representing link
         @param closed_at timestamp when reservation was closed
+        @param summary versioned summary of the hot reservation fields
         """
         session = self.get_session()
         try:
@@ -707,7 +728,7 @@ class PsqlDatabase:
                                    lease_start=lease_start, lease_end=lease_end,
                                    properties=properties, oidc_claim_sub=oidc_claim_sub, email=email,
                                    project_id=project_id, site=site, rsv_type=rsv_type, host=host, ip_subnet=ip_subnet,
-                                   closed_at=closed_at)
+                                   closed_at=closed_at, summary=summary)
             if rsv_graph_node_id is not None:
                 rsv_obj.rsv_graph_node_id = rsv_graph_node_id
 
@@ -772,37 +793,137 @@ class PsqlDatabase:
             new_comp = Components(node_id=node_id, reservation=rsv_obj, component=cid, bdf=bdf)
             session.add(new_comp)
 
+    @staticmethod
+    def _set_reservation_fields(rsv_obj, *, rsv_category: int, rsv_state: int, rsv_pending: int, rsv_joining: int,
+                                properties, lease_start: datetime = None, lease_end: datetime = None,
+                                rsv_graph_node_id: str = None, site: str = None, rsv_type: str = None,
+                                host: str = None, ip_subnet: str = None, closed_at: datetime = None,
+                                summary: dict = None):
+        # Update reservation attributes
+        rsv_obj.rsv_category = rsv_category
+        rsv_obj.rsv_state = rsv_state
+        rsv_obj.rsv_pending = rsv_pending
+        rsv_obj.rsv_joining = rsv_joining
+        rsv_obj.properties = properties
+        rsv_obj.lease_start = lease_start
+        rsv_obj.lease_end = lease_end
+        rsv_obj.closed_at = closed_at
+        if host:
+            rsv_obj.host = host
+        if ip_subnet:
+            rsv_obj.ip_subnet = ip_subnet
+        if site is not None:
+            rsv_obj.site = site
+        if rsv_graph_node_id is not None:
+            rsv_obj.rsv_graph_node_id = rsv_graph_node_id
+        if rsv_type is not None:
+            rsv_obj.rsv_type = rsv_type
+        # Always overwritten so that a summary saved by an earlier write is not left behind once summaries
+        # are no longer produced; readers fall back to the pickled reservation when it is missing
+        rsv_obj.summary = summary
+
+    def update_reservations(self, *, records: List[dict]):
+        """
+        Update multiple reservations in a single transaction. The components and links of all the
+        reservations are loaded with one query each and the changes to them are applied with bulk
+        deletes and inserts.
+        @param records list of keyword arguments as accepted by update_reservation
+        @throws DatabaseException if any of the reservations does not exist; no reservation is updated
+        """
+        if not records:
+            return
+        session = self.get_session()
+        try:
+            rsv_resids = [r.get("rsv_resid") for r in records]
+            rows = session.query(Reservations).filter(Reservations.rsv_resid.in_(rsv_resids)).all()
+            rsv_objs = {r.rsv_resid: r for r in rows}
+
+            comp_rsv_ids = [rsv_objs[r["rsv_resid"]].rsv_id for r in records
+                            if r.get("components") and r["rsv_resid"] in rsv_objs]
+            link_rsv_ids = [rsv_objs[r["rsv_resid"]].rsv_id for r in records
+                            if r.get("links") and r["rsv_resid"] in rsv_objs]
+
+            existing_components = {}
+            if comp_rsv_ids:
+                for c in session.query(Components).filter(Components.reservation_id.in_(comp_rsv_ids)).all():
+                    existing_components.setdefault(c.reservation_id, set()).add((c.node_id, c.component, c.bdf))
+
+            existing_links = {}
+            if link_rsv_ids:
+                for l in session.query(Links).filter(Links.reservation_id.in_(link_rsv_ids)).all():
+                    existing_links.setdefault(l.reservation_id, set()).add(l.node_id)
+
+            removed_components = []
+            added_components = []
+            removed_links = []
+            added_links = []
+            for record in records:
+                rsv_obj = rsv_objs.get(record.get("rsv_resid"))
+                if rsv_obj is None:
+                    raise DatabaseException(self.OBJECT_NOT_FOUND.format("Reservation", record.get("rsv_resid")))
+
+                fields = {k: v for k, v in record.items() if k not in ["slc_guid", "rsv_resid", "components",
+                                                                        "links"]}
+                self._set_reservation_fields(rsv_obj, **fields)
+
+                components = record.get("components")
+                if components:
+                    existing = existing_components.get(rsv_obj.rsv_id, set())
+                    new_set = set(components)
+                    for node_id, cid, bdf in existing - new_set:
+                        removed_components.append((rsv_obj.rsv_id, node_id, cid, bdf))
+                    for node_id, cid, bdf in new_set - existing:
+                        added_components.append({"reservation_id": rsv_obj.rsv_id, "node_id": node_id,
+                                                 "component": cid, "bdf": bdf})
+
+                links = record.get("links")
+                if links:
+                    existing = existing_links.get(rsv_obj.rsv_id, set())
+                    new_map = {l["node_id"]: l for l in links}
+                    for node_id in existing - set(new_map):
+                        removed_links.append((rsv_obj.rsv_id, node_id))
+                    for node_id in set(new_map) - existing:
+                        l = new_map[node_id]
+                        added_links.append({"reservation_id": rsv_obj.rsv_id, "node_id": node_id,
+                                            "layer": l.get("layer"), "type": l.get("type"), "bw": l.get("bw"),
+                                            "properties": l.get("properties")})
+
+            session.flush()
+            if removed_components:
+                session.query(Components).filter(
+                    tuple_(Components.reservation_id, Components.node_id, Components.component,
+                           Components.bdf).in_(removed_components)).delete(synchronize_session=False)
+            if added_components:
+                session.execute(insert(Components).values(added_components).on_conflict_do_nothing())
+            if removed_links:
+                session.query(Links).filter(
+                    tuple_(Links.reservation_id, Links.node_id).in_(removed_links)).delete(synchronize_session=False)
+            if added_links:
+                session.execute(insert(Links).values(added_links).on_conflict_do_nothing())
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.logger.error(Constants.EXCEPTION_OCCURRED.format(e))
+            raise e
+
     def update_reservation(self, *, slc_guid: str, rsv_resid: str, rsv_category: int, rsv_state: int,
                            rsv_pending: int, rsv_joining: int, properties, lease_start: datetime = None,
                            lease_end: datetime = None, rsv_graph_node_id: str = None, site: str = None,
                            rsv_type: str = None, components: List[Tuple[str, str, str]] = None,
                            host: str = None, ip_subnet: str = None, links: list[dict] = None,
-                           closed_at: datetime = None):
+                           closed_at: datetime = None, summary: dict = None):
         session = self.get_session()
         try:
             rsv_obj = session.query(Reservations).filter_by(rsv_resid=rsv_resid).one()
             if rsv_obj is None:
                 raise DatabaseException(self.OBJECT_NOT_FOUND.format("Reservation", rsv_resid))
 
-            # Update reservation attributes
-            rsv_obj.rsv_category = rsv_category
-            rsv_obj.rsv_state = rsv_state
-            rsv_obj.rsv_pending = rsv_pending
-            rsv_obj.rsv_joining = rsv_joining
-            rsv_obj.properties = properties
-            rsv_obj.lease_start = lease_start
-            rsv_obj.lease_end = lease_end
-            rsv_obj.closed_at = closed_at
-            if host:
-                rsv_obj.host = host
-            if ip_subnet:
-                rsv_obj.ip_subnet = ip_subnet
-            if site is not None:
-                rsv_obj.site = site
-            if rsv_graph_node_id is not None:
-                rsv_obj.rsv_graph_node_id = rsv_graph_node_id
-            if rsv_type is not None:
-                rsv_obj.rsv_type = rsv_type
+            self._set_reservation_fields(rsv_obj, rsv_category=rsv_category, rsv_state=rsv_state,
+                                         rsv_pending=rsv_pending, rsv_joining=rsv_joining, properties=properties,
+                                         lease_start=lease_start, lease_end=lease_end,
+                                         rsv_graph_node_id=rsv_graph_node_id, site=site, rsv_type=rsv_type,
+                                         host=host, ip_subnet=ip_subnet, closed_at=closed_at, summary=summary)
 
             if components:
                 self._update_components(session, rsv_obj, components)
@@ -870,11 +991,70 @@ class PsqlDatabase:
 
         return filter_dict
 
+    def _build_reservation_query(self, *, session, slice_id: str = None, graph_node_id: str = None,
+                                 project_id: str = None, email: str = None, oidc_sub: str = None, rid: str = None,
+                                 states: list[int] = None, category: list[int] = None, site: str = None,
+                                 rsv_type: list[str] = None, start: datetime = None, end: datetime = None,
+                                 ip_subnet: str = None, host: str = None, after: str = None, limit: int = None,
+                                 rid_list: List[str] = None):
+        """
+        Build the query on Reservations table matching the search criteria. When after or limit is
+        specified, the rows are ordered by reservation id and only the rows following after are returned
+        (keyset pagination).
+        """
+        filter_dict = self.create_reservation_filter(slice_id=slice_id, graph_node_id=graph_node_id,
+                                                     project_id=project_id, email=email, oidc_sub=oidc_sub,
+                                                     rid=rid, site=site, ip_subnet=ip_subnet, host=host)
+        rows = session.query(Reservations).filter_by(**filter_dict)
+
+        if rid_list is not None:
+            rows = rows.filter(Reservations.rsv_resid.in_(rid_list))
+
+        if rsv_type is not None:
+            rows = rows.filter(Reservations.rsv_type.in_(rsv_type))
+
+        if states is not None:
+            rows = rows.filter(Reservations.rsv_state.in_(states))
+
+        if category is not None:
+            rows = rows.filter(Reservations.rsv_category.in_(category))
+
+        # Ensure start and end are datetime objects
+        if start and isinstance(start, str):
+            start = datetime.fromisoformat(start)
+        if end and isinstance(end, str):
+            end = datetime.fromisoformat(end)
+
+        # Construct filter condition for lease_end within the given time range
+        if start is not None or end is not None:
+            lease_end_filter = True  # Initialize with True to avoid NoneType comparison
+            if start is not None and end is not None:
+                lease_end_filter = or_(
+                    and_(start <= Reservations.lease_end, Reservations.lease_end <= end),
+                    and_(start <= Reservations.lease_start, Reservations.lease_start <= end),
+                    and_(Reservations.lease_start <= start, Reservations.lease_end >= end)
+                )
+            elif start is not None:
+                lease_end_filter = start <= Reservations.lease_end
+            elif end is not None:
+                lease_end_filter = Reservations.lease_end <= end
+
+            rows = rows.filter(lease_end_filter)
+
+        if after is not None:
+            rows = rows.filter(Reservations.rsv_resid > after)
+
+        if after is not None or limit is not None:
+            rows = rows.order_by(Reservations.rsv_resid)
+            if limit is not None:
+                rows = rows.limit(limit)
+        return rows
+
     def get_reservations(self, *, slice_id: str = None, graph_node_id: str = None, project_id: str = None,
                          email: str = None, oidc_sub: str = None, rid: str = None, states: list[int] = None,
                          category: list[int] = None, site: str = None, rsv_type: list[str] = None,
                          start: datetime = None, end: datetime = None, ip_subnet: str = None,
-                         host: str = None) -> List[dict]:
+                         host: str = None, after: str = None, limit: int = None) -> List[dict]:
         """
         Get Reservations for an actor
         @param slice_id slice id
@@ -891,48 +1071,64 @@ class PsqlDatabase:
         @param end search for slivers with lease_end_time before end
         @param ip_subnet ip subnet
         @param host host
+        @param after return only the reservations with id greater than this reservation id
+        @param limit maximum number of reservations to return
 
         @return list of reservations
         """
         result = []
         session = self.get_session()
         try:
-            filter_dict = self.create_reservation_filter(slice_id=slice_id, graph_node_id=graph_node_id,
-                                                         project_id=project_id, email=email, oidc_sub=oidc_sub,
-                                                         rid=rid, site=site, ip_subnet=ip_subnet, host=host)
-            rows = session.query(Reservations).filter_by(**filter_dict)
-
-            if rsv_type is not None:
-                rows = rows.filter(Reservations.rsv_type.in_(rsv_type))
-
-            if states is not None:
-                rows = rows.filter(Reservations.rsv_state.in_(states))
-
-            if category is not None:
-                rows = rows.filter(Reservations.rsv_category.in_(category))
-
-            # Ensure start and end are datetime objects
-            if start and isinstance(start, str):
-                start = datetime.fromisoformat(start)
-            if end and isinstance(end, str):
-                end = datetime.fromisoformat(end)
-
-            # Construct filter condition for lease_end within the given time range
-            if start is not None or end is not None:
-                lease_end_filter = True  # Initialize with True to avoid NoneType comparison
-                if start is not None and end is not None:
-                    lease_end_filter = or_(
-                        and_(start <= Reservations.lease_end, Reservations.lease_end <= end),
-                        and_(start <= Reservations.lease_start, Reservations.lease_start <= end),
-                        and_(Reservations.lease_start <= start, Reservations.lease_end >= end)
-                    )
-                elif start is not None:
-                    lease_end_filter = start <= Reservations.lease_end
-                elif end is not None:
-                    lease_end_filter = Reservations.lease_end <= end
+            rows = self._build_reservation_query(session=session, slice_id=slice_id, graph_node_id=graph_node_id,
+                                                 project_id=project_id, email=email, oidc_sub=oidc_sub, rid=rid,
+                                                 states=states, category=category, site=site, rsv_type=rsv_type,
+                                                 start=start, end=end, ip_subnet=ip_subnet, host=host,
+                                                 after=after, limit=limit)
+            for row in rows.all():
+                result.append(self.generate_dict_from_row(row=row))
+        except Exception as e:
+            session.rollback()
+            self.logger.error(Constants.EXCEPTION_OCCURRED.format(e))
+            raise e
+        return result
 
-                rows = rows.filter(lease_end_filter)
+    def get_reservation_summaries(self, *, slice_id: str = None, graph_node_id: str = None, project_id: str = None,
+                                  email: str = None, oidc_sub: str = None, rid: str = None, states: list[int] = None,
+                                  category: list[int] = None, site: str = None, rsv_type: list[str] = None,
+                                  start: datetime = None, end: datetime = None, ip_subnet: str = None,
+                                  host: str = None, after: str = None, limit: int = None,
+                                  rid_list: List[str] = None) -> List[dict]:
+        """
+        Get Reservations for an actor without loading the pickled properties
+        @param slice_id slice id
+        @param graph_node_id graph node id
+        @param project_id project id
+        @param email email
+        @param oidc_sub oidc sub
+        @param rid reservation id
+        @param states reservation state
+        @param category reservation category
+        @param site site name
+        @param rsv_type rsv_type
+        @param start search for slivers with lease_end_time after start
+        @param end search for slivers with lease_end_time before end
+        @param ip_subnet ip subnet
+        @param host host
+        @param after return only the reservations with id greater than this reservation id
+        @param limit maximum number of reservations to return
+        @param rid_list reservation guid list
 
+        @return list of reservations; pickled properties are never loaded
+        """
+        result = []
+        session = self.get_session()
+        try:
+            rows = self._build_reservation_query(session=session, slice_id=slice_id, graph_node_id=graph_node_id,
+                                                 project_id=project_id, email=email, oidc_sub=oidc_sub, rid=rid,
+                                                 states=states, category=category, site=site, rsv_type=rsv_type,
+                                                 start=start, end=end, ip_subnet=ip_subnet, host=host,
+                                                 after=after, limit=limit, rid_list=rid_list)
+            rows = rows.options(defer(Reservations.properties))
             for row in rows.all():
                 result.append(self.generate_dict_from_row(row=row))
         except Exception as e:
@@ -1846,8 +2042,8 @@ class PsqlDatabase:
         return filter_dict
 
     def get_poas(self, *, poa_guid: str = None, project_id: str = None, email: str = None, sliver_id: str = None,
-                 slice_id: str, limit: int = None, offset: int = None, last_update_time: datetime = None,
-                 states: list[int] = None) -> List[dict]:
+                 slice_id: str = None, limit: int = None, offset: int = None, last_update_time: datetime = None,
+                 states: list[int] = None, sliver_ids: List[str] = None) -> List[dict]:
         """
         Get slices for an actor
         @param poa_guid POA Guid
@@ -1859,6 +2055,7 @@ class PsqlDatabase:
         @param slice_id Slice Id
         @param last_update_time Last Update Time
         @param states
+        @param sliver_ids list of Sliver Ids
         @return list of POAs
         """
         result = []
@@ -1875,6 +2072,9 @@ class PsqlDatabase:
             if states is not None:
                 rows = rows.filter(Poas.state.in_(states))
 
+            if sliver_ids is not None:
+                rows = rows.filter(Poas.sliver_id.in_(sliver_ids))
+
             rows = rows.order_by(desc(Poas.last_update_time))
 
             if offset is not None and limit is not None:
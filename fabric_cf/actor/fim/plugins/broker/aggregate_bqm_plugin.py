@@ -46,7 +46,9 @@ from fim.slivers.interface_info import InterfaceType
 from fim.slivers.network_service import ServiceType
 from matplotlib.style.core import available
 
+from fabric_cf.actor.core.container.maintenance import Maintenance
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.plugins.db.occupancy_cache import OccupancyCache
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.abc_database import ABCDatabase
@@ -75,7 +77,7 @@ class AggregatedBQMPlugin:
     def __site_maintenance_info(self, *, site_name: str):
         if self.actor is None:
             return None
-        site = self.actor.get_plugin().get_database().get_site(site_name=site_name)
+        site = Maintenance.get_site(database=self.actor.get_plugin().get_database(), site_name=site_name)
         if site is not None:
             result = site.get_maintenance_info().copy()
             if result.get(site_name) is None:
@@ -112,8 +114,13 @@ class AggregatedBQMPlugin:
             res_type.append(str(x))
 
         # Only get Active or Ticketing reservations
-        comps = db.get_components(node_id=node_id, component=component_name, rsv_type=res_type, states=states,
-                                  start=start, end=end)
+        occupancy_cache = db.get_occupancy_cache()
+        if occupancy_cache is not None:
+            comps = occupancy_cache.get_components(node_id=node_id, component=component_name, rsv_type=res_type,
+                                                   start=start, end=end)
+        else:
+            comps = db.get_components(node_id=node_id, component=component_name, rsv_type=res_type, states=states,
+                                      start=start, end=end)
         if comps is not None:
             if comps.get(component_name):
                 result = comps.get(component_name)
@@ -147,7 +154,11 @@ class AggregatedBQMPlugin:
             res_type.append(str(x))
 
         # Only get Active or Ticketing reservations
-        existing = db.get_links(node_id=node_id, rsv_type=res_type, states=states, start=start, end=end)
+        occupancy_cache = db.get_occupancy_cache()
+        if occupancy_cache is not None:
+            existing = occupancy_cache.get_links(node_id=node_id, rsv_type=res_type, start=start, end=end)
+        else:
+            existing = db.get_links(node_id=node_id, rsv_type=res_type, states=states, start=start, end=end)
 
         bw_used = existing.get(node_id, 0)
         if bw_used:
@@ -176,6 +187,10 @@ class AggregatedBQMPlugin:
             start = now
             end = now
 
+        occupancy_cache = db.get_occupancy_cache()
+        if occupancy_cache is not None:
+            return occupancy_cache.get_node_capacities(node_id=node_id, start=start, end=end)
+
         # get existing reservations for this node
         existing_reservations = db.get_reservations(graph_node_id=node_id, states=states, start=start, end=end)
         # node capacities
@@ -185,29 +200,15 @@ class AggregatedBQMPlugin:
         if existing_reservations is not None:
             for reservation in existing_reservations:
                 # For Active or Ticketed or Ticketing reservations; compute the counts from available
-                allocated_sliver = None
-                if reservation.is_ticketing() and reservation.get_approved_resources() is not None:
-                    allocated_sliver = reservation.get_approved_resources().get_sliver()
-
-                if (reservation.is_active() or reservation.is_ticketed()) and \
-                        reservation.get_resources() is not None:
-                    allocated_sliver = reservation.get_resources().get_sliver()
-
-                if allocated_sliver is not None:
-                    occupied_capacities = occupied_capacities + allocated_sliver.get_capacity_allocations()
-
-                    if allocated_sliver.attached_components_info is not None:
-                        for allocated_component in allocated_sliver.attached_components_info.devices.values():
-                            # Ignore components without any allocations
-                            if not allocated_component.capacity_allocations:
-                                continue
-                            rt = allocated_component.resource_type
-                            rm = allocated_component.resource_model
-                            if occupied_component_capacities[rt].get(rm) is None:
-                                occupied_component_capacities[rt][rm] = Capacities()
-
-                            occupied_component_capacities[rt][rm] = occupied_component_capacities[rt][rm] + \
-                                                          allocated_component.capacity_allocations
+                allocated_caps, allocated_comp_caps = OccupancyCache.get_allocated_capacities(reservation=reservation)
+                if allocated_caps is None:
+                    continue
+                occupied_capacities = occupied_capacities + allocated_caps
+                for rt, rm, capacities in allocated_comp_caps:
+                    if occupied_component_capacities[rt].get(rm) is None:
+                        occupied_component_capacities[rt][rm] = Capacities()
+
+                    occupied_component_capacities[rt][rm] = occupied_component_capacities[rt][rm] + capacities
 
         return occupied_capacities, occupied_component_capacities
 
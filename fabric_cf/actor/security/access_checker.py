@@ -71,13 +71,27 @@ class AccessChecker:
         verify_exp = oauth_config.get(Constants.PROPERTY_CONF_O_AUTH_VERIFY_EXP, True)
         decoded_token = token_validator.validate_token(token=token, verify_exp=verify_exp)
 
-        for p in decoded_token.projects:
-            AccessChecker.check_pdp_access(action_id=action_id, email=decoded_token.email,
-                                           project=p.get(Constants.UUID), tags=p.get(Constants.TAGS),
-                                           resource=resource, lease_end_time=lease_end_time, logger=logger)
+        checks = [dict(action_id=action_id, email=decoded_token.email, project=p.get(Constants.UUID),
+                       tags=p.get(Constants.TAGS), resource=resource, lease_end_time=lease_end_time)
+                  for p in decoded_token.projects]
+        if len(checks):
+            AccessChecker.get_pdp_auth(logger=logger).check_access_batch(checks=checks)
 
         return decoded_token
 
+    @staticmethod
+    def get_pdp_auth(*, logger=None) -> PdpAuth:
+        """
+        Return the shared PDP client holding the pooled session and the decision cache
+        :param logger logger used if no shared client is available
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        pdp_auth = GlobalsSingleton.get().get_pdp_auth()
+        if pdp_auth is None:
+            pdp_config = GlobalsSingleton.get().get_config().get_global_config().get_pdp_config()
+            pdp_auth = PdpAuth(config=pdp_config, logger=logger)
+        return pdp_auth
+
     @staticmethod
     def check_pdp_access(*, action_id: ActionId, email: str, project: str, tags: List[str],
                          resource: BaseSliver or ExperimentTopology = None,
@@ -94,10 +108,7 @@ class AccessChecker:
 
         :throws exception in case of failure
         """
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        pdp_config = GlobalsSingleton.get().get_config().get_global_config().get_pdp_config()
-
-        pdp_auth = PdpAuth(config=pdp_config, logger=logger)
+        pdp_auth = AccessChecker.get_pdp_auth(logger=logger)
         pdp_auth.check_access(email=email, project=project, tags=tags,
                               lease_end_time=lease_end_time,
                               action_id=action_id, resource=resource)
@@ -23,13 +23,19 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import concurrent.futures
+import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from fim.slivers.base_sliver import BaseSliver
 from fim.user.topology import ExperimentTopology
 from fss_utils.jwt_validate import JWTValidator
@@ -88,11 +94,49 @@ class ActionId(Enum):
 class PdpAuth:
     """
     Responsible for Authorization against PDP
+
+    Requests are sent over a pooled keep-alive HTTP session and decisions are cached for a bounded time,
+    keyed on a fingerprint of the PDP request i.e. subject, project, action and resource attributes.
     """
+    CACHE_TTL = "cache-ttl"
+    CACHE_SIZE = "cache-size"
+    POOL_SIZE = "pool-size"
+    TIMEOUT = "timeout"
+
+    DEFAULT_CACHE_TTL = 60
+    DEFAULT_CACHE_SIZE = 1024
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_TIMEOUT = 30
 
     def __init__(self, *, config: dict, logger=None):
         self.config = config
         self.logger = logger
+        self.cache_ttl = int(self.config.get(self.CACHE_TTL, self.DEFAULT_CACHE_TTL))
+        self.cache_size = int(self.config.get(self.CACHE_SIZE, self.DEFAULT_CACHE_SIZE))
+        self.pool_size = int(self.config.get(self.POOL_SIZE, self.DEFAULT_POOL_SIZE))
+        self.timeout = int(self.config.get(self.TIMEOUT, self.DEFAULT_TIMEOUT))
+        # fingerprint -> (expiry, permitted, failure message)
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.session = None
+        self.executor = None
+
+    def __get_session(self) -> requests.Session:
+        with self.lock:
+            if self.session is None:
+                self.session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+                self.session.headers.update(self._headers())
+            return self.session
+
+    def __get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.pool_size,
+                                                                      thread_name_prefix=self.__class__.__name__)
+            return self.executor
 
     @staticmethod
     def _headers() -> dict:
@@ -105,6 +149,52 @@ class PdpAuth:
         }
         return headers
 
+    @staticmethod
+    def fingerprint(*, pdp_request: dict) -> str:
+        """
+        Compute a fingerprint for a PDP request which is independent of the ordering of the attributes
+        @param pdp_request PDP request
+        @return fingerprint
+        """
+        def normalize(value):
+            if isinstance(value, dict):
+                return {k: normalize(v) for k, v in value.items()}
+            if isinstance(value, list):
+                items = [normalize(v) for v in value]
+                return sorted(items, key=lambda x: json.dumps(x, sort_keys=True, default=str))
+            return value
+
+        normalized = json.dumps(normalize(pdp_request), sort_keys=True, default=str)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def __get_cached(self, *, key: str) -> Tuple[bool, str] or None:
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            expiry, permitted, msg = entry
+            if expiry < time.monotonic():
+                self.cache.pop(key, None)
+                return None
+            self.cache.move_to_end(key)
+            return permitted, msg
+
+    def __add_cached(self, *, key: str, permitted: bool, msg: str):
+        if self.cache_ttl <= 0 or self.cache_size <= 0:
+            return
+        with self.lock:
+            self.cache[key] = (time.monotonic() + self.cache_ttl, permitted, msg)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def clear_cache(self):
+        """
+        Clear the cached decisions
+        """
+        with self.lock:
+            self.cache.clear()
+
     def build_pdp_request(self, *, email: str, project: str, tags: List[str], action_id: ActionId,
                           resource: BaseSliver or ExperimentTopology, lease_end_time: datetime) -> dict:
         """
@@ -145,6 +235,58 @@ class PdpAuth:
 
         return request_json
 
+    def __evaluate(self, *, pdp_request: dict) -> Tuple[bool, str]:
+        """
+        Send the request to PDP
+        @param pdp_request PDP request
+        @return tuple of decision and the failure message
+        @raises PdpAuthException in case of failure to get a decision
+        """
+        self.logger.debug("PDP Auth Request: {}".format(pdp_request))
+
+        try:
+            response = self.__get_session().post(url=self.config['url'], json=pdp_request, timeout=self.timeout)
+
+            try:
+                response_json = response.json()
+            except ValueError:
+                # Handle non-JSON response
+                self.logger.error(f"Non-JSON response from PDP: {response.text}")
+                raise PdpAuthException("PDP returned a non-JSON response")
+
+            if response.status_code == 200 and response_json.get("Response", [{}])[0].get("Decision") == "Permit":
+                self.logger.debug("PDP response: {}".format(response_json))
+                return True, None
+
+            self.logger.error("PDP response: {}".format(response_json))
+            msg = (
+                response_json.get("Response", [{}])[0]
+                    .get("AssociatedAdvice", [{}])[0]
+                    .get("AttributeAssignment", [{}])[0]
+                    .get("Value", "Unknown reason")
+            )
+            if response.status_code != 200:
+                raise PdpAuthException(f"PDP Authorization check failed - {msg}")
+            return False, f"PDP Failure: PDP Authorization check failed - {msg}"
+
+        except Exception as e:
+            self.logger.error(f"Request to PDP failed: {e}")
+            raise PdpAuthException(f"PDP Failure: {e}") from e
+
+    def __decide(self, *, pdp_request: dict, key: str = None) -> Tuple[bool, str]:
+        """
+        Return the decision for a request from the cache or from PDP
+        """
+        if key is None:
+            key = self.fingerprint(pdp_request=pdp_request)
+        cached = self.__get_cached(key=key)
+        if cached is not None:
+            self.logger.debug(f"PDP decision found in cache: {cached[0]}")
+            return cached
+        permitted, msg = self.__evaluate(pdp_request=pdp_request)
+        self.__add_cached(key=key, permitted=permitted, msg=msg)
+        return permitted, msg
+
     def check_access(self, *, email: str, project: str, tags: List[str], action_id: ActionId,
                      resource: BaseSliver or ExperimentTopology, lease_end_time: datetime):
         """
@@ -164,31 +306,38 @@ class PdpAuth:
         pdp_request = self.build_pdp_request(email=email, project=project, tags=tags, action_id=action_id,
                                              resource=resource, lease_end_time=lease_end_time)
 
-        self.logger.debug("PDP Auth Request: {}".format(pdp_request))
+        permitted, msg = self.__decide(pdp_request=pdp_request)
+        if not permitted:
+            raise PdpAuthException(msg)
 
-        # send request to PDP
-        try:
-            response = requests.post(url=self.config['url'], headers=self._headers(), json=pdp_request)
+    def check_access_batch(self, *, checks: List[dict]):
+        """
+        Check Access for multiple requests; duplicate requests are evaluated once and the requests not
+        found in the cache are sent to PDP concurrently over the pooled session. This is not a single round trip:
+        each distinct request not found in the cache is a separate single-decision HTTP request.
+        @param checks list of dictionaries with the arguments of check_access i.e. email, project, tags,
+                      action_id, resource and lease_end_time
+        @raises PdpAuthException if access is denied for any of the requests or in case of failure
+        """
+        if not self.config['enable']:
+            self.logger.debug("Skipping PDP Authorization check as configured")
+            return
 
-            try:
-                response_json = response.json()
-            except ValueError:
-                # Handle non-JSON response
-                self.logger.error(f"Non-JSON response from PDP: {response.text}")
-                raise PdpAuthException("PDP returned a non-JSON response")
+        pdp_requests = {}
+        for c in checks:
+            pdp_request = self.build_pdp_request(email=c.get('email'), project=c.get('project'),
+                                                 tags=c.get('tags'), action_id=c.get('action_id'),
+                                                 resource=c.get('resource'), lease_end_time=c.get('lease_end_time'))
+            pdp_requests[self.fingerprint(pdp_request=pdp_request)] = pdp_request
 
-            if response.status_code == 200 and response_json.get("Response", [{}])[0].get("Decision") == "Permit":
-                self.logger.debug("PDP response: {}".format(response_json))
-            else:
-                self.logger.error("PDP response: {}".format(response_json))
-                msg = (
-                    response_json.get("Response", [{}])[0]
-                        .get("AssociatedAdvice", [{}])[0]
-                        .get("AttributeAssignment", [{}])[0]
-                        .get("Value", "Unknown reason")
-                )
-                raise PdpAuthException(f"PDP Authorization check failed - {msg}")
+        if len(pdp_requests) == 1:
+            key, pdp_request = next(iter(pdp_requests.items()))
+            decisions = [self.__decide(pdp_request=pdp_request, key=key)]
+        else:
+            executor = self.__get_executor()
+            futures = [executor.submit(self.__decide, pdp_request=r, key=k) for k, r in pdp_requests.items()]
+            decisions = [f.result() for f in futures]
 
-        except Exception as e:
-            self.logger.error(f"Request to PDP failed: {e}")
-            raise PdpAuthException(f"PDP Failure: {e}") from e
+        for permitted, msg in decisions:
+            if not permitted:
+                raise PdpAuthException(msg)
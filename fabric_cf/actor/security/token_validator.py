@@ -26,6 +26,8 @@
 import datetime
 import json
 import logging
+import threading
+from collections import OrderedDict
 
 from fabric_cm.credmgr.credmgr_proxy import CredmgrProxy, Status
 from fabric_cm.credmgr.swagger_client.rest import ApiException
@@ -38,33 +40,48 @@ from fabric_cf.actor.security.fabric_token import TokenException, FabricToken
 
 class TokenValidator:
     """This class caches revoke list retrieved from a specified endpoint
-    and uses it to validate provided tokens"""
+    and uses it to validate provided tokens.
+
+    The revoke list of each project is kept as a set of token hashes and refreshed on its own schedule.
+    Tokens which have been validated are cached by token hash until they expire, so repeat requests skip
+    the signature verification; the revoke list is checked on every call."""
+    DEFAULT_CACHE_SIZE = 1000
 
     def __init__(self, *, credmgr_host: str, refresh_period: datetime.timedelta,
-                 jwt_validator: JWTValidator):
+                 jwt_validator: JWTValidator, cache_size: int = DEFAULT_CACHE_SIZE):
         """ Initialize a validator with an endpoint URL presenting Token revoke list,
         a refresh period for keys expressed as datetime.timedelta and
         audience (i.e. CI Logon client id cilogon:/client_id/1234567890).
         :param credmgr_host:
         :param refresh_period:
+        :param cache_size: maximum number of validated tokens cached
         """
         self.credmgr_host = credmgr_host
         assert refresh_period is None or isinstance(refresh_period, datetime.timedelta)
         self.cache_period = refresh_period
-        self.trl = []
-        self.trl_fetched = None
+        # project id => (set of revoked token hashes, time fetched)
+        self.trl = {}
         self.credmgr_proxy = CredmgrProxy(credmgr_host=credmgr_host)
         self.jwt_validator = jwt_validator
         self.logger = logging.getLogger()
+        self.cache_size = cache_size
+        # token hash => (decoded token, time until which the entry is valid)
+        self.validated = OrderedDict()
+        self.lock = threading.Lock()
 
-    def __fetch_token_revoke_list(self, *, project_id: str):
+    def __fetch_token_revoke_list(self, *, project_id: str) -> set:
         """
-        Fetch TRL from an endpoint and save it
-        @param token token
+        Fetch TRL for a project from an endpoint and save it; the saved TRL is returned
+        until the refresh period of the project elapses
+        @param project_id project id
+        @return set of revoked token hashes
         """
-        if self.trl_fetched is not None:
-            if datetime.datetime.now() < self.trl_fetched + self.cache_period:
-                return
+        with self.lock:
+            entry = self.trl.get(project_id)
+        if entry is not None:
+            trl, trl_fetched = entry
+            if self.cache_period is None or datetime.datetime.now() < trl_fetched + self.cache_period:
+                return trl
 
         status, trl_or_exception = self.credmgr_proxy.token_revoke_list(project_id=project_id)
         if status != Status.OK:
@@ -77,9 +94,48 @@ class TokenValidator:
                     details = errors[0].get('details')
             raise Exception(f"Unable to fetch token revoke list: {trl_or_exception.status}:{trl_or_exception.reason}:{details}")
 
-        self.trl_fetched = datetime.datetime.now()
-        if trl_or_exception is not None:
-            self.trl = trl_or_exception
+        trl = set(trl_or_exception) if trl_or_exception is not None else set()
+        if entry is not None and trl_or_exception is None:
+            trl = entry[0]
+        with self.lock:
+            self.trl[project_id] = (trl, datetime.datetime.now())
+        return trl
+
+    def __get_validated(self, *, token_hash: str) -> FabricToken or None:
+        with self.lock:
+            entry = self.validated.get(token_hash)
+            if entry is None:
+                return None
+            fabric_token, valid_until = entry
+            if valid_until <= datetime.datetime.now(datetime.timezone.utc):
+                self.validated.pop(token_hash)
+                return None
+            self.validated.move_to_end(token_hash)
+            return fabric_token
+
+    def __save_validated(self, *, token_hash: str, fabric_token: FabricToken):
+        """
+        Cache a validated token until it expires; tokens without an expiry are cached for the TRL refresh period
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        exp = fabric_token.token.get("exp")
+        if exp is not None:
+            valid_until = datetime.datetime.fromtimestamp(exp, tz=datetime.timezone.utc)
+        elif self.cache_period is not None:
+            valid_until = now + self.cache_period
+        else:
+            return
+        if valid_until <= now or self.cache_size <= 0:
+            return
+        with self.lock:
+            self.validated[token_hash] = (fabric_token, valid_until)
+            self.validated.move_to_end(token_hash)
+            while len(self.validated) > self.cache_size:
+                self.validated.popitem(last=False)
+
+    def __evict(self, *, token_hash: str):
+        with self.lock:
+            self.validated.pop(token_hash, None)
 
     def validate_token(self, *, token, verify_exp=False) -> FabricToken:
         """
@@ -92,14 +148,19 @@ class TokenValidator:
         result = None
         token_hash = generate_sha256(token=token)
         if self.jwt_validator is not None:
-            code, token_or_exception = self.jwt_validator.validate_jwt(token=token, verify_exp=verify_exp)
-            if code is not ValidateCode.VALID:
-                raise TokenException(f"Unable to validate provided token: {code}/{token_or_exception}")
+            result = self.__get_validated(token_hash=token_hash)
+            if result is None:
+                code, token_or_exception = self.jwt_validator.validate_jwt(token=token, verify_exp=verify_exp)
+                if code is not ValidateCode.VALID:
+                    raise TokenException(f"Unable to validate provided token: {code}/{token_or_exception}")
+
+                result = FabricToken(decoded_token=token_or_exception, token_hash=token_hash)
+                self.__save_validated(token_hash=token_hash, fabric_token=result)
 
-            result = FabricToken(decoded_token=token_or_exception, token_hash=token_hash)
             project_id, tags, name = result.first_project
-            self.__fetch_token_revoke_list(project_id=project_id)
-            if token_hash in self.trl:
+            trl = self.__fetch_token_revoke_list(project_id=project_id)
+            if token_hash in trl:
+                self.__evict(token_hash=token_hash)
                 raise TokenException(f"Unauthorized: Token: {token_hash} is revoked!")
         else:
             raise TokenException("JWT Token validator not initialized, skipping validation")
@@ -24,6 +24,8 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import logging
+import os
+import tempfile
 
 from fabric_cf.actor.boot.configuration import Configuration
 from fabric_cf.actor.core.apis.abc_actor_mixin import ABCActorMixin, ActorType
@@ -69,7 +71,7 @@ class BaseTestCase:
 
     logger = logging.getLogger('BaseTestCase')
     log_format = '%(asctime)s - %(name)s - {%(filename)s:%(lineno)d} - [%(threadName)s] - %(levelname)s - %(message)s'
-    logging.basicConfig(format=log_format, filename="./actor.log")
+    logging.basicConfig(format=log_format, filename=os.path.join(tempfile.gettempdir(), "actor.log"))
     logger.setLevel(logging.INFO)
 
     Term.set_cycles = False
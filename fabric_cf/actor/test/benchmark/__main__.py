@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Run the benchmarks and emit the results as JSON, e.g.
+
+    python -m fabric_cf.actor.test.benchmark --sites 8 --hosts 8 --reservations 1000 --output results.json
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from fabric_cf.actor.test.benchmark.benchmarks import BenchmarkEnvironment, BenchmarkRunner
+from fabric_cf.actor.test.benchmark.topology import SyntheticTopology
+
+
+def get_commit() -> str or None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m fabric_cf.actor.test.benchmark",
+                                     description="Benchmark the broker and orchestrator hot paths against a "
+                                                 "synthetic substrate without external services")
+    parser.add_argument("--sites", type=int, default=4, help="number of sites")
+    parser.add_argument("--hosts", type=int, default=4, help="number of worker hosts per site")
+    parser.add_argument("--components", type=int, default=2, help="number of components per host")
+    parser.add_argument("--links", type=int, default=None,
+                        help="number of inter-site links (default: a chain through all the sites)")
+    parser.add_argument("--reservations", type=int, default=200,
+                        help="number of reservations to populate the broker with")
+    parser.add_argument("--requests", type=int, default=50, help="number of ticket requests to time")
+    parser.add_argument("--iterations", type=int, default=10, help="iterations of the repeated benchmarks")
+    parser.add_argument("--horizon", type=int, default=14, help="days over which the leases are spread")
+    parser.add_argument("--write-behind-window", type=int, default=0,
+                        help="write-behind window of the database in ms (0 disables it)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated topology and requests")
+    parser.add_argument("--benchmarks", default=",".join(BenchmarkRunner.BENCHMARKS),
+                        help=f"comma separated benchmarks to run, from {BenchmarkRunner.BENCHMARKS}")
+    parser.add_argument("--output", default=None, help="file to write the results to (default: stdout)")
+    parser.add_argument("--log-file", default=None, help="file to write the actor logs to")
+    parser.add_argument("--log-level", default="INFO", help="level of the actor logs")
+    return parser.parse_args(args)
+
+
+def main(args=None) -> int:
+    args = parse_args(args)
+
+    logger = logging.getLogger("benchmark")
+    logger.propagate = False
+    if args.log_file is not None:
+        handler = logging.FileHandler(args.log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - {%(filename)s:%(lineno)d} - "
+                                               "[%(threadName)s] - %(levelname)s - %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(args.log_level.upper())
+    else:
+        logger.addHandler(logging.NullHandler())
+
+    parameters = {"sites": args.sites, "hosts": args.hosts, "components": args.components, "links": args.links,
+                  "reservations": args.reservations, "requests": args.requests, "iterations": args.iterations,
+                  "horizon": args.horizon, "write_behind_window": args.write_behind_window, "seed": args.seed}
+    started = datetime.now(timezone.utc)
+
+    topology = SyntheticTopology(sites=args.sites, hosts=args.hosts, components=args.components, links=args.links,
+                                 seed=args.seed)
+    environment = BenchmarkEnvironment(topology=topology, logger=logger, horizon=args.horizon,
+                                       write_behind_window=args.write_behind_window)
+    runner = BenchmarkRunner(environment=environment, reservations=args.reservations, requests=args.requests,
+                             iterations=args.iterations)
+    try:
+        results = runner.run(benchmarks=[b.strip() for b in args.benchmarks.split(",") if b.strip()])
+    finally:
+        environment.shutdown()
+
+    report = {
+        "started": started.isoformat(),
+        "duration_seconds": (datetime.now(timezone.utc) - started).total_seconds(),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "reservations": len(environment.reservations),
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
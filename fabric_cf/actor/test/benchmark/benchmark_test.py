@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_cf.actor.test.benchmark.benchmarks import BenchmarkEnvironment, BenchmarkRunner, BenchmarkResult
+from fabric_cf.actor.test.benchmark.topology import SyntheticTopology
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_topology(self):
+        topology = SyntheticTopology(sites=3, hosts=2, components=2, links=4)
+        cbm = topology.build()
+        self.assertEqual(sorted(topology.sites), sorted(cbm.get_sites()))
+        links = cbm.get_intersite_links()
+        self.assertEqual(4, len(links))
+        for link in links:
+            self.assertGreater(link[3], link[4])
+        self.assertEqual(2, len(cbm.get_matching_nodes_with_components(label="NetworkNode",
+                                                                       props={"Site": "SITE000",
+                                                                              "Type": "Server"})))
+
+    def test_percentile(self):
+        samples = [float(x) for x in range(1, 101)]
+        self.assertEqual(50.0, BenchmarkResult.percentile(samples=samples, pct=50))
+        self.assertEqual(95.0, BenchmarkResult.percentile(samples=samples, pct=95))
+        self.assertEqual(1.0, BenchmarkResult.percentile(samples=[1.0], pct=95))
+
+    def test_run(self):
+        logger = logging.getLogger("benchmark-test")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        environment = BenchmarkEnvironment(topology=SyntheticTopology(sites=2, hosts=2), logger=logger)
+        runner = BenchmarkRunner(environment=environment, reservations=5, requests=2, iterations=1)
+        try:
+            results = runner.run()
+        finally:
+            environment.shutdown()
+        names = [r["benchmark"] for r in results]
+        for name in ["database.get_reservations", "ticket", "bqm.summary.level2.occupancy_cache", "find_slot",
+                     "kernel_tick.full", "kernel_tick.incremental"]:
+            self.assertIn(name, names)
+        ticket = results[names.index("ticket")]
+        self.assertEqual(2, ticket["iterations"])
+        self.assertLessEqual(ticket["min_seconds"], ticket["p50_seconds"])
+        self.assertLessEqual(ticket["p95_seconds"], ticket["max_seconds"])
+
+        with self.assertRaises(ValueError):
+            runner.run(benchmarks=["unknown"])
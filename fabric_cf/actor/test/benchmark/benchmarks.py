@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Benchmarks of the broker and orchestrator hot paths (ticketing, BQM generation, find-slot, kernel tick and
+reservation persistence) against a synthetic substrate, using the stand-ins for the external services.
+"""
+import math
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple, Callable, Any
+
+from fim.pluggable import PluggableType
+from fim.user import NodeType
+
+from fabric_cf.actor.core.apis.abc_actor_mixin import ActorType
+from fabric_cf.actor.core.apis.abc_reservation_mixin import ABCReservationMixin
+from fabric_cf.actor.core.apis.abc_slice import ABCSlice
+from fabric_cf.actor.core.common.event_logger import EventLoggerSingleton
+from fabric_cf.actor.core.kernel.broker_reservation import BrokerReservationFactory
+from fabric_cf.actor.core.kernel.kernel import Kernel
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.kernel.slice import SliceFactory
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+from fabric_cf.actor.core.plugins.db.occupancy_cache import OccupancyCache
+from fabric_cf.actor.core.policy.broker_simpler_units_policy import BrokerSimplerUnitsPolicy
+from fabric_cf.actor.core.policy.network_node_inventory import NetworkNodeInventory
+from fabric_cf.actor.core.time.actor_clock import ActorClock
+from fabric_cf.actor.core.time.calendar.broker_calendar import BrokerCalendar
+from fabric_cf.actor.core.time.term import Term
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.resource_type import ResourceType
+from fabric_cf.actor.fim.plugins.broker.aggregate_bqm_plugin import AggregatedBQMPlugin
+from fabric_cf.actor.security.auth_token import AuthToken
+from fabric_cf.actor.test.benchmark.stand_ins import SqliteDatabase, LocalPlugin, LocalBroker, LocalController
+from fabric_cf.actor.test.benchmark.topology import SyntheticTopology
+
+
+class BenchmarkResult:
+    """
+    Timings of the iterations of a single benchmark
+    """
+    def __init__(self, *, name: str, samples: List[float], **details):
+        self.name = name
+        self.samples = samples
+        self.details = details
+
+    @staticmethod
+    def percentile(*, samples: List[float], pct: float) -> float:
+        """
+        Nearest-rank percentile
+        @param samples sorted samples
+        @param pct percentile in (0, 100]
+        """
+        rank = max(int(math.ceil(pct / 100 * len(samples))), 1)
+        return samples[rank - 1]
+
+    def to_dict(self) -> dict:
+        result = {"benchmark": self.name, "iterations": len(self.samples)}
+        if len(self.samples) > 0:
+            samples = sorted(self.samples)
+            result.update({
+                "total_seconds": sum(samples),
+                "min_seconds": samples[0],
+                "mean_seconds": sum(samples) / len(samples),
+                "p50_seconds": self.percentile(samples=samples, pct=50),
+                "p95_seconds": self.percentile(samples=samples, pct=95),
+                "max_seconds": samples[-1]
+            })
+        result.update(self.details)
+        return result
+
+
+def timed(func: Callable, **kwargs) -> Tuple[float, Any]:
+    """
+    Invoke a function and return the elapsed time along with its result
+    """
+    begin = time.perf_counter()
+    result = func(**kwargs)
+    return time.perf_counter() - begin, result
+
+
+class BenchmarkEnvironment:
+    """
+    A broker with the real BrokerSimplerUnitsPolicy and ActorDatabase, wired to the stand-ins: the substrate
+    lives in a NetworkX CBM and the reservations in an in-memory SQLite database
+    """
+    ACTOR_NAME = "benchmark-broker"
+    # Reservation states considered by the orchestrator when computing live allocations
+    ALLOCATED_STATES = [ReservationStates.Active.value, ReservationStates.ActiveTicketed.value,
+                        ReservationStates.Ticketed.value]
+
+    def __init__(self, *, topology: SyntheticTopology, logger, horizon: int = 14, write_behind_window: int = 0):
+        """
+        @param topology substrate
+        @param logger logger
+        @param horizon horizon (days) over which reservation leases are spread
+        @param write_behind_window write-behind window (ms) of the database; 0 disables it
+        """
+        self.topology = topology
+        self.logger = logger
+        self.horizon = horizon
+        if EventLoggerSingleton.get().logger is None:
+            EventLoggerSingleton.get().logger = logger
+        self.now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self.clock = ActorClock(beginning_of_time=int(self.now.timestamp() * 1000), cycle_millis=1000)
+        Term.set_clock(self.clock)
+
+        self.database = ActorDatabase(user=None, password=None, database=None, db_host=None, logger=logger,
+                                      write_behind_window=write_behind_window)
+        self.database.db = SqliteDatabase(logger=logger)
+        self.database.db.create_db()
+        self.database.db.add_actor(name=self.ACTOR_NAME, guid=str(ID()), act_type=ActorType.Broker.value,
+                                   properties=b"")
+        self.database.set_actor_name(name=self.ACTOR_NAME)
+        self.database.initialize()
+
+        self.broker = LocalBroker(name=self.ACTOR_NAME, clock=self.clock,
+                                  plugin=LocalPlugin(database=self.database, logger=logger), logger=logger,
+                                  delegation_id=SyntheticTopology.DELEGATION_ID)
+        self.database.actor_added(actor=self.broker)
+
+        self.cbm = topology.build()
+        self.policy = BrokerSimplerUnitsPolicy(actor=self.broker)
+        self.policy.calendar = BrokerCalendar(clock=self.clock)
+        inventory = NetworkNodeInventory()
+        inventory.set_logger(logger=logger)
+        self.policy.register_inventory(resource_type=ResourceType(resource_type=NodeType.VM.name),
+                                       inventory=inventory)
+        self.policy.combined_broker_model = self.cbm
+        self.policy.combined_broker_model_graph_id = self.cbm.get_graph_id()
+        self.policy.query_cbm = self.cbm
+        self.policy.pluggable_registry.unregister_pluggable(t=PluggableType.Broker)
+        self.policy.pluggable_registry.register_pluggable(t=PluggableType.Broker, p=AggregatedBQMPlugin,
+                                                          actor=self.broker, logger=logger)
+        self.broker.set_policy(policy=self.policy)
+
+        self.controller = LocalController(broker=self.broker)
+        self.slice = self.create_slice()
+        self.reservations = []
+        self.node_id_to_reservations = {}
+        self.sequence = 0
+
+    def shutdown(self):
+        """
+        Flush pending writes and stop the write-behind thread, if any
+        """
+        self.database.stop()
+
+    def create_slice(self) -> ABCSlice:
+        slice_obj = SliceFactory.create(slice_id=ID(), name="benchmark-slice", project_id=str(uuid.uuid4()))
+        slice_obj.set_owner(owner=AuthToken(name="benchmark", guid=ID(), oidc_sub_claim=str(uuid.uuid4()),
+                                            email="benchmark@fabric-testbed.net"))
+        self.database.add_slice(slice_object=slice_obj)
+        return slice_obj
+
+    def next_term(self) -> Term:
+        """
+        Lease starting on a random hour within the horizon and lasting 1 to 7 days
+        """
+        rnd = self.topology.random
+        start = self.now + timedelta(hours=rnd.randrange(self.horizon * 24))
+        return Term(start=start, end=start + timedelta(days=rnd.randint(1, 7)))
+
+    def create_reservation(self) -> ABCReservationMixin:
+        self.sequence += 1
+        sliver = self.topology.build_node_sliver(name=f"vm-{self.sequence}")
+        rset = ResourceSet(units=1, rtype=ResourceType(resource_type=NodeType.VM.name), sliver=sliver)
+        reservation = BrokerReservationFactory.create(rid=ID(), resources=rset, term=self.next_term(),
+                                                      slice_obj=self.slice)
+        reservation.set_logger(logger=self.logger)
+        reservation.transition(prefix="benchmark", state=ReservationStates.Nascent,
+                               pending=ReservationPendingStates.Ticketing)
+        return reservation
+
+    def ticket(self, *, reservation: ABCReservationMixin) -> bool:
+        """
+        Allocate a reservation via the broker policy and, on success, move it to Ticketed
+        @param reservation reservation
+        @return True if the reservation was allocated
+        """
+        status, self.node_id_to_reservations, error_msg = \
+            self.policy.ticket(reservation=reservation, node_id_to_reservations=self.node_id_to_reservations)
+        if not status:
+            return False
+        reservation.map_and_update(ticketed=False)
+        reservation.transition(prefix="benchmark", state=ReservationStates.Ticketed,
+                               pending=ReservationPendingStates.None_)
+        return True
+
+    def populate(self, *, count: int) -> List[float]:
+        """
+        Ticket and persist reservations to build up the existing allocations
+        @param count number of reservations to attempt
+        @return time taken by each add to the database
+        """
+        samples = []
+        for i in range(count):
+            reservation = self.create_reservation()
+            if not self.ticket(reservation=reservation):
+                continue
+            elapsed, _ = timed(self.database.add_reservation, reservation=reservation)
+            samples.append(elapsed)
+            self.reservations.append(reservation)
+        self.database.flush()
+        # Recovery has ended, the allocation index is consulted from now on
+        self.policy.allocation_index.set_ready(value=True)
+        return samples
+
+    def get_find_slot_body(self, *, duration: int = 24, max_results: int = 1) -> dict:
+        """
+        Find-slot request for a VM with a component on one site and a link between two sites
+        """
+        sites = self.topology.sites
+        core, ram, disk = SyntheticTopology.SHAPES[-1]
+        compute = {"type": "compute", "site": sites[0], "cores": core, "ram": ram, "disk": disk, "components": {}}
+        if self.topology.components > 0:
+            ctype, model = SyntheticTopology.COMPONENTS[0]
+            compute["components"] = {f"{str(ctype)}-{model}": 1}
+        resources = [compute]
+        if len(sites) > 1 and self.topology.links > 0:
+            resources.append({"type": "link", "site_a": sites[0], "site_b": sites[1], "bandwidth": 10})
+        return {"start": self.now.isoformat(), "end": (self.now + timedelta(days=self.horizon)).isoformat(),
+                "duration": duration, "resources": resources, "max_results": max_results}
+
+
+class BenchmarkRunner:
+    """
+    Runs the selected benchmarks on an environment populated with reservations
+    """
+    BENCHMARKS = ["database", "ticket", "bqm", "find_slot", "kernel_tick"]
+
+    def __init__(self, *, environment: BenchmarkEnvironment, reservations: int = 200, requests: int = 50,
+                 iterations: int = 10):
+        """
+        @param environment environment
+        @param reservations number of reservations to populate the environment with
+        @param requests number of ticket requests to time
+        @param iterations iterations of the repeated benchmarks (BQM, find-slot, kernel tick, database loads)
+        """
+        self.env = environment
+        self.reservations = reservations
+        self.requests = requests
+        self.iterations = iterations
+        self.add_samples = None
+
+    def run(self, *, benchmarks: List[str] = None) -> List[dict]:
+        """
+        Populate the environment and run the benchmarks
+        @param benchmarks names of the benchmarks to run, all if not specified
+        @return results
+        """
+        self.add_samples = self.env.populate(count=self.reservations)
+        results = []
+        for name in benchmarks or self.BENCHMARKS:
+            if name not in self.BENCHMARKS:
+                raise ValueError(f"Unknown benchmark {name}, expected one of {self.BENCHMARKS}")
+            for result in getattr(self, f"run_{name}")():
+                results.append(result.to_dict())
+        return results
+
+    def run_database(self) -> List[BenchmarkResult]:
+        db = self.env.database
+        hosts = [f"{site}-w{h}" for site in self.env.topology.sites for h in range(self.env.topology.hosts)]
+        results = [BenchmarkResult(name="database.add_reservation", samples=self.add_samples)]
+
+        samples = []
+        for r in self.env.reservations:
+            r.set_dirty()
+            elapsed, _ = timed(db.update_reservation, reservation=r)
+            samples.append(elapsed)
+        begin = time.perf_counter()
+        db.flush()
+        flush = time.perf_counter() - begin
+        results.append(BenchmarkResult(name="database.update_reservation", samples=samples, flush_seconds=flush))
+
+        samples = []
+        loaded = 0
+        for i in range(self.iterations):
+            elapsed, reservations = timed(db.get_reservations, states=BenchmarkEnvironment.ALLOCATED_STATES)
+            samples.append(elapsed)
+            loaded = len(reservations)
+        results.append(BenchmarkResult(name="database.get_reservations", samples=samples, reservations=loaded))
+
+        samples = []
+        start, end = self.env.now, self.env.now + timedelta(days=1)
+        for i in range(self.iterations):
+            for node_id in hosts:
+                elapsed, _ = timed(db.get_reservations, graph_node_id=node_id, start=start, end=end,
+                                   states=BenchmarkEnvironment.ALLOCATED_STATES)
+                samples.append(elapsed)
+        results.append(BenchmarkResult(name="database.get_reservations_by_node", samples=samples))
+        return results
+
+    def run_ticket(self) -> List[BenchmarkResult]:
+        samples = []
+        allocated = 0
+        for i in range(self.requests):
+            reservation = self.env.create_reservation()
+            elapsed, status = timed(self.env.ticket, reservation=reservation)
+            samples.append(elapsed)
+            if status:
+                allocated += 1
+                self.env.database.add_reservation(reservation=reservation)
+                self.env.reservations.append(reservation)
+        return [BenchmarkResult(name="ticket", samples=samples, allocated=allocated,
+                                allocation_index=self.env.policy.allocation_index.is_ready())]
+
+    def run_bqm(self) -> List[BenchmarkResult]:
+        results = []
+        db = self.env.database
+        plugin = AggregatedBQMPlugin(actor=self.env.broker, logger=self.env.logger)
+        start, end = self.env.now, self.env.now + timedelta(days=self.env.horizon)
+        saved = db.occupancy_cache
+        try:
+            for source, cache in (("database", None), ("occupancy_cache", OccupancyCache(logger=self.env.logger))):
+                db.occupancy_cache = cache
+                for level in (0, 1, 2):
+                    samples = []
+                    for i in range(self.iterations):
+                        elapsed, bqm = timed(plugin.plug_produce_bqm, cbm=self.env.cbm, query_level=level,
+                                             start=start, end=end, graph_id=str(uuid.uuid4()))
+                        samples.append(elapsed)
+                        bqm.delete_graph()
+                    results.append(BenchmarkResult(name=f"bqm.graph.level{level}.{source}", samples=samples))
+                samples = []
+                for i in range(self.iterations):
+                    elapsed, _ = timed(plugin.plug_produce_bqm_summary, cbm=self.env.cbm, query_level=2,
+                                       start=start, end=end)
+                    samples.append(elapsed)
+                results.append(BenchmarkResult(name=f"bqm.summary.level2.{source}", samples=samples))
+        finally:
+            db.occupancy_cache = saved
+        return results
+
+    def run_find_slot(self) -> List[BenchmarkResult]:
+        from fabric_cf.orchestrator.core.orchestrator_handler import OrchestratorHandler
+        from fabric_cf.orchestrator.core.orchestrator_kernel import OrchestratorKernel
+
+        state = OrchestratorKernel()
+        state.controller = self.env.controller
+        state.broker = self.env.broker.get_guid()
+        state.logger = self.env.logger
+        handler = OrchestratorHandler.__new__(OrchestratorHandler)
+        handler.controller_state = state
+        handler.logger = self.env.logger
+
+        body = self.env.get_find_slot_body()
+        # The first call fetches the resource summary from the broker, later calls are served from the cache
+        first, response = timed(handler._find_slot_live, body=body, token=None)
+        samples = []
+        for i in range(self.iterations):
+            elapsed, response = timed(handler._find_slot_live, body=body, token=None)
+            samples.append(elapsed)
+        return [BenchmarkResult(name="find_slot", samples=samples, first_call_seconds=first,
+                                windows=response.get("total", 0))]
+
+    def run_kernel_tick(self) -> List[BenchmarkResult]:
+        results = []
+        for incremental in (False, True):
+            kernel = Kernel(plugin=self.env.broker.get_plugin(), policy=self.env.policy, logger=self.env.logger,
+                            incremental_tick=incremental)
+            for r in self.env.reservations:
+                kernel.reservations.add(reservation=r)
+                kernel.mark_dirty(reservation=r)
+            samples = []
+            for i in range(self.iterations):
+                elapsed, _ = timed(kernel.tick)
+                samples.append(elapsed)
+            name = "kernel_tick.incremental" if incremental else "kernel_tick.full"
+            results.append(BenchmarkResult(name=name, samples=samples, reservations=kernel.reservations.size()))
+        return results
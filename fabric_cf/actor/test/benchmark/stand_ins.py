@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+In-process stand-ins for the external services an actor depends on (PostgreSQL, Neo4j and the Kafka message
+bus) so that the real policy, database and query code paths can be exercised without a deployment.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Tuple, Any
+
+from fim.graph.abc_property_graph import ABCPropertyGraph
+from fim.graph.networkx_property_graph import NetworkXPropertyGraph
+from fim.graph.resources.abc_cbm import ABCCBMPropertyGraph
+from fim.pluggable import PluggableRegistry, PluggableType, BrokerPluggable
+from fim.slivers.attached_components import AttachedComponentsInfo
+from fim.slivers.delegations import DelegationType
+from fim.user import ComponentType, NodeType
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from fabric_cf.actor.core.apis.abc_policy import ABCPolicy
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.core.broker_policy import BrokerPolicy
+from fabric_cf.actor.core.delegation.broker_delegation_factory import BrokerDelegationFactory
+from fabric_cf.actor.core.manage.converter import Converter
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+from fabric_cf.actor.core.proxies.kafka.translate import Translate
+from fabric_cf.actor.core.time.actor_clock import ActorClock
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.db.psql_database import PsqlDatabase
+from fabric_cf.actor.security.auth_token import AuthToken
+
+
+class SqliteDatabase(PsqlDatabase):
+    """
+    PsqlDatabase bound to an in-memory SQLite engine instead of PostgreSQL. A single connection is shared by
+    all threads so that every session sees the same database.
+    """
+    def __init__(self, *, logger):
+        self.db_engine = create_engine("sqlite://", poolclass=StaticPool,
+                                       connect_args={"check_same_thread": False})
+        self.logger = logger
+        self.session_factory = sessionmaker(bind=self.db_engine)
+        self.sessions = {}
+
+
+class NetworkXCBMGraph(ABCCBMPropertyGraph, NetworkXPropertyGraph):
+    """
+    Combined Broker Model held in a NetworkX graph instead of Neo4j. Implements the queries the broker
+    policy and the BQM plugin issue against the CBM by walking the graph rather than running Cypher.
+    """
+    def __init__(self, *, graph: NetworkXPropertyGraph, logger=None):
+        """
+        Wrap an existing NetworkX graph (e.g. an ARM generated from a substrate topology)
+        @param graph graph
+        @param logger logger
+        """
+        NetworkXPropertyGraph.__init__(self, graph_id=graph.graph_id, importer=graph.importer,
+                                       logger=logger if logger is not None else graph.log)
+
+    def get_node_properties(self, *, node_id: str) -> (List[str], Dict[str, Any]):
+        """
+        Return the Class among the node properties as the Neo4j graph does, the BQM plugin relies on it
+        @param node_id node id
+        @return tuple of labels and properties
+        """
+        labels, props = NetworkXPropertyGraph.get_node_properties(self, node_id=node_id)
+        props[ABCPropertyGraph.PROP_CLASS] = labels[0]
+        return labels, props
+
+    def merge_adm(self, *, adm: ABCPropertyGraph) -> None:
+        raise NotImplementedError("Merging ADMs is not supported by the benchmark CBM")
+
+    def unmerge_adm(self, *, graph_id: str) -> None:
+        raise NotImplementedError("Unmerging ADMs is not supported by the benchmark CBM")
+
+    def get_bqm(self, **kwargs) -> ABCPropertyGraph:
+        """
+        Get a Broker Query Model from the registered Broker pluggable, as the Neo4j CBM does
+        @param kwargs query_level, start, end, includes and excludes
+        @return BQM graph
+        """
+        p = PluggableRegistry()
+        if p.pluggable_registered(t=PluggableType.Broker) and \
+                BrokerPluggable.PLUGGABLE_PRODUCE_BQM in p.get_implemented_methods(t=PluggableType.Broker):
+            c = p.get_method_callable(t=PluggableType.Broker, method=BrokerPluggable.PLUGGABLE_PRODUCE_BQM)
+            return c(cbm=self, **kwargs)
+        return self.clone_graph(new_graph_id=str(uuid.uuid4()))
+
+    def get_delegations(self, *, node_id: str, adm_id: str, delegation_type: DelegationType) -> List or None:
+        raise NotImplementedError("Delegations are not tracked by the benchmark CBM")
+
+    def get_matching_nodes_with_components(self, *, label: str, props: Dict,
+                                           comps: AttachedComponentsInfo = None) -> List[str]:
+        """
+        Return the nodes with the given label and properties which have at least the requested
+        number of components of each (type, model)
+        @param label node label
+        @param props node properties to match
+        @param comps requested components
+        @return list of node ids
+        """
+        component_counts = defaultdict(int)
+        if comps is not None:
+            for comp in comps.list_devices():
+                # shared nic count should always be 1
+                if comp.resource_type != ComponentType.SharedNIC:
+                    component_counts[(comp.resource_type, comp.resource_model)] += 1
+                else:
+                    component_counts[(comp.resource_type, comp.resource_model)] = 1
+
+        result = []
+        for node_id in self.get_all_nodes_by_class(label=label):
+            _, node_props = self.get_node_properties(node_id=node_id)
+            if any(node_props.get(k) != v for k, v in props.items()):
+                continue
+            if len(component_counts) > 0:
+                available = defaultdict(int)
+                for comp_id in self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
+                                                       node_label=ABCPropertyGraph.CLASS_Component):
+                    _, comp_props = self.get_node_properties(node_id=comp_id)
+                    available[(comp_props.get(ABCPropertyGraph.PROP_TYPE),
+                               comp_props.get(ABCPropertyGraph.PROP_MODEL))] += 1
+                    available[(comp_props.get(ABCPropertyGraph.PROP_TYPE), None)] += 1
+                if any(available[(str(ctype) if ctype is not None else None, model)] < count
+                       for (ctype, model), count in component_counts.items()):
+                    continue
+            result.append(node_id)
+        return result
+
+    def __get_switch(self, *, cp_id: str) -> Tuple[str, str] or None:
+        for ns_id in self.get_first_neighbor(node_id=cp_id, rel=ABCPropertyGraph.REL_CONNECTS,
+                                             node_label=ABCPropertyGraph.CLASS_NetworkService):
+            for node_id in self.get_first_neighbor(node_id=ns_id, rel=ABCPropertyGraph.REL_HAS,
+                                                   node_label=ABCPropertyGraph.CLASS_NetworkNode):
+                _, node_props = self.get_node_properties(node_id=node_id)
+                if node_props.get(ABCPropertyGraph.PROP_TYPE) == str(NodeType.Switch):
+                    return node_id, node_props.get(ABCPropertyGraph.PROP_SITE)
+        return None
+
+    def get_intersite_links(self) -> List[Tuple[str, str, str, str, str, str, str]]:
+        """
+        Return the links between switches of different sites, ordered the way the Neo4j CBM orders them
+        @return list of tuples (source switch, link, sink switch, source site, sink site, source cp, sink cp)
+        """
+        result = []
+        for link_id in self.get_all_nodes_by_class(label=ABCPropertyGraph.CLASS_Link):
+            ends = []
+            for cp_id in self.get_first_neighbor(node_id=link_id, rel=ABCPropertyGraph.REL_CONNECTS,
+                                                 node_label=ABCPropertyGraph.CLASS_ConnectionPoint):
+                switch = self.__get_switch(cp_id=cp_id)
+                if switch is not None:
+                    ends.append((switch[0], switch[1], cp_id))
+            if len(ends) != 2 or ends[0][1] == ends[1][1]:
+                continue
+            source, sink = sorted(ends, key=lambda e: e[1], reverse=True)
+            result.append((source[0], link_id, sink[0], source[1], sink[1], source[2], sink[2]))
+        return result
+
+    def get_sites(self) -> List[str]:
+        sites = set()
+        for node_id in self.get_all_nodes_by_class(label=ABCPropertyGraph.CLASS_NetworkNode):
+            _, node_props = self.get_node_properties(node_id=node_id)
+            if node_props.get(ABCPropertyGraph.PROP_SITE) is not None:
+                sites.add(node_props.get(ABCPropertyGraph.PROP_SITE))
+        return list(sites)
+
+    def get_disconnected_sites(self) -> List[str]:
+        connected = set(self.get_connected_sites())
+        return [s for s in self.get_sites() if s not in connected]
+
+    def get_connected_sites(self) -> List[str]:
+        sites = set()
+        for link in self.get_intersite_links():
+            sites.add(link[3])
+            sites.add(link[4])
+        return list(sites)
+
+    def get_facility_ports(self) -> List[str]:
+        return []
+
+
+class LocalPlugin:
+    """
+    Minimal actor plugin exposing the database and logger
+    """
+    def __init__(self, *, database: ActorDatabase, logger):
+        self.database = database
+        self.logger = logger
+
+    def get_database(self) -> ActorDatabase:
+        return self.database
+
+    def get_logger(self):
+        return self.logger
+
+
+class LocalBroker:
+    """
+    Minimal broker actor: exposes the identity, clock, plugin, delegation and policy the broker policy and
+    the BQM plugin consult
+    """
+    def __init__(self, *, name: str, clock: ActorClock, plugin: LocalPlugin, logger, delegation_id: str):
+        self.identity = AuthToken(name=name, guid=ID())
+        self.clock = clock
+        self.plugin = plugin
+        self.logger = logger
+        self.delegation = BrokerDelegationFactory.create(did=delegation_id, slice_id=ID(), broker=None)
+        self.policy = None
+
+    def get_logger(self):
+        return self.logger
+
+    def get_actor_clock(self) -> ActorClock:
+        return self.clock
+
+    def get_current_cycle(self) -> int:
+        return self.clock.cycle(when=datetime.now())
+
+    def get_plugin(self) -> LocalPlugin:
+        return self.plugin
+
+    def get_identity(self) -> AuthToken:
+        return self.identity
+
+    def get_guid(self) -> ID:
+        return self.identity.get_guid()
+
+    def get_name(self) -> str:
+        return self.identity.get_name()
+
+    def get_delegation(self, *, did: str):
+        return self.delegation
+
+    def get_reservation(self, *, rid: ID):
+        return None
+
+    def get_policy(self) -> ABCPolicy:
+        return self.policy
+
+    def set_policy(self, *, policy: ABCPolicy):
+        self.policy = policy
+
+
+class LocalController:
+    """
+    Management controller answering the orchestrator's queries by dispatching them directly to the broker
+    policy and database, in place of the Kafka round trip between the orchestrator and the broker
+    """
+    def __init__(self, *, broker: LocalBroker):
+        self.broker = broker
+
+    def get_broker_query_model_summary(self, *, broker: ID, id_token: str, level: int,
+                                       start: datetime = None, end: datetime = None,
+                                       includes: str = None, excludes: str = None):
+        query = BrokerPolicy.get_broker_query_model_summary_query(level=level, start=start, end=end,
+                                                                  includes=includes, excludes=excludes)
+        response = self.broker.get_policy().query(p=query)
+        # Serialize as the response would be on the message bus
+        response = json.loads(json.dumps(response))
+        if response.get(Constants.QUERY_RESPONSE_STATUS) != "True":
+            return None
+        return Translate.translate_to_broker_query_model(query_response=response, level=level)
+
+    def get_reservations(self, *, states: List[int] = None, type: str = None, start: datetime = None,
+                         end: datetime = None, full: bool = False, **kwargs):
+        rsv_type = None
+        if type is not None:
+            rsv_type = type.split(",")
+        reservations = self.broker.get_plugin().get_database().get_reservations(states=states, rsv_type=rsv_type,
+                                                                                start=start, end=end)
+        return [Converter.fill_reservation(reservation=r, full=full) for r in reservations]
+
+    def get_last_error(self):
+        return None
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Synthetic substrate topologies and request slivers used by the benchmarks
+"""
+import random
+from typing import List, Tuple
+
+from fim.slivers.attached_components import AttachedComponentsInfo, ComponentSliver
+from fim.slivers.capacities_labels import Capacities, Labels, CapacityHints
+from fim.slivers.delegations import Pools, DelegationType
+from fim.slivers.instance_catalog import InstanceCatalog
+from fim.slivers.network_node import NodeSliver
+from fim.user import NodeType, ComponentType, ServiceType, InterfaceType, LinkType
+from fim.user.topology import SubstrateTopology
+
+from fabric_cf.actor.test.benchmark.stand_ins import NetworkXCBMGraph
+
+
+class SyntheticTopology:
+    """
+    Builds a substrate of sites, each with a number of worker hosts carrying GPU/NVMe components and a data
+    switch, connected to each other by inter-site links. The substrate is delegated in full to a single
+    broker delegation and returned as a CBM.
+    """
+    DELEGATION_ID = "primary"
+    # (type, model) of the components placed on the hosts, round-robin
+    COMPONENTS = [(ComponentType.GPU, "Tesla T4"), (ComponentType.NVME, "P4510")]
+    # Requested (core, ram, disk), round-robin
+    SHAPES = [(2, 8, 10), (4, 16, 50), (8, 32, 100), (16, 64, 500)]
+
+    def __init__(self, *, sites: int = 4, hosts: int = 4, components: int = 2, links: int = None,
+                 cores: int = 64, ram: int = 384, disk: int = 4000, bandwidth: int = 100, seed: int = 0):
+        """
+        @param sites number of sites
+        @param hosts number of worker hosts per site
+        @param components number of components per host
+        @param links number of inter-site links; defaults to a chain through all the sites
+        @param cores cores per host
+        @param ram ram per host (G)
+        @param disk disk per host (G)
+        @param bandwidth bandwidth of each inter-site link (Gbps)
+        @param seed seed for the choice of extra links and the generated requests
+        """
+        self.sites = [f"SITE{i:03d}" for i in range(sites)]
+        self.hosts = hosts
+        self.components = components
+        self.links = links if links is not None else max(sites - 1, 0)
+        self.cores = cores
+        self.ram = ram
+        self.disk = disk
+        self.bandwidth = bandwidth
+        self.random = random.Random(seed)
+        self.catalog = InstanceCatalog()
+
+    def __get_site_pairs(self) -> List[Tuple[str, str]]:
+        """
+        Chain the sites first so that they are all connected, then add random pairs for the remaining links
+        """
+        pairs = []
+        for i in range(min(self.links, len(self.sites) - 1)):
+            pairs.append((self.sites[i], self.sites[i + 1]))
+        while len(pairs) < self.links and len(self.sites) > 1:
+            a, b = self.random.sample(self.sites, 2)
+            pairs.append((a, b))
+        return pairs
+
+    def build(self) -> NetworkXCBMGraph:
+        """
+        Build the substrate and return it as a CBM
+        @return CBM
+        """
+        topology = SubstrateTopology()
+        services = {}
+        for site in self.sites:
+            for h in range(self.hosts):
+                node_name = f"{site.lower()}-w{h}"
+                node = topology.add_node(name=node_name, node_id=f"{site}-w{h}", site=site, ntype=NodeType.Server,
+                                         capacities=Capacities(core=self.cores, cpu=2, ram=self.ram,
+                                                               disk=self.disk, unit=1))
+                for c in range(self.components):
+                    ctype, model = self.COMPONENTS[c % len(self.COMPONENTS)]
+                    node.add_component(name=f"{node_name}-{str(ctype).lower()}{c}", node_id=f"{node.node_id}-c{c}",
+                                       model=model, ctype=ctype, capacities=Capacities(unit=1),
+                                       labels=Labels(bdf=[f"0000:{c + 0x25:02x}:00.0"]))
+            switch = topology.add_node(name=f"{site.lower()}-data-sw", node_id=f"{site}-sw", site=site,
+                                       ntype=NodeType.Switch, capacities=Capacities(unit=1))
+            services[site] = switch.add_network_service(name=f"{switch.name}-ns", node_id=f"{site}-sw-ns",
+                                                        nstype=ServiceType.MPLS, labels=Labels(vlan_range=["1-1000"]))
+
+        for i, (a, b) in enumerate(self.__get_site_pairs()):
+            interfaces = []
+            for local, remote in ((a, b), (b, a)):
+                interfaces.append(services[local].add_interface(name=f"{local}-{remote}-{i}",
+                                                                node_id=f"{local}-{remote}-{i}-if",
+                                                                itype=InterfaceType.TrunkPort,
+                                                                capacities=Capacities(bw=self.bandwidth)))
+            topology.add_link(name=f"link:{a}-{b}-{i}", node_id=f"link:{a}-{b}-{i}", ltype=LinkType.L2Path,
+                              interfaces=interfaces, capacities=Capacities(bw=self.bandwidth))
+
+        topology.single_delegation(delegation_id=self.DELEGATION_ID,
+                                   label_pools=Pools(atype=DelegationType.LABEL),
+                                   capacity_pools=Pools(atype=DelegationType.CAPACITY))
+        return NetworkXCBMGraph(graph=topology.as_arm())
+
+    def build_node_sliver(self, *, name: str, site: str = None) -> NodeSliver:
+        """
+        Build a VM request of one of the pre-defined shapes, with a component every other request
+        @param name sliver name
+        @param site site; chosen at random if not specified
+        @return sliver
+        """
+        core, ram, disk = self.random.choice(self.SHAPES)
+        capacities = Capacities(core=core, ram=ram, disk=disk)
+        sliver = NodeSliver()
+        sliver.set_properties(name=name, type=NodeType.VM, site=site or self.random.choice(self.sites),
+                              capacities=capacities,
+                              capacity_hints=CapacityHints(
+                                  instance_type=self.catalog.map_capacities_to_instance(cap=capacities)))
+        if self.components > 0 and self.random.random() < 0.5:
+            ctype, model = self.COMPONENTS[self.random.randrange(min(self.components, len(self.COMPONENTS)))]
+            component = ComponentSliver()
+            component.set_properties(name=f"{name}-{str(ctype).lower()}", type=ctype, model=model)
+            sliver.attached_components_info = AttachedComponentsInfo()
+            sliver.attached_components_info.add_device(device_info=component)
+        return sliver
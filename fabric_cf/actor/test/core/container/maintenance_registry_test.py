@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fim.slivers.maintenance_mode import MaintenanceInfo, MaintenanceEntry, MaintenanceState
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.container.maintenance import Site, MaintenanceRegistry, Maintenance
+
+
+class MaintenanceRegistryTest(unittest.TestCase):
+    class Database:
+        """
+        Minimal stand-in for the actor database exposing only the site lookups
+        """
+        def __init__(self, sites: list):
+            self.sites = {s.get_name(): s for s in sites}
+            self.get_site_calls = 0
+            self.loads = 0
+            self.registry = MaintenanceRegistry(loader=self.load)
+
+        def load(self):
+            self.loads += 1
+            return list(self.sites.values())
+
+        def get_site(self, *, site_name: str):
+            self.get_site_calls += 1
+            return self.sites.get(site_name)
+
+        def get_maintenance_registry(self):
+            if self.registry.load():
+                return self.registry
+            return None
+
+    @staticmethod
+    def make_site(*, name: str, state: MaintenanceState, workers: list = None, projects: str = None,
+                  users: str = None) -> Site:
+        maint_info = MaintenanceInfo()
+        if workers is None:
+            maint_info.add(name, MaintenanceEntry(state=state))
+        else:
+            for w in workers:
+                maint_info.add(w, MaintenanceEntry(state=state))
+        site = Site(name=name, maint_info=maint_info)
+        properties = {}
+        if projects is not None:
+            properties[Constants.PROJECT_ID] = projects
+        if users is not None:
+            properties[Constants.USERS] = users
+        site.set_properties(properties=properties)
+        return site
+
+    def test_sliver_provisioning(self):
+        renc = self.make_site(name="RENC", state=MaintenanceState.Maint, projects="p1, p2", users="a@x.org")
+        uky = self.make_site(name="UKY", state=MaintenanceState.Maint, workers=["uky-w1"])
+        db = self.Database(sites=[renc, uky])
+
+        self.assertEqual((True, None), Maintenance.is_sliver_provisioning_allowed(database=db, project="p3",
+                                                                                  email=None, site="LBNL",
+                                                                                  worker="lbnl-w1"))
+        status, msg = Maintenance.is_sliver_provisioning_allowed(database=db, project="p3", email="b@x.org",
+                                                                 site="RENC", worker="renc-w1")
+        self.assertFalse(status)
+        self.assertIsNotNone(msg)
+        self.assertTrue(Maintenance.is_sliver_provisioning_allowed(database=db, project="p2", email=None,
+                                                                   site="RENC", worker="renc-w1")[0])
+        self.assertTrue(Maintenance.is_sliver_provisioning_allowed(database=db, project=None, email="a@x.org",
+                                                                   site="RENC", worker="renc-w1")[0])
+        # Allow-lists match whole entries only
+        self.assertFalse(Maintenance.is_sliver_provisioning_allowed(database=db, project="p", email=None,
+                                                                    site="RENC", worker="renc-w1")[0])
+
+        self.assertFalse(Maintenance.is_sliver_provisioning_allowed(database=db, project="p1", email=None,
+                                                                    site="UKY", worker="uky-w1")[0])
+        self.assertTrue(Maintenance.is_sliver_provisioning_allowed(database=db, project="p1", email=None,
+                                                                   site="UKY", worker="uky-w2")[0])
+
+        # Loaded once; the database is never queried per lookup
+        self.assertEqual(1, db.loads)
+        self.assertEqual(0, db.get_site_calls)
+
+    def test_updates_and_invalidation(self):
+        db = self.Database(sites=[])
+        registry = db.get_maintenance_registry()
+        self.assertTrue(Maintenance.is_slice_provisioning_allowed(database=db, project="p1", email=None))
+        version = registry.get_version()
+
+        test_bed = self.make_site(name=Constants.ALL, state=MaintenanceState.Maint, projects="p1")
+        registry.site_updated(site=test_bed)
+        self.assertGreater(registry.get_version(), version)
+        self.assertTrue(Maintenance.is_slice_provisioning_allowed(database=db, project="p1", email=None))
+        self.assertFalse(Maintenance.is_slice_provisioning_allowed(database=db, project="p2", email=None))
+        self.assertTrue(Maintenance.is_testbed_in_maintenance(database=db)[0])
+
+        registry.site_removed(site_name=Constants.ALL)
+        self.assertTrue(Maintenance.is_slice_provisioning_allowed(database=db, project="p2", email=None))
+
+        # Changes made directly in the database are picked up once the registry is invalidated
+        db.sites[Constants.ALL] = test_bed
+        self.assertTrue(Maintenance.is_slice_provisioning_allowed(database=db, project="p2", email=None))
+        registry.invalidate()
+        self.assertFalse(Maintenance.is_slice_provisioning_allowed(database=db, project="p2", email=None))
+        self.assertEqual(2, db.loads)
+
+    def test_load_failure_falls_back_to_database(self):
+        def loader():
+            raise Exception("database unavailable")
+
+        db = self.Database(sites=[self.make_site(name="RENC", state=MaintenanceState.Maint)])
+        db.registry = MaintenanceRegistry(loader=loader)
+        self.assertFalse(Maintenance.is_sliver_provisioning_allowed(database=db, project=None, email=None,
+                                                                    site="RENC", worker=None)[0])
+        self.assertEqual(1, db.get_site_calls)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+
+from fabric_mb.message_bus.messages.close_reservations_avro import CloseReservationsAvro
+from fabric_mb.message_bus.messages.failed_rpc_avro import FailedRpcAvro
+from fabric_mb.message_bus.messages.reservation_avro import ReservationAvro
+from fabric_mb.message_bus.messages.slice_avro import SliceAvro
+from fabric_mb.message_bus.messages.ticket_avro import TicketAvro
+from fabric_mb.message_bus.messages.update_ticket_avro import UpdateTicketAvro
+
+from fabric_cf.actor.core.container.offset_tracker import OffsetTracker
+from fabric_cf.actor.core.container.rpc_consumer import RPCConsumer
+
+
+class RPCConsumerTest(unittest.TestCase):
+    class Service:
+        def __init__(self, block: threading.Event = None):
+            self.processed = []
+            self.block = block
+            self.lock = threading.Lock()
+
+        def process(self, *, message):
+            if self.block is not None and message.reservation.slice.guid == "slow":
+                self.block.wait(timeout=10)
+            with self.lock:
+                self.processed.append(message)
+
+    @staticmethod
+    def build_ticket(slice_id: str, rid: str) -> TicketAvro:
+        ticket = TicketAvro()
+        ticket.reservation = ReservationAvro()
+        ticket.reservation.reservation_id = rid
+        ticket.reservation.slice = SliceAvro()
+        ticket.reservation.slice.guid = slice_id
+        return ticket
+
+    def test_get_key(self):
+        self.assertEqual("r1", RPCConsumer.get_key(message=self.build_ticket("s1", "r1")))
+        ticket = self.build_ticket("s1", None)
+        self.assertEqual("s1", RPCConsumer.get_key(message=ticket))
+        close = CloseReservationsAvro()
+        close.guid = "actor"
+        close.reservation_id = "r1"
+        self.assertEqual("r1", RPCConsumer.get_key(message=close))
+        close.reservation_id = None
+        self.assertEqual("actor", RPCConsumer.get_key(message=close))
+
+    def test_failed_rpc_same_worker(self):
+        consumer = RPCConsumer(kafka_service=None, kafka_mgmt_service=None, logger=logging.getLogger(__name__),
+                               workers=8)
+        for i in range(20):
+            ticket = self.build_ticket(f"s{i}", f"r{i}")
+            update = UpdateTicketAvro()
+            update.reservation = ticket.reservation
+            failed = FailedRpcAvro()
+            failed.reservation_id = f"r{i}"
+            self.assertEqual(consumer.get_worker(message=update), consumer.get_worker(message=failed))
+
+    def test_ordering_and_parallelism(self):
+        block = threading.Event()
+        service = self.Service(block=block)
+        consumer = RPCConsumer(kafka_service=service, kafka_mgmt_service=None, logger=logging.getLogger(__name__),
+                               workers=4)
+        slow = self.build_ticket("slow", "r0")
+        fast = [self.build_ticket(f"s{i}", f"r{i}") for i in range(1, 20)]
+        fast = [m for m in fast if consumer.get_worker(message=m) != consumer.get_worker(message=slow)]
+        same = [self.build_ticket("slow", "r0") for _ in range(5)]
+        acked = []
+        consumer.start()
+        try:
+            consumer.enqueue(slow, ack=lambda: acked.append(slow))
+            for m in same + fast:
+                consumer.enqueue(m, ack=lambda m=m: acked.append(m))
+
+            # Messages for other reservations are processed while the slow one is blocked
+            deadline = time.time() + 5
+            while len(service.processed) < len(fast) and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(set(map(id, fast)), set(map(id, service.processed)))
+            self.assertNotIn(slow, acked)
+
+            block.set()
+            deadline = time.time() + 5
+            while len(acked) < len(same) + len(fast) + 1 and time.time() < deadline:
+                time.sleep(0.01)
+            # Messages for the same reservation are processed in order
+            self.assertEqual([slow] + same, [m for m in service.processed if m.reservation.slice.guid == "slow"])
+            self.assertEqual(len(same) + len(fast) + 1, len(acked))
+        finally:
+            block.set()
+            consumer.stop()
+
+
+class OffsetTrackerTest(unittest.TestCase):
+    def test_commit_after_ack(self):
+        tracker = OffsetTracker()
+        for offset in range(3):
+            tracker.track(topic="t", partition=0, offset=offset)
+        self.assertEqual([], tracker.committable())
+
+        # Out of order acknowledgement does not move the offset past the oldest message in flight
+        tracker.ack(topic="t", partition=0, offset=1)
+        self.assertEqual([("t", 0, 0)], tracker.committable())
+        tracker.ack(topic="t", partition=0, offset=0)
+        self.assertEqual([("t", 0, 2)], tracker.committable())
+        tracker.ack(topic="t", partition=0, offset=2)
+        self.assertEqual([], tracker.committable(batch_size=2))
+        self.assertEqual([("t", 0, 3)], tracker.committable())
+        self.assertEqual({}, tracker.pending())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fabric_cf.actor.core.kernel.kernel import Kernel
+from fabric_cf.actor.core.util.id import ID
+
+
+class IncrementalTickTest(unittest.TestCase):
+    class Term:
+        def __init__(self, start: datetime, end: datetime):
+            self.start = start
+            self.end = end
+
+        def get_start_time(self):
+            return self.start
+
+        def get_end_time(self):
+            return self.end
+
+    class Database:
+        def update_reservation(self, *, reservation):
+            return
+
+    class Plugin:
+        def get_database(self):
+            return IncrementalTickTest.Database()
+
+    class Reservation:
+        """
+        Minimal stand-in for a kernel reservation counting the probes
+        """
+        def __init__(self, *, term, pending: bool = False):
+            self.rid = ID()
+            self.term = term
+            self.pending = pending
+            self.closed = False
+            self.probes = 0
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_term(self):
+            return self.term
+
+        def get_requested_term(self):
+            return self.term
+
+        def get_slice(self):
+            return None
+
+        def lock(self):
+            return
+
+        def unlock(self):
+            return
+
+        def prepare_probe(self):
+            return
+
+        def probe_pending(self):
+            self.probes += 1
+
+        def service_probe(self):
+            return
+
+        def is_probe_required(self) -> bool:
+            return self.pending
+
+        def is_closed(self) -> bool:
+            return self.closed
+
+        def is_terminal(self) -> bool:
+            return self.closed
+
+        def is_nascent(self) -> bool:
+            return False
+
+        def is_no_pending(self) -> bool:
+            return not self.pending
+
+    def get_kernel(self, *, sweep_ticks: int = 5) -> Kernel:
+        return Kernel(plugin=self.Plugin(), policy=None, logger=logging.getLogger(__name__),
+                      incremental_tick=True, sweep_ticks=sweep_ticks)
+
+    def add(self, *, kernel: Kernel, reservation):
+        kernel.reservations.add(reservation=reservation)
+        kernel.mark_dirty(reservation=reservation)
+
+    def test_idle_reservations_probed_on_sweep(self):
+        kernel = self.get_kernel(sweep_ticks=5)
+        now = datetime.now(timezone.utc)
+        term = self.Term(start=now - timedelta(hours=1), end=now + timedelta(days=1))
+        idle = self.Reservation(term=term)
+        pending = self.Reservation(term=term, pending=True)
+        self.add(kernel=kernel, reservation=idle)
+        self.add(kernel=kernel, reservation=pending)
+
+        for i in range(4):
+            kernel.tick()
+        # Idle reservation is probed once after being marked dirty, pending reservation on every tick
+        self.assertEqual(1, idle.probes)
+        self.assertEqual(4, pending.probes)
+
+        # Fifth tick is a full sweep
+        kernel.tick()
+        self.assertEqual(2, idle.probes)
+        self.assertEqual(5, pending.probes)
+
+        # Kernel operations mark the reservation dirty
+        kernel.mark_dirty(reservation=idle)
+        kernel.tick()
+        self.assertEqual(3, idle.probes)
+
+    def test_term_boundary_marks_reservation_dirty(self):
+        kernel = self.get_kernel(sweep_ticks=100)
+        now = datetime.now(timezone.utc)
+        term = self.Term(start=now - timedelta(hours=1), end=now + timedelta(days=1))
+        reservation = self.Reservation(term=term)
+        self.add(kernel=kernel, reservation=reservation)
+        kernel.tick()
+        kernel.tick()
+        self.assertEqual(1, reservation.probes)
+
+        # Reservation is extended to end shortly; it is probed once the new end time is reached
+        reservation.term = self.Term(start=term.get_start_time(), end=now + timedelta(milliseconds=1))
+        kernel.mark_dirty(reservation=reservation)
+        kernel.tick()
+        self.assertEqual(2, reservation.probes)
+        while datetime.now(timezone.utc) <= reservation.term.get_end_time():
+            pass
+        kernel.tick()
+        self.assertEqual(3, reservation.probes)
+        kernel.tick()
+        self.assertEqual(3, reservation.probes)
+
+    def test_nothing_pending(self):
+        kernel = self.get_kernel()
+        now = datetime.now(timezone.utc)
+        reservation = self.Reservation(term=self.Term(start=now, end=now + timedelta(days=1)), pending=True)
+        self.add(kernel=kernel, reservation=reservation)
+        kernel.tick()
+        self.assertTrue(kernel.has_something_pending())
+
+        reservation.pending = False
+        kernel.tick()
+        self.assertFalse(kernel.has_something_pending())
+        self.assertEqual(2, reservation.probes)
+        self.assertEqual(0, len(kernel.dirty_reservations))
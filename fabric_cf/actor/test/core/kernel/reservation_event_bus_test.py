@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import unittest
+
+from fabric_cf.actor.core.kernel.reservation_event_bus import ReservationEventBus
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.util.id import ID
+
+
+class ReservationEventBusTest(unittest.TestCase):
+    class Reservation:
+        def __init__(self, rid: ID, state: ReservationStates):
+            self.rid = rid
+            self.state = state
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_state(self):
+            return self.state
+
+    class Bus(ReservationEventBus):
+        @staticmethod
+        def snapshot(*, reservation):
+            return reservation.get_state()
+
+    def setUp(self) -> None:
+        self.bus = self.Bus(logger=logging.getLogger(__name__))
+        self.received = []
+        self.done = threading.Event()
+
+    def tearDown(self) -> None:
+        self.bus.stop()
+
+    def callback(self, snapshot):
+        self.received.append(snapshot)
+        self.done.set()
+
+    def test_callback_on_target_state(self):
+        rid = ID()
+        reservation = self.Reservation(rid=rid, state=ReservationStates.Ticketed)
+        self.bus.subscribe(rid=rid, states=[ReservationStates.Active, ReservationStates.Failed],
+                           callback=self.callback)
+        self.bus.publish(reservation=reservation)
+        self.assertTrue(self.bus.has_subscriptions(rid=rid))
+
+        reservation.state = ReservationStates.Active
+        self.bus.publish(reservation=reservation)
+        self.assertTrue(self.done.wait(timeout=5))
+        self.assertEqual([ReservationStates.Active], self.received)
+        self.assertFalse(self.bus.has_subscriptions(rid=rid))
+
+        # Subscription is removed after the first matching transition
+        self.done.clear()
+        reservation.state = ReservationStates.Failed
+        self.bus.publish(reservation=reservation)
+        self.assertFalse(self.done.wait(timeout=0.2))
+        self.assertEqual([ReservationStates.Active], self.received)
+
+    def test_unsubscribe(self):
+        rid = ID()
+        subscription = self.bus.subscribe(rid=rid, states=[ReservationStates.Active], callback=self.callback)
+        self.bus.unsubscribe(subscription=subscription)
+        self.assertFalse(self.bus.has_subscriptions(rid=rid))
+        self.bus.publish(reservation=self.Reservation(rid=rid, state=ReservationStates.Active))
+        self.assertFalse(self.done.wait(timeout=0.2))
+
+    def test_failing_callback(self):
+        rid = ID()
+
+        def fail(snapshot):
+            raise Exception("callback failed")
+
+        self.bus.subscribe(rid=rid, states=[ReservationStates.Active], callback=fail)
+        self.bus.subscribe(rid=rid, states=[ReservationStates.Active], callback=self.callback)
+        self.bus.publish(reservation=self.Reservation(rid=rid, state=ReservationStates.Active))
+        self.assertTrue(self.done.wait(timeout=5))
+        self.assertEqual([ReservationStates.Active], self.received)
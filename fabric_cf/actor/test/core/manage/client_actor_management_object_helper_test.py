@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
+from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
+
+from fabric_cf.actor.core.common.constants import ErrorCodes
+from fabric_cf.actor.core.manage.client_actor_management_object_helper import ClientActorManagementObjectHelper
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.security.auth_token import AuthToken
+from fabric_cf.actor.test.core.plugins.actor_database_batch_test import ActorDatabaseBatchTest, Reservation
+
+
+class ClientActorManagementObjectHelperTest(unittest.TestCase):
+    class ResourceSet:
+        def __init__(self):
+            self.sliver = None
+
+        def get_sliver(self):
+            return self.sliver
+
+        def set_sliver(self, *, sliver):
+            self.sliver = sliver
+
+        def get_units(self):
+            return None
+
+        def get_type(self):
+            return None
+
+    class Reservation(Reservation):
+        def __init__(self, rid: str, state: int):
+            super().__init__(rid, state)
+            self.resources = ClientActorManagementObjectHelperTest.ResourceSet()
+
+        def get_resources(self):
+            return self.resources
+
+    class Plugin:
+        def __init__(self, db: ActorDatabase):
+            self.db = db
+
+        def get_database(self):
+            return self.db
+
+    class Client:
+        """
+        Stand-in for the client actor; runnables are executed on the calling thread
+        """
+        def __init__(self, db: ActorDatabase):
+            self.plugin = ClientActorManagementObjectHelperTest.Plugin(db)
+            self.reservations = {}
+            self.demanded = []
+            self.extended = {}
+
+        def get_plugin(self):
+            return self.plugin
+
+        def get_reservation(self, *, rid: ID):
+            return self.reservations.get(str(rid))
+
+        def execute_on_actor_thread_and_wait(self, *, runnable):
+            return runnable.run()
+
+        def demand(self, *, rid: ID):
+            self.demanded.append(str(rid))
+
+        def extend(self, *, rid: ID, resources, term, dependencies):
+            self.extended[str(rid)] = (resources.get_sliver(), [d.get_reservation_id() for d in dependencies])
+
+    class Helper(ClientActorManagementObjectHelper):
+        def __init__(self, *, client):
+            self.client = client
+            self.logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        self.db = ActorDatabase(user="fabric", password="fabric", database="test", db_host="localhost:5432",
+                                logger=logging.getLogger(__name__))
+        self.db.db = ActorDatabaseBatchTest.Database()
+        self.client = self.Client(self.db)
+        for i in range(3):
+            self.client.reservations[f"r{i}"] = self.Reservation(f"r{i}", state=1)
+        self.helper = self.Helper(client=self.client)
+        self.caller = AuthToken(name="test", guid=ID())
+
+    def update(self, rid: str, r):
+        self.db.update_reservation(reservation=r)
+
+    def test_run_batch(self):
+        results = self.helper.run_batch(rids=["r0", "r1", "r2", "r3"], caller=self.caller, action=self.update,
+                                        name="update")
+        self.assertEqual(4, len(results))
+        for rid in ["r0", "r1", "r2"]:
+            self.assertEqual(0, results[rid].get_code())
+        self.assertEqual(ErrorCodes.ErrorNoSuchReservation.value, results["r3"].get_code())
+        # Single transaction for the whole batch
+        self.assertEqual([["r0", "r1", "r2"]], self.db.db.batches)
+        self.assertEqual([], self.db.db.single)
+
+    def test_run_batch_invalid_arguments(self):
+        self.assertEqual({}, self.helper.run_batch(rids=[], caller=self.caller, action=self.update, name="update"))
+        results = self.helper.run_batch(rids=["r0"], caller=None, action=self.update, name="update")
+        self.assertEqual(ErrorCodes.ErrorInvalidArguments.value, results["r0"].get_code())
+
+    def test_run_batch_action_failure(self):
+        def action(rid: str, r):
+            if rid == "r1":
+                raise Exception("action failed")
+            self.update(rid, r)
+
+        results = self.helper.run_batch(rids=["r0", "r1", "r2"], caller=self.caller, action=action, name="update")
+        self.assertEqual(0, results["r0"].get_code())
+        self.assertEqual(ErrorCodes.ErrorInternalError.value, results["r1"].get_code())
+        self.assertEqual(0, results["r2"].get_code())
+        self.assertEqual([["r0", "r2"]], self.db.db.batches)
+
+    def test_run_batch_write_failure(self):
+        # Only the reservation whose update cannot be written is reported as failed
+        self.db.db.fail_rids.add("r1")
+        results = self.helper.run_batch(rids=["r0", "r1", "r2"], caller=self.caller, action=self.update,
+                                        name="update")
+        self.assertEqual(0, results["r0"].get_code())
+        self.assertEqual(ErrorCodes.ErrorDatabaseError.value, results["r1"].get_code())
+        self.assertEqual(0, results["r2"].get_code())
+        self.assertEqual(["r0", "r2"], self.db.db.single)
+
+    def test_demand_reservations(self):
+        reservations = []
+        for rid in ["r0", "r1", "r2", "r3"]:
+            reservation = LeaseReservationAvro()
+            reservation.set_reservation_id(rid)
+            reservations.append(reservation)
+
+        results = self.helper.demand_reservations(reservations=reservations, caller=self.caller)
+        for rid in ["r0", "r1", "r2"]:
+            self.assertEqual(0, results[rid].get_code())
+        self.assertEqual(ErrorCodes.ErrorNoSuchReservation.value, results["r3"].get_code())
+        self.assertEqual(["r0", "r1", "r2"], self.client.demanded)
+        self.assertEqual([["r0", "r1", "r2"]], self.db.db.batches)
+
+    def test_extend_reservations(self):
+        dependency = ReservationPredecessorAvro()
+        dependency.set_reservation_id("r0")
+        missing = ReservationPredecessorAvro()
+        missing.set_reservation_id("r9")
+        slivers = {ID(uid="r0"): "sliver0", ID(uid="r1"): "sliver1", ID(uid="r2"): "sliver2"}
+        dependencies = {ID(uid="r1"): [dependency], ID(uid="r2"): [missing]}
+
+        results = self.helper.extend_reservations(rids=[ID(uid=rid) for rid in ["r0", "r1", "r2"]],
+                                                  caller=self.caller, slivers=slivers, dependencies=dependencies)
+        self.assertEqual(0, results["r0"].get_code())
+        self.assertEqual(0, results["r1"].get_code())
+        self.assertEqual(ErrorCodes.ErrorNoSuchReservation.value, results["r2"].get_code())
+        self.assertEqual({"r0": ("sliver0", []), "r1": ("sliver1", ["r0"])}, self.client.extended)
+
+        # Neither a new end time nor a sliver
+        results = self.helper.extend_reservations(rids=[ID(uid="r0")], caller=self.caller)
+        self.assertEqual(ErrorCodes.ErrorInvalidArguments.value, results["r0"].get_code())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from datetime import datetime, timezone
+
+from fabric_mb.message_bus.messages.auth_avro import AuthAvro
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
+
+from fabric_cf.actor.core.common.constants import ErrorCodes
+from fabric_cf.actor.core.manage.kafka.kafka_controller import KafkaController
+from fabric_cf.actor.core.util.id import ID
+
+
+class KafkaControllerTest(unittest.TestCase):
+    class Controller(KafkaController):
+        """
+        Controller proxy recording the requests instead of sending them; requests for failed ids time out
+        """
+        def __init__(self, *, failed: list = None):
+            super().__init__(guid=ID(), kafka_topic="controller-topic", auth=AuthAvro(),
+                             logger=logging.getLogger(__name__), message_processor=None, producer=object())
+            self.failed = failed or []
+            self.requests = []
+
+        def send_request(self, request):
+            self.requests.append(request)
+            status = ResultAvro()
+            if request.reservation_id in self.failed:
+                status.code = ErrorCodes.ErrorTransportTimeout.value
+                status.message = ErrorCodes.ErrorTransportTimeout.interpret()
+            self.last_status = status
+            return status, None
+
+    def test_close_reservations_by_rids(self):
+        controller = self.Controller(failed=["r1"])
+        results = controller.close_reservations_by_rids(rids=[ID(uid="r0"), ID(uid="r1"), ID(uid="r2")])
+
+        self.assertEqual(["r0", "r1", "r2"], [r.reservation_id for r in controller.requests])
+        self.assertEqual(0, results["r0"].get_code())
+        self.assertEqual(ErrorCodes.ErrorTransportTimeout.value, results["r1"].get_code())
+        self.assertEqual(0, results["r2"].get_code())
+        self.assertIs(results["r1"], controller.get_last_error().get_status())
+
+    def test_extend_reservations(self):
+        controller = self.Controller()
+        results = controller.extend_reservations(rids=[ID(uid="r0"), ID(uid="r1")],
+                                                 slivers={ID(uid="r0"): None})
+        self.assertEqual(ErrorCodes.ErrorInvalidArguments.value, results["r0"].get_code())
+        self.assertEqual(ErrorCodes.ErrorInvalidArguments.value, results["r1"].get_code())
+        self.assertEqual([], controller.requests)
+
+        end = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        results = controller.extend_reservations(rids=[ID(uid="r0"), ID(uid="r1")], new_end_time=end)
+        self.assertEqual({"r0": 0, "r1": 0}, {rid: r.get_code() for rid, r in results.items()})
+        self.assertEqual(["r0", "r1"], [r.reservation_id for r in controller.requests])
+        self.assertEqual(0, controller.get_last_error().get_status().get_code())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+from fabric_cf.actor.core.plugins.db.reservation_write_behind import ReservationWriteBehind
+
+
+class Value:
+    def __init__(self, value: int):
+        self.value = value
+
+
+class Reservation:
+    """
+    Stand-in for a reservation carrying only the fields saved in the database
+    """
+    def __init__(self, rid: str, state: int):
+        self.rid = rid
+        self.state = state
+        self.dirty = True
+
+    def is_dirty(self):
+        return self.dirty
+
+    def clear_dirty(self):
+        self.dirty = False
+
+    def get_reservation_id(self):
+        return self.rid
+
+    def get_slice(self):
+        return None
+
+    def get_slice_id(self):
+        return "slice"
+
+    def get_resources(self):
+        return None
+
+    def get_term(self):
+        return None
+
+    def get_category(self):
+        return Value(1)
+
+    def get_state(self):
+        return Value(self.state)
+
+    def get_pending_state(self):
+        return Value(0)
+
+    def get_join_state(self):
+        return Value(0)
+
+    def get_graph_node_id(self):
+        return None
+
+
+class ActorDatabaseBatchTest(unittest.TestCase):
+    class Database:
+        """
+        Stand-in for PsqlDatabase recording the writes
+        """
+        def __init__(self):
+            self.batches = []
+            self.single = []
+            self.removed = []
+            # Reservations whose update fails
+            self.fail_rids = set()
+
+        def update_reservations(self, *, records):
+            rids = [r["rsv_resid"] for r in records]
+            if self.fail_rids.intersection(rids):
+                raise Exception("Batch failed")
+            self.batches.append(rids)
+
+        def update_reservation(self, **record):
+            if record["rsv_resid"] in self.fail_rids:
+                raise Exception(f"Update of {record['rsv_resid']} failed")
+            self.single.append(record["rsv_resid"])
+
+        def remove_unit(self, *, unt_uid: str):
+            pass
+
+        def remove_reservation(self, *, rsv_resid: str):
+            self.removed.append(rsv_resid)
+
+    def get_database(self) -> ActorDatabase:
+        actor_db = ActorDatabase(user="fabric", password="fabric", database="test", db_host="localhost:5432",
+                                 logger=logging.getLogger(__name__))
+        actor_db.db = self.Database()
+        return actor_db
+
+    def test_updates_written_in_one_transaction(self):
+        actor_db = self.get_database()
+        with actor_db.batch_updates():
+            for i in range(3):
+                actor_db.update_reservation(reservation=Reservation(f"r{i}", state=1))
+            with actor_db.batch_updates():
+                actor_db.update_reservation(reservation=Reservation("r0", state=2))
+            self.assertEqual([], actor_db.db.batches)
+        self.assertEqual([["r0", "r1", "r2"]], actor_db.db.batches)
+        self.assertEqual([], actor_db.db.single)
+
+        actor_db.update_reservation(reservation=Reservation("r3", state=1))
+        self.assertEqual(["r3"], actor_db.db.single)
+
+    def test_remove_and_flush(self):
+        actor_db = self.get_database()
+        with actor_db.batch_updates():
+            actor_db.update_reservation(reservation=Reservation("r1", state=1))
+            actor_db.update_reservation(reservation=Reservation("r2", state=1))
+            actor_db.remove_reservation(rid="r1")
+            actor_db.flush()
+            self.assertEqual([["r2"]], actor_db.db.batches)
+            actor_db.update_reservation(reservation=Reservation("r3", state=1))
+        self.assertEqual([["r2"], ["r3"]], actor_db.db.batches)
+        self.assertEqual(["r1"], actor_db.db.removed)
+
+    def test_failed_batch_written_one_at_a_time(self):
+        actor_db = self.get_database()
+        actor_db.db.fail_rids.add("r1")
+        with actor_db.batch_updates() as failed:
+            for i in range(3):
+                actor_db.update_reservation(reservation=Reservation(f"r{i}", state=1))
+        self.assertEqual([], actor_db.db.batches)
+        self.assertEqual(["r0", "r2"], actor_db.db.single)
+        self.assertEqual(["r1"], list(failed.keys()))
+
+    def test_stop_writes_pending_and_stops_writer(self):
+        actor_db = self.get_database()
+        write_behind = ReservationWriteBehind(db=actor_db.db, logger=actor_db.logger, window_ms=60000)
+        write_behind.start()
+        actor_db.write_behind = write_behind
+        actor_db.update_reservation(reservation=Reservation("r1", state=1))
+        self.assertEqual([], actor_db.db.batches)
+
+        actor_db.stop()
+        self.assertEqual([["r1"]], actor_db.db.batches)
+        self.assertIsNone(write_behind.thread)
+        self.assertIsNone(actor_db.write_behind)
+
+        # Updates after stop are written through
+        actor_db.update_reservation(reservation=Reservation("r2", state=1))
+        self.assertEqual(["r2"], actor_db.db.single)
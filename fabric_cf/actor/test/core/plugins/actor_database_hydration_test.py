@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import pickle
+import unittest
+from collections import defaultdict
+
+from fabric_cf.actor.core.apis.abc_controller_reservation import ABCControllerReservation
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+
+
+class Slice:
+    def __init__(self, slice_id: str):
+        self.slice_id = slice_id
+
+
+class Predecessor:
+    """
+    Stand-in for PredecessorState; only the reservation id is saved in the database
+    """
+    def __init__(self, reservation_id: str):
+        self.reservation_id = reservation_id
+        self.reservation = None
+
+    def set_reservation(self, reservation):
+        self.reservation = reservation
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['reservation']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reservation = None
+
+
+class Reservation:
+    """
+    Stand-in for a controller reservation with redeem predecessors
+    """
+    def __init__(self, rid: str, predecessors: list = None):
+        self.rid = rid
+        self.predecessors = [Predecessor(reservation_id=p) for p in predecessors or []]
+        self.slice = None
+
+    def restore(self, *, actor, slice_obj):
+        self.slice = slice_obj
+
+    def get_reservation_id(self):
+        return self.rid
+
+    def get_redeem_predecessors(self):
+        return self.predecessors
+
+    def get_join_predecessors(self):
+        return []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['slice']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.slice = None
+
+
+ABCControllerReservation.register(Reservation)
+
+
+class ActorDatabaseHydrationTest(unittest.TestCase):
+    class Database:
+        """
+        Stand-in for PsqlDatabase holding pickled rows and counting the queries issued
+        """
+        def __init__(self):
+            self.slices = {}
+            self.reservations = []
+            self.queries = defaultdict(int)
+
+        def add_slice(self, *, slc_id: int, slice_id: str):
+            self.slices[slc_id] = {'slc_id': slc_id, 'slc_guid': slice_id,
+                                   Constants.PROPERTY_PICKLE_PROPERTIES: pickle.dumps(Slice(slice_id))}
+
+        def add_reservation(self, *, reservation: Reservation, slc_id: int):
+            self.reservations.append({'rsv_resid': reservation.get_reservation_id(), Constants.RSV_SLC_ID: slc_id,
+                                      Constants.PROPERTY_PICKLE_PROPERTIES: pickle.dumps(reservation)})
+
+        def get_reservations(self, *, slice_id: str = None, rid: str = None, **kwargs):
+            self.queries['get_reservations'] += 1
+            result = []
+            for r in self.reservations:
+                if rid is not None and r['rsv_resid'] != rid:
+                    continue
+                if slice_id is not None and self.slices[r[Constants.RSV_SLC_ID]]['slc_guid'] != slice_id:
+                    continue
+                result.append(r)
+            return result
+
+        def get_reservations_by_rids(self, *, rsv_resid_list: list):
+            self.queries['get_reservations_by_rids'] += 1
+            return [r for r in self.reservations if r['rsv_resid'] in rsv_resid_list]
+
+        def get_slices_by_ids(self, *, slc_ids: list):
+            self.queries['get_slices_by_ids'] += 1
+            return [self.slices[x] for x in slc_ids]
+
+        def get_slice_by_id(self, *, slc_id: int):
+            self.queries['get_slice_by_id'] += 1
+            return self.slices.get(slc_id)
+
+        def get_poas(self, **kwargs):
+            self.queries['get_poas'] += 1
+            return []
+
+    def get_database(self) -> ActorDatabase:
+        actor_db = ActorDatabase(user="fabric", password="fabric", database="test", db_host="localhost:5432",
+                                 logger=logging.getLogger(__name__))
+        actor_db.db = self.Database()
+        actor_db.db.add_slice(slc_id=1, slice_id="s1")
+        actor_db.db.add_slice(slc_id=2, slice_id="s2")
+        return actor_db
+
+    @staticmethod
+    def describe(reservation: Reservation) -> tuple:
+        preds = tuple((p.reservation_id, p.reservation.get_reservation_id() if p.reservation is not None else None)
+                      for p in reservation.get_redeem_predecessors())
+        return reservation.get_reservation_id(), reservation.slice.slice_id, preds
+
+    def test_batch_matches_per_rid(self):
+        actor_db = self.get_database()
+        actor_db.db.add_reservation(reservation=Reservation("p0"), slc_id=2)
+        count = 10
+        for i in range(count):
+            predecessors = ["p0"] if i % 2 == 0 else [f"r{i - 1}"]
+            actor_db.db.add_reservation(reservation=Reservation(f"r{i}", predecessors=predecessors), slc_id=1)
+
+        actor_db.db.queries.clear()
+        batch = actor_db.get_reservations(slice_id="s1")
+        batch_queries = dict(actor_db.db.queries)
+
+        # One query each for the rows, the slices and the predecessors outside the batch (plus the slice
+        # of those predecessors) regardless of how many reservations are loaded
+        self.assertEqual(1, batch_queries.get('get_reservations'))
+        self.assertEqual(1, batch_queries.get('get_reservations_by_rids'))
+        self.assertEqual(2, batch_queries.get('get_slices_by_ids'))
+        self.assertIsNone(batch_queries.get('get_slice_by_id'))
+
+        per_rid = []
+        for i in range(count):
+            per_rid.extend(actor_db.get_reservations(rid=f"r{i}"))
+
+        self.assertEqual(count, len(batch))
+        self.assertEqual([self.describe(r) for r in per_rid], [self.describe(r) for r in batch])
+
+        # Reservations in the same slice share the slice object
+        self.assertEqual(1, len({id(r.slice) for r in batch}))
+
+    def test_predecessors_in_batch_not_reloaded(self):
+        actor_db = self.get_database()
+        actor_db.db.add_reservation(reservation=Reservation("r0"), slc_id=1)
+        actor_db.db.add_reservation(reservation=Reservation("r1", predecessors=["r0"]), slc_id=1)
+
+        actor_db.db.queries.clear()
+        batch = actor_db.get_reservations(slice_id="s1")
+
+        self.assertEqual({'get_reservations': 1, 'get_slices_by_ids': 1}, dict(actor_db.db.queries))
+        self.assertIs(batch[0], batch[1].get_redeem_predecessors()[0].reservation)
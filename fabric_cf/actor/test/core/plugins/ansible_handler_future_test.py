@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import concurrent.futures
+import logging
+import queue
+import threading
+import unittest
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.plugins.handlers.ansible_handler_processor import AnsibleHandlerProcessor
+from fabric_cf.actor.core.plugins.handlers.handler_processor import HandlerProcessor
+
+
+class CountingHandler:
+    """
+    Handler stand-in counting the instances created by the process pool
+    """
+    instances = 0
+
+    def __init__(self, logger, properties: dict, process_lock):
+        CountingHandler.instances += 1
+
+    def create(self, unit):
+        return {Constants.PROPERTY_TARGET_NAME: Constants.TARGET_CREATE,
+                Constants.PROPERTY_TARGET_RESULT_CODE: Constants.RESULT_CODE_OK}, unit
+
+
+class AnsibleHandlerFutureTest(unittest.TestCase):
+    class Unit:
+        def __init__(self, name: str):
+            self.name = name
+
+        def update_sliver(self, *, sliver):
+            pass
+
+        def get_sliver(self):
+            return None
+
+    class Plugin:
+        def __init__(self):
+            self.completed = []
+            self.event = threading.Event()
+
+        def configuration_complete(self, *, token, properties):
+            self.completed.append(token.name)
+            self.event.set()
+
+    class Processor(AnsibleHandlerProcessor):
+        """
+        Processor running the handlers on a thread pool instead of the process pool
+        """
+        def __init__(self):
+            HandlerProcessor.__init__(self)
+            self.max_workers = 2
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            self.futures = {}
+            self.completed = queue.Queue()
+            self.thread = None
+            self.future_lock = threading.Condition()
+            self.stopped = False
+
+    def test_futures_processed_on_completion(self):
+        processor = self.Processor()
+        processor.set_logger(logger=logging.getLogger(__name__))
+        plugin = self.Plugin()
+        processor.set_plugin(plugin=plugin)
+        processor.start()
+        try:
+            release = threading.Event()
+            blocked = self.Unit("blocked")
+
+            def blocked_handler():
+                release.wait(timeout=10)
+                return {Constants.PROPERTY_TARGET_NAME: Constants.TARGET_CREATE}, blocked
+
+            processor.queue_future(future=processor.executor.submit(blocked_handler), unit=blocked)
+            done = self.Unit("done")
+            processor.queue_future(future=processor.executor.submit(
+                lambda: ({Constants.PROPERTY_TARGET_NAME: Constants.TARGET_CREATE}, done)), unit=done)
+
+            # The completed handler is processed without waiting for the outstanding one
+            self.assertTrue(plugin.event.wait(timeout=5))
+            self.assertEqual(["done"], plugin.completed)
+            self.assertEqual([blocked], list(processor.futures.values()))
+
+            plugin.event.clear()
+            release.set()
+            self.assertTrue(plugin.event.wait(timeout=5))
+            self.assertEqual(["done", "blocked"], plugin.completed)
+            self.assertEqual(0, len(processor.futures))
+        finally:
+            processor.shutdown()
+        self.assertIsNone(processor.thread)
+
+    def test_handler_cached_per_process(self):
+        CountingHandler.instances = 0
+        unit = self.Unit("n1")
+        for i in range(3):
+            properties, result_unit = AnsibleHandlerProcessor.process_pool_main(
+                Constants.TARGET_CREATE, CountingHandler.__name__, __name__, {"key": "value"}, unit, None, None)
+            self.assertEqual(Constants.RESULT_CODE_OK, properties[Constants.PROPERTY_TARGET_RESULT_CODE])
+            self.assertEqual(unit, result_unit)
+        self.assertEqual(1, CountingHandler.instances)
+
+        AnsibleHandlerProcessor.process_pool_main(Constants.TARGET_CREATE, CountingHandler.__name__, __name__,
+                                                  {"key": "other"}, unit, None, None)
+        self.assertEqual(2, CountingHandler.instances)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fim.slivers.attached_components import AttachedComponentsInfo, ComponentSliver, ComponentType
+from fim.slivers.capacities_labels import Capacities
+from fim.slivers.network_node import NodeSliver, NodeType
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.plugins.db.occupancy_cache import OccupancyCache
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.fim.plugins.broker.aggregate_bqm_plugin import AggregatedBQMPlugin
+
+
+class OccupancyCacheTest(unittest.TestCase):
+    class Term:
+        def __init__(self, start: datetime, end: datetime):
+            self.start = start
+            self.end = end
+
+        def get_start_time(self):
+            return self.start
+
+        def get_end_time(self):
+            return self.end
+
+    class Resources:
+        def __init__(self, sliver):
+            self.sliver = sliver
+
+        def get_sliver(self):
+            return self.sliver
+
+    class Reservation:
+        """
+        Minimal stand-in for a broker reservation exposing only what the cache needs
+        """
+        def __init__(self, sliver, term, graph_node_id: str = "worker-1",
+                     state: ReservationStates = ReservationStates.Ticketed):
+            self.rid = ID()
+            self.resources = OccupancyCacheTest.Resources(sliver)
+            self.term = term
+            self.graph_node_id = graph_node_id
+            self.state = state
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_graph_node_id(self):
+            return self.graph_node_id
+
+        def get_term(self):
+            return self.term
+
+        def get_state(self):
+            return self.state
+
+        def get_resources(self):
+            return self.resources
+
+        def get_approved_resources(self):
+            return None
+
+        def is_ticketing(self):
+            return False
+
+        def is_ticketed(self):
+            return self.state == ReservationStates.Ticketed
+
+        def is_active(self):
+            return self.state == ReservationStates.Active
+
+    class Database:
+        """
+        Stand-in for the actor database returning the reservations on the node from memory
+        """
+        def __init__(self, reservations: list, occupancy_cache: OccupancyCache = None):
+            self.reservations = reservations
+            self.occupancy_cache = occupancy_cache
+
+        def get_occupancy_cache(self):
+            return self.occupancy_cache
+
+        def get_reservations(self, *, graph_node_id: str, states: list, start: datetime, end: datetime):
+            return [r for r in self.reservations if r.get_graph_node_id() == graph_node_id and
+                    r.get_state().value in states and r.get_term().get_start_time() <= end and
+                    start <= r.get_term().get_end_time()]
+
+    @staticmethod
+    def build_sliver(core: int, gpus: int = 0) -> NodeSliver:
+        sliver = NodeSliver()
+        sliver.set_type(NodeType.VM)
+        sliver.set_name("vm1")
+        sliver.set_capacity_allocations(cap=Capacities(core=core, ram=8, disk=10))
+        if gpus:
+            sliver.attached_components_info = AttachedComponentsInfo()
+            component = ComponentSliver()
+            component.set_name("gpu1")
+            component.set_type(ComponentType.GPU)
+            component.set_model("Tesla T4")
+            component.set_capacity_allocations(cap=Capacities(unit=gpus))
+            sliver.attached_components_info.add_device(device_info=component)
+        return sliver
+
+    def setUp(self) -> None:
+        self.now = datetime.now(timezone.utc)
+        self.cache = OccupancyCache()
+        self.cache.begin_load()
+        self.cache.end_load()
+
+    def test_node_capacities_by_window(self):
+        r1 = self.Reservation(sliver=self.build_sliver(core=2, gpus=1),
+                              term=self.Term(self.now, self.now + timedelta(days=1)))
+        r2 = self.Reservation(sliver=self.build_sliver(core=4),
+                              term=self.Term(self.now + timedelta(days=10), self.now + timedelta(days=12)))
+        for r in [r1, r2]:
+            self.cache.update(reservation=r, rsv_type="VM", components=None, links=[])
+
+        caps, comp_caps = self.cache.get_node_capacities(node_id="worker-1", start=self.now, end=self.now)
+        self.assertEqual(2, caps.core)
+        self.assertEqual(1, comp_caps[ComponentType.GPU]["Tesla T4"].unit)
+
+        caps, _ = self.cache.get_node_capacities(node_id="worker-1", start=self.now,
+                                                 end=self.now + timedelta(days=30))
+        self.assertEqual(6, caps.core)
+
+        caps, _ = self.cache.get_node_capacities(node_id="worker-1", start=self.now + timedelta(days=11),
+                                                 end=self.now + timedelta(days=11))
+        self.assertEqual(4, caps.core)
+
+        # Without a time filter, reservations without a lease are included as well
+        r3 = self.Reservation(sliver=self.build_sliver(core=1), term=None)
+        self.cache.update(reservation=r3, rsv_type="VM", components=None, links=[])
+        caps, _ = self.cache.get_node_capacities(node_id="worker-1")
+        self.assertEqual(7, caps.core)
+
+        # Releasing a reservation removes its occupancy
+        r2.state = ReservationStates.Closed
+        self.cache.update(reservation=r2, rsv_type="VM", components=None, links=[])
+        caps, _ = self.cache.get_node_capacities(node_id="worker-1", start=self.now,
+                                                 end=self.now + timedelta(days=30))
+        self.assertEqual(2, caps.core)
+
+        self.cache.remove(rid=r1.get_reservation_id())
+        caps, comp_caps = self.cache.get_node_capacities(node_id="worker-1", start=self.now, end=self.now)
+        self.assertEqual(0, caps.core)
+        self.assertEqual(0, len(comp_caps))
+
+    def test_components_and_links(self):
+        term = self.Term(self.now, self.now + timedelta(days=1))
+        r1 = self.Reservation(sliver=None, term=term, graph_node_id=None)
+        r2 = self.Reservation(sliver=None, term=term, graph_node_id=None)
+        self.cache.update(reservation=r1, rsv_type="L2STS", components=[("facility-1", "port-1", "100")],
+                          links=[{"node_id": "link:1", "bw": 10}])
+        self.cache.update(reservation=r2, rsv_type="L2PTP", components=[("facility-1", "port-1", "101")],
+                          links=[{"node_id": "link:1", "bw": 5}])
+
+        comps = self.cache.get_components(node_id="facility-1", component="port-1", rsv_type=["L2STS", "L2PTP"])
+        self.assertEqual({"port-1": ["100", "101"]}, comps)
+        comps = self.cache.get_components(node_id="facility-1", component="port-1", rsv_type=["L2STS"],
+                                          start=self.now, end=self.now)
+        self.assertEqual({"port-1": ["100"]}, comps)
+
+        links = self.cache.get_links(node_id="link:1", rsv_type=["L2STS", "L2PTP"], start=self.now, end=self.now)
+        self.assertEqual({"link:1": 15}, links)
+        links = self.cache.get_links(node_id="link:1", rsv_type=["L2STS", "L2PTP"],
+                                     start=self.now + timedelta(days=2), end=self.now + timedelta(days=3))
+        self.assertEqual({}, links)
+
+        # Updates replace the previous occupancy of the reservation
+        self.cache.update(reservation=r1, rsv_type="L2STS", components=[("facility-1", "port-1", "200")],
+                          links=[{"node_id": "link:2", "bw": 10}])
+        self.assertEqual({"link:1": 5}, self.cache.get_links(node_id="link:1", rsv_type=["L2STS", "L2PTP"]))
+        self.assertEqual({"port-1": ["101", "200"]},
+                         self.cache.get_components(node_id="facility-1", rsv_type=["L2STS", "L2PTP"]))
+
+    def test_updates_while_loading_take_precedence(self):
+        term = self.Term(self.now, self.now + timedelta(days=1))
+        stale = self.Reservation(sliver=self.build_sliver(core=2), term=term)
+        fresh = self.Reservation(sliver=self.build_sliver(core=8), term=term)
+        fresh.rid = stale.rid
+
+        self.cache.begin_load()
+        self.assertFalse(self.cache.is_ready())
+        self.cache.update(reservation=fresh, rsv_type="VM", components=None, links=[])
+        self.cache.load(reservation=stale, rsv_type="VM", components=None, links=[])
+        self.cache.end_load()
+
+        self.assertTrue(self.cache.is_ready())
+        caps, _ = self.cache.get_node_capacities(node_id="worker-1", start=self.now, end=self.now)
+        self.assertEqual(8, caps.core)
+
+        self.cache.invalidate()
+        self.assertFalse(self.cache.is_ready())
+
+    def test_plugin_matches_database(self):
+        reservations = [
+            self.Reservation(sliver=self.build_sliver(core=2, gpus=1),
+                             term=self.Term(self.now - timedelta(days=1), self.now + timedelta(days=1))),
+            self.Reservation(sliver=self.build_sliver(core=4, gpus=2),
+                             term=self.Term(self.now - timedelta(hours=1), self.now + timedelta(days=3))),
+            self.Reservation(sliver=self.build_sliver(core=8),
+                             term=self.Term(self.now + timedelta(days=5), self.now + timedelta(days=6))),
+            self.Reservation(sliver=self.build_sliver(core=16), term=self.Term(self.now, self.now + timedelta(days=1)),
+                             state=ReservationStates.Closed)
+        ]
+        for r in reservations:
+            self.cache.update(reservation=r, rsv_type="VM", components=None, links=[])
+
+        windows = [(None, None), (self.now, self.now + timedelta(days=2)),
+                   (self.now + timedelta(days=4), self.now + timedelta(days=7))]
+        for start, end in windows:
+            expected = AggregatedBQMPlugin.occupied_node_capacity(db=self.Database(reservations=reservations),
+                                                                 node_id="worker-1", start=start, end=end)
+            cached = AggregatedBQMPlugin.occupied_node_capacity(db=self.Database(reservations=reservations,
+                                                                                 occupancy_cache=self.cache),
+                                                                node_id="worker-1", start=start, end=end)
+            self.assertEqual(expected[0].to_json(), cached[0].to_json())
+            self.assertEqual({k: {m: c.to_json() for m, c in v.items()} for k, v in expected[1].items()},
+                             {k: {m: c.to_json() for m, c in v.items()} for k, v in cached[1].items()})
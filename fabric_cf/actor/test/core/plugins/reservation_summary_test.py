@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import json
+import unittest
+
+from fim.slivers.capacities_labels import Capacities, Labels
+from fim.slivers.network_node import NodeSliver
+from fim.user import NodeType
+
+from fabric_cf.actor.core.kernel.reservation_client import ClientReservationFactory
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.kernel.slice import SliceFactory
+from fabric_cf.actor.core.plugins.db.reservation_summary import ReservationSummary
+from fabric_cf.actor.core.util.id import ID
+
+
+class ReservationSummaryTest(unittest.TestCase):
+    def make_reservation(self):
+        sliver = NodeSliver()
+        sliver.set_type(NodeType.VM)
+        sliver.set_name("n1")
+        sliver.set_site("RENC")
+        sliver.set_capacities(cap=Capacities(core=2, ram=8, disk=10))
+        sliver.set_label_allocations(lab=Labels(instance_parent="renc-w1"))
+        slice_obj = SliceFactory.create(slice_id=ID(), name="summary-slice")
+        return ClientReservationFactory.create(rid=ID(), resources=ResourceSet(units=1, rtype=None, sliver=sliver),
+                                               slice_object=slice_obj)
+
+    def test_build(self):
+        reservation = self.make_reservation()
+        sliver = reservation.get_resources().get_sliver()
+        summary = ReservationSummary.build(reservation=reservation, sliver=sliver, site=sliver.get_site(),
+                                           host="renc-w1")
+        # Summary must be JSON serializable to be saved in the summary column
+        summary = json.loads(json.dumps(summary))
+        self.assertTrue(ReservationSummary.is_current(summary=summary))
+        self.assertEqual(str(reservation.get_reservation_id()), summary[ReservationSummary.RESERVATION_ID])
+        self.assertEqual(reservation.get_state().value, summary[ReservationSummary.STATE])
+        self.assertEqual("VM", summary[ReservationSummary.SLIVER_TYPE])
+        self.assertEqual("RENC", summary[ReservationSummary.SITE])
+        self.assertEqual("renc-w1", summary[ReservationSummary.HOST])
+        self.assertEqual(2, summary[ReservationSummary.CAPACITIES]["core"])
+        self.assertEqual("renc-w1", summary[ReservationSummary.LABEL_ALLOCATIONS]["instance_parent"])
+        self.assertEqual(reservation.get_notices(), summary[ReservationSummary.NOTICES])
+        self.assertIsNone(summary[ReservationSummary.CLOSED_AT])
+
+    def test_is_current(self):
+        self.assertFalse(ReservationSummary.is_current(summary=None))
+        self.assertFalse(ReservationSummary.is_current(summary={ReservationSummary.VERSION_KEY: 0}))
+        self.assertTrue(ReservationSummary.is_current(
+            summary={ReservationSummary.VERSION_KEY: ReservationSummary.VERSION}))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import unittest
+
+from fabric_cf.actor.core.plugins.db.reservation_write_behind import ReservationWriteBehind
+
+
+class ReservationWriteBehindTest(unittest.TestCase):
+    class Database:
+        """
+        Stand-in for PsqlDatabase recording the writes
+        """
+        def __init__(self, fail_batch: bool = False):
+            self.batches = []
+            self.single = []
+            self.fail_batch = fail_batch
+            self.written = threading.Event()
+
+        def update_reservations(self, *, records):
+            if self.fail_batch or any(r.get("rsv_state") < 0 for r in records):
+                raise Exception("batch failed")
+            self.batches.append(list(records))
+            self.written.set()
+
+        def update_reservation(self, **record):
+            if record.get("rsv_state") < 0:
+                raise Exception("bad record")
+            self.single.append(record)
+
+    @staticmethod
+    def record(rid: str, state: int) -> dict:
+        return {"slc_guid": "slice", "rsv_resid": rid, "rsv_category": 1, "rsv_state": state, "rsv_pending": 0,
+                "rsv_joining": 0, "properties": b""}
+
+    def test_updates_coalesced(self):
+        db = self.Database()
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=60000)
+        for state in range(5):
+            write_behind.submit(rid="r1", record=self.record("r1", state))
+        write_behind.submit(rid="r2", record=self.record("r2", 1))
+        self.assertTrue(write_behind.has_pending())
+
+        write_behind.flush()
+        self.assertFalse(write_behind.has_pending())
+        self.assertEqual(1, len(db.batches))
+        self.assertEqual(2, len(db.batches[0]))
+        self.assertEqual(4, db.batches[0][0]["rsv_state"])
+
+    def test_barrier_for_reservation(self):
+        db = self.Database()
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=60000)
+        write_behind.submit(rid="r1", record=self.record("r1", 1))
+        write_behind.submit(rid="r2", record=self.record("r2", 1))
+        write_behind.flush(rid="r1")
+        self.assertEqual([["r1"]], [[r["rsv_resid"] for r in b] for b in db.batches])
+        self.assertTrue(write_behind.has_pending())
+
+        write_behind.discard(rid="r2")
+        self.assertFalse(write_behind.has_pending())
+
+    def test_background_writer(self):
+        db = self.Database()
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=10)
+        write_behind.start()
+        try:
+            write_behind.submit(rid="r1", record=self.record("r1", 1))
+            self.assertTrue(db.written.wait(timeout=5))
+            self.assertEqual("r1", db.batches[0][0]["rsv_resid"])
+        finally:
+            write_behind.stop()
+        self.assertIsNone(write_behind.thread)
+
+    def test_failed_batch_written_individually(self):
+        db = self.Database(fail_batch=True)
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=60000)
+        write_behind.submit(rid="r1", record=self.record("r1", 1))
+        write_behind.submit(rid="r2", record=self.record("r2", -1))
+        write_behind.submit(rid="r3", record=self.record("r3", 1))
+        with self.assertRaises(Exception):
+            write_behind.flush()
+        self.assertEqual(["r1", "r3"], [r["rsv_resid"] for r in db.single])
+        # The failed update is retried with the next write
+        self.assertTrue(write_behind.has_pending())
+
+    def test_failed_update_requeued(self):
+        db = self.Database()
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=60000)
+        write_behind.submit(rid="r1", record=self.record("r1", -1))
+        for attempt in range(ReservationWriteBehind.MAX_ATTEMPTS - 1):
+            with self.assertRaises(Exception):
+                write_behind.flush()
+            self.assertTrue(write_behind.has_pending())
+        with self.assertRaises(Exception):
+            write_behind.flush()
+        self.assertFalse(write_behind.has_pending())
+
+    def test_newer_update_replaces_failed_update(self):
+        db = self.Database()
+        write_behind = ReservationWriteBehind(db=db, logger=logging.getLogger(__name__), window_ms=60000)
+        write_behind.submit(rid="r1", record=self.record("r1", -1))
+        with self.assertRaises(Exception):
+            write_behind.flush()
+        write_behind.submit(rid="r1", record=self.record("r1", 2))
+        write_behind.flush()
+        self.assertFalse(write_behind.has_pending())
+        self.assertEqual(2, db.batches[0][0]["rsv_state"])
@@ -24,6 +24,8 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import logging
+import os
+import tempfile
 from datetime import datetime
 
 from fabric_cf.actor.core.apis.abc_database import ABCDatabase
@@ -31,10 +33,12 @@ from fabric_cf.actor.core.core.unit import Unit
 from fabric_cf.actor.core.kernel.authority_reservation import AuthorityReservationFactory
 from fabric_cf.actor.core.kernel.resource_set import ResourceSet
 from fabric_cf.actor.core.kernel.slice import SliceFactory
+from fabric_cf.actor.core.plugins.db.reservation_summary import ReservationSummary
 from fabric_cf.actor.core.plugins.substrate.db.substrate_actor_database import SubstrateActorDatabase
 from fabric_cf.actor.core.time.term import Term
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.core.util.resource_type import ResourceType
+from fabric_cf.actor.security.auth_token import AuthToken
 from fabric_cf.actor.test.core.plugins.actor_database_test import ActorDatabaseTest
 
 
@@ -42,7 +46,7 @@ class SubstrateDatabaseTest(ActorDatabaseTest):
 
     logger = logging.getLogger('AuthorityPolicyTest')
     log_format = '%(asctime)s - %(name)s - {%(filename)s:%(lineno)d} - [%(threadName)s] - %(levelname)s - %(message)s'
-    logging.basicConfig(format=log_format, filename="actor.log")
+    logging.basicConfig(format=log_format, filename=os.path.join(tempfile.gettempdir(), "actor.log"))
     logger.setLevel(logging.INFO)
 
     def make_actor_database(self) -> ABCDatabase:
@@ -67,3 +71,48 @@ class SubstrateDatabaseTest(ActorDatabaseTest):
         db.add_unit(u=u)
 
         self.assertIsNotNone(db.get_unit(uid=u.get_id()))
+
+    def test_e_reservation_summaries(self):
+        actor = self.prepare_actor_database()
+        db = actor.get_plugin().get_database()
+        db.reservation_summary = True
+        slice_obj = SliceFactory.create(slice_id=ID(), name="slice-summary")
+        slice_obj.set_owner(owner=AuthToken(name="owner", guid=ID(), oidc_sub_claim="owner-sub"))
+        db.add_slice(slice_object=slice_obj)
+
+        term = Term(start=datetime.now(), end=datetime.now().replace(minute=20))
+        reservations = []
+        for i in range(3):
+            res = AuthorityReservationFactory.create(resources=ResourceSet(), term=term, slice_obj=slice_obj,
+                                                     rid=ID())
+            db.add_reservation(reservation=res)
+            reservations.append(res)
+        rids = sorted([str(r.get_reservation_id()) for r in reservations])
+
+        # Summaries are saved with the reservations and returned in reservation id order
+        rows = db.db.get_reservation_summaries(slice_id=str(slice_obj.get_slice_id()))
+        self.assertEqual(3, len(rows))
+        for r in rows:
+            self.assertTrue(ReservationSummary.is_current(summary=r.get('summary')))
+        summaries = db.get_reservation_summaries(slice_id=slice_obj.get_slice_id(), after=ID(uid=rids[0]))
+        self.assertEqual(rids[1:], [s[ReservationSummary.RESERVATION_ID] for s in summaries])
+        # Summaries are filtered by the slice owner
+        summaries = db.get_reservation_summaries(slice_id=slice_obj.get_slice_id(), oidc_sub="owner-sub")
+        self.assertEqual(3, len(summaries))
+        summaries = db.get_reservation_summaries(slice_id=slice_obj.get_slice_id(), oidc_sub="other-sub")
+        self.assertEqual(0, len(summaries))
+        summaries = db.get_reservation_summaries(rid_list=rids[:2],
+                                                 category=[reservations[0].get_category().value])
+        self.assertEqual(2, len(summaries))
+
+        # Once summaries are no longer produced, the saved summary is cleared rather than left stale
+        # and the summary is built from the pickled reservation
+        db.reservation_summary = False
+        db.update_reservation(reservation=reservations[0])
+        db.flush()
+        row = db.db.get_reservation_summaries(rid=str(reservations[0].get_reservation_id()))[0]
+        self.assertIsNone(row.get('summary'))
+        summaries = db.get_reservation_summaries(rid=reservations[0].get_reservation_id())
+        self.assertEqual(1, len(summaries))
+        self.assertEqual(str(reservations[0].get_reservation_id()), summaries[0][ReservationSummary.RESERVATION_ID])
+        self.assertEqual(reservations[0].get_state().value, summaries[0][ReservationSummary.STATE])
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fim.slivers.capacities_labels import Capacities
+from fim.slivers.network_node import NodeSliver, NodeType
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.policy.authority_calendar_policy import AuthorityCalendarPolicy
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.reservation_set import ReservationSet
+
+
+class AuthorityAllocationIndexTest(unittest.TestCase):
+    class Resources:
+        def __init__(self, sliver):
+            self.sliver = sliver
+
+        def get_sliver(self):
+            return self.sliver
+
+    class Reservation:
+        """
+        Minimal stand-in for an authority reservation exposing only what the index needs
+        """
+        def __init__(self, state: ReservationStates = ReservationStates.Active,
+                     pending: ReservationPendingStates = ReservationPendingStates.None_):
+            self.rid = ID()
+            sliver = NodeSliver()
+            sliver.set_type(NodeType.VM)
+            sliver.set_capacity_allocations(cap=Capacities(core=2, ram=8, disk=10))
+            self.resources = AuthorityAllocationIndexTest.Resources(sliver)
+            self.state = state
+            self.pending = pending
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_graph_node_id(self):
+            return "worker-1"
+
+        def get_term(self):
+            return None
+
+        def get_state(self):
+            return self.state
+
+        def get_pending_state(self):
+            return self.pending
+
+        def get_resources(self):
+            return self.resources
+
+        def get_approved_resources(self):
+            return None
+
+        def get_requested_resources(self):
+            return self.resources
+
+        def is_ticketing(self):
+            return False
+
+        def is_extending_ticket(self):
+            return False
+
+        def is_ticketed(self):
+            return self.state == ReservationStates.Ticketed
+
+        def is_active(self):
+            return self.state == ReservationStates.Active
+
+        def is_closed(self):
+            return self.state == ReservationStates.Closed
+
+        def is_failed(self):
+            return self.state == ReservationStates.Failed
+
+    class ARM:
+        """
+        Stand-in for the ARM graph counting the slivers built
+        """
+        def __init__(self):
+            self.graph_id = "arm"
+            self.built = 0
+
+        def build_deep_node_sliver(self, node_id: str) -> NodeSliver:
+            self.built += 1
+            sliver = NodeSliver()
+            sliver.set_type(NodeType.Server)
+            sliver.set_name(node_id)
+            sliver.set_capacities(cap=Capacities(core=32, ram=128, disk=500))
+            return sliver
+
+    def setUp(self) -> None:
+        self.policy = AuthorityCalendarPolicy()
+        self.policy.logger = logging.getLogger(__name__)
+
+    def test_graph_node_cached_until_arm_reload(self):
+        arm = self.ARM()
+        self.policy.set_aggregate_resource_model(aggregate_resource_model=arm)
+        first = self.policy.get_network_node_from_graph(node_id="worker-1")
+        first.set_capacities(cap=Capacities(core=1))
+        second = self.policy.get_network_node_from_graph(node_id="worker-1")
+        self.assertEqual(1, arm.built)
+        # Callers get copies of the cached sliver
+        self.assertEqual(32, second.get_capacities().core)
+
+        self.policy.set_aggregate_resource_model(aggregate_resource_model=arm)
+        self.policy.get_network_node_from_graph(node_id="worker-1")
+        self.assertEqual(2, arm.built)
+
+    def test_existing_reservations_from_index(self):
+        active = self.Reservation()
+        closing = self.Reservation(pending=ReservationPendingStates.Closing)
+        closed = self.Reservation()
+        for r in [active, closing, closed]:
+            self.policy.allocation_index.add(reservation=r)
+        self.policy.allocation_index.set_ready(value=True)
+        closed.state = ReservationStates.Closed
+
+        # Served from the index; the actor database is never consulted
+        existing = self.policy.get_existing_reservations(node_id="worker-1", node_id_to_reservations={})
+        self.assertEqual([active.get_reservation_id()], [r.get_reservation_id() for r in existing])
+
+        in_cycle = self.Reservation(state=ReservationStates.Ticketed)
+        cycle_set = ReservationSet()
+        cycle_set.add(reservation=in_cycle)
+        existing = self.policy.get_existing_reservations(node_id="worker-1",
+                                                         node_id_to_reservations={"worker-1": cycle_set})
+        self.assertEqual({active.get_reservation_id(), in_cycle.get_reservation_id()},
+                         {r.get_reservation_id() for r in existing})
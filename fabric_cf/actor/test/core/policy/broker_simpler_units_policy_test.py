@@ -24,6 +24,8 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import logging
+import os
+import tempfile
 import time
 import unittest
 from datetime import datetime
@@ -67,7 +69,7 @@ class BrokerSimplerUnitsPolicyTest(BaseTestCase, unittest.TestCase):
     DonateEndCycle = 100
     logger = logging.getLogger('BrokerSimplerUnitsPolicyTest')
     log_format = '%(asctime)s - %(name)s - {%(filename)s:%(lineno)d} - [%(threadName)s] - %(levelname)s - %(message)s'
-    logging.basicConfig(format=log_format, filename="actor.log")
+    logging.basicConfig(format=log_format, filename=os.path.join(tempfile.gettempdir(), "actor.log"))
     logger.setLevel(logging.INFO)
 
     from fabric_cf.actor.core.container.globals import Globals
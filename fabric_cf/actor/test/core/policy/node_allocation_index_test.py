@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fim.slivers.attached_components import AttachedComponentsInfo, ComponentSliver, ComponentType
+from fim.slivers.capacities_labels import Capacities, Labels
+from fim.slivers.network_node import NodeSliver, NodeType
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.policy.node_allocation_index import NodeAllocationIndex
+from fabric_cf.actor.core.util.id import ID
+
+
+class NodeAllocationIndexTest(unittest.TestCase):
+    class Term:
+        def __init__(self, start: datetime, end: datetime):
+            self.start = start
+            self.end = end
+
+        def get_start_time(self):
+            return self.start
+
+        def get_end_time(self):
+            return self.end
+
+    class Resources:
+        def __init__(self, sliver):
+            self.sliver = sliver
+
+        def get_sliver(self):
+            return self.sliver
+
+    class Reservation:
+        """
+        Minimal stand-in for a broker reservation exposing only what the index needs
+        """
+        def __init__(self, sliver: NodeSliver, term, state: ReservationStates = ReservationStates.Ticketed):
+            self.rid = ID()
+            self.resources = NodeAllocationIndexTest.Resources(sliver)
+            self.term = term
+            self.state = state
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_graph_node_id(self):
+            return "worker-1"
+
+        def get_term(self):
+            return self.term
+
+        def get_state(self):
+            return self.state
+
+        def get_pending_state(self):
+            return ReservationPendingStates.None_
+
+        def get_resources(self):
+            return self.resources
+
+        def get_approved_resources(self):
+            return None
+
+        def get_requested_resources(self):
+            return self.resources
+
+        def is_ticketing(self):
+            return False
+
+        def is_extending_ticket(self):
+            return False
+
+        def is_ticketed(self):
+            return self.state == ReservationStates.Ticketed
+
+        def is_active(self):
+            return self.state == ReservationStates.Active
+
+        def is_closed(self):
+            return self.state == ReservationStates.Closed
+
+        def is_failed(self):
+            return self.state == ReservationStates.Failed
+
+    @staticmethod
+    def build_sliver(bdf: str = None) -> NodeSliver:
+        sliver = NodeSliver()
+        sliver.set_type(NodeType.VM)
+        sliver.set_name("vm1")
+        sliver.set_capacity_allocations(cap=Capacities(core=2, ram=8, disk=10))
+        if bdf is not None:
+            sliver.attached_components_info = AttachedComponentsInfo()
+            component = ComponentSliver()
+            component.set_name("nic1")
+            component.set_type(ComponentType.SmartNIC)
+            component.set_node_map(node_map=("graph", "nic-1"))
+            component.set_labels(Labels(bdf=[bdf]))
+            sliver.attached_components_info.add_device(device_info=component)
+        return sliver
+
+    def setUp(self) -> None:
+        self.now = datetime.now(timezone.utc)
+        self.term = self.Term(self.now, self.now + timedelta(days=1))
+
+    def test_reservations_filtered_by_state_and_term(self):
+        index = NodeAllocationIndex()
+        r1 = self.Reservation(sliver=self.build_sliver(), term=self.term)
+        r2 = self.Reservation(sliver=self.build_sliver(),
+                              term=self.Term(self.now + timedelta(days=2), self.now + timedelta(days=3)))
+        index.add(reservation=r1)
+        index.add(reservation=r2)
+
+        result = index.get_reservations(node_id="worker-1", start=self.now, end=self.now + timedelta(hours=1))
+        self.assertEqual([r1], result)
+        self.assertEqual(2, len(index.get_reservations(node_id="worker-1")))
+        self.assertEqual(0, len(index.get_reservations(node_id="worker-2")))
+
+        r1.state = ReservationStates.Failed
+        self.assertEqual([r2], index.get_reservations(node_id="worker-1"))
+        self.assertFalse(index.contains(rid=r1.get_reservation_id()))
+
+        index.remove(rid=r2.get_reservation_id())
+        self.assertEqual(0, len(index.get_reservations(node_id="worker-1")))
+
+    def test_components(self):
+        index = NodeAllocationIndex()
+        r1 = self.Reservation(sliver=self.build_sliver(bdf="0000:41:00.0"), term=self.term)
+        index.add(reservation=r1)
+
+        components = index.get_components(node_id="worker-1", start=self.now, end=self.now + timedelta(hours=1))
+        self.assertEqual({"nic-1": ["0000:41:00.0"]}, components)
+
+        components = index.get_components(node_id="worker-1", excludes=[str(r1.get_reservation_id())])
+        self.assertEqual({}, components)
+
+        components = index.get_components(node_id="worker-1", include_node=False)
+        self.assertEqual({}, components)
+
+        # Re-adding replaces the previous entries
+        r1.resources = self.Resources(self.build_sliver(bdf="0000:42:00.0"))
+        index.add(reservation=r1)
+        self.assertEqual({"nic-1": ["0000:42:00.0"]}, index.get_components(node_id="worker-1"))
+
+    def test_graph_node_cache(self):
+        index = NodeAllocationIndex()
+        sliver = self.build_sliver(bdf="0000:41:00.0")
+        index.add_graph_node(node_id="worker-1", graph_node=sliver)
+
+        cached = index.get_graph_node(node_id="worker-1")
+        cached.attached_components_info.remove_device(name="nic1")
+        self.assertIsNotNone(index.get_graph_node(node_id="worker-1").attached_components_info.get_device(name="nic1"))
+
+        index.clear_graph_nodes()
+        self.assertIsNone(index.get_graph_node(node_id="worker-1"))
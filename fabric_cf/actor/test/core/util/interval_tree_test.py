@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import random
+import unittest
+
+from fabric_cf.actor.core.util.interval_tree import IntervalTree
+
+
+class IntervalTreeTest(unittest.TestCase):
+    def test_queries(self):
+        tree = IntervalTree()
+        tree.insert(start=0, end=10, key="a", value="a")
+        tree.insert(start=5, end=5, key="b", value="b")
+        tree.insert(start=5, end=20, key="c", value="c")
+        tree.insert(start=12, end=15, key="d", value="d")
+        self.assertEqual(4, len(tree))
+
+        self.assertEqual(["a"], sorted(tree.stab(point=0)))
+        self.assertEqual(["a", "b", "c"], sorted(tree.stab(point=5)))
+        self.assertEqual(["c"], sorted(tree.stab(point=11)))
+        self.assertEqual([], tree.stab(point=21))
+        self.assertEqual(["a", "c", "d"], sorted(tree.overlap(start=10, end=12)))
+        self.assertEqual(["a", "b"], sorted(x[2] for x in tree.ending_by(time=10)))
+        self.assertEqual([0, 5, 5, 12], [start for start, end, value in tree])
+
+        self.assertTrue(tree.remove(start=5, key="c"))
+        self.assertFalse(tree.remove(start=5, key="c"))
+        self.assertEqual(["a", "b"], sorted(tree.stab(point=5)))
+        self.assertEqual(3, len(tree))
+
+    def test_against_brute_force(self):
+        rnd = random.Random(7)
+        tree = IntervalTree()
+        intervals = {}
+        for i in range(2000):
+            key = str(rnd.randint(0, 200))
+            if key in intervals:
+                self.assertTrue(tree.remove(start=intervals.pop(key)[0], key=key))
+            else:
+                start = rnd.randint(0, 1000)
+                end = start + rnd.randint(0, 100)
+                tree.insert(start=start, end=end, key=key, value=key)
+                intervals[key] = (start, end)
+
+            low = rnd.randint(0, 1100)
+            high = low + rnd.randint(0, 50)
+            expected = sorted(k for k, (s, e) in intervals.items() if s <= high and e >= low)
+            self.assertEqual(expected, sorted(tree.overlap(start=low, end=high)))
+            self.assertEqual(len(intervals), len(tree))
+
+        expected = sorted(k for k, (s, e) in intervals.items() if e <= 500)
+        self.assertEqual(expected, sorted(x[1] for x in tree.ending_by(time=500)))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from fabric_cf.actor.core.util.metrics import timed, instrument_methods
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = CollectorRegistry()
+        self.histogram = Histogram("test_seconds", "test", ["method"], registry=self.registry)
+        self.errors = Counter("test_errors", "test", ["method"], registry=self.registry)
+
+    def get_count(self, method: str) -> float:
+        return self.registry.get_sample_value("test_seconds_count", {"method": method})
+
+    def test_timed(self):
+        with timed(self.histogram, method="block"):
+            pass
+        with self.assertRaises(ValueError):
+            with timed(self.histogram, method="block"):
+                raise ValueError("failed")
+        self.assertEqual(2, self.get_count(method="block"))
+
+    def test_instrument_methods(self):
+        @instrument_methods(histogram=self.histogram, errors=self.errors, excludes=("skipped",))
+        class Sample:
+            def work(self, value: int) -> int:
+                return value * 2
+
+            def fail(self):
+                raise ValueError("failed")
+
+            def skipped(self):
+                return True
+
+            def _private(self):
+                return True
+
+        sample = Sample()
+        self.assertEqual(4, sample.work(2))
+        self.assertEqual("work", Sample.work.__name__)
+        with self.assertRaises(ValueError):
+            sample.fail()
+        sample.skipped()
+        sample._private()
+
+        self.assertEqual(1, self.get_count(method="work"))
+        self.assertEqual(1, self.get_count(method="fail"))
+        self.assertIsNone(self.get_count(method="skipped"))
+        self.assertIsNone(self.get_count(method="_private"))
+        self.assertEqual(1, self.registry.get_sample_value("test_errors_total", {"method": "fail"}))
+        self.assertEqual(0, self.registry.get_sample_value("test_errors_total", {"method": "work"}))
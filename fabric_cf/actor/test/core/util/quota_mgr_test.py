@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fim.slivers.capacities_labels import Capacities
+from fim.slivers.network_node import NodeSliver
+
+from fabric_cf.actor.core.util.quota_mgr import QuotaMgr
+
+
+class QuotaMgrTest(unittest.TestCase):
+    PROJECT = "project-1"
+    HOUR = 3600000
+
+    class FakeCoreApi:
+        """
+        Local stand-in for Core API keeping the quotas in memory
+        """
+        def __init__(self, quotas: dict, failures: int = 0):
+            self.quotas = quotas
+            self.failures = failures
+            self.list_calls = 0
+            self.update_calls = 0
+
+        def list_quotas(self, *, project_uuid: str, offset: int = 0, limit: int = 200) -> list:
+            self.list_calls += 1
+            result = []
+            for (resource, unit), (limit_value, used) in self.quotas.items():
+                result.append({"uuid": f"{project_uuid}-{resource}", "resource_type": {"name": resource},
+                               "resource_unit": unit, "quota_limit": limit_value, "quota_used": used})
+            return result
+
+        def update_quota_usage(self, *, uuid: str, project_uuid: str, quota_used: float):
+            self.update_calls += 1
+            if self.failures > 0:
+                self.failures -= 1
+                raise Exception("Core API unavailable")
+            for key, (limit_value, used) in self.quotas.items():
+                if uuid == f"{project_uuid}-{key[0]}":
+                    self.quotas[key] = (limit_value, used + quota_used)
+
+    class Slice:
+        def get_project_id(self):
+            return QuotaMgrTest.PROJECT
+
+    class Resources:
+        def __init__(self, sliver):
+            self.sliver = sliver
+
+        def get_sliver(self):
+            return self.sliver
+
+    class Reservation:
+        """
+        Minimal stand-in for an active reservation exposing only what the quota manager needs
+        """
+        def __init__(self, *, core: int, closed: bool = False):
+            sliver = NodeSliver()
+            capacities = Capacities(core=core, ram=core * 4, disk=core * 10)
+            sliver.set_capacities(cap=capacities)
+            sliver.set_capacity_allocations(cap=capacities)
+            self.resources = QuotaMgrTest.Resources(sliver=sliver)
+            self.closed = closed
+
+        def get_slice(self):
+            return QuotaMgrTest.Slice()
+
+        def is_ticketing(self):
+            return False
+
+        def is_active(self):
+            return not self.closed
+
+        def is_ticketed(self):
+            return False
+
+        def is_closed(self):
+            return self.closed
+
+        def is_closing(self):
+            return False
+
+        def get_resources(self):
+            return self.resources
+
+        def get_requested_resources(self):
+            return None
+
+    def make_quota_mgr(self, *, core_api: FakeCoreApi) -> QuotaMgr:
+        return QuotaMgr(core_api_host=None, token=None, logger=logging.getLogger(__name__), core_api=core_api,
+                        refresh_interval=3600, retry_delay=0)
+
+    def test_enforce_against_local_ledger(self):
+        core_api = self.FakeCoreApi(quotas={("core", "hours"): (10, 0), ("ram", "hours"): (100, 0),
+                                            ("disk", "hours"): (1000, 0)})
+        quota_mgr = self.make_quota_mgr(core_api=core_api)
+
+        status, error = quota_mgr.enforce_quota_limits(reservation=self.Reservation(core=4), duration=2 * self.HOUR)
+        self.assertTrue(status)
+        self.assertIsNone(error)
+
+        # Usage is accounted locally without calling Core API
+        quota_mgr.update_quota(reservation=self.Reservation(core=4), duration=2 * self.HOUR)
+        self.assertEqual(0, core_api.update_calls)
+        status, error = quota_mgr.enforce_quota_limits(reservation=self.Reservation(core=4), duration=2 * self.HOUR)
+        self.assertFalse(status)
+        self.assertIsNotNone(error)
+        self.assertEqual(1, core_api.list_calls)
+
+        # Returned hours of a closed reservation free up the quota
+        quota_mgr.update_quota(reservation=self.Reservation(core=4, closed=True), duration=1 * self.HOUR)
+        status, error = quota_mgr.enforce_quota_limits(reservation=self.Reservation(core=4), duration=1 * self.HOUR)
+        self.assertTrue(status)
+
+        # Deltas of a project are synced as one update per quota
+        quota_mgr.sync()
+        self.assertEqual(3, core_api.update_calls)
+        self.assertEqual((10, 4), core_api.quotas[("core", "hours")])
+        self.assertEqual(4, quota_mgr.get_ledger(project_id=self.PROJECT).get_used(quota_key=("core", "hours")))
+
+    def test_undefined_quota(self):
+        core_api = self.FakeCoreApi(quotas={("core", "hours"): (10, 0)})
+        quota_mgr = self.make_quota_mgr(core_api=core_api)
+        status, error = quota_mgr.enforce_quota_limits(reservation=self.Reservation(core=1), duration=self.HOUR)
+        self.assertFalse(status)
+        self.assertIn("Quota not defined", error)
+
+    def test_sync_retries_and_keeps_failed_deltas(self):
+        core_api = self.FakeCoreApi(quotas={("core", "hours"): (100, 0), ("ram", "hours"): (100, 0),
+                                            ("disk", "hours"): (100, 0)}, failures=1)
+        quota_mgr = self.make_quota_mgr(core_api=core_api)
+        quota_mgr.update_quota(reservation=self.Reservation(core=1), duration=self.HOUR)
+
+        # The first failure is retried within the same cycle
+        quota_mgr.sync()
+        self.assertEqual((100, 1), core_api.quotas[("core", "hours")])
+
+        # Deltas which could not be synced stay pending and are still enforced
+        core_api.failures = quota_mgr.sync_retries * 3
+        quota_mgr.update_quota(reservation=self.Reservation(core=2), duration=self.HOUR)
+        quota_mgr.sync()
+        ledger = quota_mgr.get_ledger(project_id=self.PROJECT)
+        self.assertEqual(3, ledger.get_used(quota_key=("core", "hours")))
+        self.assertEqual(2, ledger.pending[("core", "hours")])
+
+        core_api.failures = 0
+        quota_mgr.sync()
+        self.assertEqual((100, 3), core_api.quotas[("core", "hours")])
+        self.assertEqual(0, len(ledger.pending))
+
+
+    def test_in_flight_usage_enforced(self):
+        core_api = self.FakeCoreApi(quotas={("core", "hours"): (10, 0), ("ram", "hours"): (100, 0),
+                                            ("disk", "hours"): (1000, 0)})
+        quota_mgr = self.make_quota_mgr(core_api=core_api)
+        quota_mgr.update_quota(reservation=self.Reservation(core=4), duration=2 * self.HOUR)
+        ledger = quota_mgr.get_ledger(project_id=self.PROJECT)
+
+        # While the deltas are being pushed to Core API, they are still accounted
+        observed = []
+        update_quota_usage = core_api.update_quota_usage
+
+        def observe(*, uuid: str, project_uuid: str, quota_used: float):
+            observed.append((len(ledger.pending), ledger.get_used(quota_key=("core", "hours")),
+                             quota_mgr.enforce_quota_limits(reservation=self.Reservation(core=4),
+                                                            duration=2 * self.HOUR)[0]))
+            update_quota_usage(uuid=uuid, project_uuid=project_uuid, quota_used=quota_used)
+
+        core_api.update_quota_usage = observe
+        quota_mgr.sync()
+        self.assertEqual((0, 8, False), observed[0])
+        self.assertEqual(8, ledger.get_used(quota_key=("core", "hours")))
+        self.assertEqual(0, len(ledger.in_flight))
+
+        # A failed push is pending again
+        core_api.update_quota_usage = update_quota_usage
+        core_api.failures = quota_mgr.sync_retries * 3
+        quota_mgr.update_quota(reservation=self.Reservation(core=1), duration=self.HOUR)
+        quota_mgr.sync()
+        self.assertEqual(9, ledger.get_used(quota_key=("core", "hours")))
+        self.assertEqual(1, ledger.pending[("core", "hours")])
+        self.assertEqual(0, len(ledger.in_flight))
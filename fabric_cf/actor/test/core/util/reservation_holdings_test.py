@@ -194,4 +194,15 @@ class ReservationHoldingsTest(unittest.TestCase):
         for i in range(len(points)):
             rset = holdings.get_reservations(time=points[i])
             self.assertIsNotNone(rset)
-            self.assertEqual(results[i], rset.size())
\ No newline at end of file
+            self.assertEqual(results[i], rset.size())
+
+    def test_range_intersection(self):
+        holdings = ReservationHoldings()
+        length = 5
+        for i in range(6):
+            holdings.add_reservation(reservation=self.make_reservation(rid=str(i)), start=5 - i, end=5 - i + length)
+
+        self.assertEqual(6, holdings.get_reservations_in_range(start=0, end=12).size())
+        self.assertEqual(2, holdings.get_reservations_in_range(start=9, end=12).size())
+        self.assertEqual(0, holdings.get_reservations_in_range(start=11, end=12).size())
+        self.assertEqual(3, holdings.get_reservations_in_range(start=-5, end=2).size())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+from ipaddress import IPv4Address, IPv4Network, IPv6Network
+
+from fabric_cf.actor.core.util.subnet_pool import SubnetPool
+
+
+class SubnetPoolTest(unittest.TestCase):
+    def test_ipv6_subnets(self):
+        network = IPv6Network("2602:fcfb:1d::/48")
+        pool = SubnetPool(network=network, new_prefix=64, exclude_first=1, exclude_last=1)
+        subnets = list(network.subnets(new_prefix=64))
+
+        self.assertEqual(len(subnets) - 2, len(pool))
+        self.assertNotIn(subnets[0], pool)
+        self.assertNotIn(subnets[-1], pool)
+        self.assertIn(subnets[1], pool)
+        self.assertEqual(subnets[1], pool.first())
+
+        self.assertTrue(pool.reserve(value=subnets[1]))
+        self.assertFalse(pool.reserve(value=subnets[1]))
+        self.assertTrue(pool.reserve(value=subnets[100]))
+        self.assertEqual(subnets[2], pool.first())
+        self.assertNotIn(subnets[100], pool)
+        self.assertIn(subnets[99], pool)
+        self.assertIn(subnets[101], pool)
+        self.assertEqual(len(subnets) - 4, len(pool))
+
+        pool.release(value=subnets[100])
+        pool.release(value=subnets[1])
+        self.assertEqual(1, len(pool.starts))
+        self.assertEqual(len(subnets) - 2, len(pool))
+
+        # Subnets of a different size or outside the network are never part of the pool
+        self.assertNotIn(IPv6Network("2602:fcfb:1d:1::/80"), pool)
+        self.assertNotIn(IPv6Network("2602:fcfb:1e:1::/64"), pool)
+        self.assertFalse(pool.reserve(value=IPv6Network("2602:fcfb:1e:1::/64")))
+
+    def test_ipv4_subnets(self):
+        network = IPv4Network("10.128.0.0/10")
+        pool = SubnetPool(network=network, new_prefix=24, exclude_first=1)
+        subnets = list(network.subnets(new_prefix=24))
+        self.assertEqual(len(subnets) - 1, len(pool))
+
+        allocated = [pool.allocate() for _ in range(3)]
+        self.assertEqual(subnets[1:4], allocated)
+        self.assertEqual(subnets[4], pool.first())
+
+    def test_ipv4_hosts(self):
+        network = IPv4Network("23.134.232.0/28")
+        pool = SubnetPool.hosts(network=network)
+        hosts = list(network.hosts())
+        self.assertEqual(len(hosts), len(pool))
+        self.assertEqual(hosts[0], pool.first())
+        self.assertNotIn(network.network_address, pool)
+        self.assertNotIn(network.broadcast_address, pool)
+        self.assertNotIn(str(hosts[0]), pool)
+
+        for h in hosts:
+            self.assertTrue(pool.reserve(value=h))
+        self.assertEqual(0, len(pool))
+        self.assertIsNone(pool.first())
+        self.assertIsNone(pool.allocate())
+
+        pool.release(value=IPv4Address("23.134.232.5"))
+        self.assertEqual(IPv4Address("23.134.232.5"), pool.first())
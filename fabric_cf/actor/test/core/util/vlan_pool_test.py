@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fim.slivers.capacities_labels import Labels
+
+from fabric_cf.actor.core.util.vlan_pool import VlanPool
+
+
+class VlanPoolTest(unittest.TestCase):
+    def test_from_labels(self):
+        self.assertIsNone(VlanPool.from_labels(labels=None))
+        self.assertIsNone(VlanPool.from_labels(labels=Labels()))
+
+        pool = VlanPool.from_labels(labels=Labels(vlan_range="100-199"))
+        self.assertEqual(100, len(pool))
+        self.assertIn(100, pool)
+        self.assertIn(199, pool)
+        self.assertNotIn(200, pool)
+
+        pool = VlanPool.from_labels(labels=Labels(vlan_range=["1-10", "5-20", "4000-4095"]))
+        self.assertEqual(20 + 96, len(pool))
+        self.assertEqual("[1-20, 4000-4095]", str(pool))
+
+        pool = VlanPool.from_labels(labels=Labels(vlan="7"))
+        self.assertEqual([7], pool.to_list())
+
+    def test_reserve_release(self):
+        pool = VlanPool.from_range(start=1, end=4)
+        self.assertEqual(1, pool.first_free())
+        self.assertTrue(pool.reserve(vlan=1))
+        self.assertFalse(pool.reserve(vlan=1))
+        self.assertFalse(pool.reserve(vlan=10))
+        self.assertEqual(2, pool.first_free())
+        self.assertEqual(3, len(pool))
+
+        pool.reserve(vlan=2)
+        pool.reserve(vlan=3)
+        pool.reserve(vlan=4)
+        self.assertEqual(0, len(pool))
+        self.assertFalse(pool)
+        self.assertIsNone(pool.first_free())
+        self.assertIsNone(pool.random_free())
+
+        pool.release(vlan=3)
+        self.assertEqual(3, pool.first_free())
+        self.assertEqual(3, pool.random_free())
+
+        self.assertRaises(ValueError, pool.reserve, vlan=4096)
+        self.assertNotIn(5000, pool)
+
+    def test_random_free(self):
+        pool = VlanPool.from_range(start=1, end=4095)
+        for v in range(1, 4095):
+            if v % 97:
+                pool.reserve(vlan=v)
+        free = set(pool.to_list())
+        for _ in range(200):
+            self.assertIn(pool.random_free(), free)
+
+    def test_intersect(self):
+        a = VlanPool.from_range(start=100, end=300)
+        b = VlanPool.from_range(start=250, end=400)
+        c = a.intersect(other=b)
+        self.assertEqual(VlanPool.from_range(start=250, end=300), c)
+        self.assertEqual(201, len(a))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import json
+import logging
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fabric_cf.actor.security.pdp_auth import PdpAuth, ActionId, PdpAuthException
+
+
+class PdpAuthTest(unittest.TestCase):
+    class FakePdp(BaseHTTPRequestHandler):
+        """
+        Local stand-in for PDP; denies any request for the project named deny
+        """
+        requests = []
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            PdpAuthTest.FakePdp.requests.append(body)
+            decision = "Deny" if "deny" in json.dumps(body) else "Permit"
+            response = {"Response": [{"Decision": decision,
+                                      "AssociatedAdvice": [{"AttributeAssignment": [{"Value": "denied"}]}]}]}
+            payload = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.FakePdp)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.FakePdp.requests.clear()
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/services/pdp"
+        self.pdp_auth = PdpAuth(config={"url": url, "enable": True}, logger=logging.getLogger(__name__))
+
+    def check(self, project: str, action_id: ActionId = ActionId.query):
+        self.pdp_auth.check_access(email="user@example.com", project=project, tags=["Slice.Multisite"],
+                                   action_id=action_id, resource=None, lease_end_time=None)
+
+    def test_decision_cache(self):
+        self.check(project="p1")
+        self.check(project="p1")
+        self.assertEqual(1, len(self.FakePdp.requests))
+
+        self.check(project="p1", action_id=ActionId.delete)
+        self.assertEqual(2, len(self.FakePdp.requests))
+
+        with self.assertRaises(PdpAuthException) as e:
+            self.check(project="deny")
+        self.assertIn("denied", str(e.exception))
+        # Denials are cached as well
+        with self.assertRaises(PdpAuthException):
+            self.check(project="deny")
+        self.assertEqual(3, len(self.FakePdp.requests))
+
+        self.pdp_auth.clear_cache()
+        self.check(project="p1")
+        self.assertEqual(4, len(self.FakePdp.requests))
+
+    def test_batch(self):
+        checks = [dict(email="user@example.com", project=f"p{i % 3}", tags=[], action_id=ActionId.query)
+                  for i in range(10)]
+        self.pdp_auth.check_access_batch(checks=checks)
+        self.assertEqual(3, len(self.FakePdp.requests))
+
+        checks.append(dict(email="user@example.com", project="deny", tags=[], action_id=ActionId.query))
+        with self.assertRaises(PdpAuthException):
+            self.pdp_auth.check_access_batch(checks=checks)
+        self.assertEqual(4, len(self.FakePdp.requests))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import datetime
+import unittest
+
+from fabric_cm.credmgr.credmgr_proxy import Status
+from fss_utils.jwt_manager import ValidateCode
+
+from fabric_cf.actor.core.util.utils import generate_sha256
+from fabric_cf.actor.security.fabric_token import TokenException
+from fabric_cf.actor.security.token_validator import TokenValidator
+
+
+class TokenValidatorTest(unittest.TestCase):
+    class FakeJwtValidator:
+        """
+        Local stand-in for the JWT validator; the token is the name of the project
+        """
+        def __init__(self):
+            self.calls = 0
+            self.exp = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)).timestamp()
+
+        def validate_jwt(self, *, token: str, verify_exp: bool = False):
+            self.calls += 1
+            return ValidateCode.VALID, {"exp": self.exp, "projects": [{"uuid": token, "tags": [], "name": token}]}
+
+    class FakeCredmgrProxy:
+        """
+        Local stand-in for Credential Manager serving the revoke list of each project
+        """
+        def __init__(self):
+            self.trl = {}
+            self.calls = {}
+
+        def token_revoke_list(self, *, project_id: str):
+            self.calls[project_id] = self.calls.get(project_id, 0) + 1
+            return Status.OK, list(self.trl.get(project_id, []))
+
+    def make_validator(self, *, refresh_period: datetime.timedelta, cache_size: int = 10) -> TokenValidator:
+        validator = TokenValidator(credmgr_host="localhost", refresh_period=refresh_period,
+                                   jwt_validator=self.FakeJwtValidator(), cache_size=cache_size)
+        validator.credmgr_proxy = self.FakeCredmgrProxy()
+        return validator
+
+    def test_validated_tokens_are_cached(self):
+        validator = self.make_validator(refresh_period=datetime.timedelta(minutes=5), cache_size=2)
+        for i in range(3):
+            self.assertEqual("p1", validator.validate_token(token="p1").first_project[0])
+        self.assertEqual(1, validator.jwt_validator.calls)
+
+        # Least recently used tokens are evicted
+        validator.validate_token(token="p2")
+        validator.validate_token(token="p3")
+        validator.validate_token(token="p1")
+        self.assertEqual(4, validator.jwt_validator.calls)
+
+        # Expired tokens are validated again
+        validator = self.make_validator(refresh_period=datetime.timedelta(minutes=5))
+        validator.jwt_validator.exp = (datetime.datetime.now(datetime.timezone.utc) -
+                                       datetime.timedelta(seconds=1)).timestamp()
+        validator.validate_token(token="p1")
+        validator.validate_token(token="p1")
+        self.assertEqual(2, validator.jwt_validator.calls)
+
+    def test_revoke_list_per_project(self):
+        validator = self.make_validator(refresh_period=datetime.timedelta(minutes=5))
+        proxy = validator.credmgr_proxy
+        validator.validate_token(token="p1")
+        validator.validate_token(token="p2")
+        validator.validate_token(token="p1")
+        self.assertEqual({"p1": 1, "p2": 1}, proxy.calls)
+
+        # Revocations are picked up once the project's revoke list is refreshed, even for cached tokens
+        proxy.trl["p1"] = [generate_sha256(token="p1")]
+        validator.validate_token(token="p1")
+        validator.trl["p1"] = (validator.trl["p1"][0], datetime.datetime.now() - datetime.timedelta(minutes=10))
+        with self.assertRaises(TokenException):
+            validator.validate_token(token="p1")
+        self.assertEqual(2, proxy.calls["p1"])
+        self.assertEqual(1, proxy.calls["p2"])
+        validator.validate_token(token="p2")
@@ -23,134 +23,27 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import queue
-import threading
-import time
 import traceback
 
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 
-from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
-from fabric_cf.actor.core.util.id import ID
-from fabric_cf.actor.core.util.iterable_queue import IterableQueue
-from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.orchestrator_slice_wrapper import OrchestratorSliceWrapper
+from fabric_cf.orchestrator.core.slice_dispatcher import SliceDispatcher
 
 
-class AdvanceSchedulingThread:
+class AdvanceSchedulingThread(SliceDispatcher):
     """
-    This runs as a standalone thread started by Orchestrator and deals with determining the
+    This runs as standalone threads started by Orchestrator and deals with determining the
     nearest start time for slices requested in future.
-    The purpose of this thread is to help orchestrator respond back to the create
+    The purpose of these threads is to help orchestrator respond back to the create
     without identifying the start time and waiting for the slivers to be demanded
     """
 
-    def __init__(self, *, kernel):
-        self.slice_queue = queue.Queue()
-        self.slice_avail_condition = threading.Condition()
-        self.thread_lock = threading.Lock()
-        self.thread = None
-        self.stopped = False
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        self.logger = GlobalsSingleton.get().get_logger()
-        self.mgmt_actor = kernel.get_management_actor()
-        self.kernel = kernel
-
-    def queue_slice(self, *, controller_slice: OrchestratorSliceWrapper):
-        """
-        Queue a slice
-        :param controller_slice:
-        :return:
-        """
-        try:
-            self.slice_queue.put_nowait(controller_slice)
-            self.logger.debug(f"Added slice to slices queue {controller_slice.get_slice_id()}")
-        except Exception as e:
-            self.logger.error(f"Failed to queue slice: {controller_slice.get_slice_id()} e: {e}")
-
-    def start(self):
-        """
-        Start thread
-        :return:
-        """
-        try:
-            self.thread_lock.acquire()
-            if self.thread is not None:
-                raise OrchestratorException(f"This {self.__class__.__name__} has already been started")
-
-            self.thread = threading.Thread(target=self.run)
-            self.thread.setName(self.__class__.__name__)
-            self.thread.setDaemon(True)
-            self.thread.start()
-
-        finally:
-            self.thread_lock.release()
-
-    def stop(self):
-        """
-        Stop thread
-        :return:
-        """
-        self.stopped = True
-        try:
-            self.thread_lock.acquire()
-            temp = self.thread
-            self.thread = None
-            if temp is not None:
-                self.logger.warning(f"It seems that the {self.__class__.__name__} is running. "
-                                    f"Interrupting it")
-                try:
-                    # TODO find equivalent of interrupt
-                    with self.slice_avail_condition:
-                        self.slice_avail_condition.notify_all()
-                    temp.join()
-                except Exception as e:
-                    self.logger.error(f"Could not join {self.__class__.__name__} thread {e}")
-                finally:
-                    self.thread_lock.release()
-        finally:
-            if self.thread_lock is not None and self.thread_lock.locked():
-                self.thread_lock.release()
-
-    def run(self):
-        """
-        Thread main loop
-        :return:
-        """
-        self.logger.debug(f"{self.__class__.__name__} started")
-        while True:
-            slices = []
-            if not self.stopped and self.slice_queue.empty():
-                time.sleep(0.001)
-
-            if self.stopped:
-                self.logger.info(f"{self.__class__.__name__} exiting")
-                return
-
-            if not self.slice_queue.empty():
-                try:
-                    for s in IterableQueue(source_queue=self.slice_queue):
-                        slices.append(s)
-                except Exception as e:
-                    self.logger.error(f"Error while adding slice to slice queue! e: {e}")
-                    self.logger.error(traceback.format_exc())
-
-            if len(slices) > 0:
-                self.logger.debug(f"Processing {len(slices)} slices")
-                for s in slices:
-                    try:
-                        # Process the Slice i.e. Determine the nearest start time
-                        # If start time found, queue the slice on SliceDeferredThread
-                        # Else move the slice to Close State with failure
-                        self.process_slice(controller_slice=s)
-                    except Exception as e:
-                        self.logger.error(f"Error while processing slice {type(s)}, {e}")
-                        self.logger.error(traceback.format_exc())
-
     def process_slice(self, *, controller_slice: OrchestratorSliceWrapper):
         """
         Determine nearest start time for a slice requested in future and
         add to deferred slice thread for further processing
+        If start time is not found, the slice fails with insufficient resources
         :param controller_slice:
         """
         computed_reservations = controller_slice.get_computed_reservations()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import concurrent.futures
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Tuple
+
+
+class BqmQueryCache:
+    """
+    Size bounded LRU cache of the Broker Query Models (and resource summaries) returned for filtered queries
+    i.e. queries restricted by start/end time or by the sites to include/exclude.
+
+    Queries are keyed by their normalized parameters: site lists are de-duplicated, upper cased and sorted
+    and the time range is widened to the scheduling granularity. Concurrent identical queries are coalesced
+    so that a single round trip to the Broker serves all of them.
+    """
+    DEFAULT_SIZE = 128
+    DEFAULT_GRANULARITY_SECONDS = 3600
+    EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, *, size: int = DEFAULT_SIZE, refresh_interval: int,
+                 granularity: int = DEFAULT_GRANULARITY_SECONDS, logger=None):
+        """
+        @param size maximum number of cached queries
+        @param refresh_interval seconds for which a cached result is served
+        @param granularity seconds to which the start and end time of the queries are aligned
+        @param logger logger
+        """
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.granularity = granularity
+        self.logger = logger
+        # key => (result, saved at)
+        self.entries = OrderedDict()
+        # key => future completed by the query in progress for the key
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize_sites(*, sites: str) -> str or None:
+        """
+        Normalize a comma separated list of sites
+        @param sites comma separated list of sites
+        @return sorted, upper cased comma separated list of sites without duplicates, or None if empty
+        """
+        if not sites:
+            return None
+        result = sorted({s.strip().upper() for s in sites.split(",") if s.strip()})
+        return ",".join(result) if len(result) else None
+
+    def align(self, *, start: datetime = None, end: datetime = None) -> Tuple[datetime, datetime]:
+        """
+        Widen a time range to the scheduling granularity; start is moved back and end is moved forward
+        @param start start time
+        @param end end time
+        @return aligned start and end
+        """
+        if self.granularity is None or self.granularity <= 0:
+            return start, end
+        granularity = timedelta(seconds=self.granularity)
+        if start is not None:
+            epoch = self.EPOCH if start.tzinfo is not None else self.EPOCH.replace(tzinfo=None)
+            start = start - (start - epoch) % granularity
+        if end is not None:
+            epoch = self.EPOCH if end.tzinfo is not None else self.EPOCH.replace(tzinfo=None)
+            remainder = (end - epoch) % granularity
+            if remainder:
+                end = end + granularity - remainder
+        return start, end
+
+    @staticmethod
+    def get_key(*, query: str, level: int, graph_format=None, start: datetime = None, end: datetime = None,
+                includes: str = None, excludes: str = None) -> tuple:
+        """
+        Build the cache key for a query; the parameters are expected to be normalized and aligned
+        """
+        return (query, level, str(graph_format) if graph_format is not None else None,
+                start.isoformat() if start is not None else None,
+                end.isoformat() if end is not None else None,
+                includes, excludes)
+
+    def __get_cached(self, *, key: tuple) -> str or None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        result, saved_at = entry
+        if (datetime.now(timezone.utc) - saved_at).total_seconds() > self.refresh_interval:
+            self.entries.pop(key)
+            return None
+        self.entries.move_to_end(key)
+        return result
+
+    def __save(self, *, key: tuple, result: str):
+        self.entries[key] = (result, datetime.now(timezone.utc))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def get(self, *, key: tuple, loader: Callable[[], str], force_refresh: bool = False) -> str:
+        """
+        Return the cached result for a query, loading it if not cached, expired or a refresh is forced.
+        If the query is already being loaded, wait for that load instead of issuing another one.
+        @param key cache key
+        @param loader callable querying the Broker
+        @param force_refresh ignore the cached result
+        @return query result
+        @raises Exception raised by the loader
+        """
+        with self.lock:
+            if not force_refresh:
+                result = self.__get_cached(key=key)
+                if result is not None:
+                    return result
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self.in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = loader()
+            with self.lock:
+                if result:
+                    self.__save(key=key, result=result)
+                self.in_flight.pop(key, None)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            with self.lock:
+                self.in_flight.pop(key, None)
+            future.set_exception(e)
+            raise e
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
@@ -34,17 +34,13 @@ class BqmWrapper:
     """
     Implements cache for storing the BQM
     """
-    def __init__(self, *, logger=None):
+    DEFAULT_REFRESH_INTERVAL = 2000
+
+    def __init__(self, *, logger=None, refresh_interval: int = DEFAULT_REFRESH_INTERVAL):
         self.graph_format = None
         self.bqm = None
         self.last_query_time = None
-        '''
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        config = GlobalsSingleton.get().get_config()
-        bqm_config = config.get_global_config().get_bqm_config()
-        refresh_interval = bqm_config.get(Constants.REFRESH_INTERVAL, 2000)
-        '''
-        self.refresh_interval_in_seconds = 2000
+        self.refresh_interval_in_seconds = refresh_interval
         self.refresh_in_progress = False
         self.refresh_started_at = None
         self.level = 1
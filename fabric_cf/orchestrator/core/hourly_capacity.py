@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import math
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+
+
+class HourlyCapacity:
+    """
+    Accumulates usage into hourly buckets using a difference array. Adding an allocation is O(1)
+    regardless of its length; the per-hour usage matrix is materialized with a single cumulative sum.
+
+    The usage of each hour may be a scalar or a vector/matrix (e.g. hosts x resource dimensions),
+    as described by shape.
+    """
+    def __init__(self, *, hours: int, shape: tuple = ()):
+        """
+        :param hours: number of hourly buckets
+        :type hours: int
+        :param shape: shape of the usage tracked per hour
+        :type shape: tuple
+        """
+        self.hours = hours
+        self.diff = np.zeros((hours + 1,) + tuple(shape), dtype=np.int64)
+
+    @staticmethod
+    def hour_span(*, base: datetime, start: datetime, end: datetime, hours: int) -> Tuple[int, int]:
+        """
+        Return the range of buckets [first, last) that overlap the interval [start, end); bucket i
+        covers [base + i hours, base + (i + 1) hours).
+
+        :param base: start of the first bucket
+        :type base: datetime
+        :param start: start of the interval
+        :type start: datetime
+        :param end: end of the interval
+        :type end: datetime
+        :param hours: number of buckets
+        :type hours: int
+        :return: tuple of first bucket and the bucket after the last one
+        :rtype: Tuple[int, int]
+        """
+        first = math.floor((start - base).total_seconds() / 3600)
+        last = math.ceil((end - base).total_seconds() / 3600)
+        return max(first, 0), min(last, hours)
+
+    def add(self, *, first: int, last: int, value, index=None):
+        """
+        Add usage to the buckets [first, last)
+
+        :param first: first bucket
+        :param last: bucket after the last one
+        :param value: usage to add per bucket
+        :param index: optional index within the per hour usage to which value is added
+        """
+        first = max(first, 0)
+        last = min(last, self.hours)
+        if first >= last:
+            return
+        if index is None:
+            self.diff[first] += value
+            self.diff[last] -= value
+        else:
+            self.diff[first][index] += value
+            self.diff[last][index] -= value
+
+    def usage(self) -> np.ndarray:
+        """
+        :return: array of shape (hours,) + shape with the usage of every hour
+        :rtype: np.ndarray
+        """
+        return np.cumsum(self.diff[:-1], axis=0)
+
+    @staticmethod
+    def window_starts(*, hour_ok: np.ndarray, duration: int) -> np.ndarray:
+        """
+        Find all the windows of duration consecutive hours in which every hour is usable
+
+        :param hour_ok: boolean array indicating if an hour is usable
+        :type hour_ok: np.ndarray
+        :param duration: length of the window in hours
+        :type duration: int
+        :return: sorted indices of the first hour of each usable window
+        :rtype: np.ndarray
+        """
+        count = len(hour_ok) - duration + 1
+        if count <= 0 or duration <= 0:
+            return np.zeros(0, dtype=np.int64)
+        bad = np.concatenate(([0], np.cumsum(~hour_ok, dtype=np.int64)))
+        bad_in_window = bad[duration:duration + count] - bad[:count]
+        return np.nonzero(bad_in_window == 0)[0]
+
+    @staticmethod
+    def first_fit(*, remaining: np.ndarray, candidates: np.ndarray, request: np.ndarray,
+                  checked: np.ndarray) -> np.ndarray:
+        """
+        Place a request on the first candidate host which can fit it, independently for every hour.
+        The remaining capacity of the chosen host is reduced in place.
+
+        :param remaining: remaining capacity of shape (hours, hosts, dimensions)
+        :type remaining: np.ndarray
+        :param candidates: boolean array of shape (hosts,) identifying the hosts eligible for the request
+        :type candidates: np.ndarray
+        :param request: requested amount per dimension
+        :type request: np.ndarray
+        :param checked: boolean array of shape (dimensions,) identifying the dimensions to check
+        :type checked: np.ndarray
+        :return: boolean array of shape (hours,) indicating the hours in which the request was placed
+        :rtype: np.ndarray
+        """
+        fits = np.all((remaining >= request) | ~checked, axis=2) & candidates
+        placed = fits.any(axis=1)
+        chosen = np.argmax(fits, axis=1)
+        rows = np.nonzero(placed)[0]
+        remaining[rows, chosen[rows]] -= request
+        return placed
@@ -29,7 +29,9 @@ import time
 import traceback
 from datetime import datetime, timedelta, timezone
 from http.client import NOT_FOUND, BAD_REQUEST, UNAUTHORIZED
-from typing import List, Union
+from typing import List, Union, Iterator
+
+import numpy as np
 
 from fabric_mb.message_bus.messages.auth_avro import AuthAvro
 from fabric_mb.message_bus.messages.poa_avro import PoaAvro
@@ -55,12 +57,16 @@ from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.security.fabric_token import FabricToken
 from fabric_cf.actor.security.pdp_auth import ActionId
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
+from fabric_cf.orchestrator.core.hourly_capacity import HourlyCapacity
 from fabric_cf.orchestrator.core.orchestrator_slice_wrapper import OrchestratorSliceWrapper
 from fabric_cf.orchestrator.core.orchestrator_kernel import OrchestratorKernelSingleton
 from fabric_cf.orchestrator.core.response_builder import ResponseBuilder
 
 
 class OrchestratorHandler:
+    # Number of slivers loaded at a time when listing the slivers of a slice
+    SLIVERS_PAGE_SIZE = 100
+
     def __init__(self):
         self.controller_state = OrchestratorKernelSingleton.get()
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
@@ -224,8 +230,8 @@ class OrchestratorHandler:
         :return str or None
         """
         broker_query_model = None
-        # Always get Fresh copy for advanced resource requests
-        if not start and not end and not includes and not excludes:
+        filtered = start or end or includes or excludes
+        if not filtered:
             saved_bqm = self.controller_state.get_saved_bqm(graph_format=graph_format, level=level)
             if saved_bqm is not None:
                 if force_refresh:
@@ -240,28 +246,57 @@ class OrchestratorHandler:
 
         # Request the model from Broker as a fallback
         if not broker_query_model:
-            broker = self.get_broker(controller=controller)
-            if broker is None:
-                raise OrchestratorException("Unable to determine broker proxy for this controller. "
-                                            "Please check Orchestrator container configuration and logs.")
+            if filtered and level > 0:
+                # Filtered requests are served from the query cache; identical concurrent requests share a query
+                query_cache = self.controller_state.get_query_cache()
+                includes = query_cache.normalize_sites(sites=includes)
+                excludes = query_cache.normalize_sites(sites=excludes)
+                start, end = query_cache.align(start=start, end=end)
+                key = query_cache.get_key(query=Constants.QUERY_ACTION_DISCOVER_BQM, level=level,
+                                          graph_format=graph_format, start=start, end=end, includes=includes,
+                                          excludes=excludes)
+                broker_query_model = query_cache.get(
+                    key=key, force_refresh=force_refresh,
+                    loader=lambda: self.__query_broker_model(controller=controller, token=token, level=level,
+                                                             graph_format=graph_format, start=start, end=end,
+                                                             includes=includes, excludes=excludes, email=email,
+                                                             force_refresh=force_refresh))
+            else:
+                broker_query_model = self.__query_broker_model(controller=controller, token=token, level=level,
+                                                               graph_format=graph_format, start=start, end=end,
+                                                               includes=includes, excludes=excludes, email=email,
+                                                               force_refresh=force_refresh)
+
+                # Do not update cache for advance requests
+                if not filtered and level > 0:
+                    self.controller_state.save_bqm(bqm=broker_query_model, graph_format=graph_format, level=level)
 
-            self.logger.info(f"Sending Query to broker on behalf of {email} Start: {start}, End: {end}, "
-                             f"Force: {force_refresh}, Level: {level}, format: {graph_format}")
+        return broker_query_model
 
-            model = controller.get_broker_query_model(broker=broker, id_token=token, level=level,
-                                                      graph_format=graph_format, start=start, end=end,
-                                                      includes=includes, excludes=excludes)
-            if model is None or model.get_model() is None or model.get_model() == '':
-                raise OrchestratorException(http_error_code=NOT_FOUND, message=f"Resource(s) not found for "
-                                                                               f"level: {level} format: {graph_format}!")
+    def __query_broker_model(self, *, controller: ABCMgmtControllerMixin, token: str, level: int,
+                             graph_format: GraphFormat, start: datetime, end: datetime, includes: str,
+                             excludes: str, email: str, force_refresh: bool) -> str:
+        """
+        Query the Broker for the Broker Query Model
+        :raises OrchestratorException if the Broker cannot be determined or no model is returned
+        :return Broker Query Model
+        """
+        broker = self.get_broker(controller=controller)
+        if broker is None:
+            raise OrchestratorException("Unable to determine broker proxy for this controller. "
+                                        "Please check Orchestrator container configuration and logs.")
 
-            broker_query_model = model.get_model()
+        self.logger.info(f"Sending Query to broker on behalf of {email} Start: {start}, End: {end}, "
+                         f"Force: {force_refresh}, Level: {level}, format: {graph_format}")
 
-            # Do not update cache for advance requests
-            if not start and not end and not includes and not excludes and level > 0:
-                self.controller_state.save_bqm(bqm=broker_query_model, graph_format=graph_format, level=level)
+        model = controller.get_broker_query_model(broker=broker, id_token=token, level=level,
+                                                  graph_format=graph_format, start=start, end=end,
+                                                  includes=includes, excludes=excludes)
+        if model is None or model.get_model() is None or model.get_model() == '':
+            raise OrchestratorException(http_error_code=NOT_FOUND, message=f"Resource(s) not found for "
+                                                                           f"level: {level} format: {graph_format}!")
 
-        return broker_query_model
+        return model.get_model()
 
     def list_resources(self, *, level: int, force_refresh: bool = False, start: datetime = None,
                        end: datetime, includes: str = None, excludes: str = None, graph_format_str: str = None,
@@ -321,8 +356,8 @@ class OrchestratorHandler:
         :return: JSON string or None
         """
         summary_json = None
-        # Always get fresh copy for advanced resource requests
-        if not start and not end and not includes and not excludes:
+        filtered = start or end or includes or excludes
+        if not filtered:
             saved = self.controller_state.get_saved_summary(level=level)
             if saved is not None:
                 if force_refresh:
@@ -336,28 +371,56 @@ class OrchestratorHandler:
                     summary_json = saved.get_bqm()
 
         if not summary_json:
-            broker = self.get_broker(controller=controller)
-            if broker is None:
-                raise OrchestratorException("Unable to determine broker proxy for this controller. "
-                                            "Please check Orchestrator container configuration and logs.")
+            if filtered and level > 0:
+                # Filtered requests are served from the query cache; identical concurrent requests share a query
+                query_cache = self.controller_state.get_query_cache()
+                includes = query_cache.normalize_sites(sites=includes)
+                excludes = query_cache.normalize_sites(sites=excludes)
+                start, end = query_cache.align(start=start, end=end)
+                key = query_cache.get_key(query=Constants.QUERY_ACTION_DISCOVER_BQM_SUMMARY, level=level,
+                                          start=start, end=end, includes=includes, excludes=excludes)
+                summary_json = query_cache.get(
+                    key=key, force_refresh=force_refresh,
+                    loader=lambda: self.__query_broker_model_summary(controller=controller, token=token,
+                                                                     level=level, start=start, end=end,
+                                                                     includes=includes, excludes=excludes,
+                                                                     email=email, force_refresh=force_refresh))
+            else:
+                summary_json = self.__query_broker_model_summary(controller=controller, token=token, level=level,
+                                                                 start=start, end=end, includes=includes,
+                                                                 excludes=excludes, email=email,
+                                                                 force_refresh=force_refresh)
+
+                # Do not update cache for advance requests
+                if not filtered and level > 0:
+                    self.controller_state.save_summary(summary=summary_json, level=level)
 
-            self.logger.info(f"Sending Summary Query to broker on behalf of {email} Start: {start}, End: {end}, "
-                             f"Force: {force_refresh}, Level: {level}")
+        return summary_json
 
-            model = controller.get_broker_query_model_summary(broker=broker, id_token=token, level=level,
-                                                               start=start, end=end,
-                                                               includes=includes, excludes=excludes)
-            if model is None or model.get_model() is None or model.get_model() == '':
-                raise OrchestratorException(http_error_code=NOT_FOUND,
-                                            message=f"Resource summary not found for level: {level}!")
+    def __query_broker_model_summary(self, *, controller: ABCMgmtControllerMixin, token: str, level: int,
+                                     start: datetime, end: datetime, includes: str, excludes: str, email: str,
+                                     force_refresh: bool) -> str:
+        """
+        Query the Broker for the resource summary
+        :raises OrchestratorException if the Broker cannot be determined or no summary is returned
+        :return JSON string
+        """
+        broker = self.get_broker(controller=controller)
+        if broker is None:
+            raise OrchestratorException("Unable to determine broker proxy for this controller. "
+                                        "Please check Orchestrator container configuration and logs.")
 
-            summary_json = model.get_model()
+        self.logger.info(f"Sending Summary Query to broker on behalf of {email} Start: {start}, End: {end}, "
+                         f"Force: {force_refresh}, Level: {level}")
 
-            # Do not update cache for advance requests
-            if not start and not end and not includes and not excludes and level > 0:
-                self.controller_state.save_summary(summary=summary_json, level=level)
+        model = controller.get_broker_query_model_summary(broker=broker, id_token=token, level=level,
+                                                           start=start, end=end,
+                                                           includes=includes, excludes=excludes)
+        if model is None or model.get_model() is None or model.get_model() == '':
+            raise OrchestratorException(http_error_code=NOT_FOUND,
+                                        message=f"Resource summary not found for level: {level}!")
 
-        return summary_json
+        return model.get_model()
 
     def list_resources_summary(self, *, level: int = 2, force_refresh: bool = False,
                                start: datetime = None, end: datetime = None,
@@ -606,6 +669,96 @@ class OrchestratorHandler:
             self.logger.error(f"Exception occurred processing get_slivers e: {e}")
             raise e
 
+    def list_slivers(self, *, token: str, slice_id: str, as_self: bool = True, states: List[str] = None,
+                     limit: int = None, cursor: str = None, fields: List[str] = None) -> Iterator[List[dict]]:
+        """
+        List the Slivers of a Slice ordered by sliver id, loading them a page at a time. The request is
+        authorized and the first page is loaded before returning so that failures are raised here; the
+        remaining pages are loaded as the returned iterator is consumed.
+        :param token Fabric Identity Token
+        :param slice_id Slice Id
+        :param as_self flag; True - return calling user's slivers otherwise, return all slivers in the project
+        :param states Sliver states to include; all if not specified
+        :param limit Maximum number of slivers to return; all if not specified
+        :param cursor Return the slivers following this sliver id (last sliver id of the previous page)
+        :param fields Sliver fields to return; all if not specified (sliver_id is always returned)
+        :raises Raises an exception in case of failure
+        :returns Iterator over lists of slivers
+        """
+        try:
+            controller = self.controller_state.get_management_actor()
+            self.logger.debug(f"list_slivers invoked for Controller: {controller}")
+
+            if limit is not None and limit < 1:
+                raise OrchestratorException(f"Invalid limit: {limit}", http_error_code=BAD_REQUEST)
+
+            rsv_states = None
+            if states is not None and len(states) > 0:
+                try:
+                    rsv_states = [ReservationStates[s].value for s in states]
+                except KeyError as e:
+                    raise OrchestratorException(f"Invalid sliver state: {e}", http_error_code=BAD_REQUEST)
+
+            if fields is not None and len(fields) > 0:
+                invalid = [f for f in fields if f not in ResponseBuilder.SLIVER_FIELDS]
+                if len(invalid) > 0:
+                    raise OrchestratorException(f"Invalid sliver fields: {invalid}", http_error_code=BAD_REQUEST)
+                # Serve the slivers from the reservation summaries unless a field derived from the sliver is requested
+                full = any(f in ResponseBuilder.SLIVER_DETAIL_FIELDS for f in fields)
+            else:
+                fields = None
+                full = True
+
+            slice_guid = ID(uid=slice_id) if slice_id is not None else None
+            fabric_token = self.__authorize_request(id_token=token, action_id=ActionId.query)
+
+            # Filter slices based on user's user_id only when querying as_self
+            user_id = fabric_token.uuid
+            if not as_self:
+                user_id = None
+
+            def get_page(after: str, remaining: int or None) -> (List[dict], bool):
+                page_size = self.SLIVERS_PAGE_SIZE if remaining is None else min(self.SLIVERS_PAGE_SIZE, remaining)
+                after_id = ID(uid=after) if after is not None else None
+                if full:
+                    reservations = controller.get_reservations(slice_id=slice_guid, oidc_claim_sub=user_id,
+                                                               states=rsv_states, full=full, after=after_id,
+                                                               limit=page_size)
+                else:
+                    # Served from the reservation summaries without unpickling the reservations
+                    reservations = controller.get_reservation_summaries(slice_id=slice_guid, oidc_claim_sub=user_id,
+                                                                        states=rsv_states, after=after_id,
+                                                                        limit=page_size)
+                if reservations is None:
+                    if controller.get_last_error() is not None:
+                        self.logger.error(controller.get_last_error())
+                        if controller.get_last_error().status.code == ErrorCodes.ErrorNoSuchSlice:
+                            raise OrchestratorException(f"Slice# {slice_id} not found",
+                                                        http_error_code=NOT_FOUND)
+                    raise OrchestratorException(f"Slice# {slice_id} has no reservations",
+                                                http_error_code=NOT_FOUND)
+                return ResponseBuilder.get_reservation_summary(res_list=reservations, fields=fields), \
+                    len(reservations) == page_size
+
+            first, more = get_page(after=cursor, remaining=limit)
+
+            def pages() -> Iterator[List[dict]]:
+                page, has_more = first, more
+                returned = 0
+                while True:
+                    yield page
+                    returned += len(page)
+                    if not has_more or len(page) == 0 or (limit is not None and returned >= limit):
+                        return
+                    page, has_more = get_page(after=page[-1][ResponseBuilder.PROP_SLIVER_ID],
+                                              remaining=limit - returned if limit is not None else None)
+
+            return pages()
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(f"Exception occurred processing list_slivers e: {e}")
+            raise e
+
     def get_slices(self, *, token: str, states: List[str], name: str, limit: int, offset: int,
                    as_self: bool = True, search: str = None, exact_match: bool = False) -> List[dict]:
         """
@@ -1553,25 +1706,24 @@ class OrchestratorHandler:
                         "site": sliver.get_site(),
                     })
 
-        # --- Sliding window search ---
+        # --- Window search ---
+        # Availability is evaluated once per hour over the whole range; windows are then found with a
+        # cumulative sum over the unusable hours instead of re-checking every hour of every window
+        hour_ok = self._live_hours_available(
+            start_time, total_hours,
+            compute_requests, link_requests, fp_requests,
+            host_cap_map, hosts_by_site, compute_reservations,
+            link_cap_map, net_reservations,
+            fp_cap_map,
+        )
         windows = []
-        for h in range(total_hours - duration + 1):
-            window_start = start_time + timedelta(hours=h)
+        for h in HourlyCapacity.window_starts(hour_ok=hour_ok, duration=duration)[:max_results]:
+            window_start = start_time + timedelta(hours=int(h))
             window_end = window_start + timedelta(hours=duration)
-
-            if self._check_live_window(
-                window_start, window_end, duration,
-                compute_requests, link_requests, fp_requests,
-                host_cap_map, hosts_by_site, compute_reservations,
-                link_cap_map, net_reservations,
-                fp_cap_map,
-            ):
-                windows.append({
-                    "start": window_start.isoformat(),
-                    "end": window_end.isoformat(),
-                })
-                if len(windows) >= max_results:
-                    break
+            windows.append({
+                "start": window_start.isoformat(),
+                "end": window_end.isoformat(),
+            })
 
         return {
             "windows": windows,
@@ -1611,130 +1763,128 @@ class OrchestratorHandler:
         return comps
 
     @staticmethod
-    def _check_live_window(window_start, window_end, duration,
-                           compute_requests, link_requests, fp_requests,
-                           host_cap_map, hosts_by_site, compute_reservations,
-                           link_cap_map, net_reservations,
-                           fp_cap_map) -> bool:
-        """Check if all resource requests can be satisfied in every hour of the window."""
+    def _live_hours_available(start_time, total_hours,
+                              compute_requests, link_requests, fp_requests,
+                              host_cap_map, hosts_by_site, compute_reservations,
+                              link_cap_map, net_reservations,
+                              fp_cap_map) -> np.ndarray:
+        """
+        Check, for every hour of the search range, if all resource requests can be satisfied in that hour.
+
+        Allocations are accumulated into per-hour matrices (hours x hosts x [cores, ram, disk, components])
+        with difference arrays and the compute requests are bin-packed greedily for all hours at once.
+
+        :returns boolean array with one entry per hour
+        """
+        hour_ok = np.ones(total_hours, dtype=bool)
+
+        def span(rsv) -> tuple:
+            return HourlyCapacity.hour_span(base=start_time, start=rsv["lease_start"], end=rsv["lease_end"],
+                                            hours=total_hours)
 
         # --- Compute check (greedy bin-pack per hour) ---
         if compute_requests:
-            for dh in range(duration):
-                hour_start = window_start + timedelta(hours=dh)
-                hour_end = hour_start + timedelta(hours=1)
-
-                # Build remaining capacity for each host at this hour
-                remaining = {}
-                for host_name, cap in host_cap_map.items():
-                    remaining[host_name] = {
-                        "cores": cap["cores_capacity"],
-                        "ram": cap["ram_capacity"],
-                        "disk": cap["disk_capacity"],
-                        "components": dict(cap["components"]),
-                    }
-
-                # Subtract live allocations overlapping this hour
-                for rsv in compute_reservations:
-                    if rsv["lease_start"] < hour_end and rsv["lease_end"] > hour_start:
-                        h = rsv["host"]
-                        if h and h in remaining:
-                            remaining[h]["cores"] -= rsv["cores"]
-                            remaining[h]["ram"] -= rsv["ram"]
-                            remaining[h]["disk"] -= rsv["disk"]
-                            for comp_key in rsv["components"]:
-                                if comp_key in remaining[h]["components"]:
-                                    remaining[h]["components"][comp_key] -= 1
-
-                # Greedy bin-pack each compute request
-                for req in compute_requests:
-                    req_cores = req.get("cores", 0)
-                    req_ram = req.get("ram", 0)
-                    req_disk = req.get("disk", 0)
-                    req_components = req.get("components", {})
-                    req_site = req.get("site")
-
-                    candidate_hosts = (
-                        [hid for hid in hosts_by_site.get(req_site, []) if hid in remaining]
-                        if req_site
-                        else list(remaining.keys())
-                    )
+            host_names = list(host_cap_map.keys())
+            host_index = {name: i for i, name in enumerate(host_names)}
+            comp_keys = sorted({k for cap in host_cap_map.values() for k in cap["components"]})
+            dims = 3 + len(comp_keys)
+
+            capacity = np.zeros((len(host_names), dims), dtype=np.int64)
+            # Components which are present on a host; allocations are only subtracted for those
+            has_component = np.zeros((len(host_names), dims), dtype=bool)
+            has_component[:, :3] = True
+            for i, host_name in enumerate(host_names):
+                cap = host_cap_map[host_name]
+                capacity[i, :3] = [cap["cores_capacity"], cap["ram_capacity"], cap["disk_capacity"]]
+                for k, v in cap["components"].items():
+                    capacity[i, 3 + comp_keys.index(k)] = v
+                    has_component[i, 3 + comp_keys.index(k)] = True
+
+            # Subtract live allocations overlapping each hour
+            allocated = HourlyCapacity(hours=total_hours, shape=(len(host_names), dims))
+            for rsv in compute_reservations:
+                i = host_index.get(rsv["host"]) if rsv["host"] else None
+                if i is None:
+                    continue
+                usage = np.zeros(dims, dtype=np.int64)
+                usage[:3] = [rsv["cores"], rsv["ram"], rsv["disk"]]
+                for comp_key in rsv["components"]:
+                    if comp_key in comp_keys:
+                        usage[3 + comp_keys.index(comp_key)] += 1
+                usage[~has_component[i]] = 0
+                first, last = span(rsv)
+                allocated.add(first=first, last=last, value=usage, index=i)
+
+            remaining = capacity - allocated.usage()
+
+            # Greedy bin-pack each compute request
+            for req in compute_requests:
+                request = np.zeros(dims, dtype=np.int64)
+                request[:3] = [req.get("cores", 0), req.get("ram", 0), req.get("disk", 0)]
+                checked = np.zeros(dims, dtype=bool)
+                checked[:3] = True
+                placeable = True
+                for comp_key, comp_count in req.get("components", {}).items():
+                    comp_key = comp_key.lower()
+                    if comp_key not in comp_keys:
+                        placeable = placeable and comp_count <= 0
+                        continue
+                    request[3 + comp_keys.index(comp_key)] = comp_count
+                    checked[3 + comp_keys.index(comp_key)] = True
+
+                req_site = req.get("site")
+                candidates = np.zeros(len(host_names), dtype=bool)
+                if req_site:
+                    for host_name in hosts_by_site.get(req_site, []):
+                        if host_name in host_index:
+                            candidates[host_index[host_name]] = True
+                else:
+                    candidates[:] = True
+
+                if not placeable:
+                    return np.zeros(total_hours, dtype=bool)
 
-                    placed = False
-                    for host_name in candidate_hosts:
-                        rem = remaining[host_name]
-                        if rem["cores"] < req_cores:
-                            continue
-                        if rem["ram"] < req_ram:
-                            continue
-                        if rem["disk"] < req_disk:
-                            continue
-                        comp_ok = True
-                        for comp_key, comp_count in req_components.items():
-                            if rem["components"].get(comp_key.lower(), 0) < comp_count:
-                                comp_ok = False
-                                break
-                        if not comp_ok:
-                            continue
-                        # Place on this host
-                        rem["cores"] -= req_cores
-                        rem["ram"] -= req_ram
-                        rem["disk"] -= req_disk
-                        for comp_key, comp_count in req_components.items():
-                            rem["components"][comp_key.lower()] -= comp_count
-                        placed = True
-                        break
-
-                    if not placed:
-                        return False
+                hour_ok &= HourlyCapacity.first_fit(remaining=remaining, candidates=candidates, request=request,
+                                                    checked=checked)
 
         # --- Link check ---
         for req in link_requests:
             pair = tuple(sorted([req["site_a"], req["site_b"]]))
             cap_entry = link_cap_map.get(pair)
             if not cap_entry:
-                return False
-            bw_cap = cap_entry["bandwidth_capacity"]
-            req_bw = req["bandwidth"]
+                return np.zeros(total_hours, dtype=bool)
 
-            for dh in range(duration):
-                hour_start = window_start + timedelta(hours=dh)
-                hour_end = hour_start + timedelta(hours=1)
+            bw_used = HourlyCapacity(hours=total_hours)
+            for ns in net_reservations:
+                if len(ns["sites"]) == 2 and tuple(ns["sites"]) == pair:
+                    first, last = span(ns)
+                    bw_used.add(first=first, last=last, value=ns["bandwidth"])
 
-                bw_used = 0
-                for ns in net_reservations:
-                    if ns["lease_start"] < hour_end and ns["lease_end"] > hour_start:
-                        if len(ns["sites"]) == 2 and tuple(ns["sites"]) == pair:
-                            bw_used += ns["bandwidth"]
-
-                if bw_cap - bw_used < req_bw:
-                    return False
+            hour_ok &= cap_entry["bandwidth_capacity"] - bw_used.usage() >= req["bandwidth"]
 
         # --- Facility port check ---
         for req in fp_requests:
             req_name = req["name"]
             req_site = req["site"]
-            req_vlans = req["vlans"]
 
             cap_entry = fp_cap_map.get((req_name, req_site))
             if not cap_entry:
-                return False
-            total_vlans = cap_entry["total_vlans"]
-
-            for dh in range(duration):
-                hour_start = window_start + timedelta(hours=dh)
-                hour_end = hour_start + timedelta(hours=1)
-
-                vlans_in_use = set()
-                for ns in net_reservations:
-                    if ns["lease_start"] < hour_end and ns["lease_end"] > hour_start:
-                        ns_fp = ns.get("fp_name")
-                        ns_site = ns.get("site")
-                        if ns_fp == req_name and ns_site == req_site:
-                            for v in ns["vlans"]:
-                                vlans_in_use.add(v)
-
-                if total_vlans - len(vlans_in_use) < req_vlans:
-                    return False
-
-        return True
+                return np.zeros(total_hours, dtype=bool)
+
+            # Track each VLAN separately so that a VLAN used by multiple reservations is only counted once
+            vlan_usage = {}
+            for ns in net_reservations:
+                if ns.get("fp_name") == req_name and ns.get("site") == req_site:
+                    first, last = span(ns)
+                    for v in ns["vlans"]:
+                        if v not in vlan_usage:
+                            vlan_usage[v] = HourlyCapacity(hours=total_hours)
+                        vlan_usage[v].add(first=first, last=last, value=1)
+
+            vlans_in_use = np.zeros(total_hours, dtype=np.int64)
+            for usage in vlan_usage.values():
+                vlans_in_use += usage.usage() > 0
+
+            hour_ok &= cap_entry["total_vlans"] - vlans_in_use >= req["vlans"]
+
+        return hour_ok
@@ -23,9 +23,11 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import concurrent.futures
 import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Union
+from typing import List, Union, Dict, Callable, Any
 
 from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
 from fim.slivers.network_node import NodeSliver
@@ -43,6 +45,7 @@ from fabric_cf.actor.core.core.event_processor import EventProcessor
 from fabric_cf.actor.core.manage.management_utils import ManagementUtils
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.orchestrator.core.advance_scheduling_thread import AdvanceSchedulingThread
+from fabric_cf.orchestrator.core.bqm_query_cache import BqmQueryCache
 from fabric_cf.orchestrator.core.bqm_wrapper import BqmWrapper
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.reservation_status_update_thread import ReservationStatusUpdateThread
@@ -79,6 +82,10 @@ class OrchestratorKernel(ABCTick):
     """
     Class responsible for starting Orchestrator Threads; also holds Management Actor and Broker information
     """
+    DEFAULT_FUTURE_LEASE_WORKERS = 8
+    DEFAULT_FUTURE_LEASE_TIMEOUT_SECONDS = 120
+    DEFAULT_SLICE_DEFER_WORKERS = 4
+    DEFAULT_ADVANCE_SCHEDULING_WORKERS = 2
 
     def __init__(self):
         self.defer_thread = None
@@ -90,10 +97,17 @@ class OrchestratorKernel(ABCTick):
         self.lock = threading.Lock()
         self.bqm_cache = {}
         self.summary_cache = {}
+        self.bqm_refresh_interval = BqmWrapper.DEFAULT_REFRESH_INTERVAL
+        # Cache for the models returned for queries filtered by time or sites
+        self.query_cache = BqmQueryCache(refresh_interval=self.bqm_refresh_interval)
         self.event_processor = None
         self.combined_broker_model_graph_id = None
         self.combined_broker_model = None
-        
+        # Bounded pool used to evaluate candidate hosts when computing future lease times
+        self.future_lease_workers = self.DEFAULT_FUTURE_LEASE_WORKERS
+        self.future_lease_timeout = self.DEFAULT_FUTURE_LEASE_TIMEOUT_SECONDS
+        self.future_lease_pool = None
+
     def get_saved_bqm(self, *, graph_format: GraphFormat, level: int) -> BqmWrapper:
         """
         Get Saved BQM from cache
@@ -112,7 +126,7 @@ class OrchestratorKernel(ABCTick):
             key = f"{graph_format}-{level}"
             saved_bqm = self.bqm_cache.get(key)
             if saved_bqm is None:
-                saved_bqm = BqmWrapper(logger=self.get_logger())
+                saved_bqm = BqmWrapper(logger=self.get_logger(), refresh_interval=self.bqm_refresh_interval)
             saved_bqm.save(bqm=bqm, graph_format=graph_format, level=level)
             self.bqm_cache[key] = saved_bqm
 
@@ -141,12 +155,18 @@ class OrchestratorKernel(ABCTick):
             key = f"SUMMARY-{level}"
             cached = self.summary_cache.get(key)
             if cached is None:
-                cached = BqmWrapper(logger=self.get_logger())
+                cached = BqmWrapper(logger=self.get_logger(), refresh_interval=self.bqm_refresh_interval)
             cached.save(bqm=summary, graph_format=GraphFormat.GRAPHML, level=level)
             self.summary_cache[key] = cached
         finally:
             self.lock.release()
 
+    def get_query_cache(self) -> BqmQueryCache:
+        """
+        Get the cache of the models returned for filtered queries
+        """
+        return self.query_cache
+
     def set_broker(self, *, broker: ID):
         """
         Set Broker
@@ -205,8 +225,11 @@ class OrchestratorKernel(ABCTick):
             self.defer_thread.stop()
         if self.event_processor is not None:
             self.event_processor.stop()
-        #if self.sut is not None:
-        #    self.sut.stop()
+        if self.future_lease_pool is not None:
+            self.future_lease_pool.shutdown(wait=False, cancel_futures=True)
+            self.future_lease_pool = None
+        if self.sut is not None:
+            self.sut.stop()
 
     def load_model(self, model: str):
         if self.combined_broker_model_graph_id:
@@ -227,6 +250,23 @@ class OrchestratorKernel(ABCTick):
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         GlobalsSingleton.get().get_container().register(tickable=self)
         self.logger = GlobalsSingleton.get().get_logger()
+        runtime_config = GlobalsSingleton.get().get_config().get_runtime_config()
+        self.future_lease_workers = int(runtime_config.get(Constants.FUTURE_LEASE_WORKERS,
+                                                           self.DEFAULT_FUTURE_LEASE_WORKERS))
+        self.future_lease_timeout = int(runtime_config.get(Constants.FUTURE_LEASE_TIMEOUT_SECONDS,
+                                                           self.DEFAULT_FUTURE_LEASE_TIMEOUT_SECONDS))
+        if self.future_lease_workers > 1:
+            self.future_lease_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.future_lease_workers,
+                                                                           thread_name_prefix="FutureLease")
+        bqm_config = GlobalsSingleton.get().get_config().get_global_config().get_bqm_config()
+        self.bqm_refresh_interval = int(bqm_config.get(Constants.REFRESH_INTERVAL,
+                                                       BqmWrapper.DEFAULT_REFRESH_INTERVAL))
+        self.query_cache = BqmQueryCache(size=int(bqm_config.get(Constants.QUERY_CACHE_SIZE,
+                                                                 BqmQueryCache.DEFAULT_SIZE)),
+                                         refresh_interval=self.bqm_refresh_interval,
+                                         granularity=int(bqm_config.get(Constants.QUERY_CACHE_GRANULARITY,
+                                                                        BqmQueryCache.DEFAULT_GRANULARITY_SECONDS)),
+                                         logger=self.logger)
         from fabric_cf.orchestrator.core.orchestrator_handler import OrchestratorHandler
         oh = OrchestratorHandler()
         model = oh.discover_broker_query_model(controller=self.get_management_actor(),
@@ -235,15 +275,20 @@ class OrchestratorKernel(ABCTick):
         self.load_model(model=model)
 
         self.get_logger().info("Starting SliceDeferThread")
-        self.defer_thread = SliceDeferThread(kernel=self)
+        self.defer_thread = SliceDeferThread(kernel=self,
+                                             workers=int(runtime_config.get(Constants.SLICE_DEFER_WORKERS,
+                                                                            self.DEFAULT_SLICE_DEFER_WORKERS)))
         self.defer_thread.start()
         self.event_processor = EventProcessor(name="PeriodicProcessor", logger=self.logger)
         self.event_processor.start()
-        self.adv_sch_thread = AdvanceSchedulingThread(kernel=self)
+        self.adv_sch_thread = AdvanceSchedulingThread(kernel=self,
+                                                      workers=int(runtime_config.get(
+                                                          Constants.ADVANCE_SCHEDULING_WORKERS,
+                                                          self.DEFAULT_ADVANCE_SCHEDULING_WORKERS)))
         self.adv_sch_thread.start()
-        #self.get_logger().debug("Starting ReservationStatusUpdateThread")
-        #self.sut = ReservationStatusUpdateThread()
-        #self.sut.start()
+        self.get_logger().debug("Starting ReservationStatusUpdateThread")
+        self.sut = ReservationStatusUpdateThread()
+        self.sut.start()
 
     def external_tick(self, *, cycle: int):
         """
@@ -301,6 +346,94 @@ class OrchestratorKernel(ABCTick):
         # Return the earliest common start time
         return min(common_times)
 
+    def __run_bounded(self, tasks: Dict[Any, Callable], deadline: float) -> Dict[Any, Any]:
+        """
+        Run the tasks on the future lease worker pool (or inline if the pool is disabled) and collect the
+        results of the tasks which complete before the deadline.
+
+        :param tasks: Dictionary of key to callable
+        :type tasks: Dict[Any, Callable]
+        :param deadline: Deadline as returned by time.monotonic()
+        :type deadline: float
+        :return: Dictionary of key to result for the tasks which completed successfully
+        :rtype: Dict[Any, Any]
+        """
+        results = {}
+        if self.future_lease_pool is None:
+            for key, task in tasks.items():
+                if time.monotonic() > deadline:
+                    self.logger.warning(f"Deadline exceeded, skipped {len(tasks) - len(results)} candidates")
+                    break
+                try:
+                    results[key] = task()
+                except Exception as e:
+                    self.logger.error(f"Failed to evaluate {key}: {e}")
+            return results
+
+        futures = {self.future_lease_pool.submit(task): key for key, task in tasks.items()}
+        done, not_done = concurrent.futures.wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for f in not_done:
+            f.cancel()
+        if not_done:
+            self.logger.warning(f"Deadline exceeded, skipped {len(not_done)} candidates")
+        for f in done:
+            try:
+                results[futures[f]] = f.result()
+            except Exception as e:
+                self.logger.error(f"Failed to evaluate {futures[f]}: {e}")
+        return results
+
+    def __load_host(self, node_id: str, parents: set, states: list[int], start: datetime,
+                    end: datetime) -> Union[ResourceTracker, None]:
+        """
+        Build a ResourceTracker for a candidate host loaded with the reservations on it in the requested window.
+
+        :param node_id: Candidate node id
+        :type node_id: str
+        :param parents: Names of the hosts explicitly requested by the reservations interested in this node;
+                        None if any of the reservations accepts any host
+        :type parents: set
+        :param states: Reservation states to consider
+        :type states: list[int]
+        :param start: Requested start datetime.
+        :type start: datetime
+        :param end: Requested end datetime.
+        :type end: datetime
+        :return: ResourceTracker or None if the host is not requested by any reservation
+        :rtype: ResourceTracker
+        """
+        cbm_node = self.combined_broker_model.build_deep_node_sliver(node_id=node_id)
+        if parents is not None and cbm_node.get_name() not in parents:
+            return None
+        existing = self.get_management_actor().get_reservations(node_id=node_id, states=states,
+                                                                start=start, end=end, full=True)
+        tracker = ResourceTracker(cbm_node=cbm_node)
+        # Add slivers from reservations to the tracker
+        for e in existing or []:
+            tracker.update(reservation=e, start=start, end=end)
+        return tracker
+
+    @staticmethod
+    def __find_start_times(requested_sliver: NodeSliver, candidate_nodes: list[str],
+                           trackers: Dict[str, ResourceTracker], start: datetime, end: datetime,
+                           duration: int) -> set[datetime]:
+        """
+        Gather the available start times across the candidate nodes of a reservation
+        """
+        parent = None
+        if requested_sliver.get_labels() and requested_sliver.get_labels().instance_parent:
+            parent = requested_sliver.get_labels().instance_parent
+
+        reservation_times = set()
+        for c in candidate_nodes:
+            tracker = trackers.get(c)
+            # Skip if CBM node is not the specific host that is requested or could not be evaluated
+            if tracker is None or (parent is not None and parent != tracker.name):
+                continue
+            reservation_times.update(tracker.find_next_available(requested_sliver=requested_sliver, start=start,
+                                                                 end=end, duration=duration))
+        return reservation_times
+
     def determine_future_lease_time(self, computed_reservations: list[LeaseReservationAvro], start: datetime,
                                     end: datetime, duration: int) -> tuple[datetime, datetime]:
         """
@@ -308,6 +441,10 @@ class OrchestratorKernel(ABCTick):
         to start simultaneously. If resources are not available, find the nearest start time when all
         reservations can begin together.
 
+        Each candidate host is loaded once into a read-only snapshot (graph node and existing reservations)
+        shared by all the reservations; hosts and reservations are evaluated concurrently on a bounded
+        worker pool. Candidates not evaluated before the deadline are treated as unavailable.
+
         :param computed_reservations: List of LeaseReservationAvro objects representing computed reservations.
         :type computed_reservations: list[LeaseReservationAvro]
         :param start: Requested start datetime.
@@ -324,10 +461,11 @@ class OrchestratorKernel(ABCTick):
         states = [ReservationStates.Active.value,
                   ReservationStates.ActiveTicketed.value,
                   ReservationStates.Ticketed.value]
+        deadline = time.monotonic() + self.future_lease_timeout
 
-        # Dictionary to hold the future start times for each reservation's candidate nodes
-        future_start_times = []
-        resource_trackers = {}
+        # Candidate nodes for each reservation and the hosts requested for each candidate node
+        requests = []
+        host_parents = {}
 
         for r in computed_reservations:
             requested_sliver = r.get_sliver()
@@ -343,37 +481,39 @@ class OrchestratorKernel(ABCTick):
                 # Triggering Slice closure
                 return start, start + timedelta(hours=duration)
 
-            # Gather the nearest available start time per candidate node for this reservation
-            reservation_times = set()
+            requests.append((requested_sliver, candidate_nodes))
+            parent = None
+            if requested_sliver.get_labels() and requested_sliver.get_labels().instance_parent:
+                parent = requested_sliver.get_labels().instance_parent
             for c in candidate_nodes:
-                cbm_node = self.combined_broker_model.build_deep_node_sliver(node_id=c)
-                # Skip if CBM node is not the specific host that is requested
-                if requested_sliver.get_labels() and requested_sliver.get_labels().instance_parent and \
-                        requested_sliver.get_labels().instance_parent != cbm_node.get_name():
-                    continue
-                existing = self.get_management_actor().get_reservations(node_id=c, states=states,
-                                                                        start=start, end=end, full=True)
-                if c not in resource_trackers:
-                    resource_trackers[c] = ResourceTracker(cbm_node=cbm_node)
-                tracker = resource_trackers[c]
-                # Add slivers from reservations to the tracker
-                for e in existing:
-                    tracker.update(reservation=e, start=start, end=end)
-
-                start_times = tracker.find_next_available(requested_sliver=requested_sliver, start=start,
-                                                          end=end, duration=duration)
-                if start_times:
-                    start_times = sorted(start_times)
-                    reservation_times.update(start_times)
-
-            if not len(reservation_times):
+                if parent is None:
+                    host_parents[c] = None
+                elif host_parents.setdefault(c, set()) is not None:
+                    host_parents[c].add(parent)
+
+        # Snapshot of each candidate host shared across all the reservations
+        trackers = self.__run_bounded(
+            tasks={c: (lambda c=c, p=p: self.__load_host(node_id=c, parents=p, states=states, start=start, end=end))
+                   for c, p in host_parents.items()},
+            deadline=deadline)
+
+        # Gather the available start times per reservation across its candidate nodes
+        reservation_times = self.__run_bounded(
+            tasks={i: (lambda s=s, n=n: self.__find_start_times(requested_sliver=s, candidate_nodes=n,
+                                                                 trackers=trackers, start=start, end=end,
+                                                                 duration=duration))
+                   for i, (s, n) in enumerate(requests)},
+            deadline=deadline)
+
+        future_start_times = []
+        for i, (requested_sliver, candidate_nodes) in enumerate(requests):
+            if not len(reservation_times.get(i, set())):
                 self.logger.error(f"Sliver {requested_sliver} request cannot be satisfied in the requested duration!")
                 # Reservation will fail at the Broker with Insufficient resources
                 # Triggering Slice closure
                 return start, start + timedelta(hours=duration)
 
-            # Add the earliest start time for the reservation to future_start_times
-            future_start_times.append(list(reservation_times))
+            future_start_times.append(list(reservation_times.get(i)))
 
         # Find the nearest start time across all reservations where they can start together
         simultaneous_start_time = self.find_common_start_time(reservation_start_times=future_start_times)
@@ -23,42 +23,55 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import queue
 import threading
 import traceback
 from typing import List
 
+from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+
+from fabric_cf.actor.core.kernel.reservation_event_bus import ReservationEventBus, ReservationEventBusSingleton
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.util.id import ID
-from fabric_cf.actor.core.util.iterable_queue import IterableQueue
 from fabric_cf.orchestrator.core.active_status_checker import ActiveStatusChecker
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.i_status_update_callback import IStatusUpdateCallback
-from fabric_cf.orchestrator.core.status_checker import StatusChecker, Status
+from fabric_cf.orchestrator.core.status_checker import Status
 from fabric_cf.orchestrator.core.watch_entry import WatchEntry
 
 
 class ReservationStatusUpdateThread:
     """
-    This thread allows expressing interest in completion of certain reservations and can run callbacks on other specified
+    This allows expressing interest in completion of certain reservations and can run callbacks on other specified
     reservations when the status changes accordingly
 
-    The periodic thread polls reservations of interest to determine whether the they have reached the required state,
-    upon which the callback is invoked
+    Watches are subscriptions on the reservation event bus; the kernel publishes the reservation state transitions
+    and the status of the reservation is checked as soon as it reaches the required state. A reservation which is
+    already in the required state when the watch is added is checked right away. The transition is published before
+    the reservation is saved; a reservation which has transitioned but is not yet ready as read from the database
+    (older state or units not yet available) is polled by the periodic thread until it is.
     """
     MODIFY_CHECK_PERIOD = 5 # seconds
+    SUCCESS_STATES = [ReservationStates.Active]
+    FAILURE_STATES = [ReservationStates.Closed, ReservationStates.CloseFail, ReservationStates.Failed]
 
-    def __init__(self):
+    def __init__(self, *, bus: ReservationEventBus = None, logger=None):
         self.controller = None
+        self.bus = bus if bus is not None else ReservationEventBusSingleton.get()
         self.thread_lock = threading.Lock()
         self.reservation_lock = threading.Lock()
-        self.active_watch = queue.Queue()
+        # Watches which have not yet been processed
+        self.active_watch: List[WatchEntry] = []
+        # Watches on reservations which reached the required state but are not ready yet
+        self.not_ready_watch: List[WatchEntry] = []
         self.stopped_worker = threading.Event()
 
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        self.logger = GlobalsSingleton.get().get_logger()
+        if logger is None:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            logger = GlobalsSingleton.get().get_logger()
+        self.logger = logger
+        self.status_checker = ActiveStatusChecker(logger=self.logger)
 
         self.thread = None
-        self.stopped = False
 
     def start(self):
         """
@@ -70,36 +83,43 @@ class ReservationStatusUpdateThread:
             if self.thread is not None:
                 raise OrchestratorException("This ReservationStatusUpdateThread has already been started")
 
+            self.stopped_worker.clear()
+            self.bus.start()
             self.thread = threading.Thread(target=self.periodic)
             self.thread.setName(self.__class__.__name__)
             self.thread.setDaemon(True)
             self.thread.start()
-
         finally:
             self.thread_lock.release()
 
     def stop(self):
         """
-        Stop
+        Stop; pending watches are dropped
         :return:
         """
-        self.stopped = True
         self.stopped_worker.set()
-        try:
-            self.thread_lock.acquire()
+        with self.thread_lock:
             temp = self.thread
             self.thread = None
-            if temp is not None:
-                self.logger.warning("It seems that the ReservationStatusUpdateThread is running. Interrupting it")
-                try:
-                    temp.join()
-                except Exception as e:
-                    self.logger.error("Could not join ReservationStatusUpdateThread thread {}".format(e))
-                finally:
-                    self.thread_lock.release()
-        finally:
-            if self.thread_lock is not None and self.thread_lock.locked():
-                self.thread_lock.release()
+        if temp is not None:
+            try:
+                temp.join()
+            except Exception as e:
+                self.logger.error("Could not join ReservationStatusUpdateThread thread {}".format(e))
+
+        with self.reservation_lock:
+            temp = self.active_watch
+            self.active_watch = []
+            self.not_ready_watch = []
+        for we in temp:
+            self.bus.unsubscribe(subscription=we.subscription)
+        self.bus.stop()
+
+    def get_controller(self):
+        if self.controller is None:
+            from fabric_cf.orchestrator.core.orchestrator_kernel import OrchestratorKernelSingleton
+            self.controller = OrchestratorKernelSingleton.get().get_management_actor()
+        return self.controller
 
     def periodic(self):
         """
@@ -111,14 +131,6 @@ class ReservationStatusUpdateThread:
             self.run()
         self.logger.debug(f"Reservation Status Update Thread exited")
 
-    def __add_active_status_watch(self, *, we: WatchEntry):
-        try:
-            self.reservation_lock.acquire()
-            self.logger.debug(f"Added watch entry {we}")
-            self.active_watch.put_nowait(we)
-        finally:
-            self.reservation_lock.release()
-
     def add_active_status_watch(self, *, watch: ID, callback: IStatusUpdateCallback):
         """
         Watch for transition to Active or Failed. Callback is called when reservation has either Failed or became Active
@@ -129,67 +141,78 @@ class ReservationStatusUpdateThread:
             self.logger.info(f"watch {watch} callback {callback}, ignoring")
             return
 
-        self.__add_active_status_watch(we=WatchEntry(watch=watch, callback=callback))
+        we = WatchEntry(watch=watch, callback=callback)
 
-    def process_watch_list(self, *, watch_list: List[WatchEntry], watch_type: str, status_checker: StatusChecker):
-        """
-        Process watch list
-        :param watch_list:
-        :param watch_type:
-        :param status_checker:
-        :return:
-        """
-        to_remove = []
-        self.logger.debug(f"Scanning {watch_type} watch list {len(watch_list)}")
+        def on_transition(reservation: ReservationMng):
+            self.process_watch(we=we, snapshot=reservation)
 
-        if self.controller is None:
-            from fabric_cf.orchestrator.core.orchestrator_kernel import OrchestratorKernelSingleton
-            self.controller = OrchestratorKernelSingleton.get().get_management_actor()
-
-        for watch_entry in watch_list:
-            status, reservation = status_checker.check(controller=self.controller, rid=watch_entry.reservation_to_watch)
-            self.logger.info(f"Status------- {status} for {reservation.get_reservation_id()}")
-            if status == Status.OK:
-                to_remove.append(watch_entry)
-                watch_entry.callback.success(controller=self.controller, reservation=reservation)
-            elif status == Status.NOT_OK:
-                to_remove.append(watch_entry)
-                watch_entry.callback.failure(controller=self.controller, reservation=reservation)
+        with self.reservation_lock:
+            we.subscription = self.bus.subscribe(rid=watch, states=self.SUCCESS_STATES + self.FAILURE_STATES,
+                                                 callback=on_transition)
+            self.active_watch.append(we)
+        self.logger.debug(f"Added watch entry {we}")
 
-        self.logger.debug(f"Removing {watch_type} entries from watch {len(to_remove)}")
+        # The bus only reports transitions after the subscription; check the reservation in case it
+        # already reached the required state
+        self.process_watch(we=we)
 
-        for we in to_remove:
-            watch_list.remove(we)
-
-        # Add the Not Ready entries back
-        for we in watch_list:
-            self.__add_active_status_watch(we=we)
+    def process_watch(self, *, we: WatchEntry, snapshot: ReservationMng = None):
+        """
+        Check the status of a watched reservation and invoke the callback if it is either ready or has failed.
+        Once the subscription has been consumed, or the reservation is Active without any units, a reservation
+        which is not ready is checked again by the periodic thread.
+        :param we: watch entry
+        :param snapshot: reservation published by the event bus on the transition; None if not triggered by the bus
+        :return:
+        """
+        try:
+            if snapshot is not None and ReservationStates(snapshot.get_state()) in self.FAILURE_STATES:
+                # Failures are final; no need to wait for the database to catch up
+                status, reservation = Status.NOT_OK, snapshot
+            else:
+                status, reservation = self.status_checker.check(controller=self.get_controller(),
+                                                                rid=we.reservation_to_watch)
+        except Exception as e:
+            self.logger.error(f"Failed to check status of {we.reservation_to_watch}: {e}")
+            self.logger.error(traceback.format_exc())
+            status, reservation = Status.NOT_READY, None
+
+        with self.reservation_lock:
+            if we not in self.active_watch:
+                # Already processed
+                return
+            if status == Status.NOT_READY:
+                # No further transition is reported once the subscription is consumed or the reservation is Active;
+                # poll until it is ready. The database may still return the state preceding the transition.
+                polled = snapshot is not None or we in self.not_ready_watch or reservation is None or \
+                    ReservationStates(reservation.get_state()) in self.SUCCESS_STATES
+                if polled and we not in self.not_ready_watch:
+                    self.not_ready_watch.append(we)
+                return
+            self.active_watch.remove(we)
+            if we in self.not_ready_watch:
+                self.not_ready_watch.remove(we)
+
+        self.bus.unsubscribe(subscription=we.subscription)
+        self.logger.info(f"Status------- {status} for {reservation.get_reservation_id()}")
+        if status == Status.OK:
+            we.callback.success(controller=self.get_controller(), reservation=reservation)
+        else:
+            we.callback.failure(controller=self.get_controller(), reservation=reservation)
 
     def run(self):
-        # wake up periodically and check the status of reservations (state or unit modify properties)
-        # and call appropriate callbacks if necessary.
-        # scan both lists and check if any of the
-        # reservation groups on them are ready for callbacks
-        # remove those ready for callbacks off the lists and invoke callbacks
-        # outside the critical section
-        # NOTE: because callback can create another callback, which can add watches,
-        # we must make this code re-entrant hence the need to change the watch list
-        # and only then call the callbacks
-
+        """
+        Check the watches on the reservations which are not ready yet
+        :return:
+        """
         try:
-            active_watch_list = []
-
-            try:
-                self.reservation_lock.acquire()
-                if not self.active_watch.empty():
-                    for a in IterableQueue(source_queue=self.active_watch):
-                        active_watch_list.append(a)
-            finally:
-                self.reservation_lock.release()
-
-            self.process_watch_list(watch_list=active_watch_list, watch_type="active",
-                                    status_checker=ActiveStatusChecker())
+            with self.reservation_lock:
+                not_ready_watch_list = list(self.not_ready_watch)
 
+            if len(not_ready_watch_list):
+                self.logger.debug(f"Scanning not ready watch list {len(not_ready_watch_list)}")
+            for we in not_ready_watch_list:
+                self.process_watch(we=we)
         except Exception as e:
             self.logger.error(f"RuntimeException: {e} continuing")
             self.logger.error(traceback.format_exc())
@@ -23,85 +23,24 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-from collections import defaultdict
+import math
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from fabric_cf.actor.core.time.actor_clock import ActorClock
+from fabric_cf.orchestrator.core.hourly_capacity import HourlyCapacity
 from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
 from fim.slivers.base_sliver import BaseSliver
-from fim.slivers.attached_components import ComponentSliver, ComponentType
-from fim.slivers.capacities_labels import Capacities, FreeCapacity
+from fim.slivers.attached_components import ComponentType
+from fim.slivers.capacities_labels import Capacities
 from fim.slivers.network_node import NodeSliver
 
 
-class TimeSlot:
-    """Represents a time slot for resources, tracking capacities and components."""
-
-    def __init__(self, end: datetime):
-        """
-        Initialize a TimeSlot instance with end time and empty resource capacities and components.
-
-        :param end: The end datetime for this time slot.
-        :type end: datetime
-        """
-        self.end = end
-        self.capacities = Capacities()
-        self.components = {}
-
-    def __update_capacities(self, capacities: Capacities):
-        """
-        Update the capacities in this time slot.
-
-        :param capacities: The capacities to add to this time slot.
-        :type capacities: Capacities
-        """
-        self.capacities += capacities
-
-    def __update_components(self, by_type: dict[ComponentType, list[ComponentSliver]]):
-        """
-        Update the components by type in this time slot.
-
-        :param by_type: Dictionary with component types as keys and lists of ComponentSliver as values.
-        :type by_type: dict[ComponentType, list[ComponentSliver]]
-        """
-        for comp_type, comps in by_type.items():
-            if comp_type not in self.components:
-                self.components[comp_type] = 0
-            for c in comps:
-                if c.get_capacities():
-                    units = c.get_capacities().unit
-                else:
-                    units = c.get_capacity_allocations().unit
-                self.components[comp_type] += units
-
-    def add_sliver(self, sliver: BaseSliver):
-        """
-        Add sliver capacities and components to the current time slot.
-
-        :param sliver: The sliver containing resource capacities and components to add.
-        :type sliver: BaseSliver
-        """
-        if isinstance(sliver, NodeSliver):
-            if sliver.capacity_allocations:
-                self.__update_capacities(capacities=sliver.capacity_allocations)
-            else:
-                self.__update_capacities(capacities=sliver.capacities)
-
-            if sliver.attached_components_info:
-                self.__update_components(by_type=sliver.attached_components_info.by_type)
-
-    def __str__(self):
-        """
-        Return a string representation of the capacities and components in this time slot.
-
-        :return: String representation of capacities and components.
-        :rtype: str
-        """
-        return f"Capacities: {self.capacities}, Components: {self.components}"
-
-
 class ResourceTracker:
     """Tracks resource over time slots and checks availability of resources."""
+    # Capacity fields compared when checking availability
+    FIELDS = list(Capacities().__dict__.keys())
 
     def __init__(self, cbm_node: NodeSliver):
         """
@@ -110,6 +49,7 @@ class ResourceTracker:
         :param cbm_node: The CBM node from which to initialize capacities and components.
         :type cbm_node: NodeSliver
         """
+        self.name = cbm_node.get_name()
         self.total_capacities = cbm_node.get_capacities()
         self.total_components = {}
 
@@ -120,9 +60,46 @@ class ResourceTracker:
                     for c in comps:
                         self.total_components[comp_type] += c.get_capacities().unit
 
-        self.time_slots = defaultdict(TimeSlot)
+        # List of tuples (slot start, slot end, capacities, components by type) for the captured reservations
+        self.allocations = []
         self.reservation_ids = set()
 
+    @staticmethod
+    def __to_vector(capacities: Capacities) -> np.ndarray:
+        if capacities is None:
+            return np.zeros(len(ResourceTracker.FIELDS), dtype=np.int64)
+        return np.array([capacities.__dict__.get(f, 0) or 0 for f in ResourceTracker.FIELDS], dtype=np.int64)
+
+    @staticmethod
+    def __get_usage(sliver: BaseSliver) -> tuple[np.ndarray, dict[ComponentType, int]]:
+        """
+        Compute the capacities and component units used by a sliver.
+
+        :param sliver: The sliver containing resource capacities and components.
+        :type sliver: BaseSliver
+        :return: Tuple of capacities vector and units per component type.
+        :rtype: tuple[np.ndarray, dict[ComponentType, int]]
+        """
+        capacities = ResourceTracker.__to_vector(None)
+        components = {}
+        if isinstance(sliver, NodeSliver):
+            if sliver.capacity_allocations:
+                capacities = ResourceTracker.__to_vector(sliver.capacity_allocations)
+            else:
+                capacities = ResourceTracker.__to_vector(sliver.capacities)
+
+            if sliver.attached_components_info:
+                for comp_type, comps in sliver.attached_components_info.by_type.items():
+                    if comp_type not in components:
+                        components[comp_type] = 0
+                    for c in comps:
+                        if c.get_capacities():
+                            units = c.get_capacities().unit
+                        else:
+                            units = c.get_capacity_allocations().unit
+                        components[comp_type] += units
+        return capacities, components
+
     def update(self, reservation: ReservationMng, start: datetime, end: datetime):
         """
         Update allocated resource information.
@@ -144,42 +121,17 @@ class ResourceTracker:
         sliver_end = ActorClock.from_milliseconds(milli_seconds=reservation.get_end())
         sliver_end = sliver_end.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
 
-        current_time = start
-        while current_time < sliver_end and current_time < end:
-            if current_time not in self.time_slots:
-                self.time_slots[current_time] = TimeSlot(current_time)
-
-            # Update the specific time slot with the sliver's resource usage
-            self.time_slots[current_time].add_sliver(sliver=reservation.get_sliver())
-
-            current_time += timedelta(hours=1)
-
-    def __check_components(self, requested_sliver: NodeSliver,
-                           allocated: dict[ComponentType, int]) -> bool:
-        """
-        Check if requested components can be fulfilled by available components.
-
-        :param requested_sliver: The sliver with requested components.
-        :type requested_sliver: NodeSliver
-        :param allocated: Dictionary of available components by type.
-        :type allocated: dict[ComponentType, int]
-        :return: True if components can be fulfilled, False otherwise.
-        :rtype: bool
-        """
-        if not requested_sliver.attached_components_info:
-            return True
-        for comp_type, comps in requested_sliver.attached_components_info.by_type.items():
-            if comp_type not in self.total_components:
-                return False
-            elif len(comps) > (self.total_components[comp_type] - allocated.get(comp_type, 0)):
-                return False
-        return True
+        capacities, components = self.__get_usage(sliver=reservation.get_sliver())
+        self.allocations.append((start, min(sliver_end, end), capacities, components))
 
     def find_next_available(self, requested_sliver: NodeSliver, start: datetime, end: datetime,
                             duration: int) -> list[datetime]:
         """
         Find the next available time slot that can fulfill the requested sliver's capacities and components.
 
+        The allocations are accumulated into per-hour matrices once per call, every hour is checked in a
+        single vectorized pass and the usable windows are found using a cumulative sum over the hours.
+
         :param requested_sliver: The sliver with requested capacities and components.
         :type requested_sliver: NodeSliver
         :param start: The start datetime to begin searching for availability.
@@ -191,38 +143,41 @@ class ResourceTracker:
         :return: List of all possible next available time slot, or empty list if not found.
         :rtype: datetime
         """
-        current_time = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-        duration_timedelta = timedelta(hours=duration)
-        ret_val = []
-
-        while current_time + duration_timedelta <= end:
-            available = True
-            for i in range(duration):
-                time_slot_time = current_time + timedelta(hours=i)
-                if time_slot_time not in self.time_slots:
-                    # If there's no entry for this time slot, assume full capacity available
-                    continue
-
-                time_slot = self.time_slots[time_slot_time]
-                free_capacity = FreeCapacity(total=self.total_capacities, allocated=time_slot.capacities)
-
-                # Check if accumulated capacities are negative (means not enough capacity)
-                if free_capacity.free.negative_fields():
-                    available = False
-                    break
-
-                diff = free_capacity.free - requested_sliver.capacities
-                if diff.negative_fields():
-                    available = False
-                    break
-
-                if not self.__check_components(requested_sliver=requested_sliver, allocated=time_slot.components):
-                    available = False
+        base = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        count = math.floor((end - base).total_seconds() / 3600) - duration + 1
+        if count <= 0:
+            return []
+        hours = count + duration - 1
+
+        comp_types = list(self.total_components.keys())
+        occupied = HourlyCapacity(hours=hours)
+        allocated = HourlyCapacity(hours=hours, shape=(len(self.FIELDS),))
+        allocated_components = HourlyCapacity(hours=hours, shape=(len(comp_types),))
+
+        for slot_start, slot_end, capacities, components in self.allocations:
+            first, last = HourlyCapacity.hour_span(base=base, start=slot_start, end=slot_end, hours=hours)
+            occupied.add(first=first, last=last, value=1)
+            allocated.add(first=first, last=last, value=capacities)
+            for comp_type, units in components.items():
+                if comp_type in self.total_components:
+                    allocated_components.add(first=first, last=last, value=units,
+                                             index=comp_types.index(comp_type))
+
+        free = self.__to_vector(self.total_capacities) - allocated.usage()
+        requested = self.__to_vector(requested_sliver.capacities)
+        hour_ok = np.all(free >= 0, axis=1) & np.all(free - requested >= 0, axis=1)
+
+        if requested_sliver.attached_components_info:
+            free_components = np.array([self.total_components[t] for t in comp_types], dtype=np.int64) - \
+                allocated_components.usage()
+            for comp_type, comps in requested_sliver.attached_components_info.by_type.items():
+                if comp_type not in self.total_components:
+                    hour_ok[:] = False
                     break
+                hour_ok &= free_components[:, comp_types.index(comp_type)] >= len(comps)
 
-            if available:
-                ret_val.append(current_time)
-
-            current_time += timedelta(hours=1)
+        # If there's no allocation for a time slot, assume full capacity available
+        hour_ok |= occupied.usage() == 0
 
-        return ret_val
+        starts = HourlyCapacity.window_starts(hour_ok=hour_ok, duration=duration)
+        return [base + timedelta(hours=int(i)) for i in starts]
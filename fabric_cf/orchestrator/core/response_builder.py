@@ -63,11 +63,19 @@ class ResponseBuilder:
     PROP_OPERATION = "operation"
     PROP_POA_ID = "poa_id"
 
+    # Fields of a sliver which can be selected; sliver_id is always returned
+    SLIVER_FIELDS = [PROP_SLICE_ID, PROP_SLIVER_ID, PROP_STATE, PROP_PENDING_STATE, PROP_JOIN_STATE,
+                     PROP_GRAPH_NODE_ID, PROP_SLIVER_TYPE, PROP_SLIVER, PROP_LEASE_START_TIME,
+                     PROP_LEASE_END_TIME, PROP_NOTICE, PROP_CLOSED_AT]
+    # Fields which require the sliver to be loaded
+    SLIVER_DETAIL_FIELDS = [PROP_GRAPH_NODE_ID, PROP_SLIVER_TYPE, PROP_SLIVER]
+
     @staticmethod
-    def get_reservation_summary(*, res_list: List[ReservationMng]) -> List[dict]:
+    def get_reservation_summary(*, res_list: List[ReservationMng], fields: List[str] = None) -> List[dict]:
         """
         Get Reservation summary
         :param res_list:
+        :param fields: fields to include; all if not specified (sliver_id is always included)
         :return:
         """
         reservations = []
@@ -89,7 +97,8 @@ class ResponseBuilder:
                 if sliver is not None:
                     res_dict[ResponseBuilder.PROP_GRAPH_NODE_ID] = sliver.node_id
                     res_dict[ResponseBuilder.PROP_SLIVER_TYPE] = type(sliver).__name__
-                    res_dict[ResponseBuilder.PROP_SLIVER] = ABCPropertyGraph.sliver_to_dict(sliver)
+                    if fields is None or ResponseBuilder.PROP_SLIVER in fields:
+                        res_dict[ResponseBuilder.PROP_SLIVER] = ABCPropertyGraph.sliver_to_dict(sliver)
 
                 if reservation.get_start() is not None:
                     start_time = ActorClock.from_milliseconds(milli_seconds=reservation.get_start())
@@ -107,6 +116,10 @@ class ResponseBuilder:
                     closed_at_time = ActorClock.from_milliseconds(milli_seconds=closed_at_ms)
                     res_dict[ResponseBuilder.PROP_CLOSED_AT] = closed_at_time.strftime(Constants.LEASE_TIME_FORMAT)
 
+                if fields is not None:
+                    res_dict = {k: v for k, v in res_dict.items()
+                                if k in fields or k == ResponseBuilder.PROP_SLIVER_ID}
+
                 reservations.append(res_dict)
 
         return reservations
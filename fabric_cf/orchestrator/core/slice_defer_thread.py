@@ -23,35 +23,24 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import queue
-import threading
-import time
 import traceback
 
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.util.id import ID
-from fabric_cf.actor.core.util.iterable_queue import IterableQueue
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.orchestrator_slice_wrapper import OrchestratorSliceWrapper
+from fabric_cf.orchestrator.core.slice_dispatcher import SliceDispatcher
 
 
-class SliceDeferThread:
+class SliceDeferThread(SliceDispatcher):
     """
-    This runs as a standalone thread started by Orchestrator and deals with issuing demand for the slivers for
-    the newly created slices. The purpose of this thread is to help orchestrator respond back to the create
+    This runs as standalone threads started by Orchestrator and deals with issuing demand for the slivers for
+    the newly created slices. The purpose of these threads is to help orchestrator respond back to the create
     without waiting for the slivers to be demanded
     """
 
-    def __init__(self, *, kernel):
-        self.slice_queue = queue.Queue()
-        self.slice_avail_condition = threading.Condition()
-        self.thread_lock = threading.Lock()
-        self.thread = None
-        self.stopped = False
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        self.logger = GlobalsSingleton.get().get_logger()
-        self.mgmt_actor = kernel.get_management_actor()
-        self.kernel = kernel
+    def __init__(self, *, kernel, workers: int = SliceDispatcher.DEFAULT_WORKERS, logger=None):
+        super().__init__(kernel=kernel, workers=workers, logger=logger)
         self.sut = kernel.get_sut()
 
     def get_sut(self):
@@ -59,116 +48,34 @@ class SliceDeferThread:
             self.sut = self.kernel.get_sut()
         return self.sut
 
-    def queue_slice(self, *, controller_slice: OrchestratorSliceWrapper):
-        """
-        Queue a slice
-        :param controller_slice:
-        :return:
-        """
-        try:
-            self.slice_queue.put_nowait(controller_slice)
-            self.logger.debug(f"Added slice to slices queue {controller_slice.get_slice_id()}")
-        except Exception as e:
-            self.logger.error(f"Failed to queue slice: {controller_slice.get_slice_id()} e: {e}")
-
-    def start(self):
-        """
-        Start thread
-        :return:
-        """
-        try:
-            self.thread_lock.acquire()
-            if self.thread is not None:
-                raise OrchestratorException("This SliceDeferThread has already been started")
-
-            self.thread = threading.Thread(target=self.run)
-            self.thread.setName(self.__class__.__name__)
-            self.thread.setDaemon(True)
-            self.thread.start()
-
-        finally:
-            self.thread_lock.release()
-
-    def stop(self):
-        """
-        Stop thread
-        :return:
-        """
-        self.stopped = True
-        try:
-            self.thread_lock.acquire()
-            temp = self.thread
-            self.thread = None
-            if temp is not None:
-                self.logger.warning("It seems that the SliceDeferThread is running. Interrupting it")
-                try:
-                    # TODO find equivalent of interrupt
-                    with self.slice_avail_condition:
-                        self.slice_avail_condition.notify_all()
-                    temp.join()
-                except Exception as e:
-                    self.logger.error(f"Could not join SliceDeferThread thread {e}")
-                finally:
-                    self.thread_lock.release()
-        finally:
-            if self.thread_lock is not None and self.thread_lock.locked():
-                self.thread_lock.release()
-
-    def run(self):
-        """
-        Thread main loop
-        :return:
-        """
-        self.logger.debug(f"SliceDeferThread started")
-        while True:
-            slices = []
-            if not self.stopped and self.slice_queue.empty():
-                time.sleep(0.001)
-
-            if self.stopped:
-                self.logger.info("SliceDeferThread exiting")
-                return
-
-            if not self.slice_queue.empty():
-                try:
-                    for s in IterableQueue(source_queue=self.slice_queue):
-                        slices.append(s)
-                except Exception as e:
-                    self.logger.error(f"Error while adding slice to slice queue! e: {e}")
-                    self.logger.error(traceback.format_exc())
-
-            if len(slices) > 0:
-                self.logger.debug(f"Processing {len(slices)} slices")
-                for s in slices:
-                    try:
-                        # Process the Slice i.e. Demand the computed reservations i.e. Add them to the policy
-                        # Once added to the policy; Actor Tick Handler will do following asynchronously:
-                        # 1. Ticket message exchange with broker and
-                        # 2. Redeem message exchange with AM once ticket is granted by Broker
-                        self.process_slice(controller_slice=s)
-                    except Exception as e:
-                        self.logger.error(f"Error while processing slice {type(s)}, {e}")
-                        self.logger.error(traceback.format_exc())
-
     def process_slice(self, *, controller_slice: OrchestratorSliceWrapper):
         """
         Demand slice reservations.
+        Once added to the policy; Actor Tick Handler will do following asynchronously:
+        1. Ticket message exchange with broker and
+        2. Redeem message exchange with AM once ticket is granted by Broker
         :param controller_slice:
         """
         computed_reservations = controller_slice.get_computed_reservations()
 
         try:
             controller_slice.lock()
+            demand_list = []
             for reservation in computed_reservations:
-                self.logger.debug(f"Issuing demand for reservation: {reservation.get_reservation_id()}")
-
                 if reservation.get_state() != ReservationStates.Unknown.value:
                     self.logger.debug(f"Reservation not in {reservation.get_state()} state, ignoring it")
                     continue
+                demand_list.append(reservation)
 
-                if not self.mgmt_actor.demand_reservation(reservation=reservation):
+            if len(demand_list):
+                self.logger.debug(f"Issuing demand for {len(demand_list)} reservations")
+                results = self.mgmt_actor.demand_reservations(reservations=demand_list)
+                if results is None:
                     raise OrchestratorException(f"Could not demand resources: {self.mgmt_actor.get_last_error()}")
-                self.logger.debug(f"Reservation #{reservation.get_reservation_id()} demanded successfully")
+                failed = {rid: result.get_message() for rid, result in results.items() if result.get_code() != 0}
+                if len(failed):
+                    raise OrchestratorException(f"Could not demand resources: {failed}")
+                self.logger.debug(f"{len(demand_list)} reservations demanded successfully")
             '''
             for r in controller_slice.computed_l3_reservations:
                 res_status_update = ReservationStatusUpdate(logger=self.logger)
@@ -176,22 +83,31 @@ class SliceDeferThread:
                                                        callback=res_status_update)
             '''
 
-            for r in controller_slice.computed_remove_reservations:
-                self.logger.debug(f"Issuing close for reservation: {r}")
-                self.mgmt_actor.close_reservation(rid=ID(uid=r))
-
-            for rid, modified_res in controller_slice.computed_modify_reservations.items():
-                self.logger.debug(f"Issuing extend for modified reservation: {rid}")
-                if not self.mgmt_actor.extend_reservation(reservation=ID(uid=rid), sliver=modified_res.sliver,
-                                                          new_end_time=None, dependencies=modified_res.dependencies):
-                    self.logger.error(f"Could not extend rid: {rid} error: {self.mgmt_actor.get_last_error()}")
-                    continue
-                self.logger.debug(f"Issued extend for reservation #{rid} successfully")
-
-            for r in controller_slice.computed_modify_properties_reservations:
-                self.logger.debug(f"Issuing modify for reservation: {r}")
-                self.mgmt_actor.modify_reservation(rid=ID(uid=str(r.get_reservation_id())),
-                                                   modified_sliver=r.sliver)
+            if len(controller_slice.computed_remove_reservations):
+                self.logger.debug(f"Issuing close for reservations: {controller_slice.computed_remove_reservations}")
+                self.mgmt_actor.close_reservations_by_rids(
+                    rids=[ID(uid=r) for r in controller_slice.computed_remove_reservations])
+
+            if len(controller_slice.computed_modify_reservations):
+                self.logger.debug(f"Issuing extend for modified reservations: "
+                                  f"{list(controller_slice.computed_modify_reservations.keys())}")
+                rids = [ID(uid=rid) for rid in controller_slice.computed_modify_reservations.keys()]
+                slivers = {ID(uid=rid): modified_res.sliver
+                           for rid, modified_res in controller_slice.computed_modify_reservations.items()}
+                dependencies = {ID(uid=rid): modified_res.dependencies
+                                for rid, modified_res in controller_slice.computed_modify_reservations.items()}
+                results = self.mgmt_actor.extend_reservations(rids=rids, slivers=slivers, dependencies=dependencies)
+                for rid, result in (results or {}).items():
+                    if result.get_code() != 0:
+                        self.logger.error(f"Could not extend rid: {rid} error: {result.get_message()}")
+                        continue
+                    self.logger.debug(f"Issued extend for reservation #{rid} successfully")
+
+            if len(controller_slice.computed_modify_properties_reservations):
+                slivers = {ID(uid=str(r.get_reservation_id())): r.sliver
+                           for r in controller_slice.computed_modify_properties_reservations}
+                self.logger.debug(f"Issuing modify for reservations: {list(slivers.keys())}")
+                self.mgmt_actor.modify_reservations(slivers=slivers)
 
         except Exception as e:
             self.logger.error(traceback.format_exc())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import queue
+import threading
+from abc import ABC, abstractmethod
+import traceback
+import zlib
+
+from fabric_cf.orchestrator.core.exceptions import OrchestratorException
+from fabric_cf.orchestrator.core.orchestrator_slice_wrapper import OrchestratorSliceWrapper
+
+
+class SliceDispatcher(ABC):
+    """
+    Base class for the orchestrator threads processing the slices queued by the orchestrator handler.
+
+    Slices are dispatched to one of the worker threads based on the slice id; updates for the same slice are
+    always processed in order by the same worker while unrelated slices are processed in parallel. Workers block
+    on their queue until a slice is queued or the dispatcher is stopped.
+    """
+    DEFAULT_WORKERS = 1
+
+    def __init__(self, *, kernel, workers: int = DEFAULT_WORKERS, logger=None):
+        """
+        @param kernel orchestrator kernel
+        @param workers number of worker threads
+        @param logger logger
+        """
+        self.workers = max(int(workers or 1), 1)
+        self.queues = [queue.Queue() for _ in range(self.workers)]
+        self.thread_lock = threading.Lock()
+        self.threads = []
+        self.stopped = False
+        if logger is None:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            logger = GlobalsSingleton.get().get_logger()
+        self.logger = logger
+        self.mgmt_actor = kernel.get_management_actor()
+        self.kernel = kernel
+
+    def get_worker(self, *, controller_slice: OrchestratorSliceWrapper) -> int:
+        """
+        Return the index of the worker responsible for a slice
+        :param controller_slice:
+        :return: worker index
+        """
+        if self.workers == 1:
+            return 0
+        return zlib.crc32(str(controller_slice.get_slice_id()).encode()) % self.workers
+
+    def queue_slice(self, *, controller_slice: OrchestratorSliceWrapper):
+        """
+        Queue a slice
+        :param controller_slice:
+        :return:
+        """
+        try:
+            worker = self.get_worker(controller_slice=controller_slice)
+            self.queues[worker].put_nowait(controller_slice)
+            self.logger.debug(f"Added slice to slices queue {controller_slice.get_slice_id()} worker: {worker}")
+        except Exception as e:
+            self.logger.error(f"Failed to queue slice: {controller_slice.get_slice_id()} e: {e}")
+
+    def start(self):
+        """
+        Start worker threads
+        :return:
+        """
+        with self.thread_lock:
+            if len(self.threads) > 0:
+                raise OrchestratorException(f"This {self.__class__.__name__} has already been started")
+
+            self.stopped = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self.run, args=(self.queues[i],),
+                                          name=f"{self.__class__.__name__}-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def stop(self):
+        """
+        Stop worker threads; slices being processed are completed, queued slices are dropped
+        :return:
+        """
+        self.stopped = True
+        with self.thread_lock:
+            temp = self.threads
+            self.threads = []
+            for q in self.queues:
+                q.put_nowait(None)
+            for thread in temp:
+                try:
+                    thread.join()
+                except Exception as e:
+                    self.logger.error(f"Could not join {thread.name} thread {e}")
+
+    def run(self, slice_queue: queue.Queue):
+        """
+        Worker main loop
+        :param slice_queue: queue of the worker
+        :return:
+        """
+        self.logger.debug(f"{threading.current_thread().name} started")
+        while True:
+            controller_slice = slice_queue.get()
+
+            if controller_slice is None or self.stopped:
+                self.logger.info(f"{threading.current_thread().name} exiting")
+                return
+
+            try:
+                self.process_slice(controller_slice=controller_slice)
+            except Exception as e:
+                self.logger.error(f"Error while processing slice {type(controller_slice)}, {e}")
+                self.logger.error(traceback.format_exc())
+
+    @abstractmethod
+    def process_slice(self, *, controller_slice: OrchestratorSliceWrapper):
+        """
+        Process a slice
+        :param controller_slice:
+        """
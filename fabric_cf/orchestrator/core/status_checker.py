@@ -39,9 +39,11 @@ class Status(Enum):
 
 
 class StatusChecker:
-    def __init__(self):
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        self.logger = GlobalsSingleton.get().get_logger()
+    def __init__(self, *, logger=None):
+        if logger is None:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            logger = GlobalsSingleton.get().get_logger()
+        self.logger = logger
 
     def check(self, *, controller: ABCMgmtControllerMixin, rid: ID) -> Tuple[Status, ReservationMng or None]:
         """
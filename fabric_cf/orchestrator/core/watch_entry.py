@@ -31,6 +31,7 @@ class WatchEntry:
     def __init__(self, *, watch: ID, callback: IStatusUpdateCallback):
         self.reservation_to_watch = watch
         self.callback = callback
+        self.subscription = None
 
     def __str__(self):
         return f"watch: {self.reservation_to_watch} callback: {self.callback}"
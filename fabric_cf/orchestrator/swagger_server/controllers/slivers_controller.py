@@ -4,7 +4,7 @@ from fabric_cf.orchestrator.swagger_server.models.slivers import Slivers  # noqa
 from fabric_cf.orchestrator.swagger_server.response import slivers_controller as rc
 
 
-def slivers_get(slice_id, as_self=None):  # noqa: E501
+def slivers_get(slice_id, as_self=None, states=None, limit=None, cursor=None, fields=None):  # noqa: E501
     """Retrieve a listing of user slivers
 
     Retrieve a listing of user slivers # noqa: E501
@@ -13,10 +13,19 @@ def slivers_get(slice_id, as_self=None):  # noqa: E501
     :type slice_id: str
     :param as_self: GET object as Self
     :type as_self: bool
+    :param states: Search for Slivers in the specified states
+    :type states: List[str]
+    :param limit: maximum number of results to return
+    :type limit: int
+    :param cursor: return the slivers following this sliver id (next_cursor of the previous page)
+    :type cursor: str
+    :param fields: sliver fields to return
+    :type fields: List[str]
 
     :rtype: Slivers
     """
-    return rc.slivers_get(slice_id=slice_id, as_self=as_self)
+    return rc.slivers_get(slice_id=slice_id, as_self=as_self, states=states, limit=limit, cursor=cursor,
+                          fields=fields)
 
 
 def slivers_sliver_id_get(slice_id, sliver_id, as_self=None):  # noqa: E501
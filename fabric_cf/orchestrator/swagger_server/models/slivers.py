@@ -16,7 +16,7 @@ class Slivers(Model):
 
     Do not edit the class manually.
     """
-    def __init__(self, limit: int=None, offset: int=None, size: int=None, status: int=200, total: int=None, type: str=None, data: List[Sliver]=None):  # noqa: E501
+    def __init__(self, limit: int=None, offset: int=None, size: int=None, status: int=200, total: int=None, type: str=None, data: List[Sliver]=None, next_cursor: str=None):  # noqa: E501
         """Slivers - a model defined in Swagger
 
         :param limit: The limit of this Slivers.  # noqa: E501
@@ -33,6 +33,8 @@ class Slivers(Model):
         :type type: str
         :param data: The data of this Slivers.  # noqa: E501
         :type data: List[Sliver]
+        :param next_cursor: The next_cursor of this Slivers.  # noqa: E501
+        :type next_cursor: str
         """
         self.swagger_types = {
             'limit': int,
@@ -41,7 +43,8 @@ class Slivers(Model):
             'status': int,
             'total': int,
             'type': str,
-            'data': List[Sliver]
+            'data': List[Sliver],
+            'next_cursor': str
         }
 
         self.attribute_map = {
@@ -51,7 +54,8 @@ class Slivers(Model):
             'status': 'status',
             'total': 'total',
             'type': 'type',
-            'data': 'data'
+            'data': 'data',
+            'next_cursor': 'next_cursor'
         }
         self._limit = limit
         self._offset = offset
@@ -60,6 +64,7 @@ class Slivers(Model):
         self._total = total
         self._type = type
         self._data = data
+        self._next_cursor = next_cursor
 
     @classmethod
     def from_dict(cls, dikt) -> 'Slivers':
@@ -218,3 +223,24 @@ class Slivers(Model):
         """
 
         self._data = data
+
+    @property
+    def next_cursor(self) -> str:
+        """Gets the next_cursor of this Slivers.
+
+
+        :return: The next_cursor of this Slivers.
+        :rtype: str
+        """
+        return self._next_cursor
+
+    @next_cursor.setter
+    def next_cursor(self, next_cursor: str):
+        """Sets the next_cursor of this Slivers.
+
+
+        :param next_cursor: The next_cursor of this Slivers.
+        :type next_cursor: str
+        """
+
+        self._next_cursor = next_cursor
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Union
+from typing import Union, Iterable
 
 from flask import request, Response
 
@@ -37,6 +37,13 @@ def cors_response(req: request, status_code: int = 200, body: object = None, x_e
     response = Response(mimetype='application/json')
     response.status_code = status_code
     response.data = body
+    return add_cors_headers(req=req, response=response, x_error=x_error)
+
+
+def add_cors_headers(req: request, response: Response, x_error: str = None) -> Response:
+    """
+    Add CORS headers to a Response object
+    """
     response.headers['Access-Control-Allow-Origin'] = req.headers.get('Origin', '*')
     response.headers['Access-Control-Allow-Credentials'] = 'true'
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, PATCH, DELETE, OPTIONS'
@@ -64,6 +71,15 @@ def cors_200(response_body: Union[Resources, Slices, SliceDetails, Slivers, Vers
     )
 
 
+def cors_200_stream(chunks: Iterable[str]) -> Response:
+    """
+    Return 200 - OK with the body streamed from the chunks as they are generated
+    """
+    response = Response(chunks, mimetype='application/json')
+    response.status_code = 200
+    return add_cors_headers(req=request, response=response)
+
+
 def cors_200_no_content(details: str = None) -> cors_response:
     """
     Return 200 - No Content
@@ -24,6 +24,9 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 
+import json
+from typing import Iterator, List
+
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.orchestrator_handler import OrchestratorHandler
 from fabric_cf.orchestrator.swagger_server import received_counter, success_counter, failure_counter
@@ -31,10 +34,46 @@ from fabric_cf.orchestrator.swagger_server.models import Sliver
 from fabric_cf.orchestrator.swagger_server.models.slivers import Slivers  # noqa: E501
 from fabric_cf.orchestrator.swagger_server.response.constants import GET_METHOD, SLIVERS_GET_PATH, \
     SLIVERS_GET_SLIVER_ID_PATH
+from fabric_cf.orchestrator.swagger_server.response.cors_response import cors_200_stream, delete_none
 from fabric_cf.orchestrator.swagger_server.response.utils import get_token, cors_error_response, cors_success_response
 
 
-def slivers_get(slice_id, as_self = True) -> Slivers:  # noqa: E501
+def stream_slivers(*, pages: Iterator[List[dict]], limit: int = None, logger=None) -> Iterator[str]:
+    """
+    Generate the JSON of a Slivers response incrementally, one sliver at a time
+
+    :param pages: pages of slivers
+    :param limit: limit requested; next_cursor is included when as many slivers are returned
+    :param logger: logger
+
+    :rtype: Iterator[str]
+    """
+    yield '{"data": ['
+    size = 0
+    last = None
+    try:
+        for page in pages:
+            for s in page:
+                sliver = Sliver().from_dict(s)
+                yield (", " if size > 0 else "") + json.dumps(delete_none(sliver.to_dict()), sort_keys=True)
+                size += 1
+                last = sliver.sliver_id
+    except Exception as e:
+        # Headers have already been sent; the response is terminated and the client sees a truncated body
+        if logger is not None:
+            logger.exception(e)
+        failure_counter.labels(GET_METHOD, SLIVERS_GET_PATH).inc()
+        raise e
+
+    trailer = Slivers(size=size, type="slivers", limit=limit)
+    if limit is not None and size >= limit:
+        trailer.next_cursor = last
+    yield "], " + json.dumps(delete_none(trailer.to_dict()), sort_keys=True)[1:]
+    success_counter.labels(GET_METHOD, SLIVERS_GET_PATH).inc()
+
+
+def slivers_get(slice_id, as_self = True, states = None, limit = None, cursor = None,
+                fields = None) -> Slivers:  # noqa: E501
     """Retrieve a listing of user slivers
 
     Retrieve a listing of user slivers # noqa: E501
@@ -43,6 +82,14 @@ def slivers_get(slice_id, as_self = True) -> Slivers:  # noqa: E501
     :type slice_id: str
     :param as_self: GET object as Self
     :type as_self: bool
+    :param states: Search for Slivers in the specified states
+    :type states: List[str]
+    :param limit: maximum number of results to return
+    :type limit: int
+    :param cursor: return the slivers following this sliver id (next_cursor of the previous page)
+    :type cursor: str
+    :param fields: sliver fields to return
+    :type fields: List[str]
 
     :rtype: Slivers
     """
@@ -51,16 +98,9 @@ def slivers_get(slice_id, as_self = True) -> Slivers:  # noqa: E501
     received_counter.labels(GET_METHOD, SLIVERS_GET_PATH).inc()
     try:
         token = get_token()
-        slivers_dict = handler.get_slivers(slice_id=slice_id, token=token, as_self=as_self)
-        response = Slivers()
-        response.data = []
-        for s in slivers_dict:
-            sliver = Sliver().from_dict(s)
-            response.data.append(sliver)
-        response.size = len(response.data)
-        response.type = "slivers"
-        success_counter.labels(GET_METHOD, SLIVERS_GET_PATH).inc()
-        return cors_success_response(response_body=response)
+        pages = handler.list_slivers(slice_id=slice_id, token=token, as_self=as_self, states=states, limit=limit,
+                                     cursor=cursor, fields=fields)
+        return cors_200_stream(chunks=stream_slivers(pages=pages, limit=limit, logger=logger))
     except OrchestratorException as e:
         logger.exception(e)
         failure_counter.labels(GET_METHOD, SLIVERS_GET_PATH).inc()
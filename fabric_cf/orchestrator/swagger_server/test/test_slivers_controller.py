@@ -23,7 +23,11 @@ class TestSliversController(BaseTestCase):
         Retrieve a listing of user slivers
         """
         query_string = [('slice_id', 'slice_id_example'),
-                        ('as_self', true)]
+                        ('as_self', true),
+                        ('states', 'states_example'),
+                        ('limit', 1000),
+                        ('cursor', 'cursor_example'),
+                        ('fields', 'fields_example')]
         response = self.client.open(
             '//slivers',
             method='GET',
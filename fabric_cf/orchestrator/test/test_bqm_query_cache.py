@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Unit tests for the cache of filtered Broker Query Model queries.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+
+from fabric_cf.orchestrator.core.bqm_query_cache import BqmQueryCache
+
+
+class BqmQueryCacheTest(unittest.TestCase):
+    def test_normalize_and_align(self):
+        self.assertEqual("RENC,UKY", BqmQueryCache.normalize_sites(sites=" uky,RENC, renc,"))
+        self.assertIsNone(BqmQueryCache.normalize_sites(sites=" , "))
+        self.assertIsNone(BqmQueryCache.normalize_sites(sites=None))
+
+        cache = BqmQueryCache(refresh_interval=300, granularity=3600)
+        start, end = cache.align(start=datetime(2026, 1, 1, 10, 25, 3, tzinfo=timezone.utc),
+                                 end=datetime(2026, 1, 2, 8, 0, 0, 1, tzinfo=timezone.utc))
+        self.assertEqual(datetime(2026, 1, 1, 10, tzinfo=timezone.utc), start)
+        self.assertEqual(datetime(2026, 1, 2, 9, tzinfo=timezone.utc), end)
+
+        start, end = cache.align(start=None, end=datetime(2026, 1, 2, 8, tzinfo=timezone.utc))
+        self.assertIsNone(start)
+        self.assertEqual(datetime(2026, 1, 2, 8, tzinfo=timezone.utc), end)
+
+    def test_lru_and_expiry(self):
+        cache = BqmQueryCache(size=2, refresh_interval=300)
+        calls = []
+
+        def loader(value):
+            calls.append(value)
+            return value
+
+        self.assertEqual("a", cache.get(key=("a",), loader=lambda: loader("a")))
+        self.assertEqual("b", cache.get(key=("b",), loader=lambda: loader("b")))
+        self.assertEqual("a", cache.get(key=("a",), loader=lambda: loader("a")))
+        # "b" is the least recently used and is evicted
+        self.assertEqual("c", cache.get(key=("c",), loader=lambda: loader("c")))
+        self.assertEqual("b", cache.get(key=("b",), loader=lambda: loader("b")))
+        self.assertEqual(["a", "b", "c", "b"], calls)
+        self.assertEqual(2, len(cache))
+
+        self.assertEqual("b", cache.get(key=("b",), loader=lambda: loader("b"), force_refresh=True))
+        self.assertEqual(5, len(calls))
+
+        cache.refresh_interval = -1
+        self.assertEqual("b", cache.get(key=("b",), loader=lambda: loader("b")))
+        self.assertEqual(6, len(calls))
+
+    def test_concurrent_queries_are_coalesced(self):
+        cache = BqmQueryCache(refresh_interval=300)
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "model"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get(key=("k",), loader=loader)))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(["model"] * 5, results)
+        self.assertEqual(1, len(calls))
+
+    def test_failures_are_shared_and_not_cached(self):
+        cache = BqmQueryCache(refresh_interval=300)
+
+        def loader():
+            raise Exception("broker unavailable")
+
+        with self.assertRaises(Exception):
+            cache.get(key=("k",), loader=loader)
+        self.assertEqual(0, len(cache))
+        self.assertEqual("model", cache.get(key=("k",), loader=lambda: "model"))
+
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Unit tests for OrchestratorKernel.determine_future_lease_time using stand-ins for the CBM and management actor.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import concurrent.futures
+import logging
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from fim.slivers.capacities_labels import Capacities, Labels
+from fim.slivers.network_node import NodeSliver, NodeType
+
+from fabric_cf.orchestrator.core.orchestrator_kernel import OrchestratorKernel
+
+
+class FutureLeaseTimeTest(unittest.TestCase):
+    class Request:
+        def __init__(self, sliver: NodeSliver):
+            self.sliver = sliver
+
+        def get_sliver(self):
+            return self.sliver
+
+    class Existing:
+        def __init__(self, rid: str, sliver: NodeSliver, end: datetime):
+            self.rid = rid
+            self.sliver = sliver
+            self.end = end
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_sliver(self):
+            return self.sliver
+
+        def get_end(self):
+            return int(self.end.timestamp() * 1000)
+
+    @staticmethod
+    def build_sliver(name: str = None, core: int = 4, parent: str = None) -> NodeSliver:
+        sliver = NodeSliver()
+        sliver.set_type(NodeType.VM if name is None else NodeType.Server)
+        if name is not None:
+            sliver.set_name(name)
+        sliver.set_capacities(cap=Capacities(core=core, ram=8, disk=10))
+        if parent is not None:
+            sliver.set_labels(Labels(instance_parent=parent))
+        return sliver
+
+    def setUp(self) -> None:
+        self.start = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        self.end = self.start + timedelta(days=2)
+        self.hosts = {"h1": self.build_sliver(name="host1", core=16),
+                      "h2": self.build_sliver(name="host2", core=16)}
+        # host1 busy for the first 10 hours, host2 for the first 20 hours
+        self.existing = {"h1": [self.Existing("r1", self.build_sliver(core=12), self.start + timedelta(hours=10))],
+                         "h2": [self.Existing("r2", self.build_sliver(core=12), self.start + timedelta(hours=20))]}
+        self.queries = []
+
+    def get_reservations(self, **kwargs):
+        self.queries.append(kwargs.get("node_id"))
+        return self.existing[kwargs.get("node_id")]
+
+    def build_kernel(self, workers: int) -> OrchestratorKernel:
+        kernel = OrchestratorKernel()
+        kernel.logger = logging.getLogger(__name__)
+        kernel.combined_broker_model = mock.Mock()
+        kernel.combined_broker_model.build_deep_node_sliver = lambda node_id: self.hosts[node_id]
+        management_actor = mock.Mock()
+        management_actor.get_reservations = self.get_reservations
+        kernel.get_management_actor = lambda: management_actor
+        if workers > 1:
+            kernel.future_lease_pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        return kernel
+
+    def determine(self, kernel: OrchestratorKernel, requests: list):
+        with mock.patch("fabric_cf.orchestrator.core.orchestrator_kernel.FimHelper.candidate_nodes",
+                        return_value=list(self.hosts.keys())):
+            return kernel.determine_future_lease_time(computed_reservations=requests, start=self.start,
+                                                      end=self.end, duration=4)
+
+    def test_common_start_time(self):
+        requests = [self.Request(self.build_sliver(core=8)), self.Request(self.build_sliver(core=8, parent="host2"))]
+        for workers in [1, 4]:
+            self.queries = []
+            start, end = self.determine(kernel=self.build_kernel(workers=workers), requests=requests)
+            self.assertEqual(self.start + timedelta(hours=21), start)
+            self.assertEqual(start + timedelta(hours=4), end)
+            # Each host is queried only once across all the reservations
+            self.assertEqual(["h1", "h2"], sorted(self.queries))
+
+    def test_deadline(self):
+        kernel = self.build_kernel(workers=1)
+        kernel.future_lease_timeout = -1
+        requests = [self.Request(self.build_sliver(core=8))]
+        self.assertEqual((self.start, self.start + timedelta(hours=4)), self.determine(kernel=kernel, requests=requests))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Unit tests for the per-hour capacity matrices used by find-slot and future lease time computation.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from fabric_cf.orchestrator.core.hourly_capacity import HourlyCapacity
+from fabric_cf.orchestrator.core.orchestrator_handler import OrchestratorHandler
+
+
+class HourlyCapacityTest(unittest.TestCase):
+    def test_hour_span(self):
+        base = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        self.assertEqual((0, 2), HourlyCapacity.hour_span(base=base, start=base, end=base + timedelta(hours=2),
+                                                          hours=10))
+        self.assertEqual((1, 3), HourlyCapacity.hour_span(base=base, start=base + timedelta(minutes=90),
+                                                          end=base + timedelta(minutes=150), hours=10))
+        self.assertEqual((0, 10), HourlyCapacity.hour_span(base=base, start=base - timedelta(days=1),
+                                                           end=base + timedelta(days=1), hours=10))
+
+    def test_usage(self):
+        usage = HourlyCapacity(hours=5, shape=(2,))
+        usage.add(first=1, last=3, value=np.array([2, 4]))
+        usage.add(first=2, last=10, value=1, index=0)
+        self.assertEqual([[0, 0], [2, 4], [3, 4], [1, 0], [1, 0]], usage.usage().tolist())
+
+    def test_window_starts(self):
+        hour_ok = np.array([True, True, False, True, True, True, False])
+        self.assertEqual([0, 3, 4], HourlyCapacity.window_starts(hour_ok=hour_ok, duration=2).tolist())
+        self.assertEqual([3], HourlyCapacity.window_starts(hour_ok=hour_ok, duration=3).tolist())
+        self.assertEqual([], HourlyCapacity.window_starts(hour_ok=hour_ok, duration=8).tolist())
+
+    def test_first_fit(self):
+        remaining = np.array([[[4, 8], [8, 8]], [[1, 8], [8, 8]]])
+        placed = HourlyCapacity.first_fit(remaining=remaining, candidates=np.array([True, True]),
+                                          request=np.array([2, 2]), checked=np.array([True, True]))
+        self.assertEqual([True, True], placed.tolist())
+        self.assertEqual([[[2, 6], [8, 8]], [[1, 8], [6, 6]]], remaining.tolist())
+
+
+class LiveHoursAvailableTest(unittest.TestCase):
+    def test_compute_and_links(self):
+        start = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        host_cap_map = {"h1": {"site": "A", "cores_capacity": 8, "ram_capacity": 32, "disk_capacity": 100,
+                               "components": {"gpu-tesla t4": 1}}}
+        hosts_by_site = {"A": ["h1"]}
+        compute_reservations = [{"host": "h1", "lease_start": start + timedelta(hours=2),
+                                 "lease_end": start + timedelta(hours=4), "cores": 6, "ram": 8, "disk": 10,
+                                 "components": ["gpu-tesla t4"]}]
+        compute_requests = [{"site": "A", "cores": 4, "ram": 8, "disk": 10, "components": {"GPU-Tesla T4": 1}}]
+        link_cap_map = {("A", "B"): {"bandwidth_capacity": 100}}
+        net_reservations = [{"lease_start": start + timedelta(hours=5), "lease_end": start + timedelta(hours=6),
+                             "bandwidth": 80, "sites": ["A", "B"], "vlans": [], "fp_name": None, "site": "A"}]
+        link_requests = [{"site_a": "B", "site_b": "A", "bandwidth": 40}]
+
+        hour_ok = OrchestratorHandler._live_hours_available(start, 8, compute_requests, link_requests, [],
+                                                            host_cap_map, hosts_by_site, compute_reservations,
+                                                            link_cap_map, net_reservations, {})
+        self.assertEqual([True, True, False, False, True, False, True, True], hour_ok.tolist())
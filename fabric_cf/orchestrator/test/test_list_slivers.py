@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+"""
+Unit tests for the user filter applied by OrchestratorHandler.list_slivers.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import logging
+import unittest
+
+from fabric_cf.orchestrator.core.orchestrator_handler import OrchestratorHandler
+from fabric_cf.orchestrator.core.response_builder import ResponseBuilder
+
+
+class ListSliversTest(unittest.TestCase):
+    class Controller:
+        """
+        Stand-in for the management actor recording the queries
+        """
+        def __init__(self):
+            self.queries = []
+
+        def get_reservations(self, **kwargs):
+            self.queries.append(("get_reservations", kwargs))
+            return []
+
+        def get_reservation_summaries(self, **kwargs):
+            self.queries.append(("get_reservation_summaries", kwargs))
+            return []
+
+        def get_last_error(self):
+            return None
+
+    class Kernel:
+        def __init__(self, controller):
+            self.controller = controller
+
+        def get_management_actor(self):
+            return self.controller
+
+    class Token:
+        uuid = "user-1"
+
+    def get_handler(self) -> OrchestratorHandler:
+        handler = OrchestratorHandler.__new__(OrchestratorHandler)
+        handler.logger = logging.getLogger(__name__)
+        handler.controller_state = self.Kernel(self.Controller())
+        handler._OrchestratorHandler__authorize_request = lambda **kwargs: self.Token()
+        return handler
+
+    def list_slivers(self, *, as_self: bool, fields: list = None) -> tuple:
+        handler = self.get_handler()
+        list(handler.list_slivers(token="token", slice_id="5a37b9d6-3cf2-4e4b-9b2d-3f3c6f1e7a10",
+                                  as_self=as_self, fields=fields))
+        return handler.controller_state.controller.queries[0]
+
+    def test_summary_path_filtered_as_self(self):
+        method, kwargs = self.list_slivers(as_self=True, fields=[ResponseBuilder.PROP_STATE])
+        self.assertEqual("get_reservation_summaries", method)
+        self.assertEqual("user-1", kwargs.get("oidc_claim_sub"))
+
+        method, kwargs = self.list_slivers(as_self=False, fields=[ResponseBuilder.PROP_STATE])
+        self.assertEqual("get_reservation_summaries", method)
+        self.assertIsNone(kwargs.get("oidc_claim_sub"))
+
+    def test_full_path_filtered_as_self(self):
+        method, kwargs = self.list_slivers(as_self=True)
+        self.assertEqual("get_reservations", method)
+        self.assertEqual("user-1", kwargs.get("oidc_claim_sub"))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+"""
+Unit tests for the watches of ReservationStatusUpdateThread driven by the reservation event bus.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import logging
+import threading
+import time
+import unittest
+
+from fabric_cf.actor.core.kernel.reservation_event_bus import ReservationEventBus
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.orchestrator.core.reservation_status_update_thread import ReservationStatusUpdateThread
+
+
+class ReservationStatusUpdateThreadTest(unittest.TestCase):
+    class Reservation:
+        def __init__(self, rid: ID, state: ReservationStates):
+            self.rid = rid
+            self.state = state
+
+        def get_reservation_id(self):
+            return str(self.rid)
+
+        def get_state(self):
+            return self.state.value
+
+    class KernelReservation(Reservation):
+        def get_state(self):
+            return self.state
+
+    class Controller:
+        def __init__(self):
+            self.reservations = {}
+            self.units = {}
+
+        def get_reservations(self, *, rid: ID):
+            r = self.reservations.get(str(rid))
+            return [r] if r is not None else None
+
+        def get_reservation_units(self, *, rid: ID):
+            return self.units.get(str(rid))
+
+    class Callback:
+        def __init__(self):
+            self.success_calls = []
+            self.failure_calls = []
+            self.event = threading.Event()
+
+        def success(self, *, controller, reservation):
+            self.success_calls.append(reservation.get_reservation_id())
+            self.event.set()
+
+        def failure(self, *, controller, reservation):
+            self.failure_calls.append(reservation.get_reservation_id())
+            self.event.set()
+
+    class Bus(ReservationEventBus):
+        @staticmethod
+        def snapshot(*, reservation):
+            return reservation
+
+    def setUp(self):
+        logger = logging.getLogger(__name__)
+        self.bus = self.Bus(logger=logger)
+        self.controller = self.Controller()
+        self.sut = ReservationStatusUpdateThread(bus=self.bus, logger=logger)
+        self.sut.controller = self.controller
+
+    def tearDown(self):
+        self.bus.stop()
+
+    def set_state(self, *, rid: ID, state: ReservationStates, units: list = None):
+        self.controller.reservations[str(rid)] = self.Reservation(rid, state)
+        self.controller.units[str(rid)] = units
+
+    def transition(self, *, rid: ID, state: ReservationStates, units: list = None):
+        self.set_state(rid=rid, state=state, units=units)
+        self.bus.publish(reservation=self.KernelReservation(rid, state))
+
+    def test_transition_to_active(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Ticketed)
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+        self.assertEqual([], callback.success_calls)
+
+        self.transition(rid=rid, state=ReservationStates.Active, units=["unit"])
+        self.assertTrue(callback.event.wait(timeout=5))
+        self.assertEqual([str(rid)], callback.success_calls)
+        self.assertEqual(0, len(self.sut.active_watch))
+        self.assertFalse(self.bus.has_subscriptions(rid=rid))
+
+    def test_transition_to_failed(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Ticketed)
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+
+        self.transition(rid=rid, state=ReservationStates.Failed)
+        self.assertTrue(callback.event.wait(timeout=5))
+        self.assertEqual([str(rid)], callback.failure_calls)
+        self.assertEqual([], callback.success_calls)
+
+    def test_already_in_required_state(self):
+        active = ID()
+        failed = ID()
+        callback = self.Callback()
+        self.set_state(rid=active, state=ReservationStates.Active, units=["unit"])
+        self.set_state(rid=failed, state=ReservationStates.Closed)
+
+        self.sut.add_active_status_watch(watch=active, callback=callback)
+        self.sut.add_active_status_watch(watch=failed, callback=callback)
+        self.assertEqual([str(active)], callback.success_calls)
+        self.assertEqual([str(failed)], callback.failure_calls)
+        self.assertEqual(0, len(self.sut.active_watch))
+        self.assertFalse(self.bus.has_subscriptions(rid=active))
+        self.assertFalse(self.bus.has_subscriptions(rid=failed))
+
+    def test_active_without_units(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Ticketed)
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+
+        # Active without units is not ready; the watch is polled until the units are available
+        self.transition(rid=rid, state=ReservationStates.Active)
+        deadline = time.monotonic() + 5
+        while len(self.sut.not_ready_watch) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, len(self.sut.not_ready_watch))
+        self.sut.run()
+        self.assertEqual([], callback.success_calls)
+
+        self.controller.units[str(rid)] = ["unit"]
+        self.sut.run()
+        self.assertEqual([str(rid)], callback.success_calls)
+        self.assertEqual(0, len(self.sut.not_ready_watch))
+        self.assertEqual(0, len(self.sut.active_watch))
+
+    def test_callback_invoked_once(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Active, units=["unit"])
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+        # A transition reported after the watch was processed is ignored
+        self.bus.publish(reservation=self.KernelReservation(rid, ReservationStates.Active))
+        self.sut.run()
+        time.sleep(0.1)
+        self.assertEqual([str(rid)], callback.success_calls)
+
+    def wait_for_not_ready(self):
+        deadline = time.monotonic() + 5
+        while len(self.sut.not_ready_watch) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_database_lags_transition_to_active(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Ticketed)
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+        self.assertEqual(0, len(self.sut.not_ready_watch))
+
+        # The transition is published before the reservation is saved
+        self.bus.publish(reservation=self.KernelReservation(rid, ReservationStates.Active))
+        self.wait_for_not_ready()
+        self.assertEqual(1, len(self.sut.not_ready_watch))
+        self.assertFalse(self.bus.has_subscriptions(rid=rid))
+        self.sut.run()
+        self.assertEqual([], callback.success_calls)
+
+        self.set_state(rid=rid, state=ReservationStates.Active, units=["unit"])
+        self.sut.run()
+        self.assertEqual([str(rid)], callback.success_calls)
+        self.assertEqual(0, len(self.sut.not_ready_watch))
+        self.assertEqual(0, len(self.sut.active_watch))
+
+    def test_database_lags_transition_to_failed(self):
+        rid = ID()
+        callback = self.Callback()
+        self.set_state(rid=rid, state=ReservationStates.Ticketed)
+        self.sut.add_active_status_watch(watch=rid, callback=callback)
+
+        self.bus.publish(reservation=self.KernelReservation(rid, ReservationStates.Failed))
+        self.assertTrue(callback.event.wait(timeout=5))
+        self.assertEqual([str(rid)], callback.failure_calls)
+        self.assertEqual(0, len(self.sut.active_watch))
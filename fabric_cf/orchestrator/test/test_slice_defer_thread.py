@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+"""
+Unit tests for the batched demand issued by SliceDeferThread.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import logging
+import unittest
+
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
+
+from fabric_cf.actor.core.common.constants import ErrorCodes
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.orchestrator.core.slice_defer_thread import SliceDeferThread
+
+
+class SliceDeferThreadTest(unittest.TestCase):
+    class Reservation:
+        def __init__(self, rid: str, state: ReservationStates):
+            self.rid = rid
+            self.state = state
+
+        def get_reservation_id(self):
+            return self.rid
+
+        def get_state(self):
+            return self.state.value
+
+    class Slice:
+        def __init__(self, reservations: list, remove: list = None):
+            self.reservations = reservations
+            self.computed_remove_reservations = remove or []
+            self.computed_modify_reservations = {}
+            self.computed_modify_properties_reservations = []
+            self.locked = False
+
+        def get_computed_reservations(self):
+            return self.reservations
+
+        def lock(self):
+            self.locked = True
+
+        def unlock(self):
+            self.locked = False
+
+    class Controller:
+        def __init__(self, *, fail: set = None):
+            self.fail = fail or set()
+            self.demanded = []
+            self.closed = []
+
+        def demand_reservations(self, *, reservations):
+            results = {}
+            for r in reservations:
+                self.demanded.append(r.get_reservation_id())
+                result = ResultAvro()
+                if r.get_reservation_id() in self.fail:
+                    result.set_code(ErrorCodes.ErrorDatabaseError.value)
+                    result.set_message(ErrorCodes.ErrorDatabaseError.interpret())
+                results[r.get_reservation_id()] = result
+            return results
+
+        def close_reservations_by_rids(self, *, rids):
+            self.closed.extend([str(rid) for rid in rids])
+            return {}
+
+        def get_last_error(self):
+            return None
+
+    class Kernel:
+        def __init__(self, controller):
+            self.controller = controller
+
+        def get_management_actor(self):
+            return self.controller
+
+        def get_sut(self):
+            return None
+
+    def get_thread(self, *, controller) -> SliceDeferThread:
+        return SliceDeferThread(kernel=self.Kernel(controller), workers=1, logger=logging.getLogger(__name__))
+
+    def test_demand(self):
+        controller = self.Controller()
+        thread = self.get_thread(controller=controller)
+        controller_slice = self.Slice([self.Reservation("r0", ReservationStates.Unknown),
+                                       self.Reservation("r1", ReservationStates.Active),
+                                       self.Reservation("r2", ReservationStates.Unknown)], remove=["r3"])
+        thread.process_slice(controller_slice=controller_slice)
+        # Only the new reservations are demanded, in a single batch
+        self.assertEqual(["r0", "r2"], controller.demanded)
+        self.assertEqual(["r3"], controller.closed)
+        self.assertFalse(controller_slice.locked)
+
+    def test_demand_failure(self):
+        controller = self.Controller(fail={"r2"})
+        thread = self.get_thread(controller=controller)
+        controller_slice = self.Slice([self.Reservation("r0", ReservationStates.Unknown),
+                                       self.Reservation("r2", ReservationStates.Unknown)], remove=["r3"])
+        thread.process_slice(controller_slice=controller_slice)
+        self.assertEqual(["r0", "r2"], controller.demanded)
+        # Processing of the slice stops on a failed demand
+        self.assertEqual([], controller.closed)
+        self.assertFalse(controller_slice.locked)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Unit tests for the sharded dispatch of slices by SliceDispatcher.
+These tests need no Kafka/Postgres/Neo4j.
+"""
+import logging
+import threading
+import time
+import unittest
+
+from fabric_cf.orchestrator.core.slice_dispatcher import SliceDispatcher
+
+
+class SliceDispatcherTest(unittest.TestCase):
+    class Kernel:
+        def get_management_actor(self):
+            return None
+
+    class Slice:
+        def __init__(self, slice_id: str, seq: int, delay: float = 0):
+            self.slice_id = slice_id
+            self.seq = seq
+            self.delay = delay
+
+        def get_slice_id(self):
+            return self.slice_id
+
+    class RecordingDispatcher(SliceDispatcher):
+        def __init__(self, *, workers: int):
+            super().__init__(kernel=SliceDispatcherTest.Kernel(), workers=workers,
+                             logger=logging.getLogger(__name__))
+            self.processed = []
+            self.lock = threading.Lock()
+
+        def process_slice(self, *, controller_slice):
+            if controller_slice.delay:
+                time.sleep(controller_slice.delay)
+            with self.lock:
+                self.processed.append((controller_slice.slice_id, controller_slice.seq))
+
+    def wait_for(self, *, dispatcher: RecordingDispatcher, count: int, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with dispatcher.lock:
+                if len(dispatcher.processed) >= count:
+                    return
+            time.sleep(0.01)
+        self.fail(f"Timed out waiting for {count} slices")
+
+    def test_per_slice_order(self):
+        dispatcher = self.RecordingDispatcher(workers=4)
+        dispatcher.start()
+        try:
+            for seq in range(20):
+                for slice_id in ["a", "b", "c"]:
+                    dispatcher.queue_slice(controller_slice=self.Slice(slice_id, seq))
+            self.wait_for(dispatcher=dispatcher, count=60)
+            for slice_id in ["a", "b", "c"]:
+                self.assertEqual(list(range(20)), [seq for s, seq in dispatcher.processed if s == slice_id])
+        finally:
+            dispatcher.stop()
+
+    def test_slow_slice_does_not_block_others(self):
+        dispatcher = self.RecordingDispatcher(workers=4)
+        slow = self.Slice("slow", 0, delay=1)
+        fast = [s for s in (self.Slice(str(i), 0) for i in range(20))
+                if dispatcher.get_worker(controller_slice=s) != dispatcher.get_worker(controller_slice=slow)]
+        dispatcher.start()
+        try:
+            dispatcher.queue_slice(controller_slice=slow)
+            for s in fast:
+                dispatcher.queue_slice(controller_slice=s)
+            self.wait_for(dispatcher=dispatcher, count=len(fast), timeout=0.9)
+            self.assertNotIn(("slow", 0), dispatcher.processed)
+            self.wait_for(dispatcher=dispatcher, count=len(fast) + 1)
+        finally:
+            dispatcher.stop()
+
+    def test_stop_wakes_idle_workers(self):
+        dispatcher = self.RecordingDispatcher(workers=2)
+        dispatcher.start()
+        threads = list(dispatcher.threads)
+        dispatcher.stop()
+        for thread in threads:
+            self.assertFalse(thread.is_alive())